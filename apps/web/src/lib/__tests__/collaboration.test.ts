@@ -404,6 +404,22 @@ describe('Collaboration Module', () => {
       expect(Y.applyUpdate).toHaveBeenCalled();
     });
 
+    it('should apply unmerged updates after the sync state', () => {
+      collaborationModule.getYDoc('session-1', 'file:/workspace/app.tsx');
+
+      const syncHandler = eventHandlers.get('yjs_sync');
+      const encode = (bytes: number[]) => btoa(String.fromCharCode(...new Uint8Array(bytes)));
+
+      syncHandler?.({
+        session_id: 'session-1',
+        doc_name: 'file:/workspace/app.tsx',
+        state: null,
+        updates: [encode([1]), encode([2])],
+      });
+
+      expect(Y.applyUpdate).toHaveBeenCalledTimes(2);
+    });
+
     it('should ignore sync state for different session', () => {
       collaborationModule.getYDoc('session-1', 'file:/workspace/app.tsx');
 
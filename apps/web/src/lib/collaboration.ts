@@ -143,13 +143,22 @@ export function getYDoc(sessionId: string, docName: string): Y.Doc {
   // Subscribe to document updates
   sock.emit('yjs_subscribe', { session_id: sessionId, doc_name: docName });
 
-  // Handle incoming sync state (full document state)
+  // Handle incoming sync state (stored snapshot plus updates not yet merged into it)
   if (!handlers.has('yjs_sync')) {
     handlers.add('yjs_sync');
-    const syncHandler = (data: { session_id: string; doc_name: string; state: string }) => {
+    const syncHandler = (data: {
+      session_id: string;
+      doc_name: string;
+      state: string | null;
+      updates?: string[];
+    }) => {
       if (data.session_id === sessionId && data.doc_name === docName) {
-        const state = base64ToUint8Array(data.state);
-        Y.applyUpdate(doc, state, 'socket');
+        if (data.state) {
+          Y.applyUpdate(doc, base64ToUint8Array(data.state), 'socket');
+        }
+        for (const update of data.updates ?? []) {
+          Y.applyUpdate(doc, base64ToUint8Array(update), 'socket');
+        }
       }
     };
     handlerFns.set('yjs_sync', syncHandler as (...args: unknown[]) => void);
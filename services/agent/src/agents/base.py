@@ -2,6 +2,7 @@
 
 import json
 import re
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
@@ -993,17 +994,7 @@ Use this context to provide more personalized and consistent responses.
                     content = remaining_content if remaining_content.strip() else ""
 
             # Process tool calls if any
-            processed_tool_calls = []
-            for i, tool_call in enumerate(tool_calls):
-                result = await self._execute_tool(tool_call)
-                processed_tool_calls.append(
-                    {
-                        "id": tool_call.get("id", f"tc-{i}"),
-                        "name": tool_call.get("name"),
-                        "arguments": tool_call.get("arguments"),
-                        "result": result,
-                    },
-                )
+            processed_tool_calls = await self._execute_tools(tool_calls)
 
             # Generate user-friendly response if we only have tool calls
             if processed_tool_calls and not content:
@@ -1168,6 +1159,8 @@ Use this context to provide more personalized and consistent responses.
             tokens_used = 0
             input_tokens = 0
             output_tokens = 0
+            cached_input_tokens = 0
+            cache_creation_tokens = 0
             current_tool_calls: dict[str, dict[str, Any]] = {}  # Track in-progress tool calls
 
             # Stream from LLM with resilient Redis publishing
@@ -1230,30 +1223,27 @@ Use this context to provide more personalized and consistent responses.
                     )
 
                 elif event.type == "tool_call_end":
-                    # Complete tool call tracking and emit end event
+                    # Complete tool call tracking. The end event is published
+                    # once the tool has actually run (see _execute_tools below).
                     if event.tool_call_id and event.tool_call_id in current_tool_calls:
                         current_tool_calls[event.tool_call_id]["arguments"] = event.tool_input
                         tool_calls.append(current_tool_calls[event.tool_call_id])
-                    await _safe_publish(
-                        {
-                            "session_id": self.session_id or "",
-                            "agent_id": self.agent_id,
-                            "message_id": message_id,
-                            "event": event,
-                        }
-                    )
 
                 elif event.type == "done":
-                    # Capture usage stats
-                    provider = self.model_provider or "unknown"
+                    # Capture usage stats against the provider that answered, which
+                    # differs from the configured one after failover
+                    provider = event.provider or self.model_provider or "unknown"
+                    model = event.model or self.model
                     if event.usage:
                         tokens_used = event.usage.get("total_tokens", 0)
                         input_tokens = event.usage.get("input_tokens", 0)
                         output_tokens = event.usage.get("output_tokens", 0)
+                        cached_input_tokens = event.usage.get("cache_read_input_tokens", 0)
+                        cache_creation_tokens = event.usage.get("cache_creation_input_tokens", 0)
                         logger.debug(
                             "Received usage in done event",
                             provider=provider,
-                            model=self.model,
+                            model=model,
                             input_tokens=input_tokens,
                             output_tokens=output_tokens,
                             raw_usage=event.usage,
@@ -1262,7 +1252,7 @@ Use this context to provide more personalized and consistent responses.
                         logger.warning(
                             "No usage data in done event - billing will not be tracked",
                             provider=provider,
-                            model=self.model,
+                            model=model,
                             event_usage=event.usage,
                         )
 
@@ -1276,13 +1266,15 @@ Use this context to provide more personalized and consistent responses.
 
                                 params = TokenUsageParams(
                                     user_id=self.user_id,
-                                    model=self.model,
+                                    model=model,
                                     input_tokens=input_tokens,
                                     output_tokens=output_tokens,
                                     session_id=self.session_id,
                                     agent_id=self.agent_id,
                                     metadata={"streaming": True, "provider": provider},
                                     usage_source=usage_source,
+                                    cached_input_tokens=cached_input_tokens,
+                                    cache_creation_input_tokens=cache_creation_tokens,
                                 )
                                 await tracker.record_token_usage(params)
                                 logger.info(
@@ -1303,7 +1295,7 @@ Use this context to provide more personalized and consistent responses.
                         logger.warning(
                             "Zero tokens reported - billing will not be tracked",
                             provider=provider,
-                            model=self.model,
+                            model=model,
                             input_tokens=input_tokens,
                             output_tokens=output_tokens,
                         )
@@ -1335,18 +1327,29 @@ Use this context to provide more personalized and consistent responses.
                     # Keep non-JSON content, or empty string if entirely JSON tool calls
                     content = remaining_content if remaining_content.strip() else ""
 
-            # Process tool calls if any
-            processed_tool_calls = []
-            for i, tool_call in enumerate(tool_calls):
-                result = await self._execute_tool(tool_call)
-                processed_tool_calls.append(
-                    {
-                        "id": tool_call.get("id", f"tc-{i}"),
-                        "name": tool_call.get("name"),
-                        "arguments": tool_call.get("arguments"),
-                        "result": result,
-                    },
-                )
+            # Process tool calls if any, publishing each call's end as it finishes
+            async def _publish_tool_end(processed: dict[str, Any], duration_ms: int) -> None:
+                if processed["id"] not in current_tool_calls:
+                    return
+                try:
+                    await publisher.publish_tool_call_end(
+                        session_id=self.session_id or "",
+                        agent_id=self.agent_id,
+                        message_id=message_id,
+                        tool_call_id=processed["id"],
+                        tool_name=processed["name"] or "",
+                        tool_input=processed["arguments"],
+                        duration_ms=duration_ms,
+                    )
+                except Exception as publish_error:
+                    logger.warning(
+                        "Failed to publish tool call end, continuing",
+                        agent_id=self.agent_id,
+                        tool_call_id=processed["id"],
+                        error=str(publish_error),
+                    )
+
+            processed_tool_calls = await self._execute_tools(tool_calls, _publish_tool_end)
 
             # Generate user-friendly response if we only have tool calls
             if processed_tool_calls and not content:
@@ -1427,6 +1430,60 @@ Use this context to provide more personalized and consistent responses.
                 await self.update_status("error")
             raise
 
+    async def _execute_tools(
+        self,
+        tool_calls: list[dict[str, Any]],
+        on_complete: Callable[[dict[str, Any], int], Awaitable[None]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute a turn's tool calls.
+
+        With a tool executor, independent read-only calls run concurrently
+        (see ToolExecutor.execute_many); writes and commands stay serialized.
+
+        Args:
+            tool_calls: Tool call dictionaries in the order the model issued them.
+            on_complete: Optional callback invoked with (processed_call, duration_ms)
+                as each call finishes.
+
+        Returns:
+            Processed tool calls (id, name, arguments, result) in call order.
+        """
+        processed_tool_calls: list[dict[str, Any]] = [
+            {
+                "id": tool_call.get("id", f"tc-{i}"),
+                "name": tool_call.get("name"),
+                "arguments": tool_call.get("arguments"),
+                "result": None,
+            }
+            for i, tool_call in enumerate(tool_calls)
+        ]
+
+        async def _completed(index: int, result: str, duration_ms: int) -> None:
+            processed_tool_calls[index]["result"] = result
+            if on_complete:
+                await on_complete(processed_tool_calls[index], duration_ms)
+
+        if self.tool_executor:
+            logger.info(
+                "Executing tools",
+                tools=[tool_call.get("name", "") for tool_call in tool_calls],
+                agent_id=self.agent_id,
+            )
+            await self.tool_executor.execute_many(
+                [
+                    (tool_call.get("name", ""), tool_call.get("arguments", {}))
+                    for tool_call in tool_calls
+                ],
+                on_complete=_completed,
+            )
+        else:
+            for i, tool_call in enumerate(tool_calls):
+                start = time.monotonic()
+                result = await self._execute_tool(tool_call)
+                await _completed(i, result, int((time.monotonic() - start) * 1000))
+
+        return processed_tool_calls
+
     async def _execute_tool(self, tool_call: dict[str, Any]) -> str:
         """Execute a tool call.
 
@@ -7,6 +7,7 @@ container rather than the agent's local filesystem.
 
 The compute service URL is looked up from the database based on the workspace's
 assigned server, allowing multi-region deployments with different compute services.
+Lookups go through the shared workspace placement cache.
 """
 
 from __future__ import annotations
@@ -17,9 +18,10 @@ from typing import Any
 import httpx
 import structlog
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
 from podex_shared.auth import ServiceAuthClient
+from podex_shared.redis_client import get_redis_client
+from podex_shared.workspace_placement import WorkspacePlacement, WorkspacePlacementCache
 from src.config import settings
 
 logger = structlog.get_logger()
@@ -49,10 +51,48 @@ class ComputeServiceURLNotFoundError(Exception):
     pass
 
 
+async def _load_workspace_placement(workspace_id: str) -> WorkspacePlacement | None:
+    """Load a workspace's server and compute URL from the database."""
+    from src.database.connection import get_db_context
+    from src.database.models import Workspace, WorkspaceServer
+
+    async with get_db_context() as db:
+        result = await db.execute(
+            select(Workspace.server_id, WorkspaceServer.compute_service_url)
+            .outerjoin(WorkspaceServer, WorkspaceServer.id == Workspace.server_id)
+            .where(Workspace.id == workspace_id)
+        )
+        row = result.one_or_none()
+
+    if row is None:
+        return None
+    return WorkspacePlacement(
+        workspace_id=workspace_id,
+        server_id=row.server_id,
+        compute_service_url=row.compute_service_url,
+    )
+
+
+_placement_cache: WorkspacePlacementCache | None = None
+
+
+def get_workspace_placement_cache() -> WorkspacePlacementCache:
+    """Get the shared workspace placement cache for this process."""
+    global _placement_cache
+    if _placement_cache is None:
+        _placement_cache = WorkspacePlacementCache(
+            get_redis_client(settings.REDIS_URL),
+            _load_workspace_placement,
+            service="agent",
+        )
+    return _placement_cache
+
+
 async def get_compute_service_url(workspace_id: str) -> str:
-    """Look up the compute service URL for a workspace from the database.
+    """Look up the compute service URL for a workspace.
 
-    Queries the workspace's assigned server to get the compute_service_url.
+    Reads the workspace's assigned server through the shared placement cache,
+    falling back to the database on a miss.
 
     Args:
         workspace_id: The workspace ID to look up.
@@ -63,41 +103,8 @@ async def get_compute_service_url(workspace_id: str) -> str:
     Raises:
         ComputeServiceURLNotFoundError: If the URL cannot be resolved.
     """
-    from src.database.connection import get_db_context
-    from src.database.models import Workspace
-
     try:
-        async with get_db_context() as db:
-            result = await db.execute(
-                select(Workspace)
-                .options(selectinload(Workspace.server))
-                .where(Workspace.id == workspace_id)
-            )
-            workspace = result.scalar_one_or_none()
-
-            if not workspace:
-                raise ComputeServiceURLNotFoundError(f"Workspace {workspace_id} not found")
-
-            if not workspace.server:
-                raise ComputeServiceURLNotFoundError(
-                    f"Workspace {workspace_id} has no server assigned"
-                )
-
-            if not workspace.server.compute_service_url:
-                raise ComputeServiceURLNotFoundError(
-                    f"Server {workspace.server.id} has no compute_service_url configured"
-                )
-
-            logger.debug(
-                "Resolved compute service URL from database",
-                workspace_id=workspace_id,
-                server_id=workspace.server.id,
-                compute_url=workspace.server.compute_service_url,
-            )
-            return workspace.server.compute_service_url
-
-    except ComputeServiceURLNotFoundError:
-        raise
+        placement = await get_workspace_placement_cache().get(workspace_id)
     except Exception as e:
         logger.error(
             "Failed to look up compute service URL",
@@ -108,6 +115,25 @@ async def get_compute_service_url(workspace_id: str) -> str:
             f"Database error looking up compute URL for workspace {workspace_id}: {e}"
         ) from e
 
+    if not placement:
+        raise ComputeServiceURLNotFoundError(f"Workspace {workspace_id} not found")
+
+    if not placement.server_id:
+        raise ComputeServiceURLNotFoundError(f"Workspace {workspace_id} has no server assigned")
+
+    if not placement.compute_service_url:
+        raise ComputeServiceURLNotFoundError(
+            f"Server {placement.server_id} has no compute_service_url configured"
+        )
+
+    logger.debug(
+        "Resolved compute service URL",
+        workspace_id=workspace_id,
+        server_id=placement.server_id,
+        compute_url=placement.compute_service_url,
+    )
+    return placement.compute_service_url
+
 
 class ComputeClientError(Exception):
     """Error from compute service operations."""
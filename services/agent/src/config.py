@@ -14,6 +14,7 @@ logger = structlog.get_logger()
 
 # Use a secure temp directory path
 _WORKSPACE_BASE = str(Path(tempfile.gettempdir()) / "podex" / "workspaces")
+_USAGE_SPOOL = str(Path(tempfile.gettempdir()) / "podex" / "usage-spool-agent.db")
 
 
 class Settings(BaseSettings):
@@ -48,6 +49,8 @@ class Settings(BaseSettings):
     COMMAND_TIMEOUT: int = 60  # seconds
     MAX_FILE_SIZE: int = 1_000_000  # 1MB
     MAX_SEARCH_RESULTS: int = 50
+    # Read-only tool calls from one model turn run concurrently, per agent
+    MAX_CONCURRENT_TOOL_CALLS: int = 4
 
     # Task queue settings
     TASK_QUEUE_POLL_INTERVAL: float = 1.0  # seconds
@@ -66,12 +69,21 @@ class Settings(BaseSettings):
     # Streaming settings
     STREAMING_ENABLED: bool = True
     STREAMING_BUFFER_SIZE: int = 1  # Tokens to buffer before emit (1 = immediate)
+    # Adaptive token coalescing: tokens arriving faster than the window are
+    # published as one message (0 = publish every token immediately)
+    STREAMING_TOKEN_BATCH_MS: int = 25
+    STREAMING_TOKEN_BATCH_MAX_CHARS: int = 512
 
     # Context window settings
     MAX_CONTEXT_TOKENS: int = 100000
     CONTEXT_OUTPUT_RESERVATION: int = 4096
     CONTEXT_SUMMARIZATION_THRESHOLD: int = 40  # messages
     CONTEXT_TOKEN_THRESHOLD: int = 50000  # tokens
+    # "auto" counts with tiktoken BPE encodings when they can be loaded (set
+    # TIKTOKEN_CACHE_DIR for offline images); "heuristic" never loads them
+    TOKENIZER_BACKEND: str = "auto"
+    TOKENIZER_LOAD_TIMEOUT: float = 10.0  # seconds to load encodings at startup
+    TOKEN_COUNT_CACHE_SIZE: int = 20000  # memoized per-text token counts
 
     # Sentry
     SENTRY_DSN: str | None = None
@@ -81,11 +93,38 @@ class Settings(BaseSettings):
     # API Service (for usage tracking)
     API_BASE_URL: str = "http://localhost:3001"
     INTERNAL_SERVICE_TOKEN: str | None = None
+    # Usage events are spooled to this SQLite file until the API accepts them
+    # (None keeps them in memory); put it on a volume to survive container restarts
+    USAGE_SPOOL_PATH: str | None = _USAGE_SPOOL
 
     # Internal Agent URL (for service-to-service communication)
     # Docker Compose: http://agent:3002, GCP Cloud Run: https://agent-xxx.run.app
     AGENT_INTERNAL_URL: str = "http://agent:3002"
 
+    # Anthropic prompt caching (cache_control breakpoints on tools, system and history)
+    ANTHROPIC_PROMPT_CACHING: bool = True
+
+    # LLM request resilience (retries, circuit breakers, hedging, failover)
+    LLM_RETRY_MAX_ATTEMPTS: int = 3  # per provider in a failover chain
+    LLM_RETRY_BASE_DELAY: float = 1.0  # seconds, doubled per attempt with jitter
+    LLM_RETRY_MAX_DELAY: float = 30.0  # longer retry-after waits fail over instead
+    LLM_REQUEST_TIMEOUT: float = 300.0  # seconds for a completion or a stream's first event
+    LLM_PROVIDER_MAX_CONCURRENCY: int = 32  # in-flight requests per provider
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive transient failures
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    LLM_HEDGE_DELAY: float | None = None  # seconds; None disables hedged requests
+    # Providers to try when one is exhausted, e.g. {"anthropic": ["openrouter"]}
+    LLM_FAILOVER_CHAINS: dict[str, list[str]] = {}
+
+    # LLM HTTP connection pools (one per provider) and cached user-key SDK clients
+    LLM_HTTP2: bool = True  # needs h2, from the httpx[http2] extra
+    LLM_HTTP_MAX_CONNECTIONS: int = 100  # per provider
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # per provider
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # seconds before idle connections close
+    LLM_HTTP_CONNECT_TIMEOUT: float = 10.0  # seconds
+    LLM_CLIENT_CACHE_SIZE: int = 256  # user-key SDK clients kept
+    LLM_CLIENT_IDLE_SECONDS: float = 900.0  # unused clients are dropped after this
+
     # ============== MCP (Model Context Protocol) Configuration ==============
     # MCP server connection settings
     MCP_CONNECTION_TIMEOUT: int = 30  # seconds
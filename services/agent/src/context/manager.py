@@ -1,5 +1,6 @@
 """Context window manager for intelligent context handling."""
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 import structlog
@@ -199,6 +200,16 @@ def format_browser_context(browser_context: dict[str, Any]) -> str:
 DEFAULT_BUFFER = 2000
 
 
+@dataclass
+class _ConversationTotal:
+    """Token count of a conversation prefix, and the messages that bound it."""
+
+    first: dict[str, Any]
+    last: dict[str, Any]
+    count: int
+    tokens: int
+
+
 class ContextWindowManager:
     """Manages context window for agents.
 
@@ -259,6 +270,9 @@ class ContextWindowManager:
         self._total_input_tokens = 0
         self._total_output_tokens = 0
 
+        # agent_id -> running token count of its conversation history
+        self._conversation_totals: dict[str, _ConversationTotal] = {}
+
     @property
     def available_tokens(self) -> int:
         """Get available tokens for input context."""
@@ -309,7 +323,7 @@ class ContextWindowManager:
         summaries = self._summaries.get(agent_id, [])
 
         # Check if we need to summarize
-        messages_tokens = self._tokenizer.count_messages(messages)
+        messages_tokens = self._count_conversation(agent_id, messages)
 
         if messages_tokens > messages_budget:
             # Try summarization first
@@ -356,6 +370,33 @@ class ContextWindowManager:
 
         return messages, total_tokens
 
+    def _count_conversation(self, agent_id: str, messages: list[dict[str, Any]]) -> int:
+        """Count a conversation's tokens, only counting messages added since the last call.
+
+        Conversation histories are append-only lists of message dicts. If the
+        first and last previously counted messages are still in place, only
+        the messages after them are counted; otherwise (e.g. the history was
+        compacted) the whole list is counted again.
+        """
+        previous = self._conversation_totals.get(agent_id)
+        if (
+            previous is not None
+            and 0 < previous.count <= len(messages)
+            and messages[0] is previous.first
+            and messages[previous.count - 1] is previous.last
+        ):
+            tokens = previous.tokens + self._tokenizer.count_messages(messages[previous.count :])
+        else:
+            tokens = self._tokenizer.count_messages(messages)
+
+        if messages:
+            self._conversation_totals[agent_id] = _ConversationTotal(
+                first=messages[0], last=messages[-1], count=len(messages), tokens=tokens
+            )
+        else:
+            self._conversation_totals.pop(agent_id, None)
+        return tokens
+
     def estimate_context_size(
         self,
         messages: list[dict[str, Any]],
@@ -430,11 +471,12 @@ class ContextWindowManager:
         return relevant_context
 
     def clear_summaries(self, agent_id: str) -> None:
-        """Clear cached summaries for an agent.
+        """Clear cached summaries and token counts for an agent.
 
         Args:
             agent_id: Agent ID to clear summaries for
         """
+        self._conversation_totals.pop(agent_id, None)
         if agent_id in self._summaries:
             del self._summaries[agent_id]
             logger.debug("Cleared summaries", agent_id=agent_id)
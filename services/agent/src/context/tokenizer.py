@@ -1,10 +1,28 @@
-"""Token counting utilities for context management."""
-
-import re
-from typing import Any, ClassVar
+"""Token counting utilities for context management.
+
+Text is counted with a BPE encoding chosen by model family (tiktoken) when it
+can be loaded, and with a character-based estimate otherwise. Counts for
+longer texts are memoized by content hash, so a conversation's history is
+only tokenized once.
+
+tiktoken downloads an encoding the first time it is loaded, unless it is
+already in TIKTOKEN_CACHE_DIR (the agent image pre-fetches them there). The
+service calls preload_encodings at startup so that first load happens in a
+worker thread, with a time limit, rather than on the event loop mid-request.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, ClassVar, Protocol
 
 import structlog
 
+from src.config import settings
+
 logger = structlog.get_logger()
 
 # Average characters per token (approximation for Claude/GPT models)
@@ -13,12 +31,33 @@ CHARS_PER_TOKEN = 4.0
 # Token overhead for message structure
 MESSAGE_OVERHEAD = 4  # tokens for role, separators, etc.
 
+# Texts shorter than this are counted directly; hashing them costs about as much
+MEMO_MIN_CHARS = 256
+
+# BPE encodings by model name prefix (provider prefixes like "anthropic/" are
+# ignored). Anthropic publishes no offline tokenizer for current Claude
+# models; cl100k_base is the closest public encoding.
+MODEL_ENCODINGS: tuple[tuple[str, str], ...] = (
+    ("gpt-4o", "o200k_base"),
+    ("chatgpt-4o", "o200k_base"),
+    ("gpt-4.1", "o200k_base"),
+    ("gpt-5", "o200k_base"),
+    ("o1", "o200k_base"),
+    ("o3", "o200k_base"),
+    ("o4", "o200k_base"),
+    ("codex", "o200k_base"),
+    ("gpt-4", "cl100k_base"),
+    ("gpt-3.5", "cl100k_base"),
+    ("claude", "cl100k_base"),
+)
+DEFAULT_ENCODING = "cl100k_base"
+
 
 def estimate_tokens(text: str) -> int:
     """Estimate token count for a text string.
 
-    Uses a simple character-based estimation. For production,
-    consider using tiktoken or the Anthropic tokenizer.
+    Uses a simple character-based estimation. This is the fallback when no
+    BPE encoding is available; prefer Tokenizer.count for real counts.
 
     Args:
         text: Text to estimate tokens for
@@ -29,9 +68,13 @@ def estimate_tokens(text: str) -> int:
     if not text:
         return 0
 
-    # Count characters excluding whitespace runs
-    text = re.sub(r"\s+", " ", text)
-    char_count = len(text)
+    # Count characters with whitespace runs collapsed to a single space
+    words = text.split()
+    if not words:
+        char_count = 1
+    else:
+        spaces = len(words) - 1 + text[0].isspace() + text[-1].isspace()
+        char_count = sum(map(len, words)) + spaces
 
     # Estimate tokens
     return int(char_count / CHARS_PER_TOKEN) + 1
@@ -46,8 +89,7 @@ def estimate_message_tokens(message: dict[str, Any]) -> int:
     Returns:
         Estimated token count
     """
-    content = message.get("content", "")
-    content_tokens = estimate_tokens(content)
+    content_tokens = estimate_tokens(message_text(message))
 
     # Add overhead for message structure
     return content_tokens + MESSAGE_OVERHEAD
@@ -65,6 +107,186 @@ def estimate_messages_tokens(messages: list[dict[str, Any]]) -> int:
     return sum(estimate_message_tokens(msg) for msg in messages)
 
 
+def message_text(message: dict[str, Any]) -> str:
+    """Get the text of a message that counts toward the context.
+
+    Includes structured content blocks and tool calls, serialized as JSON.
+    """
+    content = message.get("content") or ""
+    if not isinstance(content, str):
+        content = json.dumps(content, default=str, ensure_ascii=False)
+    tool_calls = message.get("tool_calls")
+    if tool_calls:
+        content += json.dumps(tool_calls, default=str, ensure_ascii=False)
+    return content
+
+
+class TokenCounter(Protocol):
+    """A tokenizer backend."""
+
+    name: str
+
+    def count(self, text: str) -> int:
+        """Count tokens in a text string."""
+        ...
+
+
+class HeuristicTokenCounter:
+    """Character-based estimate, used when no BPE encoding can be loaded."""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        """Estimate tokens in a text string."""
+        return estimate_tokens(text)
+
+
+class TiktokenCounter:
+    """Counts tokens with a tiktoken BPE encoding."""
+
+    def __init__(self, encoding_name: str) -> None:
+        """Load the encoding.
+
+        Raises:
+            ImportError: If tiktoken is not installed
+            Exception: If the encoding file is not cached and cannot be downloaded
+        """
+        import tiktoken
+
+        self._encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f"tiktoken:{encoding_name}"
+
+    def count(self, text: str) -> int:
+        """Count tokens in a text string."""
+        if not text:
+            return 0
+        return len(self._encoding.encode_ordinary(text))
+
+
+# Custom backends by model name prefix, checked before MODEL_ENCODINGS
+_counter_factories: dict[str, Callable[[], TokenCounter]] = {}
+
+
+def register_token_counter(model_prefix: str, factory: Callable[[], TokenCounter]) -> None:
+    """Use a custom tokenizer backend for models whose name starts with a prefix."""
+    _counter_factories[model_prefix] = factory
+    get_token_counter.cache_clear()
+
+
+def _bare_model_name(model: str | None) -> str:
+    name = (model or "").strip().lower()
+    return name.rsplit("/", 1)[-1]
+
+
+# Loaded backends by encoding name
+_encodings: dict[str, TokenCounter] = {}
+
+
+def _create_counter(encoding_name: str) -> TokenCounter:
+    if settings.TOKENIZER_BACKEND == "heuristic":
+        return HeuristicTokenCounter()
+    try:
+        return TiktokenCounter(encoding_name)
+    except Exception as e:
+        logger.warning(
+            "BPE encoding unavailable, estimating tokens from characters",
+            encoding=encoding_name,
+            error=str(e),
+        )
+        return HeuristicTokenCounter()
+
+
+def _load_encoding(encoding_name: str) -> TokenCounter:
+    counter = _encodings.get(encoding_name)
+    if counter is None:
+        counter = _encodings[encoding_name] = _create_counter(encoding_name)
+    return counter
+
+
+async def _preload_encoding(encoding_name: str, timeout: float) -> None:
+    try:
+        counter = await asyncio.wait_for(asyncio.to_thread(_create_counter, encoding_name), timeout)
+    except TimeoutError:
+        logger.warning(
+            "BPE encoding load timed out, estimating tokens from characters",
+            encoding=encoding_name,
+            timeout=timeout,
+        )
+        counter = HeuristicTokenCounter()
+    _encodings[encoding_name] = counter
+
+
+async def preload_encodings(timeout: float | None = None) -> None:
+    """Load every BPE encoding in worker threads.
+
+    An encoding that has not loaded within the timeout (TOKENIZER_LOAD_TIMEOUT
+    by default) is counted with the character estimate for the life of the
+    process.
+    """
+    timeout = settings.TOKENIZER_LOAD_TIMEOUT if timeout is None else timeout
+    names = {DEFAULT_ENCODING, *(encoding for _, encoding in MODEL_ENCODINGS)}
+    await asyncio.gather(*(_preload_encoding(name, timeout) for name in sorted(names)))
+    get_token_counter.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def get_token_counter(model: str | None = None) -> TokenCounter:
+    """Get the tokenizer backend for a model.
+
+    Args:
+        model: Model name, optionally with a provider prefix
+
+    Returns:
+        Token counter, falling back to the character estimate offline
+    """
+    name = _bare_model_name(model)
+    for prefix, factory in _counter_factories.items():
+        if name.startswith(prefix):
+            return factory()
+    for prefix, encoding_name in MODEL_ENCODINGS:
+        if name.startswith(prefix):
+            return _load_encoding(encoding_name)
+    return _load_encoding(DEFAULT_ENCODING)
+
+
+class TokenCountCache:
+    """LRU memo of token counts keyed by backend and content hash."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+
+    def count(self, counter: TokenCounter, text: str) -> int:
+        """Count tokens in a text, reusing an earlier count of the same content."""
+        if len(text) < MEMO_MIN_CHARS:
+            return counter.count(text)
+        key = (counter.name, hashlib.blake2b(text.encode(), digest_size=16).digest())
+        tokens = self._counts.get(key)
+        if tokens is not None:
+            self._counts.move_to_end(key)
+            return tokens
+        tokens = counter.count(text)
+        self._counts[key] = tokens
+        if len(self._counts) > self._max_entries:
+            self._counts.popitem(last=False)
+        return tokens
+
+    def clear(self) -> None:
+        """Drop every memoized count."""
+        self._counts.clear()
+
+
+_token_count_cache: TokenCountCache | None = None
+
+
+def get_token_count_cache() -> TokenCountCache:
+    """Get the process-wide token count memo."""
+    global _token_count_cache
+    if _token_count_cache is None:
+        _token_count_cache = TokenCountCache(settings.TOKEN_COUNT_CACHE_SIZE)
+    return _token_count_cache
+
+
 class Tokenizer:
     """Token counter with model-specific configurations."""
 
@@ -92,6 +314,7 @@ class Tokenizer:
         """
         self._model = model
         self._context_limit = self.MODEL_LIMITS.get(model or "", 100000)
+        self._counter = get_token_counter(model)
 
     @property
     def context_limit(self) -> int:
@@ -112,7 +335,9 @@ class Tokenizer:
         Returns:
             Token count
         """
-        return estimate_tokens(text)
+        if not text:
+            return 0
+        return get_token_count_cache().count(self._counter, text)
 
     def count_message(self, message: dict[str, Any]) -> int:
         """Count tokens in a message.
@@ -123,7 +348,7 @@ class Tokenizer:
         Returns:
             Token count
         """
-        return estimate_message_tokens(message)
+        return self.count(message_text(message)) + MESSAGE_OVERHEAD
 
     def count_messages(self, messages: list[dict[str, Any]]) -> int:
         """Count tokens in a list of messages.
@@ -134,7 +359,7 @@ class Tokenizer:
         Returns:
             Total token count
         """
-        return estimate_messages_tokens(messages)
+        return sum(self.count_message(msg) for msg in messages)
 
     def fits_in_context(
         self,
@@ -14,7 +14,10 @@ from podex_shared import (
     shutdown_usage_tracker,
 )
 from podex_shared.redis_client import get_redis_client
+from src.compute_client import get_workspace_placement_cache
 from src.config import refresh_model_capabilities, settings
+from src.context.tokenizer import preload_encodings
+from src.providers.client_pool import close_http_pools
 from src.queue.agent_worker import AgentTaskWorker, set_agent_task_worker
 from src.queue.approval_listener import ApprovalListener, set_approval_listener
 from src.queue.compaction_worker import CompactionTaskWorker, set_compaction_task_worker
@@ -73,9 +76,13 @@ class ServiceManager:
             service_token=settings.INTERNAL_SERVICE_TOKEN,
             batch_size=10,
             flush_interval=5.0,
+            spool_path=settings.USAGE_SPOOL_PATH,
         )
         logger.info("Usage tracker initialized", api_url=settings.API_BASE_URL)
 
+        # Load tokenizer encodings off the event loop before workers count tokens
+        await preload_encodings()
+
         # Initialize subagent task worker (processes subagent tasks from Redis queue)
         cls._subagent_worker = SubagentTaskWorker(
             redis_client=cls._redis_client,
@@ -125,6 +132,10 @@ class ServiceManager:
         await cls._approval_listener.start()
         logger.info("Approval listener started")
 
+        # Start workspace placement cache invalidation listener
+        await get_workspace_placement_cache().start()
+        logger.info("Workspace placement cache started")
+
         # Note: Context manager is created per-request with the model specified
         # for each agent run. A global context manager is not used because
         # different agent types have different default models (admin-controlled
@@ -189,6 +200,9 @@ class ServiceManager:
             await cls._approval_listener.stop()
             logger.info("Approval listener stopped")
 
+        await get_workspace_placement_cache().stop()
+        await close_http_pools()
+
         if cls._compaction_worker:
             await cls._compaction_worker.stop()
             logger.info("Compaction task worker stopped")
@@ -0,0 +1,131 @@
+"""Shared HTTP connection pools and cached SDK clients for LLM providers.
+
+Each provider gets one ``httpx.AsyncClient`` whose keep-alive connections
+are shared by every SDK client for that provider. HTTP/2 is used unless
+LLM_HTTP2 is off; its ``h2`` package comes from the ``httpx[http2]`` extra.
+SDK clients for user-supplied keys are cached by provider and a hash of the
+key. Repeat requests from the same user then reuse the client and its pooled
+connections, with no new TLS handshake.
+"""
+
+import hashlib
+import importlib.util
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import httpx
+import structlog
+
+from src.config import settings
+
+logger = structlog.get_logger()
+
+C = TypeVar("C")
+
+# httpx only negotiates HTTP/2 when h2 is importable. It is a dependency, but
+# an install without the extra falls back to HTTP/1.1 instead of failing.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_http_pools: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_pool(provider: str) -> httpx.AsyncClient:
+    """Get the shared connection pool for a provider, creating it on first use."""
+    pool = _http_pools.get(provider)
+    if pool is None or pool.is_closed:
+        pool = httpx.AsyncClient(
+            http2=settings.LLM_HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.LLM_REQUEST_TIMEOUT, connect=settings.LLM_HTTP_CONNECT_TIMEOUT
+            ),
+        )
+        _http_pools[provider] = pool
+    return pool
+
+
+def _key_digest(api_key: str) -> str:
+    """Hash a key so raw credentials are never used as cache keys."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class SDKClientCache:
+    """LRU cache of SDK clients for user-supplied API keys.
+
+    Entries unused for ``idle_timeout`` seconds are dropped on the next
+    lookup. Cached clients share their provider's connection pool, so
+    dropping one does not close any connections. The pool closes idle
+    connections itself after LLM_HTTP_KEEPALIVE_EXPIRY.
+    """
+
+    def __init__(self, max_entries: int, idle_timeout: float) -> None:
+        self._max_entries = max_entries
+        self._idle_timeout = idle_timeout
+        # (provider, key digest) -> (client, last used), least recently used first
+        self._clients: OrderedDict[tuple[str, str], tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get_or_create(self, provider: str, api_key: str, factory: Callable[[], C]) -> C:
+        """Get the cached client for a provider and key, building it on a miss."""
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        cache_key = (provider, _key_digest(api_key))
+        entry = self._clients.get(cache_key)
+        if entry is not None:
+            client: C = entry[0]
+            self._clients[cache_key] = (client, now)
+            self._clients.move_to_end(cache_key)
+            return client
+
+        client = factory()
+        self._clients[cache_key] = (client, now)
+        while len(self._clients) > self._max_entries:
+            self._clients.popitem(last=False)
+        return client
+
+    def clear(self) -> None:
+        """Drop every cached client."""
+        self._clients.clear()
+
+    def _evict_idle(self, now: float) -> None:
+        while self._clients:
+            cache_key, (_, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self._idle_timeout:
+                break
+            del self._clients[cache_key]
+
+
+_client_cache: SDKClientCache | None = None
+
+
+def get_client_cache() -> SDKClientCache:
+    """Get the process-wide cache of user-key SDK clients."""
+    global _client_cache
+    if _client_cache is None:
+        _client_cache = SDKClientCache(
+            max_entries=settings.LLM_CLIENT_CACHE_SIZE,
+            idle_timeout=settings.LLM_CLIENT_IDLE_SECONDS,
+        )
+    return _client_cache
+
+
+async def close_http_pools() -> None:
+    """Close every provider connection pool and drop cached clients."""
+    if _client_cache is not None:
+        _client_cache.clear()
+    pools = list(_http_pools.values())
+    _http_pools.clear()
+    for pool in pools:
+        try:
+            await pool.aclose()
+        except Exception as e:
+            logger.warning("Failed to close LLM connection pool", error=str(e))
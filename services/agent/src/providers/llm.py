@@ -10,13 +10,13 @@ Supports:
 - Ollama (local LLM)
 """
 
+import functools
 import json
 import time
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass, field
 from typing import Any, Literal
 
-import httpx
 import structlog
 from anthropic import AsyncAnthropic
 from openai import AsyncOpenAI
@@ -24,6 +24,8 @@ from openai import AsyncOpenAI
 from podex_shared import TokenUsageParams, get_usage_tracker
 from podex_shared.sentry import LLMUsageMetrics, track_llm_usage
 from src.config import settings
+from src.providers.client_pool import get_client_cache, get_http_pool
+from src.providers.resilience import LLMRequestExecutor, ProviderAttempt, RetryPolicy
 
 logger = structlog.get_logger()
 
@@ -80,6 +82,56 @@ def determine_usage_source(provider: str) -> UsageSource:
     return "external"
 
 
+# Providers LLMProvider can send requests to (and so can fail over to)
+DISPATCHABLE_PROVIDERS = frozenset(
+    {
+        "anthropic",
+        "openai",
+        "openrouter",
+        "ollama",
+        "openai-codex",
+        "github-copilot",
+        "google-gemini-cli",
+    }
+)
+
+# Retries are owned by LLMRequestExecutor, so SDK clients must not retry on their own
+SDK_MAX_RETRIES = 0
+
+_request_executor: LLMRequestExecutor | None = None
+
+
+def get_request_executor() -> LLMRequestExecutor:
+    """Get the process-wide executor, so limits and circuits span all agents."""
+    global _request_executor
+    if _request_executor is None:
+        _request_executor = LLMRequestExecutor(
+            RetryPolicy(
+                max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+                base_delay=settings.LLM_RETRY_BASE_DELAY,
+                max_delay=settings.LLM_RETRY_MAX_DELAY,
+            ),
+            max_concurrency=settings.LLM_PROVIDER_MAX_CONCURRENCY,
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
+            request_timeout=settings.LLM_REQUEST_TIMEOUT,
+            hedge_delay=settings.LLM_HEDGE_DELAY,
+        )
+    return _request_executor
+
+
+def _failover_model_id(model: str, from_provider: str, to_provider: str) -> str:
+    """Map a model ID to the naming a failover provider expects.
+
+    OpenRouter names models "<vendor>/<model>"; the other providers take the
+    bare model ID.
+    """
+    bare_model = model.split("/", 1)[1] if "/" in model else model
+    if to_provider == "openrouter":
+        return model if "/" in model else f"{from_provider}/{bare_model}"
+    return bare_model
+
+
 def _is_oauth_token(api_key: str | None) -> bool:
     """Check if the API key is an Anthropic OAuth token."""
     return api_key is not None and api_key.startswith("sk-ant-oat")
@@ -107,6 +159,64 @@ def _build_system_prompt_for_oauth(system_message: str, is_oauth: bool) -> str:
     return CLAUDE_CODE_IDENTITY
 
 
+# Anthropic prompt caching. Requests are cached by prefix in the order
+# tools -> system -> messages, with at most 4 cache_control breakpoints.
+ANTHROPIC_CACHE_CONTROL: dict[str, str] = {"type": "ephemeral"}
+# Breakpoints in the conversation (after the tools and system breakpoints)
+ANTHROPIC_CACHE_MESSAGE_BREAKPOINTS = 2
+
+
+def _with_cache_control(content: Any) -> Any:
+    """Return message content with a cache breakpoint on its last block.
+
+    Returns the content unchanged if it has no block that can be cached.
+    """
+    if isinstance(content, str):
+        if not content:
+            return content
+        return [{"type": "text", "text": content, "cache_control": ANTHROPIC_CACHE_CONTROL}]
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return [*content[:-1], {**content[-1], "cache_control": ANTHROPIC_CACHE_CONTROL}]
+    return content
+
+
+def _apply_anthropic_prompt_caching(request_params: dict[str, Any]) -> None:
+    """Add cache breakpoints to an Anthropic request in place.
+
+    Marks the end of the tool list, the system prompt and the last messages,
+    so each turn of an agent session reads the previous turn's prefix from
+    the cache. The caller's tools and messages are not mutated.
+    """
+    tools = request_params.get("tools")
+    if tools:
+        request_params["tools"] = [
+            *tools[:-1],
+            {**tools[-1], "cache_control": ANTHROPIC_CACHE_CONTROL},
+        ]
+
+    system = request_params.get("system")
+    if system:
+        request_params["system"] = _with_cache_control(system)
+
+    # The last message caches the whole conversation for the next turn; the
+    # previous user message still hits if the next turn's tail differs.
+    messages = list(request_params["messages"])
+    if not messages:
+        return
+    user_indexes = [i for i, msg in enumerate(messages) if msg.get("role") == "user"]
+    marked = sorted({len(messages) - 1, *user_indexes[-2:-1]}, reverse=True)
+    for index in marked[:ANTHROPIC_CACHE_MESSAGE_BREAKPOINTS]:
+        message = messages[index]
+        messages[index] = {**message, "content": _with_cache_control(message["content"])}
+    request_params["messages"] = messages
+
+
+def _usage_count(usage: Any, name: str) -> int:
+    """Read an optional integer usage field (missing or null counts as 0)."""
+    value = getattr(usage, name, None)
+    return value if isinstance(value, int) else 0
+
+
 @dataclass
 class CompletionRequest:
     """Request parameters for LLM completion."""
@@ -164,6 +274,10 @@ class StreamEvent:
     usage: dict[str, int] | None = None
     stop_reason: str | None = None
     error: str | None = None
+    # Set on "done" events by complete_stream: the provider that answered after
+    # any failover, and the model requested from it
+    provider: str | None = None
+    model: str | None = None
 
 
 class LLMProvider:
@@ -176,17 +290,25 @@ class LLMProvider:
         self._ollama_client: AsyncOpenAI | None = None
         self._openrouter_client: AsyncOpenAI | None = None
 
-    def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count from text length.
+    def _estimate_tokens(self, text: str, model: str | None = None) -> int:
+        """Estimate token count for a response that reported no usage.
 
         Args:
             text: Text to estimate tokens for
+            model: Model the text was sent to or produced by, if known
 
         Returns:
-            Estimated token count (roughly 1 token per 4 characters)
+            Token count from the model's tokenizer (roughly 1 token per 4
+            characters if no model is given), at least 1
         """
-        # Rough estimation: 1 token ~= 4 characters for English text
-        return max(1, len(text) // 4)
+        if model is None:
+            # Rough estimation: 1 token ~= 4 characters for English text
+            return max(1, len(text) // 4)
+
+        # Imported here: src.context imports this module
+        from src.context.tokenizer import Tokenizer
+
+        return max(1, Tokenizer(model).count(text))
 
     @property
     def anthropic_client(self) -> AsyncAnthropic:
@@ -194,6 +316,8 @@ class LLMProvider:
         if self._anthropic_client is None:
             self._anthropic_client = AsyncAnthropic(
                 api_key=settings.ANTHROPIC_API_KEY,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("anthropic"),
             )
         return self._anthropic_client
 
@@ -203,6 +327,8 @@ class LLMProvider:
         if self._openai_client is None:
             self._openai_client = AsyncOpenAI(
                 api_key=settings.OPENAI_API_KEY,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("openai"),
             )
         return self._openai_client
 
@@ -214,6 +340,8 @@ class LLMProvider:
             self._ollama_client = AsyncOpenAI(
                 base_url=f"{settings.OLLAMA_URL}/v1",
                 api_key="ollama",  # Ollama doesn't require a real API key
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("ollama"),
             )
         return self._ollama_client
 
@@ -225,21 +353,31 @@ class LLMProvider:
             self._openrouter_client = AsyncOpenAI(
                 base_url="https://openrouter.ai/api/v1",
                 api_key=settings.OPENROUTER_API_KEY,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("openrouter"),
             )
         return self._openrouter_client
 
     def _get_openai_codex_client(self, api_key: str) -> AsyncOpenAI:
         """Get OpenAI Codex client for ChatGPT Plus/Pro OAuth.
 
+        Clients are cached per token and share the provider's connection pool.
+
         Args:
             api_key: OAuth access token from ChatGPT authentication.
 
         Returns:
             OpenAI client configured for Codex API.
         """
-        return AsyncOpenAI(
-            base_url=OPENAI_CODEX_BASE_URL,
-            api_key=api_key,
+        return get_client_cache().get_or_create(
+            "openai-codex",
+            api_key,
+            lambda: AsyncOpenAI(
+                base_url=OPENAI_CODEX_BASE_URL,
+                api_key=api_key,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("openai-codex"),
+            ),
         )
 
     def _get_github_copilot_client(self, api_key: str) -> AsyncOpenAI:
@@ -248,18 +386,29 @@ class LLMProvider:
         Args:
             api_key: Copilot completion token (NOT the GitHub OAuth token).
 
+        Clients are cached per token and share the provider's connection pool.
+
         Returns:
             OpenAI client configured for Copilot API with required headers.
         """
-        return AsyncOpenAI(
-            base_url=GITHUB_COPILOT_BASE_URL,
-            api_key=api_key,
-            default_headers=GITHUB_COPILOT_HEADERS,
+        return get_client_cache().get_or_create(
+            "github-copilot",
+            api_key,
+            lambda: AsyncOpenAI(
+                base_url=GITHUB_COPILOT_BASE_URL,
+                api_key=api_key,
+                default_headers=GITHUB_COPILOT_HEADERS,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("github-copilot"),
+            ),
         )
 
     def _get_anthropic_client(self, api_key: str | None = None) -> AsyncAnthropic:
         """Get Anthropic client, optionally with user-provided API key.
 
+        Clients for user keys are cached per key and share the provider's
+        connection pool, so repeat requests skip the TLS handshake.
+
         Args:
             api_key: Optional user-provided API key (can be standard API key or OAuth token).
                      OAuth tokens start with "sk-ant-oat" and require special headers.
@@ -268,36 +417,51 @@ class LLMProvider:
             Anthropic client instance
         """
         if api_key:
-            # Check if this is an OAuth token (starts with sk-ant-oat)
-            is_oauth_token = api_key.startswith("sk-ant-oat")
-            if is_oauth_token:
-                # OAuth tokens MUST use auth_token parameter, not api_key
-                # Stealth mode: Mimic Claude Code's identity to authorize OAuth token usage
-                # OAuth tokens are restricted to Claude Code and require specific headers
-                return AsyncAnthropic(
-                    api_key=None,  # Must be None for OAuth
-                    auth_token=api_key,  # OAuth token goes here
-                    default_headers={
-                        "accept": "application/json",
-                        "anthropic-dangerous-direct-browser-access": "true",
-                        # Include Claude Code version and OAuth beta flags
-                        "anthropic-beta": (
-                            "claude-code-20250219,"
-                            "oauth-2025-04-20,"
-                            "fine-grained-tool-streaming-2025-05-14"
-                        ),
-                        # Identify as Claude Code CLI (required for OAuth tokens)
-                        "user-agent": "claude-cli/2.1.2 (external, cli)",
-                        "x-app": "cli",
-                    },
-                )
-            # Standard API key
-            return AsyncAnthropic(api_key=api_key)
+            return get_client_cache().get_or_create(
+                "anthropic", api_key, lambda: self._create_anthropic_client(api_key)
+            )
         return self.anthropic_client
 
+    def _create_anthropic_client(self, api_key: str) -> AsyncAnthropic:
+        """Create an Anthropic client for a user-provided API key or OAuth token."""
+        # Check if this is an OAuth token (starts with sk-ant-oat)
+        is_oauth_token = api_key.startswith("sk-ant-oat")
+        if is_oauth_token:
+            # OAuth tokens MUST use auth_token parameter, not api_key
+            # Stealth mode: Mimic Claude Code's identity to authorize OAuth token usage
+            # OAuth tokens are restricted to Claude Code and require specific headers
+            return AsyncAnthropic(
+                api_key=None,  # Must be None for OAuth
+                auth_token=api_key,  # OAuth token goes here
+                default_headers={
+                    "accept": "application/json",
+                    "anthropic-dangerous-direct-browser-access": "true",
+                    # Include Claude Code version and OAuth beta flags
+                    "anthropic-beta": (
+                        "claude-code-20250219,"
+                        "oauth-2025-04-20,"
+                        "fine-grained-tool-streaming-2025-05-14"
+                    ),
+                    # Identify as Claude Code CLI (required for OAuth tokens)
+                    "user-agent": "claude-cli/2.1.2 (external, cli)",
+                    "x-app": "cli",
+                },
+                max_retries=SDK_MAX_RETRIES,
+                http_client=get_http_pool("anthropic"),
+            )
+        # Standard API key
+        return AsyncAnthropic(
+            api_key=api_key,
+            max_retries=SDK_MAX_RETRIES,
+            http_client=get_http_pool("anthropic"),
+        )
+
     def _get_openai_client(self, api_key: str | None = None) -> AsyncOpenAI:
         """Get OpenAI client, optionally with user-provided API key.
 
+        Clients for user keys are cached per key and share the provider's
+        connection pool.
+
         Args:
             api_key: Optional user-provided API key. If None, uses platform default.
 
@@ -305,8 +469,15 @@ class LLMProvider:
             OpenAI client instance
         """
         if api_key:
-            # Create a new client with user's API key
-            return AsyncOpenAI(api_key=api_key)
+            return get_client_cache().get_or_create(
+                "openai",
+                api_key,
+                lambda: AsyncOpenAI(
+                    api_key=api_key,
+                    max_retries=SDK_MAX_RETRIES,
+                    http_client=get_http_pool("openai"),
+                ),
+            )
         return self.openai_client
 
     def _get_user_api_key(self, llm_api_keys: dict[str, str] | None, provider: str) -> str | None:
@@ -423,105 +594,213 @@ class LLMProvider:
         """
         return determine_usage_source(provider)
 
-    async def complete(self, request: CompletionRequest) -> dict[str, Any]:
-        """
-        Generate a completion using the appropriate LLM provider.
-
-        Routes to the correct provider based on:
-        1. The model being requested (e.g., claude-* → anthropic)
-        2. Whether the user has provided an API key for that provider
-        3. Falls back to the configured default provider if no user key
-
-        Args:
-            request: CompletionRequest containing model, messages, tools, and tracking context.
+    def _failover_chain(
+        self, request: CompletionRequest, provider: str, user_key: str | None
+    ) -> list[tuple[str, str, str | None]]:
+        """Build the (provider, model, api_key) attempts for a request, in order.
 
-        Returns:
-            Response dictionary with content and metadata
+        The resolved provider comes first, followed by the providers configured
+        in LLM_FAILOVER_CHAINS. A request made with the user's own key only
+        fails over to providers the user also has a key for, so it is never
+        moved onto platform-billed credentials.
         """
-        # Resolve which provider to use based on model, database provider, and user's API keys
-        resolved_provider, user_key = self._resolve_provider(
-            request.model, request.llm_api_keys, request.model_provider
-        )
+        chain: list[tuple[str, str, str | None]] = [(provider, request.model, user_key)]
+        for fallback in settings.LLM_FAILOVER_CHAINS.get(provider, []):
+            fallback = fallback.strip().lower()
+            if fallback == provider or fallback not in DISPATCHABLE_PROVIDERS:
+                continue
+            fallback_key = self._get_user_api_key(request.llm_api_keys, fallback)
+            if user_key and not fallback_key:
+                continue
+            model = _failover_model_id(request.model, provider, fallback)
+            chain.append((fallback, model, fallback_key))
+        return chain
 
-        # Track latency for metrics
-        llm_start_time = time.perf_counter()
+    async def _dispatch_complete(
+        self, provider: str, request: CompletionRequest, model: str, api_key: str | None
+    ) -> dict[str, Any]:
+        """Make one completion request against a specific provider."""
+        if provider == "anthropic":
+            return await self._complete_anthropic(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                api_key=api_key,
+            )
+        if provider == "openai":
+            return await self._complete_openai(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                api_key=api_key,
+            )
+        if provider == "openrouter":
+            return await self._complete_openrouter(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+            )
+        if provider == "ollama":
+            return await self._complete_ollama(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+            )
+        if provider == "openai-codex":
+            return await self._complete_openai_codex(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                api_key=api_key,
+            )
+        if provider == "github-copilot":
+            return await self._complete_github_copilot(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                api_key=api_key,
+            )
+        if provider == "google-gemini-cli":
+            return await self._complete_google_gemini_cli(
+                model=model,
+                messages=request.messages,
+                tools=request.tools,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                api_key=api_key,
+            )
+        raise ValueError(f"Unknown provider: {provider}")
 
-        if resolved_provider == "anthropic":
-            result = await self._complete_anthropic(
-                model=request.model,
+    def _dispatch_stream(
+        self, provider: str, request: CompletionRequest, model: str, api_key: str | None
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Open a streaming request against a specific provider."""
+        if provider == "anthropic":
+            return self._stream_anthropic(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
-                api_key=user_key,
+                api_key=api_key,
             )
-        elif resolved_provider == "openai":
-            result = await self._complete_openai(
-                model=request.model,
+        if provider == "openai":
+            return self._stream_openai(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
-                api_key=user_key,
+                api_key=api_key,
             )
-        elif resolved_provider == "openrouter":
-            result = await self._complete_openrouter(
-                model=request.model,
+        if provider == "openrouter":
+            return self._stream_openrouter(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
             )
-        elif resolved_provider == "ollama":
-            result = await self._complete_ollama(
-                model=request.model,
+        if provider == "ollama":
+            return self._stream_ollama(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
             )
-        elif resolved_provider == "openai-codex":
-            result = await self._complete_openai_codex(
-                model=request.model,
+        if provider == "openai-codex":
+            return self._stream_openai_codex(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
-                api_key=user_key,
+                api_key=api_key,
             )
-        elif resolved_provider == "github-copilot":
-            result = await self._complete_github_copilot(
-                model=request.model,
+        if provider == "github-copilot":
+            return self._stream_github_copilot(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
-                api_key=user_key,
+                api_key=api_key,
             )
-        elif resolved_provider == "google-gemini-cli":
-            result = await self._complete_google_gemini_cli(
-                model=request.model,
+        if provider == "google-gemini-cli":
+            return self._stream_google_gemini_cli(
+                model=model,
                 messages=request.messages,
                 tools=request.tools,
                 max_tokens=request.max_tokens,
                 temperature=request.temperature,
-                api_key=user_key,
+                api_key=api_key,
             )
-        else:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    async def complete(self, request: CompletionRequest) -> dict[str, Any]:
+        """
+        Generate a completion using the appropriate LLM provider.
+
+        Routes to the correct provider based on:
+        1. The model being requested (e.g., claude-* → anthropic)
+        2. Whether the user has provided an API key for that provider
+        3. Falls back to the configured default provider if no user key
+
+        Transient failures are retried, and once the provider is exhausted the
+        request fails over along LLM_FAILOVER_CHAINS (see _failover_chain).
+
+        Args:
+            request: CompletionRequest containing model, messages, tools, and tracking context.
+
+        Returns:
+            Response dictionary with content and metadata
+        """
+        # Resolve which provider to use based on model, database provider, and user's API keys
+        resolved_provider, user_key = self._resolve_provider(
+            request.model, request.llm_api_keys, request.model_provider
+        )
+        if resolved_provider not in DISPATCHABLE_PROVIDERS:
             raise ValueError(f"Unknown provider: {resolved_provider}")
 
+        chain = self._failover_chain(request, resolved_provider, user_key)
+        models = {provider: model for provider, model, _ in chain}
+        attempts = [
+            ProviderAttempt(
+                provider, functools.partial(self._dispatch_complete, provider, request, model, key)
+            )
+            for provider, model, key in chain
+        ]
+
+        # Track latency for metrics
+        llm_start_time = time.perf_counter()
+
+        used_provider, result = await get_request_executor().run(attempts)
+
         # Calculate latency
         llm_latency_ms = (time.perf_counter() - llm_start_time) * 1000
 
         # Track usage if user context is provided
         if request.user_id and result.get("usage"):
             # Determine usage source for billing
-            usage_source = self._determine_usage_source(resolved_provider, request.llm_api_keys)
+            usage_source = self._determine_usage_source(used_provider, request.llm_api_keys)
 
             tracking_context = UsageTrackingContext(
                 user_id=request.user_id,
-                model=request.model,
-                provider=resolved_provider,
+                model=models[used_provider],
+                provider=used_provider,
                 usage=result["usage"],
                 session_id=request.session_id,
                 workspace_id=request.workspace_id,
@@ -539,8 +818,12 @@ class LLMProvider:
         Stream a completion from the appropriate LLM provider.
 
         The provider is determined by request.model_provider which must be set.
+        Failures before the first event are retried and failed over like
+        complete(); once output has been yielded, errors end the stream.
 
-        Yields StreamEvent objects as tokens are generated.
+        Yields StreamEvent objects as tokens are generated. The "done" event
+        names the provider and model that answered, which may differ from the
+        requested ones after failover.
 
         Args:
             request: CompletionRequest containing model, messages, tools, and tracking context.
@@ -555,79 +838,25 @@ class LLMProvider:
         resolved_provider, user_key = self._resolve_provider(
             request.model, request.llm_api_keys, request.model_provider
         )
+        if resolved_provider not in DISPATCHABLE_PROVIDERS:
+            yield StreamEvent(type="error", error=f"Unknown provider: {resolved_provider}")
+            return
+
+        chain = self._failover_chain(request, resolved_provider, user_key)
+        models = {provider: model for provider, model, _ in chain}
+        attempts = [
+            ProviderAttempt(
+                provider, functools.partial(self._dispatch_stream, provider, request, model, key)
+            )
+            for provider, model, key in chain
+        ]
 
         try:
-            if resolved_provider == "anthropic":
-                async for event in self._stream_anthropic(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    api_key=user_key,
-                ):
-                    yield event
-            elif resolved_provider == "openai":
-                async for event in self._stream_openai(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    api_key=user_key,
-                ):
-                    yield event
-            elif resolved_provider == "openrouter":
-                async for event in self._stream_openrouter(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                ):
-                    yield event
-            elif resolved_provider == "ollama":
-                async for event in self._stream_ollama(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                ):
-                    yield event
-            elif resolved_provider == "openai-codex":
-                async for event in self._stream_openai_codex(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    api_key=user_key,
-                ):
-                    yield event
-            elif resolved_provider == "github-copilot":
-                async for event in self._stream_github_copilot(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    api_key=user_key,
-                ):
-                    yield event
-            elif resolved_provider == "google-gemini-cli":
-                async for event in self._stream_google_gemini_cli(
-                    model=request.model,
-                    messages=request.messages,
-                    tools=request.tools,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                    api_key=user_key,
-                ):
-                    yield event
-            else:
-                yield StreamEvent(type="error", error=f"Unknown provider: {resolved_provider}")
-                return
+            async for used_provider, event in get_request_executor().stream(attempts):
+                if event.type == "done":
+                    event.provider = used_provider
+                    event.model = models[used_provider]
+                yield event
         except Exception as e:
             logger.exception("Streaming error", provider=resolved_provider)
             yield StreamEvent(type="error", error=str(e))
@@ -644,7 +873,8 @@ class LLMProvider:
         """
         input_tokens = context.usage.get("input_tokens", 0)
         output_tokens = context.usage.get("output_tokens", 0)
-        cached_tokens = context.usage.get("cached_tokens", 0)
+        cached_tokens = context.usage.get("cache_read_input_tokens", 0)
+        cache_creation_tokens = context.usage.get("cache_creation_input_tokens", 0)
 
         # Track Sentry metrics
         metrics = LLMUsageMetrics(
@@ -676,6 +906,8 @@ class LLMProvider:
                 agent_id=context.agent_id,
                 metadata={"provider": context.provider},
                 usage_source=context.usage_source,
+                cached_input_tokens=cached_tokens,
+                cache_creation_input_tokens=cache_creation_tokens,
             )
             await tracker.record_token_usage(params)
             logger.info(
@@ -749,6 +981,9 @@ class LLMProvider:
         if tools:
             request_params["tools"] = tools
 
+        if settings.ANTHROPIC_PROMPT_CACHING:
+            _apply_anthropic_prompt_caching(request_params)
+
         # Make API call
         response = await client.messages.create(**request_params)
 
@@ -775,6 +1010,10 @@ class LLMProvider:
                 "input_tokens": response.usage.input_tokens,
                 "output_tokens": response.usage.output_tokens,
                 "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+                "cache_read_input_tokens": _usage_count(response.usage, "cache_read_input_tokens"),
+                "cache_creation_input_tokens": _usage_count(
+                    response.usage, "cache_creation_input_tokens"
+                ),
             },
             "stop_reason": response.stop_reason,
         }
@@ -1016,9 +1255,9 @@ class LLMProvider:
         if total_tokens == 0:
             # Estimate input tokens from messages
             total_message_text = " ".join(msg.get("content", "") for msg in messages)
-            input_tokens = self._estimate_tokens(total_message_text)
+            input_tokens = self._estimate_tokens(total_message_text, ollama_model)
             # Estimate output tokens from content
-            output_tokens = self._estimate_tokens(content)
+            output_tokens = self._estimate_tokens(content, ollama_model)
             total_tokens = input_tokens + output_tokens
             logger.warning(
                 "Ollama didn't provide usage stats, using estimation",
@@ -1098,10 +1337,15 @@ class LLMProvider:
         if tools:
             request_params["tools"] = tools
 
+        if settings.ANTHROPIC_PROMPT_CACHING:
+            _apply_anthropic_prompt_caching(request_params)
+
         # Track tool calls being built
         current_tool_call: dict[str, Any] | None = None
         input_tokens = 0
         output_tokens = 0
+        cache_read_tokens = 0
+        cache_creation_tokens = 0
         stop_reason = "end_turn"
 
         async with client.messages.stream(**request_params) as stream:
@@ -1110,9 +1354,12 @@ class LLMProvider:
                     # Log the actual model returned by Anthropic API
                     if hasattr(event, "message") and hasattr(event.message, "model"):
                         logger.info("Anthropic response model", response_model=event.message.model)
-                    # Capture input token count
+                    # Capture input token counts (uncached, read from and written to cache)
                     if hasattr(event, "message") and hasattr(event.message, "usage"):
-                        input_tokens = event.message.usage.input_tokens
+                        usage = event.message.usage
+                        input_tokens = usage.input_tokens
+                        cache_read_tokens = _usage_count(usage, "cache_read_input_tokens")
+                        cache_creation_tokens = _usage_count(usage, "cache_creation_input_tokens")
 
                 elif event.type == "content_block_start":
                     block = event.content_block
@@ -1173,6 +1420,8 @@ class LLMProvider:
                             "input_tokens": input_tokens,
                             "output_tokens": output_tokens,
                             "total_tokens": input_tokens + output_tokens,
+                            "cache_read_input_tokens": cache_read_tokens,
+                            "cache_creation_input_tokens": cache_creation_tokens,
                         },
                         stop_reason=stop_reason,
                     )
@@ -1365,9 +1614,9 @@ class LLMProvider:
         if prompt_tokens == 0 and completion_tokens == 0:
             # Estimate input tokens from messages
             total_message_text = " ".join(msg.get("content", "") for msg in messages)
-            prompt_tokens = self._estimate_tokens(total_message_text)
+            prompt_tokens = self._estimate_tokens(total_message_text, ollama_model)
             # Estimate output tokens from accumulated content
-            completion_tokens = self._estimate_tokens(accumulated_content)
+            completion_tokens = self._estimate_tokens(accumulated_content, ollama_model)
             logger.warning(
                 "Ollama didn't provide usage stats, using estimation",
                 estimated_input=prompt_tokens,
@@ -1542,27 +1791,27 @@ class LLMProvider:
         if tools:
             request_body["tools"] = self._convert_tools_to_gemini(tools)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=request_body,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                timeout=120.0,
-            )
+        client = get_http_pool("google-gemini-cli")
+        response = await client.post(
+            url,
+            json=request_body,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=120.0,
+        )
 
-            if response.status_code != 200:
-                logger.error(
-                    "Gemini CLI API call failed",
-                    status=response.status_code,
-                    body=response.text,
-                )
-                raise ValueError(f"Gemini CLI API failed: {response.text}")
+        if response.status_code != 200:
+            logger.error(
+                "Gemini CLI API call failed",
+                status=response.status_code,
+                body=response.text,
+            )
+            raise ValueError(f"Gemini CLI API failed: {response.text}")
 
-            data = response.json()
-            return self._parse_gemini_response(data)
+        data = response.json()
+        return self._parse_gemini_response(data)
 
     def _convert_tools_to_openai(
         self, tools: list[dict[str, Any]] | None
@@ -1801,19 +2050,17 @@ class LLMProvider:
         output_tokens = 0
         accumulated_content = ""
 
-        async with (
-            httpx.AsyncClient() as client,
-            client.stream(
-                "POST",
-                url,
-                json=request_body,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                timeout=120.0,
-            ) as response,
-        ):
+        client = get_http_pool("google-gemini-cli")
+        async with client.stream(
+            "POST",
+            url,
+            json=request_body,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=120.0,
+        ) as response:
             if response.status_code != 200:
                 error_text = await response.aread()
                 yield StreamEvent(type="error", error=f"Gemini API error: {error_text.decode()}")
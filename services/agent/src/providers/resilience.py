@@ -0,0 +1,402 @@
+"""Resilient execution of LLM provider requests.
+
+Wraps a provider call with:
+- retries with jittered exponential backoff that honour ``retry-after``
+- a per-provider concurrency limit and circuit breaker
+- optional hedging: a second identical request if the first has not
+  produced a response (or first stream event) within a deadline
+- failover to the next provider in a chain once a provider is exhausted
+
+Streams are only retried before their first event has been yielded; once
+output reached the caller a failure is surfaced as-is.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import structlog
+
+from podex_shared.sentry import track_llm_request_attempt
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+
+logger = structlog.get_logger()
+
+# Rate limited (429), overloaded (529) and transient server/gateway errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+class CircuitOpenError(Exception):
+    """Raised when every provider in a chain is skipped by an open circuit."""
+
+
+def error_status_code(error: BaseException) -> int | None:
+    """Get the HTTP status code carried by an SDK or httpx error, if any."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check if an error is transient (rate limit, overload, network, timeout)."""
+    status = error_status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, TimeoutError | ConnectionError | httpx.TransportError):
+        return True
+    # anthropic/openai APIConnectionError and APITimeoutError carry no status code
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Read the server's requested retry delay from an error's response headers."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms: str | None = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+        retry_after: str | None = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Retry limits for one provider in a chain."""
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Get the delay before retrying after ``attempt`` (0-based) failed.
+
+        Returns None if the server asked for a longer wait than max_delay,
+        in which case it is better to move on to the next provider.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(ceiling / 2, ceiling)  # noqa: S311
+
+
+class CircuitBreaker:
+    """Stops sending requests to a provider after repeated transient failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens for
+    ``reset_timeout`` seconds; then a single trial request is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Check if a request may be sent now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot of a request that ended without an outcome.
+
+        Used when a request is cancelled: without it the circuit would stay
+        half-open with no trial ever allowed again.
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+@dataclass
+class ProviderAttempt[T]:
+    """One provider in a failover chain, with the call to make against it."""
+
+    provider: str
+    call: Callable[[], T]
+
+
+class LLMRequestExecutor:
+    """Runs provider calls with retries, limits, hedging and failover."""
+
+    def __init__(
+        self,
+        retry_policy: RetryPolicy | None = None,
+        *,
+        max_concurrency: int = 32,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        request_timeout: float | None = None,
+        hedge_delay: float | None = None,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            retry_policy: Retry limits applied to each provider in a chain.
+            max_concurrency: Maximum in-flight requests per provider.
+            failure_threshold: Consecutive transient failures that open a circuit.
+            reset_timeout: Seconds an open circuit waits before a trial request.
+            request_timeout: Seconds allowed for a completion, or for the first
+                event of a stream, per attempt.
+            hedge_delay: If set, seconds after which a second identical request
+                is raced against a slow first one.
+        """
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.request_timeout = request_timeout
+        self.hedge_delay = hedge_delay
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """Get the circuit breaker for a provider."""
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self._breakers[provider]
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[provider]
+
+    async def run[T](self, chain: Sequence[ProviderAttempt[Awaitable[T]]]) -> tuple[str, T]:
+        """Run a completion against a failover chain.
+
+        Returns:
+            The provider that answered and its result.
+
+        Raises:
+            The last error if every provider failed, the first non-transient
+            error, or CircuitOpenError if every circuit was open.
+        """
+        last_error: BaseException | None = None
+        for index, entry in enumerate(chain):
+            if index > 0:
+                track_llm_request_attempt(entry.provider, "failover", index)
+            breaker = self.breaker(entry.provider)
+            for attempt in range(self.retry_policy.max_attempts):
+                if not breaker.allow_request():
+                    track_llm_request_attempt(entry.provider, "circuit_open", attempt)
+                    break
+                try:
+                    async with self._semaphore(entry.provider):
+                        result = await self._hedged(entry)
+                except Exception as e:
+                    last_error = e
+                    if not self._record_failure(entry.provider, breaker, e, attempt):
+                        raise
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        break
+                    await asyncio.sleep(delay)
+                    continue
+                except BaseException:
+                    # Cancelled before the attempt had an outcome
+                    breaker.release_trial()
+                    raise
+                breaker.record_success()
+                track_llm_request_attempt(entry.provider, "success", attempt)
+                return entry.provider, result
+
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpenError("All LLM providers are temporarily unavailable")
+
+    async def stream[E](
+        self, chain: Sequence[ProviderAttempt[AsyncIterator[E]]]
+    ) -> AsyncIterator[tuple[str, E]]:
+        """Stream from a failover chain, yielding (provider, event) pairs.
+
+        Attempts are retried or failed over only until the first event has
+        been received; after that, errors propagate to the caller.
+        """
+        last_error: BaseException | None = None
+        for index, entry in enumerate(chain):
+            if index > 0:
+                track_llm_request_attempt(entry.provider, "failover", index)
+            breaker = self.breaker(entry.provider)
+            for attempt in range(self.retry_policy.max_attempts):
+                if not breaker.allow_request():
+                    track_llm_request_attempt(entry.provider, "circuit_open", attempt)
+                    break
+                started = None
+                try:
+                    async with self._semaphore(entry.provider):
+                        try:
+                            started = await self._start_stream(entry)
+                        except StopAsyncIteration:
+                            # The provider finished without emitting anything
+                            breaker.record_success()
+                            return
+                        except Exception as e:
+                            last_error = e
+                            if not self._record_failure(entry.provider, breaker, e, attempt):
+                                raise
+                            delay = self._retry_delay(e, attempt)
+                        if started is not None:
+                            iterator, first = started
+                            breaker.record_success()
+                            track_llm_request_attempt(entry.provider, "success", attempt)
+                            try:
+                                yield entry.provider, first
+                                async for event in iterator:
+                                    yield entry.provider, event
+                            finally:
+                                await _aclose(iterator)
+                            return
+                except BaseException:
+                    if started is None:
+                        # Cancelled before the attempt had an outcome
+                        breaker.release_trial()
+                    raise
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpenError("All LLM providers are temporarily unavailable")
+
+    def _record_failure(
+        self, provider: str, breaker: CircuitBreaker, error: BaseException, attempt: int
+    ) -> bool:
+        """Record a failed attempt, returning whether it may be retried."""
+        if not is_retryable_error(error):
+            # The provider answered, so it is healthy even though the request failed
+            breaker.record_success()
+            track_llm_request_attempt(provider, "error", attempt)
+            return False
+        breaker.record_failure()
+        track_llm_request_attempt(provider, "retryable_error", attempt)
+        logger.warning(
+            "LLM request failed, retrying or failing over",
+            provider=provider,
+            attempt=attempt + 1,
+            status_code=error_status_code(error),
+            error=str(error),
+        )
+        return True
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> float | None:
+        if attempt + 1 >= self.retry_policy.max_attempts:
+            return None
+        return self.retry_policy.delay(attempt, retry_after_seconds(error))
+
+    async def _hedged[T](self, entry: ProviderAttempt[Awaitable[T]]) -> T:
+        """Await the call, racing a second one if the first is slower than hedge_delay."""
+        async with asyncio.timeout(self.request_timeout):
+            if self.hedge_delay is None:
+                return await entry.call()
+            tasks = {asyncio.ensure_future(entry.call())}
+            try:
+                done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+                if not done:
+                    track_llm_request_attempt(entry.provider, "hedge", 0)
+                    tasks.add(asyncio.ensure_future(entry.call()))
+                while True:
+                    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+                    if not pending:
+                        return next(iter(done)).result()
+                    # One request failed while the other is still running
+                    tasks = pending
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _start_stream[E](
+        self, entry: ProviderAttempt[AsyncIterator[E]]
+    ) -> tuple[AsyncIterator[E], E]:
+        """Open a stream and wait for its first event, hedging a slow start."""
+        async with asyncio.timeout(self.request_timeout):
+            primary = entry.call()
+            if self.hedge_delay is None:
+                return primary, await anext(primary)
+
+            first_events = {asyncio.ensure_future(anext(primary)): primary}
+            try:
+                done, _ = await asyncio.wait(first_events, timeout=self.hedge_delay)
+                if not done:
+                    track_llm_request_attempt(entry.provider, "hedge", 0)
+                    backup = entry.call()
+                    first_events[asyncio.ensure_future(anext(backup))] = backup
+                while True:
+                    done, pending = await asyncio.wait(
+                        first_events, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if task.exception() is None:
+                            return first_events.pop(task), task.result()
+                    if not pending:
+                        # Both failed: raise, and let the cleanup below close them
+                        next(iter(done)).result()
+                    # One stream failed to start while the other is still running
+                    for task in done:
+                        await _aclose(first_events.pop(task))
+            finally:
+                for task, iterator in first_events.items():
+                    task.cancel()
+                    with contextlib.suppress(BaseException):
+                        await task
+                    await _aclose(iterator)
+
+
+async def _aclose(iterator: Any) -> None:
+    """Close an async generator, ignoring errors from an already failed stream."""
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        with contextlib.suppress(Exception):
+            await aclose()
@@ -1,12 +1,13 @@
 """Agent task worker for processing main agent tasks from Redis queue.
 
-This worker polls the Redis queue for pending agent tasks and dispatches them
-to the AgentOrchestrator for execution. It also listens for control commands
+This worker waits on the Redis ready set for sessions with pending agent tasks
+and dispatches them to the AgentOrchestrator for execution. It also listens for control commands
 (abort, pause, resume) via Redis pub/sub for distributed agent management.
 
 Key features:
 - Configurable worker pool for concurrent task processing (AGENT_WORKER_POOL_SIZE)
-- Auto-discovers sessions with pending tasks by scanning Redis keys
+- Event-driven dispatch: blocks on the global ready set (BZPOPMIN) so new
+  tasks are picked up within milliseconds, round-robin across sessions
 - Handles control commands broadcast to all agent service instances
 - Only acts on commands for tasks it is currently running
 - Publishes streaming tokens and completion events via Redis pub/sub
@@ -20,6 +21,16 @@ from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from src.queue.ready_set import (
+    READY_BLOCK_TIMEOUT,
+    RECONCILE_INTERVAL,
+    observe_pickup_latency,
+    pop_ready_sessions,
+    reconcile_ready_sessions,
+    requeue_session_if_pending,
+    wait_for_ready_session,
+)
+
 if TYPE_CHECKING:
     from podex_shared.redis_client import RedisClient
 
@@ -29,6 +40,7 @@ logger = structlog.get_logger()
 # Key structure (matches API service task_queue.py)
 PENDING_KEY = "podex:agents:{session_id}:pending"
 ACTIVE_KEY = "podex:agents:{session_id}:active"
+READY_KEY = "podex:agents:ready"
 TASK_KEY = "podex:agents:task:{task_id}"
 UPDATES_CHANNEL = "podex:agents:updates"
 CONTROL_CHANNEL = "podex:agents:control"
@@ -58,7 +70,7 @@ class AgentTaskWorker:
 
         Args:
             redis_client: Redis client for queue operations
-            poll_interval: Seconds between queue polls
+            poll_interval: Seconds to back off after errors or while paused/full
             pool_size: Maximum number of concurrent tasks (default: 4)
         """
         self._redis = redis_client
@@ -70,6 +82,10 @@ class AgentTaskWorker:
 
         # Semaphore for limiting concurrent task processing
         self._semaphore = asyncio.Semaphore(pool_size)
+        # Set whenever a running task finishes and frees a pool slot
+        self._slot_freed = asyncio.Event()
+        # Monotonic time of the last ready-set reconciliation sweep
+        self._last_reconcile = 0.0
 
         # Background tasks
         self._task_processor: asyncio.Task[None] | None = None
@@ -144,17 +160,45 @@ class AgentTaskWorker:
         )
 
     async def _run_task_processor(self) -> None:
-        """Main task processing loop."""
+        """Main task processing loop.
+
+        Drains the ready set while there is pool capacity, then blocks until
+        either a session becomes ready or a running task frees a slot.
+        """
         while self._running:
             try:
-                if not self._paused:
-                    await self._process_pending_tasks()
+                if self._paused:
+                    await asyncio.sleep(self._poll_interval)
+                    continue
+
+                await self._reconcile_if_due()
+                if await self._process_pending_tasks() == 0:
+                    await self._wait_for_work()
             except asyncio.CancelledError:
                 break
             except Exception:
                 logger.exception("Error in agent task worker loop")
+                await asyncio.sleep(self._poll_interval)
+
+    async def _reconcile_if_due(self) -> None:
+        """Periodically repair the ready set from the per-session pending keys."""
+        now = asyncio.get_running_loop().time()
+        if self._last_reconcile and now - self._last_reconcile < RECONCILE_INTERVAL:
+            return
+        self._last_reconcile = now
+        await reconcile_ready_sessions(self._redis, READY_KEY, "podex:agents:*:pending")
+
+    async def _wait_for_work(self) -> None:
+        """Block until a slot frees up (pool full) or a session becomes ready."""
+        if self._available_slots() <= 0:
+            self._slot_freed.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._slot_freed.wait(), timeout=self._poll_interval)
+            return
 
-            await asyncio.sleep(self._poll_interval)
+        session_id = await wait_for_ready_session(self._redis, READY_KEY, READY_BLOCK_TIMEOUT)
+        if session_id:
+            await self._dispatch_session(session_id)
 
     async def _run_control_listener(self) -> None:
         """Listen for control commands via Redis pub/sub."""
@@ -278,67 +322,63 @@ class AgentTaskWorker:
                     "Task cancelled by user",
                 )
 
-    async def _process_pending_tasks(self) -> None:
-        """Process pending agent tasks concurrently using the worker pool.
-
-        Uses a semaphore to limit concurrent processing to pool_size.
-        Discovers sessions with pending tasks by scanning Redis keys.
-        """
-        # Clean up completed tasks
+    def _available_slots(self) -> int:
+        """Clean up finished tasks and return the number of free pool slots."""
         completed = [tid for tid, task in self._running_tasks.items() if task.done()]
         for tid in completed:
             self._running_tasks.pop(tid, None)
+        return self._pool_size - len(self._running_tasks)
 
-        # Check if we have capacity for more tasks
-        available_slots = self._pool_size - len(self._running_tasks)
-        if available_slots <= 0:
-            return  # Pool is full, wait for tasks to complete
+    async def _process_pending_tasks(self) -> int:
+        """Claim tasks from ready sessions without blocking, up to free pool slots.
 
-        # Scan for any session with pending tasks
-        sessions_to_check: set[str] = set()
+        Returns:
+            Number of tasks spawned
+        """
+        available_slots = self._available_slots()
+        if available_slots <= 0:
+            return 0  # Pool is full, wait for tasks to complete
 
-        cursor = 0
-        while True:
-            cursor, keys = await self._redis.client.scan(
-                cursor,
-                match="podex:agents:*:pending",
-                count=100,
-            )
-            for key in keys:
-                # Extract session_id from key (podex:agents:{session_id}:pending)
-                parts = key.split(":")
-                if len(parts) >= 3:
-                    session_id = parts[2]
-                    sessions_to_check.add(session_id)
-            if cursor == 0:
-                break
+        session_ids = await pop_ready_sessions(self._redis, READY_KEY, available_slots)
 
-        # Dequeue and spawn tasks concurrently (up to available slots)
         tasks_spawned = 0
-        for session_id in sessions_to_check:
-            if tasks_spawned >= available_slots:
-                break  # Pool is now full
+        for session_id in session_ids:
+            if await self._dispatch_session(session_id):
+                tasks_spawned += 1
+        return tasks_spawned
 
-            try:
-                task_data = await self._dequeue_task(session_id)
-                if task_data:
-                    task_id = task_data["id"]
-                    # Spawn task processing in background
-                    asyncio_task = asyncio.create_task(self._process_task_with_semaphore(task_data))
-                    self._running_tasks[task_id] = asyncio_task
-                    tasks_spawned += 1
-
-                    logger.debug(
-                        "Spawned concurrent task",
-                        task_id=task_id,
-                        running_count=len(self._running_tasks),
-                        pool_size=self._pool_size,
-                    )
-            except Exception:
-                logger.exception(
-                    "Error dequeuing agent task",
-                    session_id=session_id,
-                )
+    async def _dispatch_session(self, session_id: str) -> bool:
+        """Claim and spawn the next task of a session popped from the ready set.
+
+        The claim re-adds the session to the back of the ready set if it still
+        has pending tasks, so other sessions get their turn first.
+        """
+        try:
+            task_data = await self._dequeue_task(session_id)
+        except Exception:
+            logger.exception("Error dequeuing agent task", session_id=session_id)
+            pending_key = PENDING_KEY.format(session_id=session_id)
+            await requeue_session_if_pending(self._redis, READY_KEY, pending_key, session_id)
+            return False
+
+        if not task_data:
+            return False
+
+        task_id = task_data["id"]
+        observe_pickup_latency("agent", task_data)
+
+        # Spawn task processing in background
+        asyncio_task = asyncio.create_task(self._process_task_with_semaphore(task_data))
+        asyncio_task.add_done_callback(lambda _t: self._slot_freed.set())
+        self._running_tasks[task_id] = asyncio_task
+
+        logger.debug(
+            "Spawned concurrent task",
+            task_id=task_id,
+            running_count=len(self._running_tasks),
+            pool_size=self._pool_size,
+        )
+        return True
 
     async def _process_task_with_semaphore(self, task_data: dict[str, Any]) -> None:
         """Process a task with semaphore-based concurrency control."""
@@ -346,42 +386,27 @@ class AgentTaskWorker:
             await self._process_task(task_data)
 
     async def _dequeue_task(self, session_id: str) -> dict[str, Any] | None:
-        """Dequeue the highest priority pending task for a session."""
-        pending_key = PENDING_KEY.format(session_id=session_id)
+        """Claim the highest priority pending task for a session.
 
-        # Get pending task IDs
-        task_ids = await self._redis.client.zrange(pending_key, 0, 0)
-        if not task_ids:
+        The claim (pop, move to the active set, stamp running state and
+        re-mark the session ready) is a single round trip to Redis.
+        """
+        task_data = await self._redis.claim_task(
+            PENDING_KEY.format(session_id=session_id),
+            TASK_KEY.format(task_id=""),
+            active_key=ACTIVE_KEY.format(session_id=session_id),
+            ready_key=READY_KEY,
+            ready_member=session_id,
+            worker_id=self._worker_id,
+            ttl=TASK_TTL,
+        )
+        if task_data is None:
             return None
 
-        task_id = task_ids[0]
-
-        # Try to claim the task atomically
-        removed = await self._redis.client.zrem(pending_key, task_id)
-        if removed == 0:
-            return None  # Already claimed by another worker
-
-        # Add to active set
-        active_key = ACTIVE_KEY.format(session_id=session_id)
-        await self._redis.client.sadd(active_key, task_id)
-
-        # Get task data
-        task_key = TASK_KEY.format(task_id=task_id)
-        data = await self._redis.get_json(task_key)
-
-        if data and isinstance(data, dict):
-            # Update status to running
-            data["status"] = "running"
-            data["started_at"] = datetime.now(UTC).isoformat()
-            data["assigned_worker_id"] = self._worker_id
-            await self._redis.set_json(task_key, data, ex=TASK_TTL)
-
-            # Publish task started event
-            await self._publish_event("agent_task_started", data)
-
-            return data
+        # Publish task started event
+        await self._publish_event("agent_task_started", task_data)
 
-        return None
+        return task_data
 
     async def _process_task(self, task_data: dict[str, Any]) -> None:
         """Process a single agent task using the orchestrator."""
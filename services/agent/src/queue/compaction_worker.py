@@ -1,7 +1,7 @@
 """Compaction task worker for processing context compaction tasks from Redis queue.
 
-This worker polls the Redis queue for pending compaction tasks and executes
-context compaction (LLM summarization of old messages) for agents.
+This worker blocks on the Redis pending queue (BZPOPMIN) for compaction tasks
+and executes context compaction (LLM summarization of old messages) for agents.
 """
 
 import asyncio
@@ -19,6 +19,7 @@ from src.context.tokenizer import Tokenizer
 from src.database.connection import get_db_context
 from src.database.models import Agent, ConversationMessage
 from src.providers.llm import LLMProvider
+from src.queue.ready_set import READY_BLOCK_TIMEOUT, observe_pickup_latency
 
 if TYPE_CHECKING:
     from podex_shared.redis_client import RedisClient
@@ -51,7 +52,7 @@ class CompactionTaskWorker:
 
         Args:
             redis_client: Redis client for queue operations
-            poll_interval: Seconds between queue polls
+            poll_interval: Seconds to back off after errors or while the pool is full
             pool_size: Maximum concurrent compaction tasks (default: 2)
         """
         self._redis = redis_client
@@ -65,6 +66,8 @@ class CompactionTaskWorker:
         self._semaphore = asyncio.Semaphore(pool_size)
         # Track running tasks
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        # Set whenever a running task finishes and frees a pool slot
+        self._slot_freed = asyncio.Event()
 
     async def start(self) -> None:
         """Start the background worker."""
@@ -104,75 +107,103 @@ class CompactionTaskWorker:
         logger.info("Compaction task worker stopped", worker_id=self._worker_id)
 
     async def _run(self) -> None:
-        """Main worker loop."""
+        """Main worker loop.
+
+        Drains the pending queue while there is pool capacity, then blocks until
+        either a task is enqueued or a running task frees a slot.
+        """
         while self._running:
             try:
-                await self._process_pending_tasks()
+                if await self._process_pending_tasks() == 0:
+                    await self._wait_for_work()
             except asyncio.CancelledError:
                 break
             except Exception:
                 logger.exception("Error in compaction task worker loop")
+                await asyncio.sleep(self._poll_interval)
 
-            await asyncio.sleep(self._poll_interval)
-
-    async def _process_pending_tasks(self) -> None:
-        """Process pending compaction tasks concurrently."""
-        # Clean up completed tasks
+    def _available_slots(self) -> int:
+        """Clean up finished tasks and return the number of free pool slots."""
         completed = [tid for tid, task in self._running_tasks.items() if task.done()]
         for tid in completed:
             self._running_tasks.pop(tid, None)
+        return self._pool_size - len(self._running_tasks)
 
-        # Check available capacity
-        available_slots = self._pool_size - len(self._running_tasks)
+    async def _process_pending_tasks(self) -> int:
+        """Claim pending compaction tasks without blocking, up to free pool slots.
+
+        Returns:
+            Number of tasks spawned
+        """
+        available_slots = self._available_slots()
         if available_slots <= 0:
+            return 0
+
+        claimed = await self._redis.claim_tasks(
+            PENDING_KEY,
+            TASK_KEY.format(task_id=""),
+            available_slots,
+            worker_id=self._worker_id,
+            ttl=TASK_TTL,
+        )
+        for task_data in claimed:
+            await self._publish_event("compaction_task_started", task_data)
+            self._spawn_task(task_data)
+        return len(claimed)
+
+    async def _wait_for_work(self) -> None:
+        """Block until a slot frees up (pool full) or a task is enqueued."""
+        if self._available_slots() <= 0:
+            self._slot_freed.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._slot_freed.wait(), timeout=self._poll_interval)
             return
 
-        # Dequeue and spawn tasks up to available slots
-        for _ in range(available_slots):
-            task_data = await self._dequeue_task()
-            if task_data:
-                task_id = task_data["id"]
-                asyncio_task = asyncio.create_task(self._process_task_with_semaphore(task_data))
-                self._running_tasks[task_id] = asyncio_task
-            else:
-                break  # No more pending tasks
+        task_data = await self._dequeue_task(block_timeout=READY_BLOCK_TIMEOUT)
+        if task_data:
+            self._spawn_task(task_data)
+
+    def _spawn_task(self, task_data: dict[str, Any]) -> None:
+        """Start processing a claimed task in the background."""
+        observe_pickup_latency("compaction", task_data)
+        asyncio_task = asyncio.create_task(self._process_task_with_semaphore(task_data))
+        asyncio_task.add_done_callback(lambda _t: self._slot_freed.set())
+        self._running_tasks[task_data["id"]] = asyncio_task
 
     async def _process_task_with_semaphore(self, task_data: dict[str, Any]) -> None:
         """Process a task with semaphore-based concurrency control."""
         async with self._semaphore:
             await self._process_task(task_data)
 
-    async def _dequeue_task(self) -> dict[str, Any] | None:
-        """Dequeue the next pending compaction task."""
-        # Get pending task IDs (FIFO order)
-        task_ids = await self._redis.client.zrange(PENDING_KEY, 0, 0)
-        if not task_ids:
-            return None
-
-        task_id = task_ids[0]
-
-        # Try to claim the task atomically
-        removed = await self._redis.client.zrem(PENDING_KEY, task_id)
-        if removed == 0:
-            return None  # Already claimed by another worker
-
-        # Get task data
-        task_key = TASK_KEY.format(task_id=task_id)
-        data = await self._redis.get_json(task_key)
+    async def _dequeue_task(self, block_timeout: float | None = None) -> dict[str, Any] | None:
+        """Claim the next pending compaction task.
 
-        if data and isinstance(data, dict):
-            # Update status to running
-            data["status"] = "running"
-            data["started_at"] = datetime.now(UTC).isoformat()
-            data["assigned_worker_id"] = self._worker_id
-            await self._redis.set_json(task_key, data, ex=TASK_TTL)
-
-            # Publish task started event
-            await self._publish_event("compaction_task_started", data)
+        The claim is a single round trip (see ``RedisClient.claim_task``).
+        With ``block_timeout`` the call first waits (BZPOPMIN) for a task to be
+        enqueued instead of returning immediately. The pop is only a wake-up:
+        the task ID is put back and claimed through the same script, so the
+        task is stamped running atomically.
+        """
+        if block_timeout is not None:
+            popped = await self._redis.client.bzpopmin(PENDING_KEY, timeout=block_timeout)
+            if not popped:
+                return None
+            _, task_id, score = popped
+            await self._redis.client.zadd(PENDING_KEY, {task_id: score})
+
+        data = await self._redis.claim_task(
+            PENDING_KEY,
+            TASK_KEY.format(task_id=""),
+            worker_id=self._worker_id,
+            ttl=TASK_TTL,
+        )
+        if data is None:
+            return None
 
-            return data
+        # Publish task started event
+        await self._publish_event("compaction_task_started", data)
 
-        return None
+        return data
 
     async def _process_task(self, task_data: dict[str, Any]) -> None:
         """Process a single compaction task."""
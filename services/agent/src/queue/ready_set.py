@@ -0,0 +1,122 @@
+"""Ready-set dispatch helpers shared by the session-scoped queue workers.
+
+Producers (the API service task queues) add a session to a global "ready" sorted
+set whenever they enqueue work for it, scored by the time it became ready.
+Workers block on BZPOPMIN against that set instead of SCANning the keyspace, so
+a new task is picked up as soon as a worker has a free slot.
+
+Popping a session gives the popping worker the right to claim one task from it.
+If the session still has pending work afterwards it is re-added with a fresh
+score, i.e. at the back of the set, which keeps dispatch fair across sessions.
+A low-frequency reconciliation sweep re-adds sessions that were lost from the
+set (worker crash between pop and re-add, or tasks enqueued before upgrade).
+"""
+
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from podex_shared.sentry import track_task_pickup_latency
+
+if TYPE_CHECKING:
+    from podex_shared.redis_client import RedisClient
+
+logger = structlog.get_logger()
+
+# How long a worker blocks on BZPOPMIN before re-checking its running state
+READY_BLOCK_TIMEOUT = 1.0  # seconds
+
+# How often pending keys are swept to repair the ready set
+RECONCILE_INTERVAL = 30.0  # seconds
+
+
+async def pop_ready_sessions(redis: "RedisClient", ready_key: str, count: int) -> list[str]:
+    """Pop up to ``count`` sessions from the ready set without blocking."""
+    if count <= 0:
+        return []
+    result = await redis.client.zpopmin(ready_key, count)
+    return [member for member, _score in result or []]
+
+
+async def wait_for_ready_session(
+    redis: "RedisClient",
+    ready_key: str,
+    timeout: float = READY_BLOCK_TIMEOUT,
+) -> str | None:
+    """Block until a session becomes ready or ``timeout`` elapses."""
+    result = await redis.client.bzpopmin(ready_key, timeout=timeout)
+    if not result:
+        return None
+    _key, member, _score = result
+    return str(member)
+
+
+async def requeue_session_if_pending(
+    redis: "RedisClient",
+    ready_key: str,
+    pending_key: str,
+    session_id: str,
+) -> bool:
+    """Re-add a session at the back of the ready set if it still has pending tasks."""
+    if await redis.client.zcard(pending_key) > 0:
+        await redis.client.zadd(ready_key, {session_id: time.time()}, nx=True)
+        return True
+    return False
+
+
+async def reconcile_ready_sessions(
+    redis: "RedisClient",
+    ready_key: str,
+    pending_match: str,
+    extra_sessions: Iterable[str] = (),
+) -> int:
+    """Re-add every session that has a pending queue to the ready set.
+
+    Args:
+        redis: Redis client
+        ready_key: Ready set key
+        pending_match: SCAN pattern for per-session pending keys
+            (session id must be the third ``:``-separated component)
+        extra_sessions: Additional session IDs to mark ready
+
+    Returns:
+        Number of sessions newly added to the ready set
+    """
+    sessions: set[str] = set(extra_sessions)
+
+    cursor = 0
+    while True:
+        cursor, keys = await redis.client.scan(cursor, match=pending_match, count=100)
+        for key in keys:
+            parts = key.split(":")
+            if len(parts) >= 3:
+                sessions.add(parts[2])
+        if cursor == 0:
+            break
+
+    if not sessions:
+        return 0
+
+    now = time.time()
+    added = await redis.client.zadd(ready_key, dict.fromkeys(sessions, now), nx=True)
+    if added:
+        logger.info("Repaired task ready set", ready_key=ready_key, sessions_added=added)
+    return int(added or 0)
+
+
+def observe_pickup_latency(queue: str, task_data: dict[str, Any]) -> None:
+    """Record enqueue-to-claim latency for a claimed task."""
+    created_at = task_data.get("created_at")
+    if not created_at:
+        return
+    try:
+        enqueued = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return
+    if enqueued.tzinfo is None:
+        enqueued = enqueued.replace(tzinfo=UTC)
+    latency_ms = (datetime.now(UTC) - enqueued).total_seconds() * 1000
+    track_task_pickup_latency(queue, max(latency_ms, 0.0))
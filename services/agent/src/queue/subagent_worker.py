@@ -1,8 +1,8 @@
 """Background worker for processing subagent tasks from the queue.
 
-This worker polls the subagent task queue and dispatches tasks to the
-SubagentManager for execution. It bridges the API service (which enqueues tasks)
-with the agent service (which executes them).
+This worker waits on the subagent ready set for sessions with pending tasks and
+dispatches them to the SubagentManager for execution. It bridges the API service
+(which enqueues tasks) with the agent service (which executes them).
 
 Supports concurrent processing with configurable pool size.
 """
@@ -15,6 +15,15 @@ from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from src.queue.ready_set import (
+    READY_BLOCK_TIMEOUT,
+    RECONCILE_INTERVAL,
+    observe_pickup_latency,
+    pop_ready_sessions,
+    reconcile_ready_sessions,
+    requeue_session_if_pending,
+    wait_for_ready_session,
+)
 from src.subagent.manager import SubagentManager, get_subagent_manager
 
 if TYPE_CHECKING:
@@ -27,6 +36,7 @@ logger = structlog.get_logger()
 PENDING_KEY = "podex:subagents:{session_id}:pending"
 ACTIVE_KEY = "podex:subagents:{session_id}:active"
 COMPLETED_KEY = "podex:subagents:{session_id}:completed"
+READY_KEY = "podex:subagents:ready"
 TASK_KEY = "podex:subagent:{task_id}"
 UPDATES_CHANNEL = "podex:subagents:updates"
 
@@ -55,7 +65,7 @@ class SubagentTaskWorker:
         Args:
             redis_client: Redis client for queue operations
             subagent_manager: SubagentManager instance (uses global if not provided)
-            poll_interval: Seconds between queue polls
+            poll_interval: Seconds to back off after errors or while the pool is full
             pool_size: Maximum concurrent subagent tasks (default: 4)
         """
         self._redis = redis_client
@@ -71,6 +81,10 @@ class SubagentTaskWorker:
         self._semaphore = asyncio.Semaphore(pool_size)
         # Track running tasks
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        # Set whenever a running task finishes and frees a pool slot
+        self._slot_freed = asyncio.Event()
+        # Monotonic time of the last ready-set reconciliation sweep
+        self._last_reconcile = 0.0
 
     def add_session(self, session_id: str) -> None:
         """Add a session to process subagent tasks for."""
@@ -120,72 +134,98 @@ class SubagentTaskWorker:
         logger.info("Subagent task worker stopped", worker_id=self._worker_id)
 
     async def _run(self) -> None:
-        """Main worker loop."""
+        """Main worker loop.
+
+        Drains the ready set while there is pool capacity, then blocks until
+        either a session becomes ready or a running task frees a slot.
+        """
         while self._running:
             try:
-                await self._process_pending_tasks()
+                await self._reconcile_if_due()
+                if await self._process_pending_tasks() == 0:
+                    await self._wait_for_work()
             except asyncio.CancelledError:
                 break
             except Exception:
                 logger.exception("Error in subagent task worker loop")
+                await asyncio.sleep(self._poll_interval)
 
-            await asyncio.sleep(self._poll_interval)
+    async def _reconcile_if_due(self) -> None:
+        """Periodically repair the ready set from the per-session pending keys."""
+        now = asyncio.get_running_loop().time()
+        if self._last_reconcile and now - self._last_reconcile < RECONCILE_INTERVAL:
+            return
+        self._last_reconcile = now
+        await reconcile_ready_sessions(
+            self._redis,
+            READY_KEY,
+            "podex:subagents:*:pending",
+            extra_sessions=self._active_sessions,
+        )
 
-    async def _process_pending_tasks(self) -> None:
-        """Process pending subagent tasks concurrently.
+    async def _wait_for_work(self) -> None:
+        """Block until a slot frees up (pool full) or a session becomes ready."""
+        if self._available_slots() <= 0:
+            self._slot_freed.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._slot_freed.wait(), timeout=self._poll_interval)
+            return
 
-        Discovers sessions with pending tasks by scanning Redis keys.
-        Spawns tasks up to pool_size limit for concurrent processing.
-        """
-        # Clean up completed tasks
+        session_id = await wait_for_ready_session(self._redis, READY_KEY, READY_BLOCK_TIMEOUT)
+        if session_id:
+            await self._dispatch_session(session_id)
+
+    def _available_slots(self) -> int:
+        """Clean up finished tasks and return the number of free pool slots."""
         completed = [tid for tid, task in self._running_tasks.items() if task.done()]
         for tid in completed:
             self._running_tasks.pop(tid, None)
+        return self._pool_size - len(self._running_tasks)
+
+    async def _process_pending_tasks(self) -> int:
+        """Claim subagent tasks from ready sessions without blocking.
+
+        Spawns tasks up to the free pool slots for concurrent processing.
 
-        # Check available capacity
-        available_slots = self._pool_size - len(self._running_tasks)
+        Returns:
+            Number of tasks spawned
+        """
+        available_slots = self._available_slots()
         if available_slots <= 0:
-            return
+            return 0
 
-        # First check explicitly registered sessions
-        sessions_to_check = set(self._active_sessions)
-
-        # Also scan for any session with pending tasks
-        # Pattern: podex:subagents:*:pending
-        cursor = 0
-        while True:
-            cursor, keys = await self._redis.client.scan(
-                cursor,
-                match="podex:subagents:*:pending",
-                count=100,
-            )
-            for key in keys:
-                # Extract session_id from key (podex:subagents:{session_id}:pending)
-                parts = key.split(":")
-                if len(parts) >= 3:
-                    session_id = parts[2]
-                    sessions_to_check.add(session_id)
-            if cursor == 0:
-                break
+        session_ids = await pop_ready_sessions(self._redis, READY_KEY, available_slots)
 
-        # Dequeue and spawn tasks up to available slots
         tasks_spawned = 0
-        for session_id in sessions_to_check:
-            if tasks_spawned >= available_slots:
-                break
+        for session_id in session_ids:
+            if await self._dispatch_session(session_id):
+                tasks_spawned += 1
+        return tasks_spawned
 
-            try:
-                task_data = await self._dequeue_task(session_id)
-                if task_data:
-                    task_id = task_data["id"]
-                    asyncio_task = asyncio.create_task(self._process_task_with_semaphore(task_data))
-                    self._running_tasks[task_id] = asyncio_task
-                    tasks_spawned += 1
-            except Exception:
-                logger.exception(
-                    "Error dequeuing subagent task",
-                    session_id=session_id,
-                )
+    async def _dispatch_session(self, session_id: str) -> bool:
+        """Claim and spawn the next task of a session popped from the ready set.
+
+        The claim re-adds the session to the back of the ready set if it still
+        has pending tasks, so other sessions get their turn first.
+        """
+        try:
+            task_data = await self._dequeue_task(session_id)
+        except Exception:
+            logger.exception("Error dequeuing subagent task", session_id=session_id)
+            pending_key = PENDING_KEY.format(session_id=session_id)
+            await requeue_session_if_pending(self._redis, READY_KEY, pending_key, session_id)
+            return False
+
+        if not task_data:
+            return False
+
+        task_id = task_data["id"]
+        observe_pickup_latency("subagent", task_data)
+
+        asyncio_task = asyncio.create_task(self._process_task_with_semaphore(task_data))
+        asyncio_task.add_done_callback(lambda _t: self._slot_freed.set())
+        self._running_tasks[task_id] = asyncio_task
+        return True
 
     async def _process_task_with_semaphore(self, task_data: dict[str, Any]) -> None:
         """Process a task with semaphore-based concurrency control."""
@@ -193,42 +233,27 @@ class SubagentTaskWorker:
             await self._process_task(task_data)
 
     async def _dequeue_task(self, session_id: str) -> dict[str, Any] | None:
-        """Dequeue the highest priority pending task for a session."""
-        pending_key = PENDING_KEY.format(session_id=session_id)
+        """Claim the highest priority pending task for a session.
 
-        # Get pending task IDs
-        task_ids = await self._redis.client.zrange(pending_key, 0, 0)
-        if not task_ids:
+        The claim (pop, move to the active set, stamp running state and
+        re-mark the session ready) is a single round trip to Redis.
+        """
+        task_data = await self._redis.claim_task(
+            PENDING_KEY.format(session_id=session_id),
+            TASK_KEY.format(task_id=""),
+            active_key=ACTIVE_KEY.format(session_id=session_id),
+            ready_key=READY_KEY,
+            ready_member=session_id,
+            worker_id=self._worker_id,
+            ttl=TASK_TTL,
+        )
+        if task_data is None:
             return None
 
-        task_id = task_ids[0]
-
-        # Try to claim the task atomically
-        removed = await self._redis.client.zrem(pending_key, task_id)
-        if removed == 0:
-            return None  # Already claimed by another worker
-
-        # Add to active set
-        active_key = ACTIVE_KEY.format(session_id=session_id)
-        await self._redis.client.sadd(active_key, task_id)
-
-        # Get task data
-        task_key = TASK_KEY.format(task_id=task_id)
-        raw_data = await self._redis.get_json(task_key)
-
-        if raw_data and isinstance(raw_data, dict):
-            task_data: dict[str, Any] = raw_data
-            # Update status to running
-            task_data["status"] = "running"
-            task_data["started_at"] = datetime.now(UTC).isoformat()
-            await self._redis.set_json(task_key, task_data, ex=TASK_TTL)
-
-            # Publish task started event
-            await self._publish_event("subagent_task_started", task_data)
-
-            return task_data
+        # Publish task started event
+        await self._publish_event("subagent_task_started", task_data)
 
-        return None
+        return task_data
 
     async def _process_task(self, task_data: dict[str, Any]) -> None:
         """Process a single subagent task."""
@@ -7,7 +7,7 @@ from typing import Any
 
 import structlog
 
-from podex_shared import RedisClient, get_redis_client
+from podex_shared import RedisClient, TokenBatcher, get_redis_client
 from src.config import settings
 from src.providers.llm import StreamEvent
 
@@ -43,6 +43,8 @@ class StreamMessage:
     total_steps: int | None = None
     success: bool | None = None
     duration_ms: int | None = None
+    # Number of tokens coalesced into content (token batching)
+    token_count: int | None = None
 
     def to_json(self) -> str:
         """Serialize to JSON string."""
@@ -60,12 +62,33 @@ class StreamPublisher:
 
     This allows the API service to subscribe to specific session/agent
     combinations and forward tokens to the appropriate WebSocket clients.
+
+    With a non-zero ``token_batch_window``, token and thinking events are
+    coalesced per (session, agent, message, event type) and published as a
+    single event with the concatenated content. Any other event for the same
+    session/agent flushes pending tokens first, so ordering is preserved.
     """
 
-    def __init__(self, redis_client: RedisClient) -> None:
-        """Initialize publisher with Redis client."""
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        token_batch_window: float = 0.0,
+        token_batch_max_chars: int = 512,
+    ) -> None:
+        """Initialize publisher with Redis client.
+
+        Args:
+            redis_client: Redis client used for Pub/Sub
+            token_batch_window: Token coalescing window in seconds (0 disables)
+            token_batch_max_chars: Buffered text size that forces a publish
+        """
         self._redis = redis_client
         self._connected = False
+        self._token_batcher: TokenBatcher[tuple[str, str, str, str]] = TokenBatcher(
+            self._publish_token_batch,
+            window=token_batch_window,
+            max_chars=token_batch_max_chars,
+        )
         # Context for skill events (set via set_context)
         self._session_id: str | None = None
         self._agent_id: str | None = None
@@ -83,10 +106,45 @@ class StreamPublisher:
         return f"agent_stream:{session_id}:{agent_id}"
 
     async def _publish(self, message: StreamMessage) -> None:
-        """Publish a message to Redis."""
+        """Publish a message to Redis, after any tokens buffered for its stream."""
+        if message.event_type not in ("token", "thinking"):
+            await self._flush_tokens(message.session_id, message.agent_id)
         channel = self._channel(message.session_id, message.agent_id)
         await self._redis.publish(channel, message.to_json())
 
+    async def _flush_tokens(self, session_id: str, agent_id: str) -> None:
+        """Publish tokens buffered for a session/agent stream."""
+        await self._token_batcher.flush_where(lambda key: key[:2] == (session_id, agent_id))
+
+    async def _add_token(
+        self, session_id: str, agent_id: str, message_id: str, event_type: str, content: str
+    ) -> None:
+        """Queue a token or thinking token for (possibly coalesced) publishing."""
+        # Keep token/thinking interleaving intact by flushing the other kind first
+        await self._token_batcher.flush_where(
+            lambda key: key[:2] == (session_id, agent_id) and key[2:] != (message_id, event_type)
+        )
+        await self._token_batcher.add((session_id, agent_id, message_id, event_type), content)
+
+    async def _publish_token_batch(self, key: tuple[str, str, str, str], tokens: list[str]) -> None:
+        """Publish coalesced tokens as one event."""
+        session_id, agent_id, message_id, event_type = key
+        channel = self._channel(session_id, agent_id)
+        message = StreamMessage(
+            session_id=session_id,
+            agent_id=agent_id,
+            message_id=message_id,
+            event_type=event_type,
+            content="".join(tokens),
+            token_count=len(tokens) if len(tokens) > 1 else None,
+        )
+        await self._redis.publish(channel, message.to_json())
+
+    def _forget_stream(self, session_id: str, agent_id: str, message_id: str) -> None:
+        """Drop token batching state for a finished message stream."""
+        for event_type in ("token", "thinking"):
+            self._token_batcher.forget((session_id, agent_id, message_id, event_type))
+
     async def publish_start(
         self,
         session_id: str,
@@ -116,16 +174,8 @@ class StreamPublisher:
         message_id: str,
         token: str,
     ) -> None:
-        """Publish a single token."""
-        await self._publish(
-            StreamMessage(
-                session_id=session_id,
-                agent_id=agent_id,
-                message_id=message_id,
-                event_type="token",
-                content=token,
-            )
-        )
+        """Publish a single token (coalesced with neighbours when batching is enabled)."""
+        await self._add_token(session_id, agent_id, message_id, "token", token)
 
     async def publish_thinking_token(
         self,
@@ -135,15 +185,7 @@ class StreamPublisher:
         thinking: str,
     ) -> None:
         """Publish a thinking token (for extended thinking/reasoning)."""
-        await self._publish(
-            StreamMessage(
-                session_id=session_id,
-                agent_id=agent_id,
-                message_id=message_id,
-                event_type="thinking",
-                content=thinking,
-            )
-        )
+        await self._add_token(session_id, agent_id, message_id, "thinking", thinking)
 
     async def publish_tool_call_start(
         self,
@@ -179,8 +221,12 @@ class StreamPublisher:
         tool_call_id: str,
         tool_name: str,
         tool_input: dict[str, Any] | None = None,
+        duration_ms: int | None = None,
     ) -> None:
-        """Publish tool call end event."""
+        """Publish tool call end event.
+
+        duration_ms is set when the event marks the tool finishing execution.
+        """
         await self._publish(
             StreamMessage(
                 session_id=session_id,
@@ -190,6 +236,7 @@ class StreamPublisher:
                 tool_call_id=tool_call_id,
                 tool_name=tool_name,
                 tool_input=tool_input,
+                duration_ms=duration_ms,
             )
         )
         logger.debug(
@@ -222,6 +269,7 @@ class StreamPublisher:
                 tool_calls=tool_calls,
             )
         )
+        self._forget_stream(session_id, agent_id, message_id)
         logger.debug(
             "Published stream done",
             session_id=session_id,
@@ -248,6 +296,7 @@ class StreamPublisher:
                 error=error,
             )
         )
+        self._forget_stream(session_id, agent_id, message_id)
         logger.warning(
             "Published stream error",
             session_id=session_id,
@@ -468,5 +517,9 @@ def get_stream_publisher() -> StreamPublisher:
     global _publisher
     if _publisher is None:
         redis_client = get_redis_client(settings.REDIS_URL)
-        _publisher = StreamPublisher(redis_client)
+        _publisher = StreamPublisher(
+            redis_client,
+            token_batch_window=settings.STREAMING_TOKEN_BATCH_MS / 1000,
+            token_batch_max_chars=settings.STREAMING_TOKEN_BATCH_MAX_CHARS,
+        )
     return _publisher
@@ -195,6 +195,7 @@ class ToolExecutor:
         approval_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
         workspace_id: str | None = None,
         agent_model: str | None = None,
+        max_concurrent_tools: int | None = None,
     ) -> None:
         """Initialize tool executor.
 
@@ -212,6 +213,8 @@ class ToolExecutor:
                          workspace container via the compute service.
             agent_model: Optional model used by the agent. Used as default for
                         agent builder tools when creating new templates.
+            max_concurrent_tools: Maximum read-only tool calls run at once by
+                        execute_many (defaults to settings.MAX_CONCURRENT_TOOL_CALLS).
         """
         self.workspace_path = Path(workspace_path).resolve()
         self.session_id = session_id
@@ -231,6 +234,11 @@ class ToolExecutor:
         # Pending approvals tracking
         self._pending_approvals: dict[str, asyncio.Future[tuple[bool, bool]]] = {}
 
+        # Bounds concurrent read-only tool calls for this agent
+        self._tool_semaphore = asyncio.Semaphore(
+            max(1, max_concurrent_tools or settings.MAX_CONCURRENT_TOOL_CALLS)
+        )
+
         # Compute client is lazily initialized on first use
         # This allows async database lookup of the compute service URL
         self._compute_client: ComputeClient | None = None
@@ -356,6 +364,71 @@ class ToolExecutor:
 
         return json.dumps(result, indent=2)
 
+    async def execute_many(
+        self,
+        tool_calls: list[tuple[str, dict[str, Any]]],
+        on_complete: Callable[[int, str, int], Awaitable[None]] | None = None,
+    ) -> list[str]:
+        """Execute one model turn's tool calls, overlapping independent reads.
+
+        Consecutive read-only calls run concurrently, at most
+        max_concurrent_tools at a time. Any other call (writes, commands,
+        deploys, uncategorized tools) waits for the calls before it and runs
+        alone, so it sees their effects and later calls see its effects.
+
+        Args:
+            tool_calls: (tool_name, arguments) pairs in the order the model issued them.
+            on_complete: Optional callback invoked with (index, result, duration_ms)
+                as each call finishes.
+
+        Returns:
+            JSON string results, in the same order as tool_calls.
+        """
+        results = [""] * len(tool_calls)
+
+        async def _run(index: int) -> None:
+            tool_name, arguments = tool_calls[index]
+            async with self._tool_semaphore:
+                start = time.monotonic()
+                results[index] = await self.execute(tool_name, arguments)
+                duration_ms = int((time.monotonic() - start) * 1000)
+            if on_complete:
+                await on_complete(index, results[index], duration_ms)
+
+        concurrent: list[int] = []
+
+        async def _run_concurrent() -> None:
+            if len(concurrent) == 1:
+                await _run(concurrent[0])
+            elif concurrent:
+                logger.info(
+                    "Executing read-only tools concurrently",
+                    tools=[tool_calls[i][0] for i in concurrent],
+                    agent_id=self.agent_id,
+                )
+                await asyncio.gather(*(_run(i) for i in concurrent))
+            concurrent.clear()
+
+        for index, (tool_name, _) in enumerate(tool_calls):
+            if await self._is_read_only_tool(tool_name):
+                concurrent.append(index)
+                continue
+            await _run_concurrent()
+            await _run(index)
+        await _run_concurrent()
+
+        return results
+
+    async def _is_read_only_tool(self, tool_name: str) -> bool:
+        """Check if a tool only reads, so it may run alongside other reads."""
+        if tool_name not in await _get_read_tools():
+            return False
+        return (
+            tool_name not in await _get_write_tools()
+            and tool_name not in await _get_command_tools()
+            and tool_name not in await _get_deploy_tools()
+        )
+
     async def _check_permission(
         self,
         tool_name: str,
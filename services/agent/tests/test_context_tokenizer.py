@@ -0,0 +1,195 @@
+"""Tests for tokenizer backends, token count memoization and incremental totals."""
+
+import time
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.context import tokenizer
+from src.context.manager import ContextWindowManager
+from src.context.tokenizer import (
+    HeuristicTokenCounter,
+    TokenCountCache,
+    Tokenizer,
+    get_token_counter,
+    message_text,
+    register_token_counter,
+)
+
+
+class FakeCounter:
+    """Counts one token per character and records every call."""
+
+    def __init__(self, name: str = "fake") -> None:
+        self.name = name
+        self.calls: list[str] = []
+
+    def count(self, text: str) -> int:
+        self.calls.append(text)
+        return len(text)
+
+
+@pytest.fixture(autouse=True)
+def clear_tokenizer_caches() -> Iterator[None]:
+    """Reset backend selection and memoized counts around each test."""
+    get_token_counter.cache_clear()
+    tokenizer._encodings.clear()
+    tokenizer.get_token_count_cache().clear()
+    yield
+    tokenizer._counter_factories.clear()
+    get_token_counter.cache_clear()
+    tokenizer._encodings.clear()
+    tokenizer.get_token_count_cache().clear()
+
+
+class TestTokenCounterSelection:
+    """Tests for picking a tokenizer backend by model."""
+
+    @pytest.mark.parametrize(
+        ("model", "encoding"),
+        [
+            ("gpt-4o-mini", "o200k_base"),
+            ("openai/gpt-5", "o200k_base"),
+            ("gpt-4-turbo", "cl100k_base"),
+            ("claude-sonnet-4.5", "cl100k_base"),
+            ("llama3.1:8b", "cl100k_base"),
+            (None, "cl100k_base"),
+        ],
+    )
+    def test_encoding_by_model_family(self, model: str | None, encoding: str) -> None:
+        """Test model families map to their BPE encodings."""
+        with patch.object(tokenizer, "_load_encoding", side_effect=FakeCounter) as load:
+            get_token_counter(model)
+
+        load.assert_called_once_with(encoding)
+
+    def test_falls_back_to_heuristic(self) -> None:
+        """Test an encoding that cannot be loaded falls back to the estimate."""
+        with patch.object(tokenizer, "TiktokenCounter", side_effect=OSError("offline")):
+            counter = get_token_counter("gpt-4o")
+
+        assert isinstance(counter, HeuristicTokenCounter)
+        assert counter.count("Hello, world!") > 0
+
+    async def test_preload_loads_encodings(self) -> None:
+        """Test startup preloading fills the backends used by later lookups."""
+        with patch.object(tokenizer, "TiktokenCounter", side_effect=FakeCounter) as load:
+            await tokenizer.preload_encodings(timeout=1.0)
+            counter = get_token_counter("gpt-4o")
+
+        assert {call.args[0] for call in load.call_args_list} == {"cl100k_base", "o200k_base"}
+        assert counter.name == "o200k_base"
+
+    async def test_slow_preload_falls_back_to_heuristic(self) -> None:
+        """Test an encoding that does not load in time is estimated instead."""
+
+        def slow_load(name: str) -> FakeCounter:
+            time.sleep(0.2)
+            return FakeCounter(name)
+
+        with patch.object(tokenizer, "TiktokenCounter", side_effect=slow_load):
+            await tokenizer.preload_encodings(timeout=0.01)
+
+        assert isinstance(get_token_counter("claude-sonnet-4.5"), HeuristicTokenCounter)
+
+    def test_registered_backend_takes_precedence(self) -> None:
+        """Test custom backends are used for their model prefix."""
+        custom = FakeCounter("custom")
+        register_token_counter("my-model", lambda: custom)
+
+        assert Tokenizer("my-model-7b")._counter is custom
+
+
+class TestTokenCountCache:
+    """Tests for memoized token counts."""
+
+    def test_long_text_counted_once(self) -> None:
+        """Test repeated long texts are only tokenized once."""
+        counter = FakeCounter()
+        cache = TokenCountCache(max_entries=10)
+        text = "x" * 1000
+
+        assert cache.count(counter, text) == 1000
+        assert cache.count(counter, "".join(["x"] * 1000)) == 1000
+        assert len(counter.calls) == 1
+
+    def test_counts_keyed_by_backend(self) -> None:
+        """Test the same text is counted separately per backend."""
+        cache = TokenCountCache(max_entries=10)
+        first, second = FakeCounter("a"), FakeCounter("b")
+        text = "y" * 1000
+
+        cache.count(first, text)
+        cache.count(second, text)
+
+        assert len(first.calls) == len(second.calls) == 1
+
+    def test_evicts_oldest(self) -> None:
+        """Test the memo is bounded."""
+        counter = FakeCounter()
+        cache = TokenCountCache(max_entries=1)
+        cache.count(counter, "a" * 500)
+        cache.count(counter, "b" * 500)
+        cache.count(counter, "a" * 500)
+
+        assert len(counter.calls) == 3
+
+
+class TestMessageText:
+    """Tests for message_text."""
+
+    def test_includes_tool_calls_and_blocks(self) -> None:
+        """Test structured content and tool calls count toward the message."""
+        message = {
+            "role": "assistant",
+            "content": [{"type": "text", "text": "reading"}],
+            "tool_calls": [{"name": "read_file", "input": {"path": "/a"}}],
+        }
+
+        text = message_text(message)
+
+        assert "reading" in text
+        assert "read_file" in text
+
+
+class TestIncrementalConversationTotals:
+    """Tests for ContextWindowManager counting only new messages."""
+
+    @pytest.fixture
+    def manager(self) -> ContextWindowManager:
+        """Create a context manager with a recording tokenizer."""
+        manager = ContextWindowManager(
+            llm_provider=MagicMock(),
+            model="claude-sonnet-4.5",
+            max_context_tokens=100000,
+            output_reservation=4096,
+        )
+        manager._tokenizer._counter = FakeCounter()
+        return manager
+
+    async def test_only_new_messages_counted(self, manager: ContextWindowManager) -> None:
+        """Test appended messages are counted without recounting the history."""
+        history = [{"role": "user", "content": "first"}, {"role": "assistant", "content": "ok"}]
+        _, first_total = await manager.prepare_context("agent-1", history, "")
+        calls = manager._tokenizer._counter.calls
+
+        calls.clear()
+        history.append({"role": "user", "content": "second"})
+        _, second_total = await manager.prepare_context("agent-1", history, "")
+
+        assert calls == ["second"]
+        assert second_total == first_total + len("second") + tokenizer.MESSAGE_OVERHEAD
+
+    async def test_replaced_history_recounted(self, manager: ContextWindowManager) -> None:
+        """Test a compacted history is counted from scratch."""
+        history = [{"role": "user", "content": "first"}]
+        await manager.prepare_context("agent-1", history, "")
+        calls = manager._tokenizer._counter.calls
+
+        calls.clear()
+        compacted = [{"role": "user", "content": "summary"}, {"role": "user", "content": "next"}]
+        _, total = await manager.prepare_context("agent-1", compacted, "")
+
+        assert calls == ["summary", "next"]
+        assert total == len("summarynext") + 2 * tokenizer.MESSAGE_OVERHEAD
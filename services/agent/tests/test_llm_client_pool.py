@@ -0,0 +1,111 @@
+"""Tests for shared LLM connection pools and the user-key client cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.providers import client_pool
+from src.providers.client_pool import SDKClientCache, close_http_pools, get_http_pool
+from src.providers.llm import LLMProvider
+
+
+class TestSDKClientCache:
+    """Tests for SDKClientCache."""
+
+    def test_reuses_client_for_same_key(self) -> None:
+        """Test a second lookup with the same key does not build a client."""
+        cache = SDKClientCache(max_entries=4, idle_timeout=60.0)
+        factory = MagicMock(side_effect=lambda: object())
+
+        first = cache.get_or_create("anthropic", "sk-user", factory)
+        second = cache.get_or_create("anthropic", "sk-user", factory)
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_keys_by_provider_and_key(self) -> None:
+        """Test different keys or providers get their own clients."""
+        cache = SDKClientCache(max_entries=4, idle_timeout=60.0)
+
+        a = cache.get_or_create("openai", "key-a", object)
+        b = cache.get_or_create("openai", "key-b", object)
+        c = cache.get_or_create("openai-codex", "key-a", object)
+
+        assert len({id(a), id(b), id(c)}) == 3
+
+    def test_raw_key_not_stored(self) -> None:
+        """Test cache keys hold a digest rather than the credential."""
+        cache = SDKClientCache(max_entries=4, idle_timeout=60.0)
+        cache.get_or_create("anthropic", "sk-secret", object)
+
+        assert "sk-secret" not in repr(list(cache._clients))
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the oldest client is dropped once max_entries is exceeded."""
+        cache = SDKClientCache(max_entries=2, idle_timeout=60.0)
+        first = cache.get_or_create("openai", "key-1", object)
+        cache.get_or_create("openai", "key-2", object)
+        cache.get_or_create("openai", "key-1", object)  # key-1 is now most recent
+        cache.get_or_create("openai", "key-3", object)
+
+        assert len(cache) == 2
+        assert cache.get_or_create("openai", "key-1", object) is first
+
+    def test_drops_idle_clients(self) -> None:
+        """Test clients unused for idle_timeout are rebuilt."""
+        cache = SDKClientCache(max_entries=4, idle_timeout=10.0)
+        with patch.object(client_pool.time, "monotonic", return_value=100.0):
+            first = cache.get_or_create("openai", "key", object)
+        with patch.object(client_pool.time, "monotonic", return_value=111.0):
+            second = cache.get_or_create("openai", "key", object)
+
+        assert first is not second
+
+
+class TestHttpPools:
+    """Tests for per-provider connection pools."""
+
+    @pytest.fixture(autouse=True)
+    async def reset_pools(self):
+        """Close pools created by a test."""
+        yield
+        await close_http_pools()
+
+    async def test_one_pool_per_provider(self) -> None:
+        """Test pools are shared within a provider and separate across providers."""
+        assert get_http_pool("anthropic") is get_http_pool("anthropic")
+        assert get_http_pool("anthropic") is not get_http_pool("openai")
+
+    async def test_pool_uses_http2(self) -> None:
+        """Test pools are created for HTTP/2, which needs the h2 package installed."""
+        assert client_pool.HTTP2_AVAILABLE
+        with patch.object(
+            client_pool.httpx, "AsyncClient", wraps=client_pool.httpx.AsyncClient
+        ) as client:
+            get_http_pool("anthropic")
+
+        assert client.call_args.kwargs["http2"] is True
+
+    async def test_closed_pool_is_replaced(self) -> None:
+        """Test a pool is recreated after shutdown closed it."""
+        pool = get_http_pool("anthropic")
+        await close_http_pools()
+
+        assert pool.is_closed
+        assert get_http_pool("anthropic") is not pool
+
+    async def test_user_key_clients_reuse_pool(self) -> None:
+        """Test clients for different user keys share one connection pool."""
+        client_pool.get_client_cache().clear()
+        provider = LLMProvider()
+        with patch("src.providers.llm.AsyncAnthropic") as mock_client:
+            mock_client.side_effect = lambda **_kwargs: MagicMock()
+
+            first = provider._get_anthropic_client(api_key="sk-ant-user-1")
+            again = provider._get_anthropic_client(api_key="sk-ant-user-1")
+            provider._get_anthropic_client(api_key="sk-ant-user-2")
+
+        assert first is again
+        assert mock_client.call_count == 2
+        pools = {id(call.kwargs["http_client"]) for call in mock_client.call_args_list}
+        assert pools == {id(get_http_pool("anthropic"))}
@@ -13,11 +13,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.providers.client_pool import get_client_cache
 from src.providers.llm import (
+    ANTHROPIC_CACHE_CONTROL,
     CompletionRequest,
     LLMProvider,
     StreamEvent,
     UsageTrackingContext,
+    _apply_anthropic_prompt_caching,
 )
 
 
@@ -194,7 +197,8 @@ class TestLLMProviderClientCreation:
 
     @pytest.fixture
     def provider(self) -> LLMProvider:
-        """Create test provider."""
+        """Create test provider with an empty user-key client cache."""
+        get_client_cache().clear()
         return LLMProvider()
 
     def test_anthropic_client_created_on_demand(self, provider: LLMProvider):
@@ -231,10 +235,11 @@ class TestLLMProviderClientCreation:
             mock_client.return_value = MagicMock()
             _ = provider.ollama_client
 
-            mock_client.assert_called_once_with(
-                base_url="http://localhost:11434/v1",
-                api_key="ollama",
-            )
+            mock_client.assert_called_once()
+            kwargs = mock_client.call_args.kwargs
+            assert kwargs["base_url"] == "http://localhost:11434/v1"
+            assert kwargs["api_key"] == "ollama"
+            assert kwargs["max_retries"] == 0
 
     def test_openrouter_client_created_on_demand(self, provider: LLMProvider):
         """Test that OpenRouter client is created on demand."""
@@ -255,7 +260,7 @@ class TestLLMProviderClientCreation:
 
             client = provider._get_anthropic_client(api_key="custom-key")
 
-            mock_client.assert_called_with(api_key="custom-key")
+            assert mock_client.call_args.kwargs["api_key"] == "custom-key"
 
     def test_get_anthropic_client_without_custom_key(self, provider: LLMProvider):
         """Test getting Anthropic client without custom key uses default."""
@@ -280,7 +285,7 @@ class TestLLMProviderClientCreation:
 
             client = provider._get_openai_client(api_key="custom-key")
 
-            mock_client.assert_called_with(api_key="custom-key")
+            assert mock_client.call_args.kwargs["api_key"] == "custom-key"
 
 
 class TestLLMProviderTokenEstimation:
@@ -643,7 +648,7 @@ class TestCompleteAnthropicMethod:
         )
 
         call_kwargs = mock_client.messages.create.call_args.kwargs
-        assert call_kwargs["system"] == "You are a helpful assistant"
+        assert call_kwargs["system"][0]["text"] == "You are a helpful assistant"
         assert len(call_kwargs["messages"]) == 1  # System message removed
 
     async def test_complete_anthropic_with_tools(self, provider: LLMProvider, mock_anthropic_response: MagicMock):
@@ -660,7 +665,29 @@ class TestCompleteAnthropicMethod:
         )
 
         call_kwargs = mock_client.messages.create.call_args.kwargs
-        assert call_kwargs["tools"] == tools
+        assert [tool["name"] for tool in call_kwargs["tools"]] == ["read_file"]
+
+    async def test_complete_anthropic_reports_cache_usage(
+        self, provider: LLMProvider, mock_anthropic_response: MagicMock
+    ):
+        """Test Anthropic completion reports prompt cache reads and writes."""
+        mock_anthropic_response.usage = MagicMock(
+            input_tokens=100,
+            output_tokens=50,
+            cache_read_input_tokens=4000,
+            cache_creation_input_tokens=200,
+        )
+        mock_client = MagicMock()
+        mock_client.messages.create = AsyncMock(return_value=mock_anthropic_response)
+        provider._anthropic_client = mock_client
+
+        result = await provider._complete_anthropic(
+            model="claude-3-5-sonnet",
+            messages=[{"role": "user", "content": "Hello"}],
+        )
+
+        assert result["usage"]["cache_read_input_tokens"] == 4000
+        assert result["usage"]["cache_creation_input_tokens"] == 200
 
     async def test_complete_anthropic_with_tool_use_response(self, provider: LLMProvider):
         """Test Anthropic completion extracts tool calls."""
@@ -1158,7 +1185,7 @@ class TestStreamAnthropicMethod:
 
         # Check that system message was passed to API
         call_kwargs = mock_client.messages.stream.call_args.kwargs
-        assert call_kwargs["system"] == "You are helpful"
+        assert call_kwargs["system"][0]["text"] == "You are helpful"
         assert len(call_kwargs["messages"]) == 1  # System message extracted
 
     async def test_stream_anthropic_with_tool_call(self, provider: LLMProvider, mock_stream_context):
@@ -1746,3 +1773,55 @@ class TestStreamOllamaMethod:
         token_events = [e for e in results if e.type == "token"]
         assert len(token_events) == 1
         assert token_events[0].content == "Hi"
+
+
+class TestAnthropicPromptCaching:
+    """Test cache breakpoint placement for Anthropic requests."""
+
+    def test_marks_tools_system_and_last_messages(self):
+        """Test breakpoints on the last tool, the system prompt and the conversation tail."""
+        tools = [{"name": "read_file"}, {"name": "grep"}]
+        messages = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+            {"role": "user", "content": "second"},
+            {"role": "assistant", "content": "reply 2"},
+            {
+                "role": "user",
+                "content": [{"type": "tool_result", "tool_use_id": "t1", "content": "x"}],
+            },
+        ]
+        params = {"system": "You are helpful", "tools": tools, "messages": messages}
+
+        _apply_anthropic_prompt_caching(params)
+
+        assert "cache_control" not in params["tools"][0]
+        assert params["tools"][1]["cache_control"] == ANTHROPIC_CACHE_CONTROL
+        assert params["system"] == [
+            {"type": "text", "text": "You are helpful", "cache_control": ANTHROPIC_CACHE_CONTROL}
+        ]
+        marked = [
+            i for i, msg in enumerate(params["messages"])
+            if isinstance(msg["content"], list) and "cache_control" in msg["content"][-1]
+        ]
+        assert marked == [2, 4]
+        assert params["messages"][4]["content"][0]["tool_use_id"] == "t1"
+
+    def test_does_not_mutate_caller_data(self):
+        """Test the caller's tools and messages are left untouched."""
+        tools = [{"name": "read_file"}]
+        messages = [{"role": "user", "content": "Hello"}]
+        params = {"tools": tools, "messages": messages}
+
+        _apply_anthropic_prompt_caching(params)
+
+        assert tools == [{"name": "read_file"}]
+        assert messages == [{"role": "user", "content": "Hello"}]
+
+    def test_skips_empty_content(self):
+        """Test empty text is not turned into an (invalid) empty cached block."""
+        params = {"messages": [{"role": "user", "content": ""}]}
+
+        _apply_anthropic_prompt_caching(params)
+
+        assert params["messages"][0]["content"] == ""
@@ -0,0 +1,395 @@
+"""Tests for retries, circuit breaking, hedging and failover of LLM requests."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.providers import llm
+from src.providers.llm import CompletionRequest, LLMProvider, StreamEvent
+from src.providers.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMRequestExecutor,
+    ProviderAttempt,
+    RetryPolicy,
+    is_retryable_error,
+    retry_after_seconds,
+)
+
+
+class StatusError(Exception):
+    """SDK-style error carrying an HTTP status and response headers."""
+
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = MagicMock(status_code=status_code, headers=headers or {})
+
+
+def _executor(**kwargs: Any) -> LLMRequestExecutor:
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+    return LLMRequestExecutor(policy, **kwargs)
+
+
+def _calls(*outcomes: Any) -> AsyncMock:
+    """An async call that raises or returns each outcome in turn."""
+    return AsyncMock(side_effect=list(outcomes))
+
+
+class TestErrorClassification:
+    """Tests for retryable error detection."""
+
+    @pytest.mark.parametrize("status", [408, 429, 500, 503, 529])
+    def test_transient_status_is_retryable(self, status: int) -> None:
+        """Test rate limits and server errors are retried."""
+        assert is_retryable_error(StatusError(status))
+
+    @pytest.mark.parametrize("status", [400, 401, 403, 404])
+    def test_client_error_is_not_retryable(self, status: int) -> None:
+        """Test request errors are surfaced immediately."""
+        assert not is_retryable_error(StatusError(status))
+
+    def test_network_errors_are_retryable(self) -> None:
+        """Test timeouts and transport errors are retried."""
+        assert is_retryable_error(TimeoutError())
+        assert is_retryable_error(httpx.ConnectError("refused"))
+        assert not is_retryable_error(ValueError("bad input"))
+
+    def test_retry_after_headers(self) -> None:
+        """Test retry-after and retry-after-ms are read in seconds."""
+        assert retry_after_seconds(StatusError(429, {"retry-after": "2"})) == 2.0
+        assert retry_after_seconds(StatusError(429, {"retry-after-ms": "1500"})) == 1.5
+        assert retry_after_seconds(StatusError(429)) is None
+
+    def test_long_retry_after_skips_retry(self) -> None:
+        """Test a wait beyond max_delay moves on instead of sleeping."""
+        policy = RetryPolicy(max_delay=5.0)
+        assert policy.delay(0, retry_after=2.0) == 2.0
+        assert policy.delay(0, retry_after=60.0) is None
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold(self) -> None:
+        """Test consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow_request()
+
+    def test_half_open_trial_closes_on_success(self) -> None:
+        """Test one trial request is let through after the reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestLLMRequestExecutorRun:
+    """Tests for LLMRequestExecutor.run."""
+
+    async def test_retries_transient_errors(self) -> None:
+        """Test a transient failure is retried on the same provider."""
+        call = _calls(StatusError(529), {"content": "ok"})
+        provider, result = await _executor().run([ProviderAttempt("anthropic", call)])
+
+        assert (provider, result) == ("anthropic", {"content": "ok"})
+        assert call.await_count == 2
+
+    async def test_non_retryable_error_raised_immediately(self) -> None:
+        """Test request errors are not retried or failed over."""
+        primary = _calls(StatusError(400))
+        fallback = _calls({"content": "ok"})
+
+        with pytest.raises(StatusError):
+            await _executor().run(
+                [ProviderAttempt("anthropic", primary), ProviderAttempt("openrouter", fallback)]
+            )
+        assert primary.await_count == 1
+        fallback.assert_not_awaited()
+
+    async def test_fails_over_when_retries_exhausted(self) -> None:
+        """Test the next provider is used once the first keeps failing."""
+        primary = AsyncMock(side_effect=StatusError(503))
+        fallback = _calls({"content": "fallback"})
+
+        provider, result = await _executor().run(
+            [ProviderAttempt("anthropic", primary), ProviderAttempt("openrouter", fallback)]
+        )
+
+        assert provider == "openrouter"
+        assert result == {"content": "fallback"}
+        assert primary.await_count == 3
+
+    async def test_open_circuit_skips_provider(self) -> None:
+        """Test an open circuit sends requests straight to the fallback."""
+        executor = _executor(failure_threshold=1, reset_timeout=60.0)
+        executor.breaker("anthropic").record_failure()
+        primary = _calls({"content": "primary"})
+        fallback = _calls({"content": "fallback"})
+
+        provider, _ = await executor.run(
+            [ProviderAttempt("anthropic", primary), ProviderAttempt("openrouter", fallback)]
+        )
+
+        assert provider == "openrouter"
+        primary.assert_not_awaited()
+
+    async def test_all_circuits_open(self) -> None:
+        """Test CircuitOpenError when no provider may be tried."""
+        executor = _executor(failure_threshold=1, reset_timeout=60.0)
+        executor.breaker("anthropic").record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            await executor.run([ProviderAttempt("anthropic", _calls({}))])
+
+    async def test_hedge_returns_faster_request(self) -> None:
+        """Test a second request is raced against a slow first one."""
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(1.0 if calls == 1 else 0)
+            return f"call-{calls}"
+
+        executor = _executor(hedge_delay=0.01)
+        _, result = await executor.run([ProviderAttempt("anthropic", call)])
+
+        assert result == "call-2"
+
+    async def test_request_timeout_is_retried(self) -> None:
+        """Test an attempt exceeding request_timeout counts as transient."""
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(1.0)
+            return "ok"
+
+        _, result = await _executor(request_timeout=0.01).run([ProviderAttempt("openai", call)])
+
+        assert result == "ok"
+        assert calls == 2
+
+    async def test_cancelled_trial_frees_half_open_circuit(self) -> None:
+        """Test a cancelled half-open trial lets the next request through."""
+        executor = _executor(failure_threshold=1, reset_timeout=0.0)
+        executor.breaker("anthropic").record_failure()
+        started = asyncio.Event()
+
+        async def hanging() -> str:
+            started.set()
+            await asyncio.sleep(60)
+            return "never"
+
+        task = asyncio.create_task(executor.run([ProviderAttempt("anthropic", hanging)]))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert executor.breaker("anthropic").allow_request()
+
+
+class TestLLMRequestExecutorStream:
+    """Tests for LLMRequestExecutor.stream."""
+
+    async def test_retries_before_first_event(self) -> None:
+        """Test a stream failing before any output is retried."""
+        attempts = 0
+
+        async def stream() -> AsyncIterator[str]:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise StatusError(429)
+            yield "a"
+            yield "b"
+
+        events = [
+            event async for _, event in _executor().stream([ProviderAttempt("anthropic", stream)])
+        ]
+
+        assert events == ["a", "b"]
+        assert attempts == 2
+
+    async def test_does_not_retry_after_output(self) -> None:
+        """Test a failure mid-stream is surfaced instead of replaying output."""
+        attempts = 0
+
+        async def stream() -> AsyncIterator[str]:
+            nonlocal attempts
+            attempts += 1
+            yield "a"
+            raise StatusError(503)
+
+        events = []
+        with pytest.raises(StatusError):
+            async for _, event in _executor().stream([ProviderAttempt("anthropic", stream)]):
+                events.append(event)
+
+        assert events == ["a"]
+        assert attempts == 1
+
+    async def test_stream_fails_over(self) -> None:
+        """Test streams fail over to the next provider before output."""
+
+        async def failing() -> AsyncIterator[str]:
+            raise StatusError(503)
+            yield "never"
+
+        async def fallback() -> AsyncIterator[str]:
+            yield "from-fallback"
+
+        results = [
+            pair
+            async for pair in _executor().stream(
+                [ProviderAttempt("anthropic", failing), ProviderAttempt("openrouter", fallback)]
+            )
+        ]
+
+        assert results == [("openrouter", "from-fallback")]
+
+    async def test_cancelled_trial_frees_half_open_circuit(self) -> None:
+        """Test a stream cancelled before its first event frees the trial slot."""
+        executor = _executor(failure_threshold=1, reset_timeout=0.0)
+        executor.breaker("anthropic").record_failure()
+        started = asyncio.Event()
+
+        async def hanging() -> AsyncIterator[str]:
+            started.set()
+            await asyncio.sleep(60)
+            yield "never"
+
+        async def consume() -> list[str]:
+            return [
+                event async for _, event in executor.stream([ProviderAttempt("anthropic", hanging)])
+            ]
+
+        task = asyncio.create_task(consume())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert executor.breaker("anthropic").allow_request()
+
+
+class TestLLMProviderFailover:
+    """Tests for failover chains in LLMProvider."""
+
+    @pytest.fixture(autouse=True)
+    def executor(self, monkeypatch: pytest.MonkeyPatch) -> LLMRequestExecutor:
+        """Use a fresh, fast executor for each test."""
+        executor = _executor()
+        monkeypatch.setattr(llm, "_request_executor", executor)
+        return executor
+
+    @pytest.fixture
+    def failover_chains(self) -> Any:
+        """Configure anthropic to fail over to openrouter."""
+        with patch.object(
+            llm.settings, "LLM_FAILOVER_CHAINS", {"anthropic": ["openrouter"]}
+        ) as chains:
+            yield chains
+
+    @pytest.mark.usefixtures("failover_chains")
+    async def test_complete_fails_over_and_tracks_actual_provider(self) -> None:
+        """Test usage is attributed to the provider that answered."""
+        provider = LLMProvider()
+        request = CompletionRequest(
+            model="claude-sonnet-4",
+            messages=[{"role": "user", "content": "hello"}],
+            user_id="user-1",
+            model_provider="anthropic",
+        )
+        response = {"content": "hi", "tool_calls": [], "usage": {"input_tokens": 1}}
+
+        with (
+            patch.object(provider, "_complete_anthropic", AsyncMock(side_effect=StatusError(529))),
+            patch.object(
+                provider, "_complete_openrouter", AsyncMock(return_value=response)
+            ) as openrouter,
+            patch.object(provider, "_track_usage", new_callable=AsyncMock) as track,
+        ):
+            result = await provider.complete(request)
+
+        assert result == response
+        assert openrouter.await_args.kwargs["model"] == "anthropic/claude-sonnet-4"
+        context = track.await_args.args[0]
+        assert context.provider == "openrouter"
+        assert context.usage_source == "included"
+
+    @pytest.mark.usefixtures("failover_chains")
+    async def test_user_key_not_moved_to_platform_provider(self) -> None:
+        """Test BYO-key requests never fail over onto platform credentials."""
+        provider = LLMProvider()
+        request = CompletionRequest(
+            model="claude-sonnet-4",
+            messages=[{"role": "user", "content": "hello"}],
+            model_provider="anthropic",
+            llm_api_keys={"anthropic": "sk-ant-user"},
+        )
+
+        assert provider._failover_chain(request, "anthropic", "sk-ant-user") == [
+            ("anthropic", "claude-sonnet-4", "sk-ant-user")
+        ]
+
+    @pytest.mark.usefixtures("failover_chains")
+    async def test_stream_done_names_actual_provider(self) -> None:
+        """Test the done event of a failed-over stream names the provider that answered."""
+        provider = LLMProvider()
+        request = CompletionRequest(
+            model="claude-sonnet-4",
+            messages=[{"role": "user", "content": "hello"}],
+            model_provider="anthropic",
+        )
+
+        async def failing(**_kwargs: Any) -> AsyncIterator[StreamEvent]:
+            raise StatusError(529)
+            yield StreamEvent(type="token")
+
+        async def fallback(**_kwargs: Any) -> AsyncIterator[StreamEvent]:
+            yield StreamEvent(type="token", content="hi")
+            yield StreamEvent(type="done", usage={"input_tokens": 1, "output_tokens": 1})
+
+        with (
+            patch.object(provider, "_stream_anthropic", side_effect=failing),
+            patch.object(provider, "_stream_openrouter", side_effect=fallback),
+        ):
+            events = [event async for event in provider.complete_stream(request)]
+
+        assert [event.type for event in events] == ["token", "done"]
+        assert events[1].provider == "openrouter"
+        assert events[1].model == "anthropic/claude-sonnet-4"
+
+    async def test_stream_reports_error_when_chain_exhausted(self) -> None:
+        """Test the stream ends with an error event once retries run out."""
+        provider = LLMProvider()
+        request = CompletionRequest(
+            model="claude-sonnet-4",
+            messages=[{"role": "user", "content": "hello"}],
+            model_provider="anthropic",
+        )
+
+        async def failing(**_kwargs: Any) -> AsyncIterator[StreamEvent]:
+            raise StatusError(503)
+            yield StreamEvent(type="token")
+
+        with patch.object(provider, "_stream_anthropic", side_effect=failing) as stream:
+            events = [event async for event in provider.complete_stream(request)]
+
+        assert [event.type for event in events] == ["error"]
+        assert stream.call_count == 3
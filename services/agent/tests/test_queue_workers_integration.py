@@ -23,6 +23,7 @@ from src.queue.agent_worker import (
     ACTIVE_KEY,
     CONTROL_CHANNEL,
     PENDING_KEY,
+    READY_KEY,
     TASK_KEY,
     UPDATES_CHANNEL,
     AgentTaskWorker,
@@ -53,6 +54,11 @@ from src.queue.subagent_worker import (
 )
 
 
+async def _idle_bzpopmin(*_args: Any, **_kwargs: Any) -> None:
+    """Stand-in for a BZPOPMIN that times out with nothing ready."""
+    await asyncio.sleep(0.01)
+
+
 # =============================================================================
 # Agent Task Worker Tests
 # =============================================================================
@@ -67,6 +73,10 @@ class TestAgentTaskWorkerLifecycle:
         mock = MagicMock()
         mock.client = MagicMock()
         mock.client.scan = AsyncMock(return_value=(0, []))
+        mock.client.zpopmin = AsyncMock(return_value=[])
+        mock.client.bzpopmin = AsyncMock(side_effect=_idle_bzpopmin)
+        mock.client.zadd = AsyncMock(return_value=0)
+        mock.client.zcard = AsyncMock(return_value=0)
         mock.client.zrange = AsyncMock(return_value=[])
         mock.client.zrem = AsyncMock(return_value=0)
         mock.client.sadd = AsyncMock(return_value=1)
@@ -149,6 +159,10 @@ class TestAgentTaskWorkerControlCommands:
         mock = MagicMock()
         mock.client = MagicMock()
         mock.client.scan = AsyncMock(return_value=(0, []))
+        mock.client.zpopmin = AsyncMock(return_value=[])
+        mock.client.bzpopmin = AsyncMock(side_effect=_idle_bzpopmin)
+        mock.client.zadd = AsyncMock(return_value=0)
+        mock.client.zcard = AsyncMock(return_value=0)
         mock.client.pubsub = MagicMock(return_value=MagicMock(
             subscribe=AsyncMock(),
             unsubscribe=AsyncMock(),
@@ -293,6 +307,15 @@ class TestAgentTaskWorkerTaskProcessing:
             "message": "Test message",
             "message_id": "msg-789",
         })
+        mock.claim_task = AsyncMock(return_value={
+            "id": "task-abc",
+            "session_id": "session-123",
+            "agent_id": "agent-456",
+            "message": "Test message",
+            "message_id": "msg-789",
+            "status": "running",
+            "started_at": "2026-01-01T00:00:00+00:00",
+        })
         mock.set_json = AsyncMock(return_value=True)
         mock.publish = AsyncMock(return_value=1)
         return mock
@@ -308,27 +331,24 @@ class TestAgentTaskWorkerTaskProcessing:
         assert task_data["status"] == "running"
         assert "started_at" in task_data
 
-        # Verify Redis calls
-        mock_redis.client.zrem.assert_called_once()
-        mock_redis.client.sadd.assert_called_once()
+        # Claimed in a single call that also re-marks the session ready
+        args, kwargs = mock_redis.claim_task.call_args
+        assert args == (PENDING_KEY.format(session_id="session-123"), "podex:agents:task:")
+        assert kwargs["active_key"] == "podex:agents:session-123:active"
+        assert kwargs["ready_key"] == READY_KEY
+        assert kwargs["ready_member"] == "session-123"
+        assert kwargs["worker_id"] == worker._worker_id
+        mock_redis.publish.assert_called_once()
 
     async def test_dequeue_task_no_pending(self, mock_redis: MagicMock):
-        """Test dequeue when no pending tasks."""
-        mock_redis.client.zrange = AsyncMock(return_value=[])
-        worker = AgentTaskWorker(mock_redis)
-
-        task_data = await worker._dequeue_task("session-123")
-
-        assert task_data is None
-
-    async def test_dequeue_task_already_claimed(self, mock_redis: MagicMock):
-        """Test dequeue when task already claimed by another worker."""
-        mock_redis.client.zrem = AsyncMock(return_value=0)
+        """Test dequeue when no pending tasks (or already claimed elsewhere)."""
+        mock_redis.claim_task = AsyncMock(return_value=None)
         worker = AgentTaskWorker(mock_redis)
 
         task_data = await worker._dequeue_task("session-123")
 
         assert task_data is None
+        mock_redis.publish.assert_not_called()
 
     async def test_process_task_success(self, mock_redis: MagicMock):
         """Test successful task processing."""
@@ -418,6 +438,10 @@ class TestAgentTaskWorkerConcurrency:
             get_message=AsyncMock(return_value=None),
         ))
         mock.client.scan = AsyncMock(return_value=(0, []))
+        mock.client.zpopmin = AsyncMock(return_value=[])
+        mock.client.bzpopmin = AsyncMock(side_effect=_idle_bzpopmin)
+        mock.client.zadd = AsyncMock(return_value=0)
+        mock.client.zcard = AsyncMock(return_value=0)
         mock.get_json = AsyncMock(return_value=None)
         mock.set_json = AsyncMock(return_value=True)
         mock.publish = AsyncMock(return_value=1)
@@ -452,6 +476,70 @@ class TestAgentTaskWorkerConcurrency:
         # All tasks should be cleaned up
         assert len(worker._running_tasks) == 0
 
+    async def test_process_pending_tasks_pops_ready_sessions(self, mock_redis: MagicMock):
+        """Test that only free slots worth of sessions are popped from the ready set."""
+        mock_redis.client.zpopmin = AsyncMock(return_value=[("session-a", 1.0), ("session-b", 2.0)])
+        mock_redis.client.zcard = AsyncMock(return_value=0)
+        worker = AgentTaskWorker(mock_redis, pool_size=3)
+        worker._running_tasks["busy"] = asyncio.create_task(asyncio.sleep(10))
+        worker._dequeue_task = AsyncMock(side_effect=[  # type: ignore[method-assign]
+            {"id": "task-a", "session_id": "session-a"},
+            None,
+        ])
+        worker._process_task_with_semaphore = AsyncMock()  # type: ignore[method-assign]
+
+        spawned = await worker._process_pending_tasks()
+
+        assert spawned == 1
+        mock_redis.client.zpopmin.assert_called_once_with(READY_KEY, 2)
+        assert "task-a" in worker._running_tasks
+        worker._running_tasks["busy"].cancel()
+
+    async def test_dispatch_session_requeues_on_claim_error(self, mock_redis: MagicMock):
+        """Test that a session with remaining work goes back on the ready set if the claim fails."""
+        mock_redis.client.zcard = AsyncMock(return_value=2)
+        mock_redis.client.zadd = AsyncMock(return_value=1)
+        worker = AgentTaskWorker(mock_redis)
+        worker._dequeue_task = AsyncMock(  # type: ignore[method-assign]
+            side_effect=ConnectionError("redis went away")
+        )
+
+        assert await worker._dispatch_session("session-a") is False
+
+        mock_redis.client.zcard.assert_called_once_with(PENDING_KEY.format(session_id="session-a"))
+        args, kwargs = mock_redis.client.zadd.call_args
+        assert args[0] == READY_KEY
+        assert "session-a" in args[1]
+        assert kwargs == {"nx": True}
+
+    async def test_dispatch_session_not_requeued_when_drained(self, mock_redis: MagicMock):
+        """Test that a drained session is left off the ready set."""
+        mock_redis.client.zcard = AsyncMock(return_value=0)
+        mock_redis.client.zadd = AsyncMock()
+        worker = AgentTaskWorker(mock_redis)
+        worker._dequeue_task = AsyncMock(return_value=None)  # type: ignore[method-assign]
+
+        assert await worker._dispatch_session("session-a") is False
+        mock_redis.client.zadd.assert_not_called()
+
+    async def test_reconcile_adds_scanned_sessions(self, mock_redis: MagicMock):
+        """Test that reconciliation repairs the ready set from pending keys."""
+        mock_redis.client.scan = AsyncMock(return_value=(0, [
+            "podex:agents:session-a:pending",
+            "podex:agents:session-b:pending",
+        ]))
+        mock_redis.client.zadd = AsyncMock(return_value=2)
+        worker = AgentTaskWorker(mock_redis)
+
+        await worker._reconcile_if_due()
+        await worker._reconcile_if_due()  # Not due again yet
+
+        mock_redis.client.scan.assert_called_once()
+        args, kwargs = mock_redis.client.zadd.call_args
+        assert args[0] == READY_KEY
+        assert set(args[1]) == {"session-a", "session-b"}
+        assert kwargs == {"nx": True}
+
 
 class TestAgentTaskWorkerGlobalSingleton:
     """Test global singleton management."""
@@ -485,6 +573,10 @@ class TestSubagentTaskWorkerLifecycle:
         mock = MagicMock()
         mock.client = MagicMock()
         mock.client.scan = AsyncMock(return_value=(0, []))
+        mock.client.zpopmin = AsyncMock(return_value=[])
+        mock.client.bzpopmin = AsyncMock(side_effect=_idle_bzpopmin)
+        mock.client.zadd = AsyncMock(return_value=0)
+        mock.client.zcard = AsyncMock(return_value=0)
         mock.client.zrange = AsyncMock(return_value=[])
         mock.client.zrem = AsyncMock(return_value=0)
         mock.client.sadd = AsyncMock(return_value=1)
@@ -560,6 +652,10 @@ class TestSubagentTaskWorkerProcessing:
         mock = MagicMock()
         mock.client = MagicMock()
         mock.client.scan = AsyncMock(return_value=(0, []))
+        mock.client.zpopmin = AsyncMock(return_value=[])
+        mock.client.bzpopmin = AsyncMock(side_effect=_idle_bzpopmin)
+        mock.client.zadd = AsyncMock(return_value=0)
+        mock.client.zcard = AsyncMock(return_value=0)
         mock.client.zrange = AsyncMock(return_value=["subtask-123"])
         mock.client.zrem = AsyncMock(return_value=1)
         mock.client.sadd = AsyncMock(return_value=1)
@@ -573,6 +669,14 @@ class TestSubagentTaskWorkerProcessing:
             "subagent_type": "coder",
             "task_description": "Write a function",
         })
+        mock.claim_task = AsyncMock(return_value={
+            "id": "subtask-123",
+            "session_id": "session-456",
+            "parent_agent_id": "agent-789",
+            "subagent_type": "coder",
+            "task_description": "Write a function",
+            "status": "running",
+        })
         mock.set_json = AsyncMock(return_value=True)
         mock.publish = AsyncMock(return_value=1)
         return mock
@@ -597,6 +701,9 @@ class TestSubagentTaskWorkerProcessing:
         assert task_data is not None
         assert task_data["id"] == "subtask-123"
         assert task_data["status"] == "running"
+        kwargs = mock_redis.claim_task.call_args.kwargs
+        assert kwargs["active_key"] == "podex:subagents:session-456:active"
+        assert kwargs["ready_member"] == "session-456"
 
     async def test_process_subagent_task_success(self, mock_redis: MagicMock, mock_subagent_manager: MagicMock):
         """Test successful subagent task processing."""
@@ -696,6 +803,10 @@ class TestCompactionTaskWorkerLifecycle:
         mock.client = MagicMock()
         mock.client.zrange = AsyncMock(return_value=[])
         mock.client.zrem = AsyncMock(return_value=0)
+        mock.client.zpopmin = AsyncMock(return_value=[])
+        mock.client.bzpopmin = AsyncMock(side_effect=_idle_bzpopmin)
+        mock.client.zadd = AsyncMock(return_value=0)
+        mock.client.zcard = AsyncMock(return_value=0)
         mock.get_json = AsyncMock(return_value=None)
         mock.set_json = AsyncMock(return_value=True)
         mock.publish = AsyncMock(return_value=1)
@@ -733,14 +844,26 @@ class TestCompactionTaskWorkerProcessing:
         """Create mock Redis client."""
         mock = MagicMock()
         mock.client = MagicMock()
-        mock.client.zrange = AsyncMock(return_value=["compaction-123"])
-        mock.client.zrem = AsyncMock(return_value=1)
+        mock.client.zpopmin = AsyncMock(return_value=[("compaction-123", 1.0)])
+        mock.client.bzpopmin = AsyncMock(
+            return_value=(COMPACTION_PENDING_KEY, "compaction-123", 1.0)
+        )
+        mock.client.zadd = AsyncMock(return_value=1)
         mock.get_json = AsyncMock(return_value={
             "id": "compaction-123",
             "agent_id": "agent-456",
             "session_id": "session-789",
             "preserve_recent_messages": 10,
         })
+        claimed = {
+            "id": "compaction-123",
+            "agent_id": "agent-456",
+            "session_id": "session-789",
+            "preserve_recent_messages": 10,
+            "status": "running",
+        }
+        mock.claim_task = AsyncMock(return_value=claimed)
+        mock.claim_tasks = AsyncMock(return_value=[claimed])
         mock.set_json = AsyncMock(return_value=True)
         mock.publish = AsyncMock(return_value=1)
         return mock
@@ -754,6 +877,52 @@ class TestCompactionTaskWorkerProcessing:
         assert task_data is not None
         assert task_data["id"] == "compaction-123"
         assert task_data["status"] == "running"
+        args = mock_redis.claim_task.call_args.args
+        assert args == (COMPACTION_PENDING_KEY, "podex:compaction:task:")
+
+    async def test_dequeue_compaction_task_blocking(self, mock_redis: MagicMock):
+        """Test blocking dequeue waits with BZPOPMIN, then claims through the script."""
+        worker = CompactionTaskWorker(mock_redis)
+
+        task_data = await worker._dequeue_task(block_timeout=1.0)
+
+        assert task_data is not None
+        assert task_data["id"] == "compaction-123"
+        assert task_data["status"] == "running"
+        mock_redis.client.bzpopmin.assert_called_once_with(COMPACTION_PENDING_KEY, timeout=1.0)
+        # The popped ID is put back and claimed atomically, never stamped client-side
+        mock_redis.client.zadd.assert_awaited_once_with(
+            COMPACTION_PENDING_KEY, {"compaction-123": 1.0}
+        )
+        mock_redis.claim_task.assert_awaited_once()
+        mock_redis.set_json.assert_not_awaited()
+
+    async def test_dequeue_compaction_task_blocking_timeout(self, mock_redis: MagicMock):
+        """Test blocking dequeue returns None without claiming when nothing arrives."""
+        mock_redis.client.bzpopmin = AsyncMock(return_value=None)
+        worker = CompactionTaskWorker(mock_redis)
+
+        assert await worker._dequeue_task(block_timeout=1.0) is None
+        mock_redis.claim_task.assert_not_awaited()
+
+    async def test_dequeue_compaction_task_empty(self, mock_redis: MagicMock):
+        """Test dequeue when the pending queue is empty."""
+        mock_redis.claim_task = AsyncMock(return_value=None)
+        worker = CompactionTaskWorker(mock_redis)
+
+        assert await worker._dequeue_task() is None
+
+    async def test_process_pending_tasks_claims_batch(self, mock_redis: MagicMock):
+        """Test free pool slots are filled with a single batch claim."""
+        worker = CompactionTaskWorker(mock_redis, pool_size=3)
+        worker._process_task_with_semaphore = AsyncMock()  # type: ignore[method-assign]
+
+        spawned = await worker._process_pending_tasks()
+
+        assert spawned == 1
+        args = mock_redis.claim_tasks.call_args.args
+        assert args == (COMPACTION_PENDING_KEY, "podex:compaction:task:", 3)
+        assert "compaction-123" in worker._running_tasks
 
     async def test_process_compaction_task_no_agent(self, mock_redis: MagicMock):
         """Test compaction when agent not found."""
@@ -439,6 +439,51 @@ class TestStreamPublisherSkillEvents:
         mock_redis.publish.assert_called_once()
 
 
+class TestStreamPublisherTokenBatching:
+    """Test adaptive token coalescing in StreamPublisher."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_coalesced_and_flushed_before_other_events(self):
+        """Test fast tokens become one publish that precedes the next event."""
+        from src.streaming.publisher import StreamPublisher
+
+        mock_redis = AsyncMock()
+        publisher = StreamPublisher(redis_client=mock_redis, token_batch_window=60)
+
+        for token in ["Hello", ",", " world"]:
+            await publisher.publish_token("session-123", "agent-456", "msg-789", token)
+        await publisher.publish_tool_call_start(
+            "session-123", "agent-456", "msg-789", "tool-1", "read_file"
+        )
+
+        messages = [json.loads(call.args[1]) for call in mock_redis.publish.call_args_list]
+        assert [m["event_type"] for m in messages] == ["token", "token", "tool_call_start"]
+        assert messages[0]["content"] == "Hello"
+        assert messages[1]["content"] == ", world"
+        assert messages[1]["token_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_thinking_and_tokens_keep_interleaving(self):
+        """Test switching between thinking and text tokens flushes the other kind."""
+        from src.streaming.publisher import StreamPublisher
+
+        mock_redis = AsyncMock()
+        publisher = StreamPublisher(redis_client=mock_redis, token_batch_window=60)
+
+        await publisher.publish_thinking_token("s", "a", "m", "hmm")
+        await publisher.publish_thinking_token("s", "a", "m", " ok")
+        await publisher.publish_token("s", "a", "m", "Answer")
+        await publisher.publish_done("s", "a", "m", full_content="Answer")
+
+        messages = [json.loads(call.args[1]) for call in mock_redis.publish.call_args_list]
+        assert [(m["event_type"], m.get("content")) for m in messages] == [
+            ("thinking", "hmm"),
+            ("thinking", " ok"),
+            ("token", "Answer"),
+            ("done", "Answer"),
+        ]
+
+
 class TestGetStreamPublisher:
     """Test get_stream_publisher function."""
 
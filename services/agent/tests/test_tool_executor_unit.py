@@ -935,3 +935,107 @@ class TestRequestApproval:
         call_args = executor_with_callback.approval_callback.call_args[0][0]
         assert call_args["action_type"] == "command_execute"
         assert call_args["can_add_to_allowlist"] is True
+
+
+class TestExecuteMany:
+    """Test execute_many scheduling of a turn's tool calls."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create executor limited to two concurrent tool calls."""
+        return ToolExecutor(
+            workspace_path="/tmp/workspace",
+            session_id="session-123",
+            max_concurrent_tools=2,
+        )
+
+    @staticmethod
+    def _tracking_execute(events: list[str], delay: float = 0.01):
+        import asyncio
+
+        async def execute(tool_name: str, arguments: dict[str, Any]) -> str:
+            events.append(f"start:{arguments['id']}")
+            await asyncio.sleep(delay)
+            events.append(f"end:{arguments['id']}")
+            return f"{tool_name}:{arguments['id']}"
+
+        return execute
+
+    @pytest.mark.asyncio
+    async def test_reads_run_concurrently_in_order(self, executor, mock_tool_categories):
+        """Test read-only calls overlap and results keep call order."""
+        events: list[str] = []
+        executor.execute = self._tracking_execute(events)
+
+        results = await executor.execute_many(
+            [("read_file", {"id": 1}), ("grep", {"id": 2})]
+        )
+
+        assert results == ["read_file:1", "grep:2"]
+        assert events[:2] == ["start:1", "start:2"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, executor, mock_tool_categories):
+        """Test no more than max_concurrent_tools calls run at once."""
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        async def execute(tool_name: str, arguments: dict[str, Any]) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return tool_name
+
+        executor.execute = execute
+        await executor.execute_many([("read_file", {}) for _ in range(5)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_are_barriers(self, executor, mock_tool_categories):
+        """Test a write waits for earlier reads and later reads wait for it."""
+        events: list[str] = []
+        executor.execute = self._tracking_execute(events)
+
+        await executor.execute_many(
+            [
+                ("read_file", {"id": 1}),
+                ("write_file", {"id": 2}),
+                ("read_file", {"id": 3}),
+                ("run_command", {"id": 4}),
+            ]
+        )
+
+        assert events == [
+            "start:1", "end:1",
+            "start:2", "end:2",
+            "start:3", "end:3",
+            "start:4", "end:4",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_on_complete_called_as_each_finishes(self, executor, mock_tool_categories):
+        """Test on_complete reports calls in completion order with their index."""
+        import asyncio
+
+        async def execute(tool_name: str, arguments: dict[str, Any]) -> str:
+            await asyncio.sleep(arguments["delay"])
+            return tool_name
+
+        completed: list[int] = []
+
+        async def on_complete(index: int, result: str, duration_ms: int) -> None:
+            completed.append(index)
+
+        executor.execute = execute
+        results = await executor.execute_many(
+            [("read_file", {"delay": 0.03}), ("grep", {"delay": 0.0})],
+            on_complete=on_complete,
+        )
+
+        assert completed == [1, 0]
+        assert results == ["read_file", "grep"]
@@ -0,0 +1,70 @@
+"""Add hourly and daily usage rollup tables for admin analytics.
+
+The tables are filled by the usage rollup background task, starting from the
+day it first runs. Existing usage is rolled up with
+scripts/backfill_usage_rollups.py; until then analytics read it from
+usage_records.
+
+Revision ID: 15
+Revises: 14
+Create Date: 2026-10-16
+
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "15"
+down_revision: str | None = "14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table already exists in the database."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def _rollup_columns(bucket: sa.Column[Any]) -> list[sa.Column[Any]]:
+    """Columns shared by both rollup tables, keyed by the given bucket column."""
+    return [
+        bucket,
+        sa.Column("usage_type", sa.String(50), primary_key=True),
+        sa.Column("model", sa.String(100), primary_key=True),
+        sa.Column("provider", sa.String(50), primary_key=True),
+        sa.Column("tier", sa.String(50), primary_key=True),
+        sa.Column("is_overage", sa.Boolean(), primary_key=True),
+        sa.Column("quantity", sa.BigInteger(), nullable=False),
+        sa.Column("total_cost_cents", sa.BigInteger(), nullable=False),
+        sa.Column("record_count", sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Create usage_rollups_hourly and usage_rollups_daily."""
+    # Skip tables that already exist from create_all
+    if not table_exists("usage_rollups_hourly"):
+        op.create_table(
+            "usage_rollups_hourly",
+            *_rollup_columns(
+                sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True)
+            ),
+        )
+    if not table_exists("usage_rollups_daily"):
+        op.create_table(
+            "usage_rollups_daily",
+            *_rollup_columns(sa.Column("bucket_date", sa.Date(), primary_key=True)),
+        )
+
+
+def downgrade() -> None:
+    """Drop the usage rollup tables."""
+    op.drop_table("usage_rollups_daily")
+    op.drop_table("usage_rollups_hourly")
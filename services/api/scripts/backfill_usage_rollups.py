@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Backfill and check the usage rollups used by admin analytics.
+
+Rebuilds the hourly and daily rollups from usage_records one day at a time
+(each day in its own transaction), then compares the daily rollups against
+raw usage. Rebuilding is idempotent, so a range can be backfilled again at
+any time. Each day is rebuilt under the usage_rollup task lock, so it never
+interleaves with the API's rollup background task.
+
+Usage:
+    # From the services/api directory:
+    python -m scripts.backfill_usage_rollups --since 2025-01-01
+    python -m scripts.backfill_usage_rollups --since 2025-01-01 --check-only
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+
+# Add the src directory to the path so we can import from it
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# Held while a day is rebuilt; the background task holds it for up to 120s
+ROLLUP_LOCK = "usage_rollup"
+ROLLUP_LOCK_TTL_SECONDS = 300
+LOCK_POLL_SECONDS = 5
+
+
+async def _backfill(first_day: date, last_day: date) -> None:
+    from src.database.connection import async_session_factory  # noqa: PLC0415
+    from src.main import release_task_lock, try_acquire_task_lock  # noqa: PLC0415
+    from src.services.usage_rollups import rollup_usage  # noqa: PLC0415
+
+    day = first_day
+    while day <= last_day:
+        while not await try_acquire_task_lock(ROLLUP_LOCK, ttl_seconds=ROLLUP_LOCK_TTL_SECONDS):
+            print(f"{day}: waiting for the {ROLLUP_LOCK} lock")
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+        start = datetime.combine(day, time.min, tzinfo=UTC)
+        try:
+            async with async_session_factory() as db:
+                rows = await rollup_usage(db, start, start + timedelta(days=1))
+                await db.commit()
+        finally:
+            await release_task_lock(ROLLUP_LOCK)
+        print(f"{day}: {rows} hourly rollup rows")
+        day += timedelta(days=1)
+
+
+async def _check(first_day: date, last_day: date) -> int:
+    """Print days whose rollups differ from raw usage and return how many differ."""
+    from src.database.connection import async_session_factory  # noqa: PLC0415
+    from src.services.usage_rollups import check_usage_rollups  # noqa: PLC0415
+
+    async with async_session_factory() as db:
+        mismatches = await check_usage_rollups(db, first_day, last_day)
+    for mismatch in mismatches:
+        print(
+            f"MISMATCH {mismatch.bucket_date} {mismatch.usage_type}: "
+            f"raw (quantity, cost, records)={mismatch.raw} rollup={mismatch.rollup}"
+        )
+    print(f"Checked {first_day} to {last_day}: {len(mismatches)} mismatches")
+    return len(mismatches)
+
+
+async def main() -> int:
+    """Backfill the requested range, then check it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--since", type=date.fromisoformat, required=True, help="first UTC day")
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=datetime.now(UTC).date(),
+        help="last UTC day (default: today)",
+    )
+    parser.add_argument(
+        "--check-only", action="store_true", help="compare with raw usage without rebuilding"
+    )
+    args = parser.parse_args()
+
+    from src.database.connection import close_database  # noqa: PLC0415
+
+    try:
+        if not args.check_only:
+            await _backfill(args.since, args.until)
+        mismatches = await _check(args.since, args.until)
+    finally:
+        await close_database()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""Benchmark request latency through the API middleware stack.
+
+Sends requests straight to ASGI apps (no server or sockets) through three
+middleware stacks:
+
+- none: no middleware, the floor for the routes themselves
+- base_http: the API's custom middleware as they were before moving to pure
+  ASGI, BaseHTTPMiddleware subclasses whose dispatch methods are reproduced
+  below
+- asgi: the API's custom middleware as configured in src/main.py
+
+Two routes are measured: a no-op public route and an internal-token route
+streaming --chunks chunks. Latency is reported as median and p99 for the whole
+response, and for the streaming route also the median time to the first
+body chunk.
+
+Usage:
+    # From the services/api directory:
+    python -m scripts.benchmark_middleware_stack --requests 2000 --chunks 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+# Add the src directory to the path so we can import from it
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+NOOP_PATH = "/api/billing/plans"
+STREAM_PATH = "/api/agent-tools/stream"
+INTERNAL_TOKEN = "benchmark-internal-token"
+MAX_REQUEST_BODY_SIZE = 10 * 1024 * 1024
+
+
+def _base_http_middleware() -> list[Any]:
+    """Build the BaseHTTPMiddleware stack the API ran before moving to pure ASGI.
+
+    The dispatch methods are reproduced from the middleware modules (and, for
+    request size, src/main.py) as they were, minus the warning logs on
+    rejected requests, reusing the module helpers that are unchanged.
+
+    Returns:
+        Middleware classes in the order src/main.py added them
+    """
+    from fastapi.responses import JSONResponse  # noqa: PLC0415
+    from jose import JWTError, jwt  # noqa: PLC0415
+    from slowapi import _rate_limit_exceeded_handler  # noqa: PLC0415
+    from slowapi.errors import RateLimitExceeded  # noqa: PLC0415
+    from sqlalchemy import select  # noqa: PLC0415
+    from starlette.middleware.base import BaseHTTPMiddleware  # noqa: PLC0415
+    from starlette.requests import Request  # noqa: PLC0415
+    from starlette.responses import Response  # noqa: PLC0415
+
+    from src.auth_constants import COOKIE_ACCESS_TOKEN  # noqa: PLC0415
+    from src.config import settings  # noqa: PLC0415
+    from src.database.connection import async_session_factory  # noqa: PLC0415
+    from src.database.models import User  # noqa: PLC0415
+    from src.middleware import auth, csrf, rate_limit, security_headers  # noqa: PLC0415
+    from src.services.token_blacklist import is_token_revoked  # noqa: PLC0415
+
+    def matches_path(request_path: str, paths: list[tuple[str, bool]]) -> bool:
+        for path, is_prefix in paths:
+            if is_prefix:
+                if request_path == path or request_path.startswith((path + "/", path + "?")):
+                    return True
+            elif request_path == path:
+                return True
+        return False
+
+    class RateLimitMiddleware(BaseHTTPMiddleware):
+        async def dispatch(
+            self,
+            request: Request,
+            call_next: Callable[[Request], Awaitable[Response]],
+        ) -> Response:
+            path = request.url.path
+            if path == "/health":
+                return await call_next(request)
+
+            if request.headers.get("upgrade") == "websocket":
+                client_key = rate_limit.get_client_identifier(request)
+                if not await rate_limit.check_websocket_rate_limit(client_key):
+                    return Response(
+                        content="WebSocket rate limit exceeded. Too many connection attempts.",
+                        status_code=429,
+                        headers={
+                            "Retry-After": "60",
+                            "X-RateLimit-Limit": "60",
+                            "X-RateLimit-Remaining": "0",
+                        },
+                    )
+
+            try:
+                return await call_next(request)
+            except RateLimitExceeded as e:
+                return _rate_limit_exceeded_handler(request, e)  # type: ignore[no-any-return]
+
+    class AuthMiddleware(BaseHTTPMiddleware):
+        async def dispatch(
+            self,
+            request: Request,
+            call_next: Callable[[Request], Awaitable[Response]],
+        ) -> Response:
+            if request.method == "OPTIONS":
+                return await call_next(request)
+
+            if matches_path(request.url.path, auth.PUBLIC_PATHS):
+                return await call_next(request)
+
+            if matches_path(request.url.path, auth.INTERNAL_TOKEN_PATHS):
+                if not auth._verify_internal_service_token(request):
+                    return auth._create_error_response(
+                        request, '{"detail": "Invalid service token"}', 401
+                    )
+                return await call_next(request)
+
+            if matches_path(
+                request.url.path, auth.INTERNAL_OR_USER_PATHS
+            ) and auth._verify_internal_service_token(request):
+                return await call_next(request)
+
+            if "/internal/" in request.url.path and request.headers.get("X-Internal-Service-Token"):
+                return await call_next(request)
+
+            token = request.cookies.get(COOKIE_ACCESS_TOKEN)
+            if not token:
+                auth_header = request.headers.get("Authorization")
+                if auth_header and auth_header.startswith("Bearer "):
+                    parts = auth_header.split(" ")
+                    if len(parts) == 2:
+                        token = parts[1]
+            if not token:
+                return auth._create_error_response(
+                    request, '{"detail": "Authentication required"}', 401
+                )
+
+            try:
+                payload = jwt.decode(
+                    token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+                )
+                user_id = payload.get("sub")
+                if not user_id:
+                    return auth._create_error_response(
+                        request, '{"detail": "Invalid token - missing user ID"}', 401
+                    )
+                token_jti = payload.get("jti")
+                if not token_jti:
+                    return auth._create_error_response(
+                        request, '{"detail": "Invalid token format"}', 401
+                    )
+                if await is_token_revoked(token_jti):
+                    return auth._create_error_response(
+                        request, '{"detail": "Token has been revoked"}', 401
+                    )
+
+                async with async_session_factory() as db:
+                    result = await db.execute(select(User).where(User.id == user_id))
+                    user = result.scalar_one_or_none()
+                    if not user:
+                        return auth._create_error_response(
+                            request, '{"detail": "Invalid token - user not found"}', 401
+                        )
+                    if not user.is_active:
+                        return auth._create_error_response(
+                            request,
+                            '{"detail": "Account deactivated. Please contact support."}',
+                            403,
+                        )
+                    request.state.user_id = user_id
+                    request.state.user_email = user.email
+                    db_role = getattr(user, "role", "member") or "member"
+                    request.state.user_role = db_role if db_role in auth.VALID_ROLES else "member"
+            except JWTError:
+                return auth._create_error_response(
+                    request, '{"detail": "Invalid or expired token"}', 401
+                )
+
+            return await call_next(request)
+
+    class CSRFMiddleware(BaseHTTPMiddleware):
+        async def dispatch(
+            self,
+            request: Request,
+            call_next: Callable[[Request], Awaitable[Response]],
+        ) -> Response:
+            internal_token = request.headers.get("X-Internal-Service-Token")
+            if (
+                request.method not in csrf.STATE_CHANGING_METHODS
+                or request.url.path in csrf.CSRF_EXEMPT_PATHS
+                or (settings.ENVIRONMENT == "development" and not settings.CSRF_ENABLED_IN_DEV)
+                or (internal_token and internal_token == settings.INTERNAL_SERVICE_TOKEN)
+            ):
+                return await call_next(request)
+
+            request_origin = request.headers.get("Origin")
+            if not request_origin:
+                referer = request.headers.get("Referer")
+                if referer:
+                    parsed = urlparse(referer)
+                    if parsed.scheme and parsed.netloc:
+                        request_origin = f"{parsed.scheme}://{parsed.netloc}"
+
+            if not request_origin:
+                has_auth = request.headers.get("Authorization")
+                content_type = request.headers.get("Content-Type", "")
+                if has_auth and (
+                    request.headers.get("X-Requested-With") or "application/json" in content_type
+                ):
+                    return await call_next(request)
+                return JSONResponse(
+                    status_code=403,
+                    content={
+                        "detail": "Missing Origin header. API clients must include "
+                        "X-Requested-With header or use application/json content type."
+                    },
+                )
+
+            if not csrf._is_allowed_origin(request_origin):
+                return JSONResponse(status_code=403, content={"detail": "Invalid request origin"})
+
+            return await call_next(request)
+
+    class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+        async def dispatch(
+            self,
+            request: Request,
+            call_next: Callable[[Request], Awaitable[Response]],
+        ) -> Response:
+            content_length = request.headers.get("content-length")
+            if content_length and int(content_length) > MAX_REQUEST_BODY_SIZE:
+                return JSONResponse(
+                    status_code=413,
+                    content={"detail": "Request body too large. Maximum size is 10MB."},
+                )
+            return await call_next(request)
+
+    class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+        async def dispatch(
+            self,
+            request: Request,
+            call_next: Callable[[Request], Awaitable[Response]],
+        ) -> Response:
+            response = await call_next(request)
+
+            if settings.ENVIRONMENT == "production":
+                response.headers["Strict-Transport-Security"] = (
+                    "max-age=31536000; includeSubDomains; preload"
+                )
+            response.headers["X-Frame-Options"] = "DENY"
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            response.headers["X-XSS-Protection"] = "1; mode=block"
+            response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+            response.headers["Permissions-Policy"] = (
+                "accelerometer=(), browsing-topics=(), camera=(), geolocation=(), "
+                "gyroscope=(), magnetometer=(), microphone=(), payment=(), usb=()"
+            )
+            if settings.CSP_ENABLED:
+                response.headers["Content-Security-Policy"] = (
+                    security_headers._build_csp_directives()
+                )
+            if request.url.path.startswith("/api/"):
+                response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
+                response.headers["Pragma"] = "no-cache"
+
+            return response
+
+    return [
+        RateLimitMiddleware,
+        AuthMiddleware,
+        CSRFMiddleware,
+        RequestSizeLimitMiddleware,
+        SecurityHeadersMiddleware,
+    ]
+
+
+def _build_app(stack: str, chunks: int) -> Any:
+    """Build an app with the benchmark routes behind the given middleware stack."""
+    from starlette.applications import Starlette  # noqa: PLC0415
+    from starlette.requests import Request  # noqa: PLC0415
+    from starlette.responses import PlainTextResponse, StreamingResponse  # noqa: PLC0415
+    from starlette.routing import Route  # noqa: PLC0415
+
+    from src.middleware.auth import AuthMiddleware  # noqa: PLC0415
+    from src.middleware.csrf import CSRFMiddleware  # noqa: PLC0415
+    from src.middleware.rate_limit import RateLimitMiddleware  # noqa: PLC0415
+    from src.middleware.request_size import RequestSizeLimitMiddleware  # noqa: PLC0415
+    from src.middleware.security_headers import SecurityHeadersMiddleware  # noqa: PLC0415
+
+    async def noop(_request: Request) -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    async def stream(_request: Request) -> StreamingResponse:
+        async def body() -> AsyncIterator[bytes]:
+            for _ in range(chunks):
+                yield b"x" * 1024
+                await asyncio.sleep(0)
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    app = Starlette(routes=[Route(NOOP_PATH, noop), Route(STREAM_PATH, stream)])
+    if stack == "base_http":
+        for middleware in _base_http_middleware():
+            app.add_middleware(middleware)
+    elif stack == "asgi":
+        app.add_middleware(RateLimitMiddleware)
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(CSRFMiddleware)
+        app.add_middleware(RequestSizeLimitMiddleware, max_body_size=MAX_REQUEST_BODY_SIZE)
+        app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def _request(app: Any, path: str, headers: list[tuple[bytes, bytes]]) -> tuple[float, float]:
+    """Send one GET request to app.
+
+    Returns:
+        Tuple of (seconds to first body chunk, seconds to complete response)
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    first_chunk: float | None = None
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal first_chunk
+        if message["type"] == "http.response.body" and first_chunk is None:
+            first_chunk = time.perf_counter()
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    finished = time.perf_counter()
+    return (first_chunk or finished) - started, finished - started
+
+
+async def _measure(
+    app: Any, path: str, headers: list[tuple[bytes, bytes]], requests: int
+) -> tuple[list[float], list[float]]:
+    """Send requests sequentially after a warmup, returning first-chunk and total latencies."""
+    for _ in range(min(requests, 100)):
+        await _request(app, path, headers)
+    first_chunks, totals = [], []
+    for _ in range(requests):
+        first_chunk, total = await _request(app, path, headers)
+        first_chunks.append(first_chunk)
+        totals.append(total)
+    return first_chunks, totals
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.3f}"
+
+
+async def main() -> int:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route and stack")
+    parser.add_argument("--chunks", type=int, default=50, help="1KB chunks per streamed response")
+    args = parser.parse_args()
+
+    from src.config import settings  # noqa: PLC0415
+
+    settings.INTERNAL_SERVICE_TOKEN = INTERNAL_TOKEN
+    routes: tuple[tuple[str, str, list[tuple[bytes, bytes]]], ...] = (
+        ("noop", NOOP_PATH, []),
+        ("stream", STREAM_PATH, [(b"x-internal-service-token", INTERNAL_TOKEN.encode())]),
+    )
+
+    print(f"{args.requests} requests per route, {args.chunks} chunks per streamed response")
+    print(f"{'stack':<11}{'route':<8}{'p50 ms':>10}{'p99 ms':>10}{'first chunk p50 ms':>20}")
+    for stack in ("none", "base_http", "asgi"):
+        app = _build_app(stack, args.chunks)
+        for route, path, headers in routes:
+            first_chunks, totals = await _measure(app, path, headers, args.requests)
+            p99 = statistics.quantiles(totals, n=100)[98]
+            first_chunk = _ms(statistics.median(first_chunks)) if route == "stream" else "-"
+            print(
+                f"{stack:<11}{route:<8}{_ms(statistics.median(totals)):>10}"
+                f"{_ms(p99):>10}{first_chunk:>20}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Benchmark bulk usage ingestion against the per-event path.
+
+Records the same batch of token usage events through _record_single_event
+(one event at a time, as /api/billing/usage/record used to) and through
+_record_usage_batch, reporting wall time and SQL statements for each.
+Each run happens in a transaction that is rolled back, and the benchmark
+user is deleted afterwards.
+
+Usage:
+    # From the services/api directory, against a seeded database:
+    python -m scripts.benchmark_usage_ingestion --events 200 --repeat 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+# Add the src directory to the path so we can import from it
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+async def _create_user() -> str:
+    """Create a user with a large token quota and return its ID."""
+    from src.database.connection import async_session_factory  # noqa: PLC0415
+    from src.database.models import UsageQuota, User  # noqa: PLC0415
+
+    async with async_session_factory() as db:
+        user = User(email=f"usage-benchmark-{uuid4().hex}@example.com", name="Benchmark")
+        db.add(user)
+        await db.flush()
+        db.add(UsageQuota(user_id=user.id, quota_type="tokens", limit_value=2_000_000_000))
+        await db.commit()
+        return user.id
+
+
+async def _delete_user(user_id: str) -> None:
+    from src.database.connection import async_session_factory  # noqa: PLC0415
+    from src.database.models import User  # noqa: PLC0415
+
+    async with async_session_factory() as db:
+        await db.execute(User.__table__.delete().where(User.id == user_id))
+        await db.commit()
+
+
+def _events(user_id: str, count: int, model: str) -> list[Any]:
+    from src.routes.billing import UsageEventInput  # noqa: PLC0415
+
+    return [
+        UsageEventInput(
+            id=f"bench-{uuid4().hex}",
+            user_id=user_id,
+            usage_type="tokens",
+            unit="tokens",
+            quantity=1500,
+            input_tokens=1000,
+            output_tokens=500,
+            model=model,
+        )
+        for _ in range(count)
+    ]
+
+
+async def _per_event(db: Any, events: list[Any]) -> None:
+    from src.routes.billing import _record_single_event  # noqa: PLC0415
+
+    for event in events:
+        await _record_single_event(db, event)
+    await db.flush()
+
+
+async def _bulk(db: Any, events: list[Any]) -> None:
+    from src.routes.billing import _record_usage_batch  # noqa: PLC0415
+
+    await _record_usage_batch(db, events)
+
+
+async def _measure(
+    run: Callable[[Any, list[Any]], Awaitable[None]],
+    user_id: str,
+    args: argparse.Namespace,
+) -> tuple[float, int]:
+    """Run one ingestion path in a rolled-back transaction.
+
+    Returns:
+        Tuple of (seconds, SQL statements executed)
+    """
+    from sqlalchemy import event as sa_event  # noqa: PLC0415
+
+    from src.database.connection import async_session_factory, engine  # noqa: PLC0415
+
+    statements = 0
+
+    def count(*_args: Any) -> None:
+        nonlocal statements
+        statements += 1
+
+    events = _events(user_id, args.events, args.model)
+    sa_event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        async with async_session_factory() as db:
+            started = time.perf_counter()
+            await run(db, events)
+            elapsed = time.perf_counter() - started
+            await db.rollback()
+    finally:
+        sa_event.remove(engine.sync_engine, "before_cursor_execute", count)
+    return elapsed, statements
+
+
+async def main() -> int:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100, help="events per batch")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per path")
+    parser.add_argument("--model", default="claude-sonnet-4.5", help="model to price")
+    args = parser.parse_args()
+
+    from src.database.connection import async_session_factory, close_database  # noqa: PLC0415
+    from src.services.pricing import refresh_pricing_cache  # noqa: PLC0415
+
+    async with async_session_factory() as db:
+        await refresh_pricing_cache(db)
+
+    user_id = await _create_user()
+    try:
+        print(f"{args.events} events per batch, best of {args.repeat} runs")
+        print(f"{'path':<12}{'seconds':>10}{'events/s':>12}{'statements':>12}")
+        for name, run in (("per-event", _per_event), ("bulk", _bulk)):
+            runs = [await _measure(run, user_id, args) for _ in range(args.repeat)]
+            seconds = min(elapsed for elapsed, _ in runs)
+            statements = int(statistics.median(count for _, count in runs))
+            rate = args.events / seconds if seconds else float("inf")
+            print(f"{name:<12}{seconds:>10.3f}{rate:>12.0f}{statements:>12}")
+    finally:
+        await _delete_user(user_id)
+        await close_database()
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -4,7 +4,7 @@ import asyncio
 import contextlib
 import random
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable
 from datetime import UTC, datetime
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
@@ -14,6 +14,8 @@ import structlog
 from sqlalchemy import select, update
 
 from podex_shared.auth import ServiceAuthClient
+from podex_shared.redis_client import get_redis_client
+from podex_shared.workspace_placement import WorkspacePlacement, WorkspacePlacementCache
 from src.config import settings
 from src.database.connection import get_db_context
 from src.database.models import Session as SessionModel
@@ -91,6 +93,70 @@ async def close_http_client() -> None:
     await ComputeClientPool.close_all()
 
 
+async def _load_workspace_placement(workspace_id: str) -> WorkspacePlacement | None:
+    """Load a workspace's server, compute URL and local pod from the database."""
+    from src.database.models import WorkspaceServer  # noqa: PLC0415
+
+    async with get_db_context() as db:
+        result = await db.execute(
+            select(
+                Workspace.server_id,
+                Workspace.local_pod_id,
+                WorkspaceServer.compute_service_url,
+            )
+            .outerjoin(WorkspaceServer, WorkspaceServer.id == Workspace.server_id)
+            .where(Workspace.id == workspace_id)
+        )
+        row = result.one_or_none()
+
+    if row is None:
+        return None
+    return WorkspacePlacement(
+        workspace_id=workspace_id,
+        server_id=row.server_id,
+        compute_service_url=row.compute_service_url,
+        local_pod_id=row.local_pod_id,
+    )
+
+
+_placement_cache: WorkspacePlacementCache | None = None
+
+
+def get_workspace_placement_cache() -> WorkspacePlacementCache:
+    """Get the shared workspace placement cache for this process."""
+    global _placement_cache
+    if _placement_cache is None:
+        _placement_cache = WorkspacePlacementCache(
+            get_redis_client(settings.REDIS_URL),
+            _load_workspace_placement,
+            service="api",
+        )
+    return _placement_cache
+
+
+async def get_workspace_placement(workspace_id: str) -> WorkspacePlacement | None:
+    """Get where a workspace runs (cached), or None if it does not exist."""
+    return await get_workspace_placement_cache().get(workspace_id)
+
+
+async def invalidate_workspace_placement(workspace_id: str) -> None:
+    """Drop a workspace's cached placement in every API and agent process.
+
+    Call after committing a change to the workspace's server or local pod,
+    or after deleting it.
+    """
+    await get_workspace_placement_cache().invalidate(workspace_id)
+
+
+async def invalidate_workspace_placements(workspace_ids: Iterable[str]) -> None:
+    """Drop several workspaces' cached placements in every API and agent process.
+
+    Call after committing a change that affects all of them, such as a new
+    compute service URL for their server.
+    """
+    await get_workspace_placement_cache().invalidate_many(workspace_ids)
+
+
 async def get_compute_client_for_workspace(workspace_id: str) -> "ComputeClient":
     """Get a compute client for a workspace based on its server's compute_service_url.
 
@@ -98,6 +164,8 @@ async def get_compute_client_for_workspace(workspace_id: str) -> "ComputeClient"
     If you already have the workspace loaded with its server, use:
         ComputeClient(workspace.server.compute_service_url)
 
+    The workspace's placement is read through the shared placement cache.
+
     Args:
         workspace_id: The workspace ID.
 
@@ -107,26 +175,18 @@ async def get_compute_client_for_workspace(workspace_id: str) -> "ComputeClient"
     Raises:
         ValueError: If the workspace has no server assigned or no compute_service_url.
     """
-    from sqlalchemy.orm import selectinload  # noqa: PLC0415
-
-    async with get_db_context() as db:
-        result = await db.execute(
-            select(Workspace)
-            .options(selectinload(Workspace.server))
-            .where(Workspace.id == workspace_id)
-        )
-        workspace = result.scalar_one_or_none()
+    placement = await get_workspace_placement(workspace_id)
 
-        if not workspace:
-            raise ValueError(f"Workspace {workspace_id} not found")
+    if not placement:
+        raise ValueError(f"Workspace {workspace_id} not found")
 
-        if not workspace.server:
-            raise ValueError(f"Workspace {workspace_id} has no server assigned")
+    if not placement.server_id:
+        raise ValueError(f"Workspace {workspace_id} has no server assigned")
 
-        if not workspace.server.compute_service_url:
-            raise ValueError(f"Server {workspace.server.id} has no compute_service_url configured")
+    if not placement.compute_service_url:
+        raise ValueError(f"Server {placement.server_id} has no compute_service_url configured")
 
-        return ComputeClient(workspace.server.compute_service_url)
+    return ComputeClient(placement.compute_service_url)
 
 
 async def get_compute_client_for_placement(
@@ -85,6 +85,15 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
 
+    # Agent token streaming: tokens arriving faster than the window are emitted
+    # to Socket.IO as one event (0 = emit every token immediately)
+    STREAMING_TOKEN_BATCH_MS: int = 25
+    STREAMING_TOKEN_BATCH_MAX_CHARS: int = 512
+    # Also emit agent_token for clients that did not opt into agent_token_batch.
+    # Each batch is then published twice through the Socket.IO Redis adapter;
+    # disable once all clients join with token_batching
+    STREAMING_LEGACY_TOKEN_EVENTS: bool = True
+
     # Auth
     JWT_SECRET_KEY: str = _DEV_JWT_SECRET
     JWT_ALGORITHM: str = "HS256"
@@ -92,6 +101,10 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 90  # Same as browser for consistent UX
     BROWSER_ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days (7 * 24 * 60)
     BROWSER_REFRESH_TOKEN_EXPIRE_DAYS: int = 90  # Extended to 90 days for better UX
+    # In-process auth cache (see src/services/auth_cache.py): upper bounds on how
+    # long a missed invalidation message can leave a principal or revocation stale
+    AUTH_PRINCIPAL_CACHE_TTL: int = 30  # Seconds a cached user id/role/is_active is trusted
+    AUTH_REVOCATION_RESYNC_INTERVAL: int = 60  # Seconds between full revoked-token reloads
 
     # Auth Cookies (httpOnly cookies for XSS protection)
     COOKIE_SECURE: bool = True  # Set False for local dev without HTTPS
@@ -249,6 +262,10 @@ class Settings(BaseSettings):
     CONTAINER_HEALTH_CHECK_TIMEOUT: int = 10  # 10 second timeout
     CONTAINER_HEALTH_CHECK_ENABLED: bool = True
     CONTAINER_UNRESPONSIVE_THRESHOLD: int = 3  # Mark unhealthy after 3 failures
+    CONTAINER_HEALTH_CHECK_CONCURRENCY: int = 16  # Max checks in flight per sweep
+    # Each check starts at a random offset within this window, so a sweep
+    # spreads its probes instead of bursting (keep below the interval)
+    CONTAINER_HEALTH_CHECK_SPREAD_SECONDS: float = 60.0
 
     # ============== Standby Cleanup Settings ==============
     STANDBY_CLEANUP_ENABLED: bool = True
@@ -262,6 +279,7 @@ class Settings(BaseSettings):
     BG_TASK_DB_TIMEOUT: int = 60  # Max seconds for DB operation in background tasks
     BG_TASK_QUOTA_RESET_INTERVAL: int = 300  # Quota reset check interval (5 min)
     BG_TASK_BILLING_INTERVAL: int = 300  # Billing maintenance interval (5 min)
+    BG_TASK_USAGE_ROLLUP_INTERVAL: int = 300  # Usage rollup refresh interval (5 min)
     BG_TASK_WORKSPACE_DELETE_TIMEOUT: int = 120  # Workspace deletion timeout
 
     # ============== Session Quota Retry Settings ==============
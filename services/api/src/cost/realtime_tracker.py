@@ -2,7 +2,11 @@
 
 Multi-Worker Architecture:
 - All session cost data is stored in Redis for cross-worker visibility
-- Usage records are stored as Redis lists with TTL-based expiration
+- Usage records are stored as Redis lists with TTL-based expiration, for history only
+- Running totals per session (by model and agent) and per user (all time and
+  minute/hour/day buckets) are kept in Redis hashes. They are updated with
+  HINCRBYFLOAT/HINCRBY in the same MULTI as the usage record, so cost reads
+  are a single HGETALL instead of repricing every record
 - Cleanup is coordinated via distributed lock to prevent duplicate work
 """
 
@@ -11,7 +15,6 @@ import contextlib
 import json
 import os
 import uuid
-from collections import defaultdict
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
@@ -26,6 +29,7 @@ from src.config import settings
 from src.services.pricing import (
     UnknownModelError,
     get_all_pricing_from_cache,
+    get_pricing_cache_version,
     get_pricing_from_cache,
 )
 
@@ -35,14 +39,30 @@ logger = structlog.get_logger(__name__)
 MAX_USAGE_RECORDS_PER_SESSION = 1000  # Maximum usage records to keep per session
 SESSION_RETENTION_DAYS = 7  # Days to keep session data before cleanup
 CLEANUP_INTERVAL_SECONDS = 3600  # Run cleanup every hour
+DAILY_USAGE_RETENTION_DAYS = 90  # Days of per-user daily totals (max daily-usage window)
+PRICING_MEMO_SIZE = 1024  # Maximum resolved model names memoized between pricing refreshes
 
 # Redis keys for cost tracking
 COST_SESSION_USAGE_KEY = "podex:cost:session:{session_id}:usage"  # List of usage records
 COST_SESSION_ACTIVITY_KEY = "podex:cost:session:{session_id}:activity"  # Last activity timestamp
 COST_USER_SESSIONS_KEY = "podex:cost:user:{user_id}:sessions"  # Set of session IDs
+COST_SESSION_TOTALS_KEY = "podex:cost:session:{session_id}:totals"  # Running totals hash
+COST_USER_TOTALS_KEY = "podex:cost:user:{user_id}:totals"  # All-time running totals hash
+COST_USER_BUCKET_KEY = "podex:cost:user:{user_id}:{period}:{bucket}"  # Per-period totals hash
 COST_CLEANUP_LOCK_KEY = "podex:cost:cleanup_lock"
 COST_SESSION_TTL = SESSION_RETENTION_DAYS * 24 * 3600  # 7 days in seconds
 
+# User bucket periods: (bucket name format, how long the bucket is kept)
+USER_BUCKET_PERIODS: dict[str, tuple[str, timedelta]] = {
+    "minute": ("%Y-%m-%dT%H:%M", timedelta(days=1)),
+    "hour": ("%Y-%m-%dT%H", timedelta(days=SESSION_RETENTION_DAYS)),
+    "day": ("%Y-%m-%d", timedelta(days=DAILY_USAGE_RETENTION_DAYS)),
+}
+
+# Hash fields holding running totals. Group fields are "<group>|<name>|<metric>".
+COST_FIELDS = ("input_cost", "output_cost", "cached_input_cost")
+COUNT_FIELDS = ("input_tokens", "output_tokens", "cached_input_tokens", "call_count")
+
 # Worker ID for distributed lock
 WORKER_ID = f"worker-{os.getpid()}-{uuid.uuid4().hex[:8]}"
 
@@ -162,6 +182,88 @@ class CostBreakdown:
         }
 
 
+def _user_bucket_key(user_id: str, period: str, moment: datetime) -> str:
+    """Key of the user totals hash for the period containing moment."""
+    bucket_format, _ = USER_BUCKET_PERIODS[period]
+    return COST_USER_BUCKET_KEY.format(
+        user_id=user_id, period=period, bucket=moment.strftime(bucket_format)
+    )
+
+
+def _user_bucket_keys(user_id: str, since: datetime, now: datetime) -> list[str]:
+    """Keys of the fewest user buckets covering since..now.
+
+    Minute buckets cover the partial hour after since, hour buckets the rest
+    of that day and day buckets everything after. Where a finer bucket has
+    already expired the coarser one is used, so since is rounded down to
+    the start of its minute, hour or day depending on how long ago it was.
+    """
+    oldest = now - USER_BUCKET_PERIODS["day"][1]
+    moment = max(since, oldest).replace(second=0, microsecond=0)
+    keys = []
+    while moment <= now:
+        age = now - moment
+        if moment.minute and age < USER_BUCKET_PERIODS["minute"][1]:
+            period, step = "minute", timedelta(minutes=1)
+        elif (moment.hour or moment.minute) and age < USER_BUCKET_PERIODS["hour"][1]:
+            moment = moment.replace(minute=0)
+            period, step = "hour", timedelta(hours=1)
+        else:
+            moment = moment.replace(hour=0, minute=0)
+            period, step = "day", timedelta(days=1)
+        keys.append(_user_bucket_key(user_id, period, moment))
+        moment += step
+    return keys
+
+
+def _queue_increments(
+    pipe: Any,
+    key: str,
+    cost: CostBreakdown,
+    groups: list[str],
+) -> None:
+    """Queue increments of the totals, and each group's totals, in a hash."""
+    for prefix in ("", *(f"{group}|" for group in groups)):
+        for name in COST_FIELDS:
+            value = getattr(cost, name)
+            if value:
+                pipe.hincrbyfloat(key, prefix + name, format(value, "f"))
+        for name in COUNT_FIELDS:
+            value = getattr(cost, name)
+            if value:
+                pipe.hincrby(key, prefix + name, value)
+
+
+def _breakdown_from_hash(data: dict[str, str]) -> CostBreakdown:
+    """Build a cost breakdown from a running totals hash."""
+    breakdown = CostBreakdown()
+    for field_name, raw in data.items():
+        target, metric = breakdown, field_name
+        if "|" in field_name:
+            group, _, rest = field_name.partition("|")
+            name, _, metric = rest.rpartition("|")
+            groups = breakdown.by_model if group == "model" else breakdown.by_agent
+            target = groups.setdefault(name, CostBreakdown())
+        if metric in COST_FIELDS:
+            setattr(target, metric, Decimal(raw))
+        elif metric in COUNT_FIELDS:
+            setattr(target, metric, int(raw))
+
+    for item in (breakdown, *breakdown.by_model.values(), *breakdown.by_agent.values()):
+        item.total_cost = item.input_cost + item.output_cost + item.cached_input_cost
+        item.total_tokens = item.input_tokens + item.output_tokens + item.cached_input_tokens
+    return breakdown
+
+
+def _merge_breakdown(target: CostBreakdown, other: CostBreakdown) -> None:
+    """Add other into target, including its per-model and per-agent totals."""
+    target.add(other)
+    for model, cost in other.by_model.items():
+        target.by_model.setdefault(model, CostBreakdown()).add(cost)
+    for agent_id, cost in other.by_agent.items():
+        target.by_agent.setdefault(agent_id, CostBreakdown()).add(cost)
+
+
 class RealtimeCostTracker:
     """
     Track costs in real-time for sessions and agents.
@@ -170,7 +272,7 @@ class RealtimeCostTracker:
 
     Features:
     - Real-time cost calculation per LLM call
-    - Session and agent-level aggregation
+    - Session and agent-level aggregation from running totals
     - Model-specific pricing
     - WebSocket update notifications
     """
@@ -180,6 +282,9 @@ class RealtimeCostTracker:
         self._update_callback: Callable[[str, CostBreakdown], Awaitable[None]] | None = None
         # Background cleanup task
         self._cleanup_task: asyncio.Task[None] | None = None
+        # Resolved pricing by model name, valid for one pricing cache version
+        self._pricing_memo: dict[str, ModelPricingRT | None] = {}
+        self._pricing_version: object = None
 
     async def start_cleanup_task(self) -> None:
         """Start the background cleanup task for memory management.
@@ -307,27 +412,83 @@ class RealtimeCostTracker:
         finally:
             await self._release_cleanup_lock()
 
-    async def _add_usage_to_redis(self, session_id: str, usage: TokenUsage) -> None:
-        """Add a usage record to Redis list for session."""
+    async def _record_usage(
+        self,
+        session_id: str,
+        usage: TokenUsage,
+        cost: CostBreakdown,
+        user_id: str | None,
+    ) -> CostBreakdown | None:
+        """Store a usage record and add its cost to the running totals.
+
+        Everything is written in one MULTI so the totals always match the
+        recorded usage. Returns the updated session totals.
+        """
         try:
             redis = await _get_redis()
             usage_key = COST_SESSION_USAGE_KEY.format(session_id=session_id)
             activity_key = COST_SESSION_ACTIVITY_KEY.format(session_id=session_id)
+            totals_key = COST_SESSION_TOTALS_KEY.format(session_id=session_id)
+            model_group = f"model|{usage.model}"
+            timestamp = usage.timestamp
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=UTC)
+
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.rpush(usage_key, json.dumps(usage.to_dict()))
+                pipe.ltrim(usage_key, -MAX_USAGE_RECORDS_PER_SESSION, -1)
+                pipe.set(activity_key, datetime.now(UTC).isoformat(), ex=COST_SESSION_TTL)
+                pipe.expire(usage_key, COST_SESSION_TTL)
+
+                session_groups = [model_group]
+                if usage.agent_id:
+                    session_groups.append(f"agent|{usage.agent_id}")
+                _queue_increments(pipe, totals_key, cost, session_groups)
+                pipe.expire(totals_key, COST_SESSION_TTL)
+
+                if user_id:
+                    user_sessions_key = COST_USER_SESSIONS_KEY.format(user_id=user_id)
+                    pipe.sadd(user_sessions_key, session_id)
+                    pipe.expire(user_sessions_key, COST_SESSION_TTL * 2)
+
+                    user_totals_key = COST_USER_TOTALS_KEY.format(user_id=user_id)
+                    _queue_increments(pipe, user_totals_key, cost, [model_group])
+                    pipe.expire(user_totals_key, COST_SESSION_TTL * 2)
+                    for period, (_, retention) in USER_BUCKET_PERIODS.items():
+                        bucket_key = _user_bucket_key(user_id, period, timestamp)
+                        _queue_increments(pipe, bucket_key, cost, [model_group])
+                        pipe.expire(bucket_key, int(retention.total_seconds()))
+
+                pipe.hgetall(totals_key)
+                results = await pipe.execute()
+            return _breakdown_from_hash(results[-1])
+        except Exception as e:
+            logger.warning("Failed to record usage in Redis", session_id=session_id, error=str(e))
+            return None
 
-            # Add usage record to list
-            await redis.rpush(usage_key, json.dumps(usage.to_dict()))
-
-            # Trim to max records
-            await redis.ltrim(usage_key, -MAX_USAGE_RECORDS_PER_SESSION, -1)
-
-            # Update activity timestamp
-            await redis.set(activity_key, datetime.now(UTC).isoformat())
-
-            # Set/refresh TTL on both keys
-            await redis.expire(usage_key, COST_SESSION_TTL)
-            await redis.expire(activity_key, COST_SESSION_TTL)
+    async def _get_hashes(self, keys: list[str]) -> list[dict[str, str]]:
+        """Read several running totals hashes in one round trip."""
+        if not keys:
+            return []
+        redis = await _get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            return list(await pipe.execute())
+
+    async def _get_totals(self, keys: list[str]) -> CostBreakdown:
+        """Sum the running totals stored in one or more hashes."""
+        breakdown = CostBreakdown()
+        try:
+            results = await self._get_hashes(keys)
         except Exception as e:
-            logger.warning("Failed to add usage to Redis", session_id=session_id, error=str(e))
+            logger.warning("Failed to get cost totals from Redis", error=str(e))
+            return breakdown
+
+        for data in results:
+            if data:
+                _merge_breakdown(breakdown, _breakdown_from_hash(data))
+        return breakdown
 
     async def _get_usage_from_redis(self, session_id: str) -> list[TokenUsage]:
         """Get all usage records for a session from Redis."""
@@ -340,27 +501,6 @@ class RealtimeCostTracker:
             logger.warning("Failed to get usage from Redis", session_id=session_id, error=str(e))
             return []
 
-    async def _add_user_session(self, user_id: str, session_id: str) -> None:
-        """Track user -> session mapping in Redis."""
-        try:
-            redis = await _get_redis()
-            user_key = COST_USER_SESSIONS_KEY.format(user_id=user_id)
-            await redis.sadd(user_key, session_id)
-            # Set long TTL for user session sets
-            await redis.expire(user_key, COST_SESSION_TTL * 2)
-        except Exception as e:
-            logger.warning("Failed to add user session", user_id=user_id, error=str(e))
-
-    async def _get_user_sessions(self, user_id: str) -> list[str]:
-        """Get all session IDs for a user from Redis."""
-        try:
-            redis = await _get_redis()
-            user_key = COST_USER_SESSIONS_KEY.format(user_id=user_id)
-            return list(await redis.smembers(user_key))
-        except Exception as e:
-            logger.warning("Failed to get user sessions", user_id=user_id, error=str(e))
-            return []
-
     def set_update_callback(
         self, callback: Callable[[str, CostBreakdown], Awaitable[None]]
     ) -> None:
@@ -371,8 +511,26 @@ class RealtimeCostTracker:
         """Get pricing for a model from the database.
 
         Uses pricing from the database via the pricing service cache.
+        Resolved models are memoized until the pricing cache is refreshed.
         Raises ValueError if no pricing is configured for the model.
         """
+        version = get_pricing_cache_version()
+        if version is not self._pricing_version or len(self._pricing_memo) >= PRICING_MEMO_SIZE:
+            self._pricing_memo = {}
+            self._pricing_version = version
+
+        if model in self._pricing_memo:
+            pricing = self._pricing_memo[model]
+        else:
+            pricing = self._resolve_pricing(model)
+            self._pricing_memo[model] = pricing
+
+        if pricing is None:
+            raise UnknownModelError(model)
+        return pricing
+
+    def _resolve_pricing(self, model: str) -> ModelPricingRT | None:
+        """Look up pricing for a model by exact, normalized or partial name."""
         # Try exact match from pricing service cache
         cached_pricing = get_pricing_from_cache(model)
         if cached_pricing:
@@ -393,7 +551,7 @@ class RealtimeCostTracker:
                     cached_input_per_million=pricing.cached_input_price_per_million,
                 )
 
-        raise UnknownModelError(model)
+        return None
 
     def calculate_cost(self, usage: TokenUsage) -> CostBreakdown:
         """Calculate cost for a single usage record."""
@@ -435,25 +593,18 @@ class RealtimeCostTracker:
         """
         Track token usage for a session.
 
-        Multi-Worker: Stores usage in Redis for cross-worker visibility.
+        Multi-Worker: Stores usage and running totals in Redis for
+        cross-worker visibility.
 
         Returns the cost breakdown for this usage.
         """
-        # Store usage in Redis
-        await self._add_usage_to_redis(session_id, usage)
-
-        # Track user -> session mapping
-        if user_id:
-            await self._add_user_session(user_id, session_id)
-
-        # Calculate cost for this usage
+        # Price before storing so unpriced usage never reaches the totals
         cost = self.calculate_cost(usage)
 
-        # Get updated session cost
-        session_cost = await self._calculate_session_cost(session_id)
+        session_cost = await self._record_usage(session_id, usage, cost, user_id)
 
         # Notify via callback
-        if self._update_callback:
+        if self._update_callback and session_cost is not None:
             try:
                 await self._update_callback(session_id, session_cost)
             except Exception:
@@ -461,35 +612,13 @@ class RealtimeCostTracker:
 
         return cost
 
-    async def _calculate_session_cost(self, session_id: str) -> CostBreakdown:
-        """Calculate total cost for a session from Redis data."""
-        breakdown = CostBreakdown()
-
-        usages = await self._get_usage_from_redis(session_id)
-        for usage in usages:
-            cost = self.calculate_cost(usage)
-            breakdown.add(cost)
-
-            # Track by model
-            if usage.model not in breakdown.by_model:
-                breakdown.by_model[usage.model] = CostBreakdown()
-            breakdown.by_model[usage.model].add(cost)
-
-            # Track by agent
-            if usage.agent_id:
-                if usage.agent_id not in breakdown.by_agent:
-                    breakdown.by_agent[usage.agent_id] = CostBreakdown()
-                breakdown.by_agent[usage.agent_id].add(cost)
-
-        return breakdown
-
     async def get_session_cost(self, session_id: str) -> CostBreakdown:
         """Get current cost for a session."""
-        return await self._calculate_session_cost(session_id)
+        return await self._get_totals([COST_SESSION_TOTALS_KEY.format(session_id=session_id)])
 
     async def get_agent_cost(self, session_id: str, agent_id: str) -> CostBreakdown:
         """Get cost for a specific agent in a session."""
-        session_cost = await self._calculate_session_cost(session_id)
+        session_cost = await self.get_session_cost(session_id)
         return session_cost.by_agent.get(agent_id, CostBreakdown())
 
     async def get_user_cost(
@@ -497,23 +626,18 @@ class RealtimeCostTracker:
         user_id: str,
         since: datetime | None = None,
     ) -> CostBreakdown:
-        """Get total cost for a user across all sessions."""
-        breakdown = CostBreakdown()
+        """Get total cost for a user across all sessions.
 
-        session_ids = await self._get_user_sessions(user_id)
-        for session_id in session_ids:
-            usages = await self._get_usage_from_redis(session_id)
-            for usage in usages:
-                if since and usage.timestamp < since:
-                    continue
-                cost = self.calculate_cost(usage)
-                breakdown.add(cost)
-
-                if usage.model not in breakdown.by_model:
-                    breakdown.by_model[usage.model] = CostBreakdown()
-                breakdown.by_model[usage.model].add(cost)
+        With since, usage is summed from minute, hour and day buckets, so
+        since is rounded down to the start of its bucket.
+        """
+        if since is None:
+            return await self._get_totals([COST_USER_TOTALS_KEY.format(user_id=user_id)])
 
-        return breakdown
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        keys = _user_bucket_keys(user_id, since.astimezone(UTC), datetime.now(UTC))
+        return await self._get_totals(keys)
 
     async def get_usage_history(
         self,
@@ -543,34 +667,36 @@ class RealtimeCostTracker:
         days: int = 30,
     ) -> list[dict[str, Any]]:
         """Get daily usage aggregates for a user."""
-        cutoff = datetime.now(UTC) - timedelta(days=days)
-        daily: dict[str, CostBreakdown] = defaultdict(CostBreakdown)
-
-        session_ids = await self._get_user_sessions(user_id)
-        for session_id in session_ids:
-            usages = await self._get_usage_from_redis(session_id)
-            for usage in usages:
-                if usage.timestamp < cutoff:
-                    continue
-                day = usage.timestamp.strftime("%Y-%m-%d")
-                cost = self.calculate_cost(usage)
-                daily[day].add(cost)
+        today = datetime.now(UTC)
+        dates = [today - timedelta(days=offset) for offset in range(days, -1, -1)]
+        keys = [_user_bucket_key(user_id, "day", date) for date in dates]
+
+        try:
+            results = await self._get_hashes(keys)
+        except Exception as e:
+            logger.warning("Failed to get daily usage from Redis", user_id=user_id, error=str(e))
+            return []
 
         return [
             {
-                "date": date,
-                **breakdown.to_dict(),
+                "date": date.strftime("%Y-%m-%d"),
+                **_breakdown_from_hash(data).to_dict(),
             }
-            for date, breakdown in sorted(daily.items())
+            for date, data in zip(dates, results, strict=True)
+            if data
         ]
 
     async def reset_session(self, session_id: str) -> None:
-        """Reset tracking for a session."""
+        """Reset tracking for a session.
+
+        User totals keep the spend already recorded for the session.
+        """
         try:
             redis = await _get_redis()
             usage_key = COST_SESSION_USAGE_KEY.format(session_id=session_id)
             activity_key = COST_SESSION_ACTIVITY_KEY.format(session_id=session_id)
-            await redis.delete(usage_key, activity_key)
+            totals_key = COST_SESSION_TOTALS_KEY.format(session_id=session_id)
+            await redis.delete(usage_key, activity_key, totals_key)
         except Exception as e:
             logger.warning("Failed to reset session in Redis", session_id=session_id, error=str(e))
 
@@ -44,6 +44,8 @@ from .billing import (
     SubscriptionPlan,
     UsageQuota,
     UsageRecord,
+    UsageRollupDaily,
+    UsageRollupHourly,
     UserBudget,
     UserSubscription,
 )
@@ -255,6 +257,8 @@ __all__ = [
     "TaskProgress",
     "UsageQuota",
     "UsageRecord",
+    "UsageRollupDaily",
+    "UsageRollupHourly",
     "User",
     "UserAddedSkill",
     "UserBudget",
@@ -1,10 +1,12 @@
 """Billing models: SubscriptionPlan, UserSubscription, UsageRecord, Invoice, etc."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    Date,
     DateTime,
     ForeignKey,
     Integer,
@@ -293,6 +295,46 @@ class UsageRecord(Base):
     )
 
 
+class UsageRollupHourly(Base):
+    """Hourly usage totals per usage type, model, provider and tier.
+
+    Rebuilt from usage_records by the usage rollup background task so admin
+    analytics only scan raw usage that has not been rolled up yet. Missing
+    model/provider/tier values are stored as "" so they can be part of the
+    primary key.
+    """
+
+    __tablename__ = "usage_rollups_hourly"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    usage_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    provider: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    tier: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    is_overage: Mapped[bool] = mapped_column(Boolean, primary_key=True, default=False)
+
+    quantity: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_cost_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class UsageRollupDaily(Base):
+    """Daily usage totals, summed from the hourly rollups."""
+
+    __tablename__ = "usage_rollups_daily"
+
+    bucket_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    usage_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    provider: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    tier: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    is_overage: Mapped[bool] = mapped_column(Boolean, primary_key=True, default=False)
+
+    quantity: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_cost_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class UsageQuota(Base):
     """Usage quota model for tracking limits and current usage."""
 
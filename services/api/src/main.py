@@ -5,6 +5,7 @@
 import asyncio
 import contextlib
 import os
+import random
 import shutil
 import subprocess
 import time
@@ -21,7 +22,6 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse, Response
 from slowapi import _rate_limit_exceeded_handler as _slowapi_handler
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from podex_shared import SentryConfig, configure_logging, init_sentry
 from podex_shared.sentry import track_background_task
@@ -37,8 +37,10 @@ from src.exceptions import (
 from src.middleware.admin import require_admin
 from src.middleware.auth import AuthMiddleware
 from src.middleware.csrf import CSRFMiddleware
+from src.middleware.decompression import RequestDecompressionMiddleware
 from src.middleware.logging_filter import configure_logging_filter
 from src.middleware.rate_limit import RateLimitMiddleware, close_redis_client, limiter
+from src.middleware.request_size import RequestSizeLimitMiddleware
 from src.middleware.security_headers import SecurityHeadersMiddleware
 from src.routes import (
     admin,
@@ -112,6 +114,8 @@ from src.routes.billing import (
 from src.services.local_pod_usage_tracker import local_pod_usage_tracker
 from src.services.pricing import refresh_pricing_cache
 from src.services.settings_service import ensure_settings_cached
+from src.services.task_queue import get_task_completion_listener
+from src.services.usage_rollups import refresh_usage_rollups
 from src.terminal.manager import terminal_manager
 from src.websocket.hub import cleanup_session_sync, init_session_sync, sio
 
@@ -163,6 +167,7 @@ class _BackgroundTasks:
     standby_check: asyncio.Task[None] | None = None
     workspace_provision: asyncio.Task[None] | None = None
     billing_maintenance: asyncio.Task[None] | None = None
+    usage_rollup: asyncio.Task[None] | None = None
     # New cleanup and health check tasks
     agent_watchdog: asyncio.Task[None] | None = None
     container_health_check: asyncio.Task[None] | None = None
@@ -741,6 +746,58 @@ async def billing_maintenance_background_task() -> None:
             await asyncio.sleep(60)  # Wait 1 minute before retrying
 
 
+async def usage_rollup_background_task() -> None:
+    """Background task to keep the admin analytics usage rollups current.
+
+    Runs every 5 minutes and rolls up usage recorded since the latest hourly
+    rollup (see src/services/usage_rollups.py).
+
+    RELIABILITY: Uses asyncio.wait_for() timeout to prevent connection pool
+    exhaustion from hung database operations.
+
+    SCALING: Uses distributed locking so only one instance runs each cycle.
+    """
+    while True:
+        try:
+            await asyncio.sleep(settings.BG_TASK_USAGE_ROLLUP_INTERVAL)
+
+            # Distributed lock: only one instance runs per cycle
+            if not await try_acquire_task_lock("usage_rollup", ttl_seconds=120):
+                continue  # Another instance is handling this cycle
+
+            task_start = time.perf_counter()
+            async for db in get_db():
+                try:
+                    rows = await asyncio.wait_for(
+                        refresh_usage_rollups(db),
+                        timeout=settings.BG_TASK_DB_TIMEOUT,
+                    )
+                    await asyncio.wait_for(db.commit(), timeout=settings.BG_TASK_DB_TIMEOUT)
+                    logger.debug("Refreshed usage rollups", hourly_rows=rows)
+                    duration_ms = (time.perf_counter() - task_start) * 1000
+                    _report_background_success("usage_rollup", duration_ms)
+                except TimeoutError:
+                    await db.rollback()
+                    logger.exception("Usage rollup timed out - possible DB connection issue")
+                    duration_ms = (time.perf_counter() - task_start) * 1000
+                    _report_background_error(
+                        "usage_rollup", "Database operation timed out", duration_ms=duration_ms
+                    )
+                except Exception as e:
+                    await db.rollback()
+                    logger.exception("Failed to refresh usage rollups", error=str(e))
+                    duration_ms = (time.perf_counter() - task_start) * 1000
+                    _report_background_error("usage_rollup", str(e), exc=e, duration_ms=duration_ms)
+
+        except asyncio.CancelledError:
+            logger.info("Usage rollup task cancelled")
+            break
+        except Exception as e:
+            logger.exception("Error in usage rollup task", error=str(e))
+            _report_background_error("usage_rollup", str(e), exc=e)
+            await asyncio.sleep(60)  # Wait a bit before retrying
+
+
 async def credit_enforcement_background_task() -> None:
     """Background task to enforce credit limits by stopping cloud workspaces.
 
@@ -1059,6 +1116,7 @@ async def workspace_provision_background_task() -> None:
     from src.compute_client import (
         get_compute_client_for_placement,
         get_compute_client_for_workspace,
+        invalidate_workspace_placement,
     )
     from src.database.models import Session as SessionModel
     from src.database.models import Workspace
@@ -1099,6 +1157,7 @@ async def workspace_provision_background_task() -> None:
                 async for db in get_db():
                     try:
                         provisioned_count = 0
+                        placed_workspace_ids: list[str] = []
 
                         # Find active *cloud* sessions with workspaces that should be running.
                         # IMPORTANT: Skip local-pod workspaces entirely - those are managed by the
@@ -1183,6 +1242,7 @@ async def workspace_provision_background_task() -> None:
                                         selected_server,
                                     ) = await get_compute_client_for_placement()
                                     workspace.server_id = selected_server.id
+                                    placed_workspace_ids.append(workspace.id)
 
                                 await compute.create_workspace(
                                     session_id=str(session.id),
@@ -1205,6 +1265,8 @@ async def workspace_provision_background_task() -> None:
 
                         if provisioned_count > 0:
                             await db.commit()
+                            for workspace_id in placed_workspace_ids:
+                                await invalidate_workspace_placement(workspace_id)
                             logger.info(
                                 "Auto-provisioned workspaces for active sessions",
                                 count=provisioned_count,
@@ -1412,6 +1474,73 @@ async def container_health_check_background_task() -> None:
         except Exception:
             pass
 
+    async def check(
+        workspace: Workspace, session: SessionModel, semaphore: asyncio.Semaphore
+    ) -> None:
+        """Check a workspace after a random delay, once a concurrency slot is free.
+
+        The delay spreads a sweep's probes over its first
+        CONTAINER_HEALTH_CHECK_SPREAD_SECONDS instead of bursting.
+        """
+        await asyncio.sleep(random.uniform(0, settings.CONTAINER_HEALTH_CHECK_SPREAD_SECONDS))
+        async with semaphore:
+            await check_workspace(workspace, session)
+
+    async def check_workspace(workspace: Workspace, session: SessionModel) -> None:
+        """Probe a workspace container and count or clear its failures."""
+        try:
+            # Perform health check
+            compute = await get_compute_client_for_workspace(workspace.id)
+            # Bound the whole call, not just the command in the container
+            health = await asyncio.wait_for(
+                compute.health_check_workspace(
+                    workspace.id,
+                    session.owner_id,
+                    timeout_seconds=settings.CONTAINER_HEALTH_CHECK_TIMEOUT,
+                ),
+                settings.CONTAINER_HEALTH_CHECK_TIMEOUT + 5,
+            )
+
+            if health.get("healthy", False):
+                # Clear failure count on success
+                await clear_failure_count(workspace.id)
+            else:
+                # Increment failure count (Redis-backed for consistency)
+                current_failures = await increment_failure_count(workspace.id)
+
+                if current_failures >= settings.CONTAINER_UNRESPONSIVE_THRESHOLD:
+                    logger.warning(
+                        "Workspace container unresponsive",
+                        workspace_id=workspace.id,
+                        failures=current_failures,
+                        error=health.get("error"),
+                    )
+
+                    # Move to error state
+                    workspace.status = "error"
+
+                    await emit_to_session(
+                        str(session.id),
+                        "workspace_status",
+                        {
+                            "workspace_id": workspace.id,
+                            "status": "error",
+                            "error": "Container became unresponsive",
+                        },
+                    )
+
+                    # Clear from tracking
+                    await clear_failure_count(workspace.id)
+
+        except Exception as check_error:
+            # Health check itself failed - count as failure
+            await increment_failure_count(workspace.id)
+            logger.warning(
+                "Health check failed for workspace",
+                workspace_id=workspace.id,
+                error=str(check_error),
+            )
+
     while True:
         try:
             await asyncio.sleep(settings.CONTAINER_HEALTH_CHECK_INTERVAL)
@@ -1441,59 +1570,17 @@ async def container_health_check_background_task() -> None:
 
                         result = await db.execute(query)
                         workspaces = result.all()
-
-                        for workspace, session in workspaces:
-                            try:
-                                # Perform health check
-                                compute = await get_compute_client_for_workspace(workspace.id)
-                                health = await compute.health_check_workspace(
-                                    workspace.id,
-                                    session.owner_id,
-                                    timeout_seconds=settings.CONTAINER_HEALTH_CHECK_TIMEOUT,
-                                )
-
-                                if health.get("healthy", False):
-                                    # Clear failure count on success
-                                    await clear_failure_count(workspace.id)
-                                else:
-                                    # Increment failure count (Redis-backed for consistency)
-                                    current_failures = await increment_failure_count(workspace.id)
-
-                                    if (
-                                        current_failures
-                                        >= settings.CONTAINER_UNRESPONSIVE_THRESHOLD
-                                    ):
-                                        logger.warning(
-                                            "Workspace container unresponsive",
-                                            workspace_id=workspace.id,
-                                            failures=current_failures,
-                                            error=health.get("error"),
-                                        )
-
-                                        # Move to error state
-                                        workspace.status = "error"
-
-                                        await emit_to_session(
-                                            str(session.id),
-                                            "workspace_status",
-                                            {
-                                                "workspace_id": workspace.id,
-                                                "status": "error",
-                                                "error": "Container became unresponsive",
-                                            },
-                                        )
-
-                                        # Clear from tracking
-                                        await clear_failure_count(workspace.id)
-
-                            except Exception as check_error:
-                                # Health check itself failed - count as failure
-                                await increment_failure_count(workspace.id)
-                                logger.warning(
-                                    "Health check failed for workspace",
-                                    workspace_id=workspace.id,
-                                    error=str(check_error),
-                                )
+                        semaphore = asyncio.Semaphore(settings.CONTAINER_HEALTH_CHECK_CONCURRENCY)
+
+                        # Checks run concurrently, so one slow container only delays
+                        # its own result. They only change attributes of the loaded
+                        # rows, which are committed once every check has finished.
+                        await asyncio.gather(
+                            *(
+                                check(workspace, session, semaphore)
+                                for workspace, session in workspaces
+                            )
+                        )
 
                         await db.commit()
 
@@ -1526,7 +1613,10 @@ async def standby_cleanup_background_task() -> None:
 
     from sqlalchemy import select
 
-    from src.compute_client import get_compute_client_for_workspace
+    from src.compute_client import (
+        get_compute_client_for_workspace,
+        invalidate_workspace_placement,
+    )
     from src.database.models import Session as SessionModel
     from src.database.models import UserConfig, Workspace
 
@@ -1541,6 +1631,7 @@ async def standby_cleanup_background_task() -> None:
                 try:
                     now = datetime.now(UTC)
                     deleted_count = 0
+                    deleted_workspace_ids: list[str] = []
 
                     # Find standby workspaces with their sessions and user configs
                     query = (
@@ -1592,6 +1683,7 @@ async def standby_cleanup_background_task() -> None:
 
                                 # Delete workspace from database
                                 await db.delete(workspace)
+                                deleted_workspace_ids.append(workspace.id)
 
                                 deleted_count += 1
 
@@ -1617,6 +1709,8 @@ async def standby_cleanup_background_task() -> None:
 
                     if deleted_count > 0:
                         await db.commit()
+                        for workspace_id in deleted_workspace_ids:
+                            await invalidate_workspace_placement(workspace_id)
                         logger.info("Standby cleanup completed", deleted_count=deleted_count)
 
                 except Exception as e:
@@ -1656,25 +1750,6 @@ logger = configure_logging("podex-api")
 MAX_REQUEST_BODY_SIZE = 10 * 1024 * 1024
 
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to limit request body size."""
-
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Check request body size before processing."""
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > MAX_REQUEST_BODY_SIZE:
-            return JSONResponse(
-                status_code=413,
-                content={"detail": "Request body too large. Maximum size is 10MB."},
-            )
-        response: Response = await call_next(request)
-        return response
-
-
 def run_migrations() -> None:
     """Run alembic migrations on startup using subprocess to avoid event loop conflicts."""
     # Get the directory where alembic.ini is located
@@ -1998,6 +2073,9 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     )
     logger.info("Billing maintenance background task started")
 
+    _tasks.usage_rollup = create_monitored_task(usage_rollup_background_task(), "usage_rollup")
+    logger.info("Usage rollup background task started")
+
     _tasks.agent_watchdog = create_monitored_task(
         agent_watchdog_background_task(), "agent_watchdog"
     )
@@ -2030,6 +2108,22 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     await local_pod_usage_tracker.start()
     logger.info("Local pod usage tracker started")
 
+    # Start workspace placement cache invalidation listener
+    from src.compute_client import get_workspace_placement_cache
+
+    await get_workspace_placement_cache().start()
+    logger.info("Workspace placement cache started")
+
+    # Start auth cache invalidation listener (principals and revoked tokens).
+    # Revocations from before the revoked token index existed are indexed first.
+    from src.services.auth_cache import get_auth_cache
+    from src.services.token_blacklist import index_existing_revocations
+
+    await _run_with_startup_lock("revoked_token_index", index_existing_revocations)
+
+    await get_auth_cache().start()
+    logger.info("Auth cache started")
+
     # Start local pod RPC listener (handles cross-worker pod RPC routing)
     from src.websocket.local_pod_hub import start_rpc_listener
 
@@ -2045,10 +2139,19 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     await terminal_manager.stop_cleanup_task()
     logger.info("Terminal session cleanup task stopped")
 
+    # Write out terminal history that is still being coalesced
+    from src.websocket.terminal_history import terminal_history
+
+    await terminal_history.close()
+
     # Stop cost tracker cleanup task
     await get_cost_tracker().stop_cleanup_task()
     logger.info("Cost tracker cleanup task stopped")
 
+    # Stop task completion listener (wakes any remaining waiters)
+    await get_task_completion_listener().stop()
+    logger.info("Task completion listener stopped")
+
     # Cancel quota reset task
     if _tasks.quota_reset:
         _tasks.quota_reset.cancel()
@@ -2077,6 +2180,13 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
             await _tasks.billing_maintenance
         logger.info("Billing maintenance background task stopped")
 
+    # Cancel usage rollup task
+    if _tasks.usage_rollup:
+        _tasks.usage_rollup.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _tasks.usage_rollup
+        logger.info("Usage rollup background task stopped")
+
     # Cancel agent watchdog task
     if _tasks.agent_watchdog:
         _tasks.agent_watchdog.cancel()
@@ -2115,6 +2225,12 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     await stop_rpc_listener()
     logger.info("Local pod RPC listener stopped")
 
+    # Stop workspace placement cache invalidation listener
+    await get_workspace_placement_cache().stop()
+
+    # Stop auth cache invalidation listener
+    await get_auth_cache().stop()
+
     await cleanup_session_sync()
     await close_database()
     await close_redis_client()  # Close rate limit Redis connection
@@ -2256,10 +2372,14 @@ app.add_middleware(
 )
 
 # Custom middleware (order matters - first added is last executed)
+# All are pure ASGI middleware: no per-request task or body stream, so streaming
+# responses pass through unbuffered
+# Inflate gzip request bodies (usage batches from internal services) for the routes
+app.add_middleware(RequestDecompressionMiddleware, max_body_size=MAX_REQUEST_BODY_SIZE)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(AuthMiddleware)
 app.add_middleware(CSRFMiddleware)  # Origin validation for state-changing requests
-app.add_middleware(RequestSizeLimitMiddleware)
+app.add_middleware(RequestSizeLimitMiddleware, max_body_size=MAX_REQUEST_BODY_SIZE)
 app.add_middleware(SecurityHeadersMiddleware)  # Runs first, adds security headers to all responses
 
 # Configure Prometheus metrics endpoint
@@ -1,21 +1,23 @@
 """Authentication middleware for JWT validation."""
 
 import secrets
-from collections.abc import Awaitable, Callable
 
 import structlog
 from fastapi import HTTPException, Request, Response
 from jose import JWTError, jwt
 from sqlalchemy import select
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.auth_constants import COOKIE_ACCESS_TOKEN
 from src.config import settings
 from src.database.connection import async_session_factory
 from src.database.models import User
+from src.services.auth_cache import AuthPrincipal, get_auth_cache
 
 logger = structlog.get_logger()
 
+VALID_ROLES = frozenset({"member", "admin", "super_admin"})
+
 
 def _create_error_response(
     request: Request, content: str, status_code: int, media_type: str = "application/json"
@@ -89,43 +91,42 @@ INTERNAL_OR_USER_PATHS: list[tuple[str, bool]] = [
 ]
 
 
-def _is_public_path(request_path: str) -> bool:
-    """Check if the request path is public.
+def _compile_paths(paths: list[tuple[str, bool]]) -> tuple[frozenset[str], tuple[str, ...]]:
+    """Split a path list into exact paths and prefixes for a single lookup.
 
-    Uses exact matching or prefix matching with proper boundary checks
-    to prevent path traversal bypasses.
+    Prefix paths also match exactly, and their subpaths only with a proper
+    boundary (trailing / or query), to prevent path traversal bypasses.
     """
-    for path, is_prefix in PUBLIC_PATHS:
-        if is_prefix:
-            # For prefix paths, ensure proper boundary (exact match, trailing /, or query)
-            if request_path == path or request_path.startswith((path + "/", path + "?")):
-                return True
-        # Exact match only
-        elif request_path == path:
-            return True
-    return False
+    exact = frozenset(path for path, _ in paths)
+    prefixes = tuple(
+        path + boundary for path, is_prefix in paths if is_prefix for boundary in ("/", "?")
+    )
+    return exact, prefixes
+
+
+_PUBLIC_PATHS = _compile_paths(PUBLIC_PATHS)
+_INTERNAL_TOKEN_PATHS = _compile_paths(INTERNAL_TOKEN_PATHS)
+_INTERNAL_OR_USER_PATHS = _compile_paths(INTERNAL_OR_USER_PATHS)
+
+
+def _matches(request_path: str, compiled: tuple[frozenset[str], tuple[str, ...]]) -> bool:
+    exact, prefixes = compiled
+    return request_path in exact or request_path.startswith(prefixes)
+
+
+def _is_public_path(request_path: str) -> bool:
+    """Check if the request path is public."""
+    return _matches(request_path, _PUBLIC_PATHS)
 
 
 def _is_internal_token_path(request_path: str) -> bool:
     """Check if the request path requires internal service token."""
-    for path, is_prefix in INTERNAL_TOKEN_PATHS:
-        if is_prefix:
-            if request_path == path or request_path.startswith((path + "/", path + "?")):
-                return True
-        elif request_path == path:
-            return True
-    return False
+    return _matches(request_path, _INTERNAL_TOKEN_PATHS)
 
 
 def _is_internal_or_user_path(request_path: str) -> bool:
     """Check if the request path allows internal token or user auth."""
-    for path, is_prefix in INTERNAL_OR_USER_PATHS:
-        if is_prefix:
-            if request_path == path or request_path.startswith((path + "/", path + "?")):
-                return True
-        elif request_path == path:
-            return True
-    return False
+    return _matches(request_path, _INTERNAL_OR_USER_PATHS)
 
 
 def _verify_internal_service_token(request: Request) -> bool:
@@ -151,32 +152,69 @@ def _verify_internal_service_token(request: Request) -> bool:
     return False
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """JWT authentication middleware."""
+async def _load_principal(user_id: str) -> AuthPrincipal | None:
+    """Load the user fields the middleware needs from the database."""
+    async with async_session_factory() as db:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+
+    if not user:
+        return None
+
+    # SECURITY: Always use the role from database, not from JWT
+    # This ensures role changes take effect immediately
+    db_role = getattr(user, "role", "member") or "member"
+    return AuthPrincipal(
+        user_id=user_id,
+        email=user.email,
+        role=db_role if db_role in VALID_ROLES else "member",
+        is_active=user.is_active,
+    )
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Process request and validate JWT token."""
-        # Skip auth for CORS preflight requests
-        if request.method == "OPTIONS":
-            return await call_next(request)
 
-        # Skip auth for public paths
-        if _is_public_path(request.url.path):
-            return await call_next(request)
+class AuthMiddleware:
+    """JWT authentication middleware.
 
+    Preflight requests and public paths are passed through straight from the
+    ASGI scope, and internal-token paths only check the service token, so
+    neither pays for JWT decoding or the user lookup.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Skip auth for CORS preflight requests and public paths
+        if scope["method"] == "OPTIONS" or _is_public_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        error_response = await self._authenticate(Request(scope))
+        if error_response is not None:
+            await error_response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _authenticate(self, request: Request) -> Response | None:
+        """Validate the request's credentials.
+
+        Returns an error response if the request must be rejected, None if it
+        may proceed (with the user set on request.state for JWT requests).
+        """
         # Require internal service token for internal-only endpoints
         if _is_internal_token_path(request.url.path):
             if not _verify_internal_service_token(request):
                 return _create_error_response(request, '{"detail": "Invalid service token"}', 401)
-            return await call_next(request)
+            return None
 
         # Allow internal token OR user JWT for shared endpoints
         if _is_internal_or_user_path(request.url.path) and _verify_internal_service_token(request):
-            return await call_next(request)
+            return None
         # Fall through to JWT validation if no valid service token
 
         # Check for internal service token (for service-to-service auth)
@@ -186,7 +224,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
             if internal_token:
                 # Let the endpoint handler validate the token
                 # This allows internal endpoints to have their own auth logic
-                return await call_next(request)
+                return None
             # If no internal token, fall through to JWT check
             # (in case user is trying to access via browser)
 
@@ -228,52 +266,43 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 return _create_error_response(request, '{"detail": "Invalid token format"}', 401)
 
             # Check if token has been revoked (e.g., after password change or logout)
-            from src.services.token_blacklist import is_token_revoked
-
-            if await is_token_revoked(token_jti):
+            # and load the user, both answered in-process when the auth cache is synced
+            auth_cache = get_auth_cache()
+            if await auth_cache.is_token_revoked(token_jti):
                 logger.warning("Revoked token used", user_id=user_id, jti=token_jti)
                 return _create_error_response(request, '{"detail": "Token has been revoked"}', 401)
 
-            # Verify user exists in database using proper async context manager
-            async with async_session_factory() as db:
-                result = await db.execute(select(User).where(User.id == user_id))
-                user = result.scalar_one_or_none()
-
-                if not user:
-                    logger.warning(
-                        "User not found in database",
-                        user_id=user_id,
-                    )
-                    return _create_error_response(
-                        request, '{"detail": "Invalid token - user not found"}', 401
-                    )
-
-                # Check if user account is active
-                if not user.is_active:
-                    logger.warning(
-                        "Deactivated user attempted access",
-                        user_id=user_id,
-                    )
-                    return _create_error_response(
-                        request, '{"detail": "Account deactivated. Please contact support."}', 403
-                    )
-
-                # Add user info to request state
-                request.state.user_id = user_id
-                # SECURITY: Add email for admin bypass checks (ADMIN_SUPER_USER_EMAILS)
-                request.state.user_email = user.email
-
-                # SECURITY: Always use the role from database, not from JWT
-                # This ensures role changes take effect immediately
-                valid_roles = {"member", "admin", "super_admin"}
-                db_role = getattr(user, "role", "member") or "member"
-                request.state.user_role = db_role if db_role in valid_roles else "member"
+            principal = await auth_cache.get_principal(user_id, _load_principal)
+            if not principal:
+                logger.warning(
+                    "User not found in database",
+                    user_id=user_id,
+                )
+                return _create_error_response(
+                    request, '{"detail": "Invalid token - user not found"}', 401
+                )
+
+            # Check if user account is active
+            if not principal.is_active:
+                logger.warning(
+                    "Deactivated user attempted access",
+                    user_id=user_id,
+                )
+                return _create_error_response(
+                    request, '{"detail": "Account deactivated. Please contact support."}', 403
+                )
+
+            # Add user info to request state
+            request.state.user_id = user_id
+            # SECURITY: Add email for admin bypass checks (ADMIN_SUPER_USER_EMAILS)
+            request.state.user_email = principal.email
+            request.state.user_role = principal.role
 
         except JWTError as e:
             logger.warning("JWT validation failed", error=str(e))
             return _create_error_response(request, '{"detail": "Invalid or expired token"}', 401)
 
-        return await call_next(request)
+        return None
 
 
 def get_current_user_id(request: Request) -> str:
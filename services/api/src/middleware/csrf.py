@@ -10,13 +10,12 @@ However, Origin validation provides defense-in-depth by ensuring
 state-changing requests come from expected origins.
 """
 
-from collections.abc import Awaitable, Callable
 from urllib.parse import urlparse
 
 import structlog
 from fastapi import Request
 from fastapi.responses import JSONResponse, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.config import settings
 
@@ -41,32 +40,35 @@ CSRF_EXEMPT_PATHS = {
 }
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     """Middleware for CSRF protection via Origin header validation.
 
     Validates that state-changing requests (POST, PUT, PATCH, DELETE)
     come from allowed origins as configured in CORS_ORIGINS.
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Validate Origin header for state-changing requests."""
-        # Check if validation should be skipped
-        if self._should_skip_validation(request):
-            return await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Other methods never need validation, so skip building a Request for them
+        if scope["type"] != "http" or scope["method"] not in STATE_CHANGING_METHODS:
+            await self.app(scope, receive, send)
+            return
 
-        # Get request origin from headers
-        request_origin = self._get_request_origin(request)
+        request = Request(scope)
+        # Check if validation should be skipped
+        if not self._should_skip_validation(request):
+            # Get request origin from headers
+            request_origin = self._get_request_origin(request)
 
-        # Validate origin
-        error_response = self._validate_origin(request, request_origin)
-        if error_response:
-            return error_response
+            # Validate origin
+            error_response = self._validate_origin(request, request_origin)
+            if error_response:
+                await error_response(scope, receive, send)
+                return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
     def _should_skip_validation(self, request: Request) -> bool:
         """Check if CSRF validation should be skipped for this request."""
@@ -0,0 +1,113 @@
+"""Request body decompression middleware.
+
+Internal services send large usage batches gzip-compressed
+(Content-Encoding: gzip). This middleware inflates those bodies before they
+reach the route, so handlers and request models see plain JSON.
+Decompressed bodies are capped so a small compressed payload cannot
+expand into an unbounded one.
+"""
+
+import zlib
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestBodyTooLargeError(Exception):
+    """Raised when a request body exceeds the size limit."""
+
+
+class InvalidGzipBodyError(Exception):
+    """Raised when a request body is not a complete gzip stream."""
+
+
+def gunzip_body(data: bytes, max_size: int) -> bytes:
+    """Decompress a gzip request body of at most max_size bytes.
+
+    Raises:
+        RequestBodyTooLargeError: If the body inflates past max_size
+        InvalidGzipBodyError: If the body is not valid gzip data
+    """
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        body = decompressor.decompress(data, max_size + 1)
+    except zlib.error as e:
+        raise InvalidGzipBodyError from e
+    if len(body) > max_size or decompressor.unconsumed_tail:
+        raise RequestBodyTooLargeError
+    if not decompressor.eof:
+        raise InvalidGzipBodyError
+    return body
+
+
+class RequestDecompressionMiddleware:
+    """Inflate gzip-encoded request bodies.
+
+    Requests without Content-Encoding: gzip pass through untouched. For
+    gzip requests the body is buffered (compressed and decompressed sizes
+    are both limited to max_body_size), and the route receives it with the
+    Content-Encoding header removed and Content-Length updated.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = Headers(scope=scope).get("content-encoding", "").strip().lower()
+        if encoding != "gzip":
+            await self.app(scope, receive, send)
+            return
+
+        compressed = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            compressed += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(compressed) > self.max_body_size:
+                await self._reject(scope, receive, send, 413)
+                return
+
+        try:
+            body = gunzip_body(bytes(compressed), self.max_body_size)
+        except RequestBodyTooLargeError:
+            await self._reject(scope, receive, send, 413)
+            return
+        except InvalidGzipBodyError:
+            await self._reject(scope, receive, send, 400)
+            return
+
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app({**scope, "headers": headers}, receive_body, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, status_code: int) -> None:
+        if status_code == 413:
+            limit_mb = self.max_body_size // (1024 * 1024)
+            detail = f"Request body too large. Maximum size is {limit_mb}MB."
+        else:
+            detail = "Request body is not valid gzip data."
+        response = JSONResponse(status_code=status_code, content={"detail": detail})
+        await response(scope, receive, send)
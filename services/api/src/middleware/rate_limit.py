@@ -1,7 +1,6 @@
 """Rate limiting middleware using slowapi with Redis backend."""
 
 import json
-from collections.abc import Awaitable, Callable
 from typing import Any
 
 import redis.asyncio as redis
@@ -10,8 +9,7 @@ from fastapi import Request, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.config import settings
 
@@ -103,7 +101,7 @@ RATE_LIMIT_WEBSOCKET = "300/minute"  # WebSocket handshakes
 RATE_LIMIT_HEALTH = "1000/minute"  # Health checks (high limit for monitoring)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """Rate limiting middleware using slowapi with Redis backend.
 
     This middleware applies default rate limits to all requests.
@@ -117,19 +115,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     """
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
         self._redis_connected = False
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Apply rate limiting to requests."""
         # Skip rate limiting for health checks only
-        path = request.url.path
-        if path == "/health":
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] == "/health":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # SECURITY: Apply rate limiting to WebSocket upgrades to prevent connection flooding
         # WebSocket connections consume server resources and should be rate limited
@@ -141,9 +137,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 logger.warning(
                     "WebSocket rate limit exceeded",
                     client=client_key,
-                    path=path,
+                    path=scope["path"],
                 )
-                return Response(
+                response = Response(
                     content="WebSocket rate limit exceeded. Too many connection attempts.",
                     status_code=429,
                     headers={
@@ -152,13 +148,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         "X-RateLimit-Remaining": "0",
                     },
                 )
+                await response(scope, receive, send)
+                return
 
         # Apply default rate limit via limiter
         # Note: Routes with @limiter.limit() will use their own limits
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send)
         except RateLimitExceeded as e:
-            return _rate_limit_exceeded_handler(request, e)  # type: ignore[no-any-return]
+            response = _rate_limit_exceeded_handler(request, e)
+            await response(scope, receive, send)
 
 
 # ============================================================================
@@ -7,19 +7,19 @@ which can be used for:
 - Distributed tracing integration
 """
 
-from collections.abc import Awaitable, Callable
 from uuid import uuid4
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Header names for request ID
 REQUEST_ID_HEADER = "X-Request-ID"
 CORRELATION_ID_HEADER = "X-Correlation-ID"
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """Middleware that assigns a unique request ID to each request.
 
     The request ID is:
@@ -29,42 +29,47 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     4. Bound to the structlog context for all log messages
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Process request and add request ID."""
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get or generate request ID
-        request_id = request.headers.get(REQUEST_ID_HEADER) or str(uuid4())
+        headers = Headers(scope=scope)
+        request_id = headers.get(REQUEST_ID_HEADER) or str(uuid4())
 
         # Get correlation ID if provided (for distributed tracing)
-        correlation_id = request.headers.get(CORRELATION_ID_HEADER)
+        correlation_id = headers.get(CORRELATION_ID_HEADER)
 
         # Store in request state for use by route handlers
-        request.state.request_id = request_id
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
         if correlation_id:
-            request.state.correlation_id = correlation_id
+            state["correlation_id"] = correlation_id
 
         # Bind to structlog context for automatic inclusion in logs
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(
             request_id=request_id,
-            path=request.url.path,
-            method=request.method,
+            path=scope["path"],
+            method=scope["method"],
         )
         if correlation_id:
             structlog.contextvars.bind_contextvars(correlation_id=correlation_id)
 
-        # Process the request
-        response = await call_next(request)
-
-        # Add request ID to response headers
-        response.headers[REQUEST_ID_HEADER] = request_id
-        if correlation_id:
-            response.headers[CORRELATION_ID_HEADER] = correlation_id
+        async def send_with_request_id(message: Message) -> None:
+            # Add request ID to response headers
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers[REQUEST_ID_HEADER] = request_id
+                if correlation_id:
+                    response_headers[CORRELATION_ID_HEADER] = correlation_id
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_request_id)
 
 
 def get_request_id(request: Request) -> str:
@@ -0,0 +1,35 @@
+"""Request body size limit middleware.
+
+Rejects requests whose Content-Length exceeds the limit before the body is
+read. Gzip bodies are limited again after inflating, by
+RequestDecompressionMiddleware.
+"""
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class RequestSizeLimitMiddleware:
+    """Middleware to limit request body size."""
+
+    def __init__(self, app: ASGIApp, max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and int(content_length) > self.max_body_size:
+            limit_mb = self.max_body_size // (1024 * 1024)
+            response = JSONResponse(
+                status_code=413,
+                content={"detail": f"Request body too large. Maximum size is {limit_mb}MB."},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
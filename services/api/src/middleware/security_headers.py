@@ -1,15 +1,12 @@
 """Security headers middleware for production hardening."""
 
-from collections.abc import Awaitable, Callable
-
-from fastapi import Request
-from fastapi.responses import Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """Middleware to add security headers to all responses.
 
     Adds the following headers:
@@ -20,42 +17,63 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Referrer-Policy: Controls referrer information
     - Permissions-Policy: Restricts browser features
     - Content-Security-Policy: Restricts resource loading (when configured)
+
+    Headers are added to the response start message, so streaming response
+    bodies pass through untouched.
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Add security headers to response."""
-        response: Response = await call_next(request)
-
-        # HSTS - only in production with HTTPS
-        if settings.ENVIRONMENT == "production":
-            # max-age=31536000 (1 year), includeSubDomains, preload
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
-
-        # Prevent clickjacking - DENY prevents all framing
-        # Use SAMEORIGIN if embedding in same-origin iframes is needed
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Legacy XSS protection (for older browsers)
-        # Modern browsers use CSP instead, but this doesn't hurt
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Control referrer information
-        # strict-origin-when-cross-origin: Send origin for cross-origin, full URL for same-origin
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions Policy (formerly Feature-Policy)
-        # Restrict access to sensitive browser features
-        # Note: browsing-topics is part of Chrome's Privacy Sandbox Topics API
-        response.headers["Permissions-Policy"] = (
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_api_path = scope["path"].startswith("/api/")
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _security_headers(is_api_path):
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def _security_headers(is_api_path: bool) -> list[tuple[str, str]]:
+    """Build the security headers for a response."""
+    headers = []
+
+    # HSTS - only in production with HTTPS
+    if settings.ENVIRONMENT == "production":
+        # max-age=31536000 (1 year), includeSubDomains, preload
+        headers.append(
+            ("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload")
+        )
+
+    # Prevent clickjacking - DENY prevents all framing
+    # Use SAMEORIGIN if embedding in same-origin iframes is needed
+    headers.append(("X-Frame-Options", "DENY"))
+
+    # Prevent MIME type sniffing
+    headers.append(("X-Content-Type-Options", "nosniff"))
+
+    # Legacy XSS protection (for older browsers)
+    # Modern browsers use CSP instead, but this doesn't hurt
+    headers.append(("X-XSS-Protection", "1; mode=block"))
+
+    # Control referrer information
+    # strict-origin-when-cross-origin: Send origin for cross-origin, full URL for same-origin
+    headers.append(("Referrer-Policy", "strict-origin-when-cross-origin"))
+
+    # Permissions Policy (formerly Feature-Policy)
+    # Restrict access to sensitive browser features
+    # Note: browsing-topics is part of Chrome's Privacy Sandbox Topics API
+    headers.append(
+        (
+            "Permissions-Policy",
             "accelerometer=(), "
             "browsing-topics=(), "
             "camera=(), "
@@ -64,22 +82,22 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "magnetometer=(), "
             "microphone=(), "
             "payment=(), "
-            "usb=()"
+            "usb=()",
         )
+    )
 
-        # Content-Security-Policy
-        # This is a restrictive default - adjust based on your frontend needs
-        if settings.CSP_ENABLED:
-            csp_directives = _build_csp_directives()
-            response.headers["Content-Security-Policy"] = csp_directives
+    # Content-Security-Policy
+    # This is a restrictive default - adjust based on your frontend needs
+    if settings.CSP_ENABLED:
+        headers.append(("Content-Security-Policy", _build_csp_directives()))
 
-        # Prevent caching of sensitive responses
-        # This is applied to API responses; static assets should have different caching
-        if request.url.path.startswith("/api/"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
+    # Prevent caching of sensitive responses
+    # This is applied to API responses; static assets should have different caching
+    if is_api_path:
+        headers.append(("Cache-Control", "no-store, no-cache, must-revalidate, private"))
+        headers.append(("Pragma", "no-cache"))
 
-        return response
+    return headers
 
 
 def _build_csp_directives() -> str:
@@ -14,12 +14,12 @@ from src.database.models import (
     CreditTransaction,
     Session,
     SubscriptionPlan,
-    UsageRecord,
     User,
     UserSubscription,
 )
 from src.middleware.admin import require_admin
 from src.middleware.rate_limit import RATE_LIMIT_STANDARD, limiter
+from src.services.usage_rollups import usage_rollup_window
 
 logger = structlog.get_logger()
 
@@ -178,6 +178,25 @@ def get_date_range(days: int) -> tuple[datetime, datetime]:
     return start_date, end_date
 
 
+TOKEN_USAGE_TYPES = ("tokens_input", "tokens_output")
+
+
+def _sum_where(column: Any, condition: Any) -> Any:
+    """SUM(column) over the rows matching condition, 0 when there are none."""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+async def _total_storage_bytes(db: AsyncSession) -> int:
+    """All-time storage usage, stored as storage_gb with quantity in bytes."""
+    usage = usage_rollup_window(datetime(1970, 1, 1, tzinfo=UTC))
+    result = await db.execute(
+        select(func.coalesce(func.sum(usage.c.quantity), 0)).where(
+            usage.c.usage_type == "storage_gb"
+        )
+    )
+    return int(result.scalar() or 0)
+
+
 # ==================== Endpoints ====================
 
 
@@ -253,31 +272,19 @@ async def get_dashboard_overview(
     mrr_growth_percent = 0.0  # Would need historical data for accurate calculation
 
     # Usage in last 30 days - tokens stored as tokens_input/tokens_output
-    tokens_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.quantity), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= thirty_days_ago)
-    )
-    total_tokens_30d = tokens_result.scalar() or 0
-
-    compute_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.quantity), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "compute_seconds")
-        .where(UsageRecord.created_at >= thirty_days_ago)
+    usage = usage_rollup_window(thirty_days_ago)
+    quantity = usage.c.quantity
+    usage_result = await db.execute(
+        select(
+            _sum_where(quantity, usage.c.usage_type.in_(TOKEN_USAGE_TYPES)).label("tokens"),
+            _sum_where(quantity, usage.c.usage_type == "compute_seconds").label("compute_seconds"),
+        )
     )
-    compute_seconds = compute_result.scalar() or 0
-    total_compute_hours_30d = compute_seconds / 3600
+    usage_row = usage_result.one()
+    total_tokens_30d = int(usage_row.tokens)
+    total_compute_hours_30d = int(usage_row.compute_seconds) / 3600
 
-    # Storage - stored as storage_gb with quantity in bytes
-    storage_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.quantity), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "storage_gb")
-    )
-    storage_bytes = storage_result.scalar() or 0
-    total_storage_gb = storage_bytes / (1024**3)
+    total_storage_gb = await _total_storage_bytes(db) / (1024**3)
 
     # Paying customers
     paying_result = await db.execute(
@@ -358,13 +365,13 @@ async def get_revenue_analytics(
     )
     credit_revenue_cents = credit_revenue_result.scalar() or 0
 
+    usage = usage_rollup_window(start_date)
     overage_revenue_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.total_cost_cents), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.is_overage == True)
-        .where(UsageRecord.created_at >= start_date)
+        select(func.coalesce(func.sum(usage.c.total_cost_cents), 0)).where(
+            usage.c.is_overage == True
+        )
     )
-    overage_revenue_cents = overage_revenue_result.scalar() or 0
+    overage_revenue_cents = int(overage_revenue_result.scalar() or 0)
 
     # Revenue by plan
     plan_revenue_result = await db.execute(
@@ -432,122 +439,75 @@ async def get_usage_analytics(
     """Get usage analytics."""
     start_date, _end_date = get_date_range(days)
 
+    usage = usage_rollup_window(start_date)
+    quantity = usage.c.quantity
+    is_tokens = usage.c.usage_type.in_(TOKEN_USAGE_TYPES)
+
     # Total tokens - records are stored as tokens_input and tokens_output
     tokens_result = await db.execute(
         select(
-            func.coalesce(func.sum(UsageRecord.quantity), 0).label("total"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (UsageRecord.usage_type == "tokens_input", UsageRecord.quantity),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("input_tokens"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (UsageRecord.usage_type == "tokens_output", UsageRecord.quantity),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("output_tokens"),
+            _sum_where(quantity, is_tokens).label("total"),
+            _sum_where(quantity, usage.c.usage_type == "tokens_input").label("input_tokens"),
+            _sum_where(quantity, usage.c.usage_type == "tokens_output").label("output_tokens"),
         )
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= start_date)
     )
     tokens_row = tokens_result.one()
-    total_tokens = tokens_row.total or 0
-    input_tokens = tokens_row.input_tokens or 0
-    output_tokens = tokens_row.output_tokens or 0
+    total_tokens = int(tokens_row.total)
+    input_tokens = int(tokens_row.input_tokens)
+    output_tokens = int(tokens_row.output_tokens)
 
-    # Tokens by model
+    # Tokens by model (rollups store a missing model as "")
     tokens_by_model_result = await db.execute(
-        select(
-            UsageRecord.model,
-            func.sum(UsageRecord.quantity).label("tokens"),
-        )
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= start_date)
-        .where(UsageRecord.model.isnot(None))
-        .group_by(UsageRecord.model)
-        .order_by(func.sum(UsageRecord.quantity).desc())
+        select(usage.c.model, func.sum(usage.c.quantity).label("tokens"))
+        .where(is_tokens)
+        .where(usage.c.model != "")
+        .group_by(usage.c.model)
+        .order_by(func.sum(usage.c.quantity).desc())
         .limit(10)
     )
-    tokens_by_model = [{"model": row.model, "tokens": row.tokens} for row in tokens_by_model_result]
+    tokens_by_model = [
+        {"model": row.model, "tokens": int(row.tokens)} for row in tokens_by_model_result
+    ]
 
     # Tokens by provider - use provider field stored on usage record
     tokens_by_provider_result = await db.execute(
-        select(
-            UsageRecord.provider.label("provider"),
-            func.sum(UsageRecord.quantity).label("tokens"),
-        )
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= start_date)
-        .where(UsageRecord.provider.isnot(None))
-        .group_by(UsageRecord.provider)
-        .order_by(func.sum(UsageRecord.quantity).desc())
+        select(usage.c.provider, func.sum(usage.c.quantity).label("tokens"))
+        .where(is_tokens)
+        .where(usage.c.provider != "")
+        .group_by(usage.c.provider)
+        .order_by(func.sum(usage.c.quantity).desc())
     )
     tokens_by_provider = [
-        {"provider": row.provider, "tokens": row.tokens} for row in tokens_by_provider_result
+        {"provider": row.provider, "tokens": int(row.tokens)} for row in tokens_by_provider_result
     ]
 
-    # Compute usage
-    compute_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.quantity), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "compute_seconds")
-        .where(UsageRecord.created_at >= start_date)
-    )
-    compute_seconds = compute_result.scalar() or 0
-    total_compute_hours = compute_seconds / 3600
-
     # Compute by tier (ordered by most to least used, returned in minutes)
     compute_by_tier_result = await db.execute(
-        select(
-            UsageRecord.tier.label("tier"),
-            func.sum(UsageRecord.quantity).label("seconds"),
-        )
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "compute_seconds")
-        .where(UsageRecord.created_at >= start_date)
-        .group_by(UsageRecord.tier)
-        .order_by(func.sum(UsageRecord.quantity).desc())
+        select(usage.c.tier, func.sum(usage.c.quantity).label("seconds"))
+        .where(usage.c.usage_type == "compute_seconds")
+        .group_by(usage.c.tier)
+        .order_by(func.sum(usage.c.quantity).desc())
     )
+    compute_by_tier_rows = compute_by_tier_result.all()
     compute_by_tier = [
         {"tier": row.tier or "unknown", "minutes": round((row.seconds or 0) / 60, 1)}
-        for row in compute_by_tier_result
+        for row in compute_by_tier_rows
     ]
+    compute_seconds = sum(int(row.seconds or 0) for row in compute_by_tier_rows)
+    total_compute_hours = compute_seconds / 3600
 
-    # Storage - records stored as storage_gb with quantity in bytes
-    storage_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.quantity), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "storage_gb")
-    )
-    storage_bytes = storage_result.scalar() or 0
-    total_storage_gb = storage_bytes / (1024**3)
+    total_storage_gb = await _total_storage_bytes(db) / (1024**3)
 
     # Daily token usage trend - fill in missing days with zeros
     daily_usage_result = await db.execute(
-        select(
-            func.date(UsageRecord.created_at).label("date"),
-            func.sum(UsageRecord.quantity).label("tokens"),
-        )
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= start_date)
-        .group_by(func.date(UsageRecord.created_at))
-        .order_by(func.date(UsageRecord.created_at))
+        select(usage.c.bucket_date, func.sum(usage.c.quantity).label("tokens"))
+        .where(is_tokens)
+        .group_by(usage.c.bucket_date)
+        .order_by(usage.c.bucket_date)
     )
 
     # Create a map of dates with data
-    date_map = {row.date: row.tokens for row in daily_usage_result}
+    date_map = {row.bucket_date: int(row.tokens) for row in daily_usage_result}
 
     # Fill in all dates in range with zeros for missing days
     daily_usage = []
@@ -601,32 +561,20 @@ async def get_cost_analytics(
     )
     gross_revenue_cents = revenue_result.scalar() or 0
 
-    # LLM costs (from usage records with cost) - stored as tokens_input/tokens_output
-    llm_cost_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.total_cost_cents), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= start_date)
-    )
-    llm_cost_cents = llm_cost_result.scalar() or 0
-
-    # Compute costs
-    compute_cost_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.total_cost_cents), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "compute_seconds")
-        .where(UsageRecord.created_at >= start_date)
-    )
-    compute_cost_cents = compute_cost_result.scalar() or 0
-
-    # Storage costs - stored as storage_gb
-    storage_cost_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.total_cost_cents), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "storage_gb")
-        .where(UsageRecord.created_at >= start_date)
+    # Usage charges by category - tokens are stored as tokens_input/tokens_output
+    usage = usage_rollup_window(start_date)
+    cost = usage.c.total_cost_cents
+    costs_result = await db.execute(
+        select(
+            _sum_where(cost, usage.c.usage_type.in_(TOKEN_USAGE_TYPES)).label("llm"),
+            _sum_where(cost, usage.c.usage_type == "compute_seconds").label("compute"),
+            _sum_where(cost, usage.c.usage_type == "storage_gb").label("storage"),
+        )
     )
-    storage_cost_cents = storage_cost_result.scalar() or 0
+    costs_row = costs_result.one()
+    llm_cost_cents = int(costs_row.llm)
+    compute_cost_cents = int(costs_row.compute)
+    storage_cost_cents = int(costs_row.storage)
 
     total_cost_cents = llm_cost_cents + compute_cost_cents + storage_cost_cents
 
@@ -637,25 +585,13 @@ async def get_cost_analytics(
         else 0
     )
 
-    # LLM revenue (approximated from usage charges)
-    llm_revenue_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.total_cost_cents), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type.in_(["tokens_input", "tokens_output"]))
-        .where(UsageRecord.created_at >= start_date)
-    )
-    llm_revenue = llm_revenue_result.scalar() or 0
+    # LLM and compute revenue (approximated from usage charges)
+    llm_revenue = llm_cost_cents
     llm_margin_percent = (
         ((llm_revenue - llm_cost_cents) / llm_revenue * 100) if llm_revenue > 0 else 0
     )
 
-    compute_revenue_result = await db.execute(
-        select(func.coalesce(func.sum(UsageRecord.total_cost_cents), 0))
-        .select_from(UsageRecord)
-        .where(UsageRecord.usage_type == "compute_seconds")
-        .where(UsageRecord.created_at >= start_date)
-    )
-    compute_revenue = compute_revenue_result.scalar() or 0
+    compute_revenue = compute_cost_cents
     compute_margin_percent = (
         ((compute_revenue - compute_cost_cents) / compute_revenue * 100)
         if compute_revenue > 0
@@ -24,6 +24,7 @@ from src.database.models import (
 from src.middleware.admin import get_admin_user_id, require_admin
 from src.middleware.rate_limit import RATE_LIMIT_STANDARD, limiter
 from src.routes.billing import sync_quotas_from_plan
+from src.services.auth_cache import invalidate_auth_principal
 
 logger = structlog.get_logger()
 
@@ -394,6 +395,8 @@ async def update_user(
 
     await db.commit()
     await db.refresh(user)
+    if data.role is not None or data.is_active is not None:
+        await invalidate_auth_principal(user_id)
 
     # Audit log: user updated by admin
     changes = data.model_dump(exclude_unset=True)
@@ -439,6 +442,7 @@ async def activate_user(
 
     user.is_active = True
     await db.commit()
+    await invalidate_auth_principal(user_id)
 
     admin_id = get_admin_user_id(request)
 
@@ -480,6 +484,7 @@ async def deactivate_user(
 
     user.is_active = False
     await db.commit()
+    await invalidate_auth_principal(user_id)
 
     # Audit log: user suspended/deactivated
     audit = AuditLogger(db).set_context(request=request, user_id=admin_id)
@@ -540,6 +545,8 @@ async def bulk_update_users(
             await db.execute(update(User).where(User.id.in_(data.user_ids)).values(**update_values))
             updated = len(data.user_ids)
             await db.commit()
+            for user_id in data.user_ids:
+                await invalidate_auth_principal(user_id)
         except Exception as e:
             failed = len(data.user_ids)
             errors.append(str(e))
@@ -29,6 +29,7 @@ from src.database.models import (
 )
 from src.middleware.rate_limit import RATE_LIMIT_AUTH, RATE_LIMIT_SENSITIVE, limiter
 from src.routes.billing import sync_quotas_from_plan
+from src.services.auth_cache import invalidate_auth_principal
 from src.services.geolocation import lookup_ip_location
 from src.services.mfa import get_mfa_service
 from src.services.token_blacklist import (
@@ -1460,6 +1461,7 @@ async def delete_account(
     user.mfa_backup_codes = None
 
     await db.commit()
+    await invalidate_auth_principal(user_id)
 
     # Log account deletion
     audit = AuditLogger(db).set_context(request=request, user_id=user.id, user_email=user.email)
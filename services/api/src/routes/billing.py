@@ -3,13 +3,14 @@
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
-from typing import Annotated, Any
+from typing import Annotated, Any, cast
+from uuid import UUID
 
 import stripe
 import structlog
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
-from sqlalchemy import select, update
+from sqlalchemy import Table, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -3268,6 +3269,11 @@ class UsageEventInput(BaseModel):
     )  # LLM provider (anthropic, openai, etc)
     input_tokens: int | None = Field(default=None, ge=0, le=settings.MAX_QUANTITY_TOKENS)
     output_tokens: int | None = Field(default=None, ge=0, le=settings.MAX_QUANTITY_TOKENS)
+    # Prompt cache reads and writes, on top of the uncached input_tokens
+    cached_input_tokens: int | None = Field(default=None, ge=0, le=settings.MAX_QUANTITY_TOKENS)
+    cache_creation_input_tokens: int | None = Field(
+        default=None, ge=0, le=settings.MAX_QUANTITY_TOKENS
+    )
     tier: str | None = Field(default=None, max_length=50)
     duration_seconds: int | None = Field(
         default=None, ge=0, le=settings.MAX_QUANTITY_COMPUTE_SECONDS
@@ -3325,6 +3331,10 @@ def _verify_service_token(authorization: str | None) -> bool:
     return secrets.compare_digest(token.encode(), expected_token.encode())
 
 
+# Hourly compute rate used when a hardware tier has no pricing ($0.05/hour)
+DEFAULT_COMPUTE_HOURLY_RATE_CENTS = 5
+
+
 def _apply_margin(base_cost_cents: int, margin_percent: int) -> int:
     """Apply margin percentage to base cost using Decimal for precision.
 
@@ -3382,10 +3392,42 @@ def _apply_margin_to_price(base_price: float, margin_percent: int) -> float:
     return float(total)
 
 
+def _event_input_tokens(event: UsageEventInput) -> int:
+    """Input tokens of a token event, including prompt cache reads and writes."""
+    return (
+        (event.input_tokens or 0)
+        + (event.cached_input_tokens or 0)
+        + (event.cache_creation_input_tokens or 0)
+    )
+
+
+def _event_token_quantity(event: UsageEventInput) -> int:
+    """Tokens a token event counts toward quota.
+
+    Never less than its input (cache included) and output tokens, so events
+    whose quantity leaves out prompt cache tokens still count them.
+    """
+    return max(event.quantity, _event_input_tokens(event) + (event.output_tokens or 0))
+
+
+def _input_record_metadata(event: UsageEventInput) -> dict[str, Any]:
+    """Metadata for an event's tokens_input record, with its prompt cache breakdown."""
+    if not event.cached_input_tokens and not event.cache_creation_input_tokens:
+        return event.metadata
+    return {
+        **event.metadata,
+        "uncached_input_tokens": event.input_tokens or 0,
+        "cached_input_tokens": event.cached_input_tokens or 0,
+        "cache_creation_input_tokens": event.cache_creation_input_tokens or 0,
+    }
+
+
 def _calculate_token_cost_from_db(
     model: str | None,
     input_tokens: int,
     output_tokens: int,
+    cached_input_tokens: int = 0,
+    cache_creation_input_tokens: int = 0,
 ) -> int:
     """Calculate token cost in cents using database pricing.
 
@@ -3394,8 +3436,10 @@ def _calculate_token_cost_from_db(
 
     Args:
         model: Model ID (e.g., "claude-haiku-4.5")
-        input_tokens: Number of input tokens
+        input_tokens: Number of uncached input tokens
         output_tokens: Number of output tokens
+        cached_input_tokens: Input tokens read from the prompt cache
+        cache_creation_input_tokens: Input tokens written to the prompt cache
 
     Returns:
         Cost in cents, with minimum 1 cent for any non-zero usage.
@@ -3418,15 +3462,14 @@ def _calculate_token_cost_from_db(
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
+                cached_input_tokens=cached_input_tokens,
+                cache_creation_input_tokens=cache_creation_input_tokens,
             )
         return 0
 
-    input_price = pricing.input_price_per_million
-    output_price = pricing.output_price_per_million
-
-    # Calculate cost in dollars
-    input_cost = (Decimal(input_tokens) / 1000000) * input_price
-    output_cost = (Decimal(output_tokens) / 1000000) * output_price
+    # Calculate cost in dollars, cache reads and writes at the model's cache rates
+    input_cost = pricing.input_cost(input_tokens, cached_input_tokens, cache_creation_input_tokens)
+    output_cost = (Decimal(output_tokens) / 1000000) * pricing.output_price_per_million
     total_cost_dollars = input_cost + output_cost
 
     # Convert to cents with ceiling to prevent revenue loss
@@ -3434,7 +3477,7 @@ def _calculate_token_cost_from_db(
 
     # SECURITY: Minimum 1 cent for any non-zero token usage
     # This prevents abuse through many small requests that round to 0
-    total_tokens = input_tokens + output_tokens
+    total_tokens = input_tokens + output_tokens + cached_input_tokens + cache_creation_input_tokens
     if total_tokens > 0 and total_cost_cents == 0:
         total_cost_cents = 1
 
@@ -3461,8 +3504,6 @@ async def _calculate_compute_cost_from_db(
         - total_cost_cents: Total cost with minimum 1 cent for any non-zero usage
         - unit_price_cents: Price per second (hourly_rate / 3600)
     """
-    import math
-
     if duration_seconds <= 0:
         return 0, 0
 
@@ -3473,26 +3514,45 @@ async def _calculate_compute_cost_from_db(
         result = await db.execute(
             select(HardwareSpec.hourly_rate_cents).where(HardwareSpec.tier == tier)
         )
-        spec_rate = result.scalar_one_or_none()
-        if spec_rate is not None:
-            hourly_rate_cents = spec_rate
-        else:
-            # Fallback to default rate if tier not found
-            # Use conservative default that doesn't undercharge
-            hourly_rate_cents = 5  # $0.05/hour default
-            logger.warning(
-                "Hardware tier pricing not found in database, using default",
-                tier=tier,
-                default_rate_cents=hourly_rate_cents,
-            )
+        hourly_rate_cents = _tier_hourly_rate(tier, result.scalar_one_or_none())
+
+    return _compute_cost_at_rate(hourly_rate_cents, duration_seconds)
+
+
+def _tier_hourly_rate(tier: str, spec_rate: int | None) -> int:
+    """Get the hourly rate for a tier, falling back to a default if it has no pricing."""
+    if spec_rate is not None:
+        return spec_rate
+
+    # Fallback to default rate if tier not found
+    # Use conservative default that doesn't undercharge
+    logger.warning(
+        "Hardware tier pricing not found in database, using default",
+        tier=tier,
+        default_rate_cents=DEFAULT_COMPUTE_HOURLY_RATE_CENTS,
+    )
+    return DEFAULT_COMPUTE_HOURLY_RATE_CENTS
+
+
+def _compute_cost_at_rate(hourly_rate_cents: int, duration_seconds: int) -> tuple[int, int]:
+    """Calculate compute cost in cents for a duration at an hourly rate.
+
+    Returns:
+        Tuple of (total_cost_cents, unit_price_cents), as for
+        _calculate_compute_cost_from_db
+    """
+    import math
+
+    if duration_seconds <= 0:
+        return 0, 0
 
     # Calculate unit price per second (integer division for storage)
     unit_price_cents = hourly_rate_cents // 3600 if hourly_rate_cents > 0 else 0
 
     # Calculate cost: (duration / 3600) * hourly_rate
-    # Use Decimal for precise calculation
-    hours = Decimal(duration_seconds) / Decimal(3600)
-    total_cost_decimal = hours * Decimal(hourly_rate_cents)
+    # Use Decimal for precise calculation; multiply before dividing so whole
+    # cents are not rounded up by the repeating quotient
+    total_cost_decimal = Decimal(duration_seconds) * Decimal(hourly_rate_cents) / Decimal(3600)
 
     # Convert to cents with ceiling to prevent revenue loss
     total_cost_cents = math.ceil(total_cost_decimal)
@@ -3591,17 +3651,25 @@ def _calculate_cost_split_decimal(
     input_tokens: int | None,
     output_tokens: int | None,
     pricing: Any,
+    cached_input_tokens: int | None = None,
+    cache_creation_input_tokens: int | None = None,
 ) -> tuple[int, int, int, int]:
     """Calculate cost split between input and output tokens using Decimal.
 
     SECURITY: Uses Decimal arithmetic to prevent precision loss that could
     result in missing or extra cents over many transactions.
 
+    Prompt cache reads and writes are part of the input side.
+
     Returns:
         Tuple of (input_base, input_total, output_base, output_total) in cents
     """
     from decimal import ROUND_HALF_UP
 
+    uncached_input_tokens = input_tokens or 0
+    input_tokens = (
+        uncached_input_tokens + (cached_input_tokens or 0) + (cache_creation_input_tokens or 0)
+    )
     if not input_tokens and not output_tokens:
         return 0, 0, 0, 0
 
@@ -3620,10 +3688,8 @@ def _calculate_cost_split_decimal(
 
     # Use Decimal for precise ratio calculation
     if pricing and input_tokens and output_tokens:
-        input_cost_contribution = (
-            Decimal(input_tokens)
-            * Decimal(str(pricing.input_price_per_million))
-            / Decimal(1_000_000)
+        input_cost_contribution = pricing.input_cost(
+            uncached_input_tokens, cached_input_tokens or 0, cache_creation_input_tokens or 0
         )
         output_cost_contribution = (
             Decimal(output_tokens)
@@ -3807,6 +3873,8 @@ async def _record_single_event(
                     event.model,
                     event.input_tokens or 0,
                     event.output_tokens or 0,
+                    cached_input_tokens=event.cached_input_tokens or 0,
+                    cache_creation_input_tokens=event.cache_creation_input_tokens or 0,
                 )
                 total_cost = _apply_margin(base_cost, margin_percent)
 
@@ -3832,7 +3900,8 @@ async def _record_single_event(
                     )
 
                 # SECURITY: Use safe_add to prevent integer overflow
-                new_usage = _safe_add(quota.current_usage, event.quantity)
+                token_quantity = _event_token_quantity(event)
+                new_usage = _safe_add(quota.current_usage, token_quantity)
                 if new_usage > quota.limit_value:
                     # Quota exceeded - check overage handling
                     overage_tokens = new_usage - quota.limit_value
@@ -3865,8 +3934,8 @@ async def _record_single_event(
                     else:
                         # Fallback: prorate from current event cost
                         overage_cost = (
-                            math.ceil((total_cost * overage_tokens) / event.quantity)
-                            if event.quantity > 0
+                            math.ceil((total_cost * overage_tokens) / token_quantity)
+                            if token_quantity > 0
                             else 0
                         )
 
@@ -3913,7 +3982,8 @@ async def _record_single_event(
                 )
 
             # Record input and output separately with proportional cost splitting
-            if event.input_tokens or event.output_tokens:
+            input_tokens = _event_input_tokens(event)
+            if input_tokens or event.output_tokens:
                 if is_billable:
                     # SECURITY: Use Decimal-based cost split to prevent precision loss
                     # Fetch pricing from database (cached)
@@ -3922,14 +3992,20 @@ async def _record_single_event(
                     pricing = get_pricing_from_cache(event.model or "")
                     input_base, input_total, output_base, output_total = (
                         _calculate_cost_split_decimal(
-                            base_cost, total_cost, event.input_tokens, event.output_tokens, pricing
+                            base_cost,
+                            total_cost,
+                            event.input_tokens,
+                            event.output_tokens,
+                            pricing,
+                            cached_input_tokens=event.cached_input_tokens,
+                            cache_creation_input_tokens=event.cache_creation_input_tokens,
                         )
                     )
                 else:
                     # External/local: $0 cost
                     input_base = input_total = output_base = output_total = 0
 
-                if event.input_tokens:
+                if input_tokens:
                     input_record = UsageRecord(
                         idempotency_key=f"{idempotency_key}:input",
                         user_id=event.user_id,
@@ -3940,7 +4016,7 @@ async def _record_single_event(
                         workspace_name=workspace_name,
                         agent_name=agent_name,
                         usage_type="tokens_input",
-                        quantity=event.input_tokens,
+                        quantity=input_tokens,
                         unit="tokens",
                         unit_price_cents=event.unit_price_cents if is_billable else 0,
                         base_cost_cents=input_base,
@@ -3949,7 +4025,7 @@ async def _record_single_event(
                         provider=event.provider,
                         usage_source=usage_source,
                         is_overage=is_overage,
-                        record_metadata=event.metadata,
+                        record_metadata=_input_record_metadata(event),
                     )
                     db.add(input_record)
 
@@ -3980,7 +4056,7 @@ async def _record_single_event(
             # Update token quota using the locked row to prevent race conditions
             # Only update quota for billable (included) usage
             if is_billable and quota:
-                effective_tokens = int(event.quantity * (1 + margin_percent / 100))
+                effective_tokens = int(token_quantity * (1 + margin_percent / 100))
                 quota.current_usage += effective_tokens
                 await db.flush()  # Write the change while still holding the lock
 
@@ -4142,6 +4218,461 @@ async def _record_single_event(
         return True, None
 
 
+# =============================================================================
+# BULK USAGE INGESTION
+# =============================================================================
+
+# Rows per INSERT when recording usage in bulk, keeping bind parameters well
+# under PostgreSQL's 32767 limit
+USAGE_INSERT_CHUNK_SIZE = 500
+
+
+@dataclass
+class _UsageBatchLookups:
+    """Data needed to validate and price a usage batch, loaded with set-based queries."""
+
+    recorded_keys: set[str]
+    user_ids: set[str]
+    owned_workspaces: set[tuple[str, str]]  # (workspace_id, owner_id)
+    agents: dict[str, tuple[str | None, str | None]]  # agent_id -> (session_id, name)
+    session_names: dict[str, str | None]
+    plans: dict[str, SubscriptionPlan]  # user_id -> plan of the active subscription
+    tier_rates: dict[str, int]  # hardware tier -> hourly rate in cents
+
+
+@dataclass
+class _PlannedUsageEvent:
+    """A validated, priced usage event ready to be inserted in bulk."""
+
+    event: UsageEventInput
+    rows: list[dict[str, Any]]
+    quota_type: str | None = None
+    # Amount checked against the quota limit, and amount added to usage once recorded
+    quota_check: int = 0
+    quota_delta: int = 0
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _usage_event_keys(event: UsageEventInput) -> list[str]:
+    """All idempotency keys an event may have been recorded under."""
+    idempotency_key = f"{event.user_id}:{event.id}"
+    if event.usage_type.startswith("tokens"):
+        return [idempotency_key, f"{idempotency_key}:input", f"{idempotency_key}:output"]
+    return [idempotency_key]
+
+
+async def _load_usage_batch_lookups(
+    db: AsyncSession,
+    events: list[UsageEventInput],
+) -> _UsageBatchLookups:
+    """Load everything needed to record a batch with one query per table."""
+    user_ids = {event.user_id for event in events}
+    workspace_ids = {e.workspace_id for e in events if e.workspace_id and _is_uuid(e.workspace_id)}
+    agent_ids = {e.agent_id for e in events if e.agent_id and _is_uuid(e.agent_id)}
+    session_ids = {e.session_id for e in events if e.session_id and _is_uuid(e.session_id)}
+    tiers = {
+        event.tier or "starter_arm"
+        for event in events
+        if event.usage_type in ("compute", "compute_seconds")
+    }
+
+    keys = [key for event in events for key in _usage_event_keys(event)]
+    recorded = await db.execute(
+        select(UsageRecord.idempotency_key).where(UsageRecord.idempotency_key.in_(keys))
+    )
+    lookups = _UsageBatchLookups(
+        recorded_keys={key for key in recorded.scalars() if key is not None},
+        user_ids=set(),
+        owned_workspaces=set(),
+        agents={},
+        session_names={},
+        plans={},
+        tier_rates={},
+    )
+
+    valid_user_ids = [user_id for user_id in user_ids if _is_uuid(user_id)]
+    if valid_user_ids:
+        users = await db.execute(select(User.id).where(User.id.in_(valid_user_ids)))
+        lookups.user_ids = set(users.scalars())
+
+        plans = await db.execute(
+            select(UserSubscription.user_id, SubscriptionPlan)
+            .join(SubscriptionPlan, SubscriptionPlan.id == UserSubscription.plan_id)
+            .where(UserSubscription.user_id.in_(valid_user_ids))
+            .where(UserSubscription.status.in_(["active", "trialing"]))
+        )
+        lookups.plans = dict(plans.tuples())
+
+    if workspace_ids:
+        workspaces = await db.execute(
+            select(Workspace.id, Session.owner_id)
+            .join(Session, Workspace.id == Session.workspace_id)
+            .where(Workspace.id.in_(workspace_ids))
+        )
+        lookups.owned_workspaces = set(workspaces.tuples())
+
+    if agent_ids:
+        agents = await db.execute(
+            select(Agent.id, Agent.session_id, Agent.name).where(Agent.id.in_(agent_ids))
+        )
+        lookups.agents = {
+            agent_id: (session_id, name) for agent_id, session_id, name in agents.tuples()
+        }
+
+    if session_ids:
+        sessions = await db.execute(
+            select(Session.id, Session.name).where(Session.id.in_(session_ids))
+        )
+        lookups.session_names = dict(sessions.tuples())
+
+    if tiers:
+        rates = await db.execute(
+            select(HardwareSpec.tier, HardwareSpec.hourly_rate_cents).where(
+                HardwareSpec.tier.in_(tiers)
+            )
+        )
+        lookups.tier_rates = dict(rates.tuples())
+
+    return lookups
+
+
+def _plan_usage_event(
+    event: UsageEventInput,
+    lookups: _UsageBatchLookups,
+) -> _PlannedUsageEvent | str:
+    """Validate and price one event of a batch without touching the database.
+
+    Mirrors the rules of _record_single_event for usage that stays within
+    quota. Returns the rejection reason if the event is invalid.
+    """
+    if event.user_id not in lookups.user_ids:
+        return "User not found"
+
+    # SECURITY: Usage can only be recorded on the user's own workspaces
+    if event.workspace_id and (event.workspace_id, event.user_id) not in lookups.owned_workspaces:
+        return "Workspace not found or not owned by user"
+
+    # SECURITY: Agents must belong to the session the usage is attributed to
+    agent = lookups.agents.get(event.agent_id) if event.agent_id else None
+    if event.agent_id and event.session_id and (agent is None or agent[0] != event.session_id):
+        return "Agent not found in session"
+    if event.agent_id and agent is None:
+        return "Agent not found"
+    if event.session_id and event.session_id not in lookups.session_names:
+        return "Session not found"
+
+    plan = lookups.plans.get(event.user_id)
+    idempotency_key = f"{event.user_id}:{event.id}"
+    row = {
+        "idempotency_key": idempotency_key,
+        "user_id": event.user_id,
+        "session_id": event.session_id,
+        "workspace_id": event.workspace_id,
+        "agent_id": None,
+        "session_name": lookups.session_names.get(event.session_id or ""),
+        "workspace_name": event.workspace_id,
+        "agent_name": None,
+        "unit_price_cents": 0,
+        "base_cost_cents": 0,
+        "total_cost_cents": 0,
+        "model": None,
+        "provider": None,
+        "tier": None,
+        "usage_source": "included",
+        "is_overage": False,
+        "metadata": event.metadata,
+    }
+
+    if event.usage_type.startswith("tokens"):
+        usage_source = event.usage_source or "included"
+        is_billable = usage_source == "included"
+        margin_percent = plan.llm_margin_percent if plan else 0
+        if is_billable:
+            base_cost = _calculate_token_cost_from_db(
+                event.model,
+                event.input_tokens or 0,
+                event.output_tokens or 0,
+                cached_input_tokens=event.cached_input_tokens or 0,
+                cache_creation_input_tokens=event.cache_creation_input_tokens or 0,
+            )
+            total_cost = _apply_margin(base_cost, margin_percent)
+            from src.services.pricing import get_pricing_from_cache
+
+            pricing = get_pricing_from_cache(event.model or "")
+            input_base, input_total, output_base, output_total = _calculate_cost_split_decimal(
+                base_cost,
+                total_cost,
+                event.input_tokens,
+                event.output_tokens,
+                pricing,
+                cached_input_tokens=event.cached_input_tokens,
+                cache_creation_input_tokens=event.cache_creation_input_tokens,
+            )
+        else:
+            input_base = input_total = output_base = output_total = 0
+
+        token_row = {
+            **row,
+            "agent_id": event.agent_id,
+            "agent_name": agent[1] if agent else None,
+            "unit": "tokens",
+            "unit_price_cents": event.unit_price_cents if is_billable else 0,
+            "model": event.model,
+            "provider": event.provider,
+            "usage_source": usage_source,
+        }
+        rows = []
+        input_tokens = _event_input_tokens(event)
+        if input_tokens:
+            rows.append(
+                {
+                    **token_row,
+                    "idempotency_key": f"{idempotency_key}:input",
+                    "usage_type": "tokens_input",
+                    "quantity": input_tokens,
+                    "base_cost_cents": input_base,
+                    "total_cost_cents": input_total,
+                    "metadata": _input_record_metadata(event),
+                }
+            )
+        if event.output_tokens:
+            rows.append(
+                {
+                    **token_row,
+                    "idempotency_key": f"{idempotency_key}:output",
+                    "usage_type": "tokens_output",
+                    "quantity": event.output_tokens,
+                    "base_cost_cents": output_base,
+                    "total_cost_cents": output_total,
+                }
+            )
+        if not is_billable:
+            return _PlannedUsageEvent(event, rows)
+        token_quantity = _event_token_quantity(event)
+        return _PlannedUsageEvent(
+            event,
+            rows,
+            quota_type="tokens",
+            quota_check=token_quantity,
+            quota_delta=int(token_quantity * (1 + margin_percent / 100)),
+        )
+
+    if event.usage_type in ("compute", "compute_seconds"):
+        duration_seconds = event.duration_seconds or event.quantity
+        tier = event.tier or "starter_arm"
+        hourly_rate_cents = (
+            _tier_hourly_rate(tier, lookups.tier_rates.get(tier)) if duration_seconds > 0 else 0
+        )
+        base_cost, unit_price_cents = _compute_cost_at_rate(hourly_rate_cents, duration_seconds)
+        total_cost = _apply_margin(base_cost, plan.compute_margin_percent if plan else 0)
+        compute_row = {
+            **row,
+            "usage_type": "compute_seconds",
+            "quantity": duration_seconds,
+            "unit": "seconds",
+            "unit_price_cents": unit_price_cents,
+            "base_cost_cents": base_cost,
+            "total_cost_cents": total_cost,
+            "tier": tier,
+        }
+        return _PlannedUsageEvent(
+            event,
+            [compute_row],
+            quota_type="compute_credits",
+            quota_check=total_cost,
+            quota_delta=total_cost,
+        )
+
+    if event.usage_type == "storage":
+        quantity_gb = int(event.quantity / (1024 * 1024 * 1024))
+        storage_row = {
+            **row,
+            "usage_type": "storage_gb",
+            "quantity": event.quantity,
+            "unit": "bytes",
+            "unit_price_cents": event.unit_price_cents,
+            "base_cost_cents": event.total_cost_cents,
+            "total_cost_cents": event.total_cost_cents,
+        }
+        return _PlannedUsageEvent(
+            event,
+            [storage_row],
+            quota_type="storage_gb",
+            quota_check=quantity_gb,
+            quota_delta=quantity_gb,
+        )
+
+    if event.usage_type == "api_calls":
+        api_row = {**row, "workspace_id": None, "workspace_name": None}
+        api_row.update(usage_type="api_calls", quantity=event.quantity, unit="calls")
+        return _PlannedUsageEvent(event, [api_row])
+
+    # Unknown usage types are accepted but not recorded, as in _record_single_event
+    return _PlannedUsageEvent(event, [])
+
+
+def _quota_needs_single_path(quota: UsageQuota, amount: int) -> bool:
+    """Whether adding amount would cross the quota, needing overage handling."""
+    new_usage = quota.current_usage + amount
+    if new_usage > settings.POSTGRES_INT_MAX:
+        return True
+    if new_usage <= quota.limit_value:
+        return False
+    # Storage over quota is still recorded when overage is allowed, without charging credits
+    return not (quota.quota_type == "storage_gb" and quota.overage_allowed)
+
+
+async def _insert_usage_rows(db: AsyncSession, rows: list[dict[str, Any]]) -> set[str]:
+    """Insert usage rows, skipping any already recorded.
+
+    Returns the idempotency keys of the rows actually inserted.
+    """
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    # Rows are keyed by column name ("metadata"), so insert into the table
+    usage_table = cast("Table", UsageRecord.__table__)
+    inserted: set[str] = set()
+    for start in range(0, len(rows), USAGE_INSERT_CHUNK_SIZE):
+        stmt = (
+            pg_insert(usage_table)
+            .values(rows[start : start + USAGE_INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])
+            .returning(usage_table.c.idempotency_key)
+        )
+        result = await db.execute(stmt)
+        inserted.update(result.scalars().all())
+    return inserted
+
+
+async def _record_usage_batch(
+    db: AsyncSession,
+    events: list[UsageEventInput],
+) -> list[tuple[bool, str | None]]:
+    """Record a batch of usage events with set-based queries.
+
+    The batch is validated and priced from a handful of IN queries, rows
+    are inserted with INSERT ... ON CONFLICT (idempotency_key) DO NOTHING,
+    and quota usage is added per user and quota type on rows locked with
+    a single ordered SELECT ... FOR UPDATE.
+
+    Users whose batch would cross a quota limit go through
+    _record_single_event one event at a time, so overage charging, credit
+    deduction and limit notifications behave exactly as before.
+
+    Returns a (success, error) pair for each event, in order.
+    """
+    results: list[tuple[bool, str | None] | None] = [None] * len(events)
+    if not events:
+        return []
+
+    lookups = await _load_usage_batch_lookups(db, events)
+
+    planned: dict[int, _PlannedUsageEvent] = {}
+    seen_keys: set[str] = set()
+    for index, event in enumerate(events):
+        keys = _usage_event_keys(event)
+        # SECURITY: Idempotency - events already recorded (or repeated in this batch) succeed
+        if keys[0] in seen_keys or lookups.recorded_keys.intersection(keys):
+            logger.info(
+                "Duplicate usage event - already processed",
+                event_id=event.id,
+                user_id=event.user_id,
+            )
+            results[index] = (True, None)
+            continue
+        seen_keys.add(keys[0])
+
+        outcome = _plan_usage_event(event, lookups)
+        if isinstance(outcome, str):
+            logger.warning(
+                "Usage event rejected",
+                event_id=event.id,
+                user_id=event.user_id,
+                reason=outcome,
+            )
+            results[index] = (False, outcome)
+        else:
+            planned[index] = outcome
+
+    # Lock every quota the batch touches in one ordered statement to avoid deadlocks
+    checks: dict[tuple[str, str], int] = {}
+    for item in planned.values():
+        if item.quota_type:
+            quota_key = (item.event.user_id, item.quota_type)
+            checks[quota_key] = checks.get(quota_key, 0) + item.quota_check
+
+    quotas: dict[tuple[str, str], UsageQuota] = {}
+    if checks:
+        result = await db.execute(
+            select(UsageQuota)
+            .where(UsageQuota.user_id.in_({user_id for user_id, _ in checks}))
+            .where(UsageQuota.quota_type.in_({quota_type for _, quota_type in checks}))
+            .order_by(UsageQuota.user_id, UsageQuota.quota_type)
+            .with_for_update()
+        )
+        quotas = {(quota.user_id, quota.quota_type): quota for quota in result.scalars().all()}
+
+    single_path_users: set[str] = set()
+    for (user_id, quota_type), amount in checks.items():
+        quota = quotas.get((user_id, quota_type))
+        if quota is not None and _quota_needs_single_path(quota, amount):
+            single_path_users.add(user_id)
+
+    bulk: dict[int, _PlannedUsageEvent] = {}
+    for index, item in planned.items():
+        if item.event.user_id in single_path_users:
+            continue
+        # SECURITY: Require a token quota record for billable tokens - prevents quota bypass
+        if item.quota_type == "tokens" and (item.event.user_id, "tokens") not in quotas:
+            logger.error(
+                "User missing token quota record - rejecting usage",
+                user_id=item.event.user_id,
+                event_id=item.event.id,
+            )
+            results[index] = (False, "Usage quota not configured. Please contact support.")
+            continue
+        bulk[index] = item
+
+    inserted = await _insert_usage_rows(db, [row for item in bulk.values() for row in item.rows])
+
+    deltas: dict[tuple[str, str], int] = {}
+    for index, item in bulk.items():
+        results[index] = (True, None)
+        # Only count usage whose rows were inserted here, not by a concurrent duplicate
+        if item.quota_type and (
+            not item.rows or any(row["idempotency_key"] in inserted for row in item.rows)
+        ):
+            quota_key = (item.event.user_id, item.quota_type)
+            deltas[quota_key] = deltas.get(quota_key, 0) + item.quota_delta
+
+    updated = []
+    for quota_key, delta in deltas.items():
+        quota = quotas.get(quota_key)
+        if quota is not None and delta:
+            quota.current_usage += delta
+            updated.append(quota)
+    await db.flush()  # Write all quota changes while still holding the locks
+
+    for quota in updated:
+        usage_percent = (
+            (quota.current_usage / quota.limit_value * 100) if quota.limit_value > 0 else 0
+        )
+        await check_and_send_usage_warning(db, quota.user_id, quota, usage_percent)
+
+    for index, item in planned.items():
+        if item.event.user_id in single_path_users:
+            results[index] = await _record_single_event(db, item.event)
+
+    return [result or (False, "Usage event was not processed") for result in results]
+
+
 @router.post("/usage/record", response_model=RecordUsageResponse)
 @limiter.limit(RATE_LIMIT_STANDARD)
 async def record_usage_events(
@@ -4165,8 +4696,8 @@ async def record_usage_events(
     failed = 0
     errors: list[str] = []
 
-    for event in data.events:
-        success, error = await _record_single_event(db, event)
+    results = await _record_usage_batch(db, data.events)
+    for event, (success, error) in zip(data.events, results, strict=True):
         if success:
             recorded += 1
         else:
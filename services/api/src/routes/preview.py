@@ -7,14 +7,17 @@ via the compute service. This allows:
 - Full HTTP support for dev servers
 """
 
+from contextlib import AsyncExitStack
 from http import HTTPStatus
 
 import httpx
 from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from starlette.background import BackgroundTask
 
 from src.config import settings
 from src.database.models import Session, Workspace
@@ -52,6 +55,20 @@ DEFAULT_PORTS = [
     PreviewPortConfig(port=4000, label="GraphQL", protocol="http"),
 ]
 
+# Hop-by-hop headers are not forwarded from the compute service response
+_HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
 # Valid port range for preview proxy
 MIN_PORT = 1024  # Exclude privileged ports
 MAX_PORT = 65535
@@ -296,10 +313,10 @@ async def _proxy_to_compute(
     if request.url.query:
         compute_path += f"?{request.url.query}"
 
-    # Get request body for mutation requests
+    # Stream request body for mutation requests
     body = None
     if request.method in ("POST", "PUT", "PATCH"):
-        body = await request.body()
+        body = request.stream()
 
     # Filter headers to forward
     forward_headers = {
@@ -308,37 +325,45 @@ async def _proxy_to_compute(
         if key.lower() not in ("host", "connection", "content-length")
     }
 
+    # The client and upstream response stay open until the body has been sent
+    stack = AsyncExitStack()
     try:
-        async with _get_compute_client(compute_url, user_id) as client:
-            response = await client.request(
+        client = await stack.enter_async_context(_get_compute_client(compute_url, user_id))
+        compute_response = await stack.enter_async_context(
+            client.stream(
                 method=request.method,
                 url=compute_path,
                 headers=forward_headers,
                 content=body,
             )
-
-            # Return the response from compute service
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers={
-                    key: value
-                    for key, value in response.headers.items()
-                    if key.lower() not in ("content-encoding", "transfer-encoding", "connection")
-                },
-            )
-
+        )
     except httpx.ConnectError as e:
+        await stack.aclose()
         raise HTTPException(
             status_code=502,
             detail="Could not connect to compute service. Is it running?",
         ) from e
     except httpx.TimeoutException as e:
+        await stack.aclose()
         raise HTTPException(status_code=504, detail="Request to compute service timed out") from e
     except Exception:
+        await stack.aclose()
         # Don't leak internal error details to clients
         raise HTTPException(status_code=500, detail="Internal proxy error") from None
 
+    # Raw bytes pass through undecoded, so content-encoding and content-length
+    # still describe the body
+    return StreamingResponse(
+        compute_response.aiter_raw(),
+        status_code=compute_response.status_code,
+        headers={
+            key: value
+            for key, value in compute_response.headers.items()
+            if key.lower() not in _HOP_BY_HOP_HEADERS
+        },
+        background=BackgroundTask(stack.aclose),
+    )
+
 
 # Convenience endpoint for default dev server port
 @router.api_route(
@@ -18,6 +18,7 @@ from pydantic import BaseModel, Field, model_validator
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from src.compute_client import invalidate_workspace_placements
 from src.config import settings
 from src.database.models import (
     HardwareSpec,
@@ -419,6 +420,10 @@ async def update_server(
         server.ip_address = data.ip_address
     if data.docker_port is not None:
         server.docker_port = data.docker_port
+    compute_url_changed = (
+        data.compute_service_url is not None
+        and data.compute_service_url != server.compute_service_url
+    )
     if data.compute_service_url is not None:
         server.compute_service_url = data.compute_service_url
     # Hardware resource updates
@@ -464,6 +469,13 @@ async def update_server(
     await db.commit()
     await db.refresh(server)
 
+    if compute_url_changed:
+        # Cached placements of this server's workspaces carry the old URL
+        workspace_ids = await db.execute(
+            select(Workspace.id).where(Workspace.server_id == server_id)
+        )
+        await invalidate_workspace_placements(workspace_ids.scalars().all())
+
     logger.info(
         "Server updated",
         server_id=server_id,
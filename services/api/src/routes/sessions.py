@@ -31,6 +31,7 @@ from src.cache import (
 from src.compute_client import (
     get_compute_client_for_placement,
     get_compute_client_for_workspace,
+    invalidate_workspace_placement,
 )
 from src.config import settings
 from src.database import Agent as AgentModel
@@ -776,6 +777,7 @@ async def create_session(
             # Pre-assign server to workspace before calling compute service
             workspace.server_id = selected_server.id
             await db.commit()
+            await invalidate_workspace_placement(str(workspace.id))
 
             workspace_info = await compute.create_workspace(
                 session_id=str(session.id),
@@ -1263,6 +1265,8 @@ async def delete_session(
 
     await db.delete(session)
     await db.commit()
+    if workspace_id:
+        await invalidate_workspace_placement(workspace_id)
 
     # Audit log: session deleted
     audit = AuditLogger(db).set_context(request=request, user_id=user_id)
@@ -1968,6 +1972,7 @@ async def ensure_workspace_provisioned(
                 if db and workspace_record:
                     workspace_record.server_id = selected_server.id
                     await db.commit()
+                    await invalidate_workspace_placement(workspace_id)
 
             workspace_info = await compute.create_workspace(
                 session_id=str(session.id),
@@ -0,0 +1,301 @@
+"""In-process auth cache for AuthMiddleware.
+
+Every authenticated request needs to know that its token has not been
+revoked and that its user still exists, is active and has a given role.
+Both change rarely, so each API worker answers them from memory:
+
+- principals (user id, email, role, is_active) in an LRU with a short TTL
+- the set of revoked token jtis, reloaded from the Redis revoked index when the
+  invalidation listener subscribes and every AUTH_REVOCATION_RESYNC_INTERVAL
+  seconds, and kept current in between from the invalidation channel
+
+Writers call ``invalidate_auth_principal`` after deactivating a user,
+changing a role or logging a user out, and the token blacklist calls
+``publish_token_revocations`` after revoking tokens. Until the listener has
+subscribed and loaded the revoked index, or while it has lost Redis, the cache is
+bypassed: revocations are checked in Redis and principals are loaded from the
+database on every request.
+
+If an invalidation message is lost, a principal stays stale for at most
+AUTH_PRINCIPAL_CACHE_TTL seconds and a revocation is missed for at most
+AUTH_REVOCATION_RESYNC_INTERVAL seconds.
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Collection, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from podex_shared.sentry import track_auth_cache_lookup, track_auth_revocation_sync
+from src.config import settings
+from src.middleware.rate_limit import get_redis_client
+from src.services import token_blacklist
+
+logger = structlog.get_logger()
+
+AUTH_INVALIDATE_CHANNEL = "podex:auth:invalidate"
+
+DEFAULT_MAX_PRINCIPALS = 10_000
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """The user fields AuthMiddleware needs for each request."""
+
+    user_id: str
+    email: str | None
+    role: str
+    is_active: bool
+
+
+PrincipalLoader = Callable[[str], Awaitable[AuthPrincipal | None]]
+
+
+class AuthCache:
+    """Principal LRU and revoked-token set, kept current from Redis pub/sub."""
+
+    RECONNECT_DELAY = 1.0  # seconds between invalidation listener reconnects
+
+    def __init__(
+        self,
+        *,
+        principal_ttl: float,
+        resync_interval: float,
+        max_principals: int = DEFAULT_MAX_PRINCIPALS,
+    ) -> None:
+        """Initialize the cache (the listener is started with start()).
+
+        Args:
+            principal_ttl: Seconds a cached principal is trusted
+            resync_interval: Seconds between full reloads of the revoked set
+            max_principals: Size of the principal LRU
+        """
+        self._principal_ttl = principal_ttl
+        self._resync_interval = resync_interval
+        self._max_principals = max_principals
+        # user_id -> (principal, expires_at), least recently used first
+        self._principals: OrderedDict[str, tuple[AuthPrincipal, float]] = OrderedDict()
+        self._revoked: set[str] = set()
+        # Monotonic time of the last full revoked-set reload, None while not listening
+        self._synced_at: float | None = None
+        # Bumped on every principal invalidation, so loads racing one are not cached
+        self._invalidations = 0
+        self._counters = {
+            ("principal", "hit"): 0,
+            ("principal", "miss"): 0,
+            ("principal", "bypass"): 0,
+            ("revocation", "local"): 0,
+            ("revocation", "bypass"): 0,
+        }
+        self._running = False
+        self._listener_task: asyncio.Task[None] | None = None
+
+    @property
+    def is_synced(self) -> bool:
+        """Whether the listener is subscribed and the revoked set is current."""
+        return (
+            self._synced_at is not None
+            and time.monotonic() - self._synced_at < 2 * self._resync_interval
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit rates, cache sizes and staleness bounds."""
+        principal_lookups = sum(n for (kind, _), n in self._counters.items() if kind == "principal")
+        revocation_checks = sum(
+            n for (kind, _), n in self._counters.items() if kind == "revocation"
+        )
+        return {
+            **{f"{kind}_{result}": n for (kind, result), n in self._counters.items()},
+            "principal_hit_rate": (
+                round(self._counters["principal", "hit"] / principal_lookups, 4)
+                if principal_lookups
+                else 0.0
+            ),
+            "revocation_local_rate": (
+                round(self._counters["revocation", "local"] / revocation_checks, 4)
+                if revocation_checks
+                else 0.0
+            ),
+            "principals": len(self._principals),
+            "revoked_tokens": len(self._revoked),
+            "synced": self.is_synced,
+            "revocation_sync_age_seconds": (
+                round(time.monotonic() - self._synced_at, 1) if self._synced_at else None
+            ),
+            "principal_ttl_seconds": self._principal_ttl,
+            "revocation_resync_interval_seconds": self._resync_interval,
+        }
+
+    async def is_token_revoked(self, jti: str) -> bool:
+        """Check a token jti against the revoked set, or Redis when not synced."""
+        if self.is_synced:
+            self._record("revocation", "local")
+            return jti in self._revoked
+        self._record("revocation", "bypass")
+        return await token_blacklist.is_token_revoked(jti)
+
+    async def get_principal(self, user_id: str, load: PrincipalLoader) -> AuthPrincipal | None:
+        """Get a user's principal, calling load on a miss (or on every call when not synced)."""
+        if not self.is_synced:
+            self._record("principal", "bypass")
+            return await load(user_id)
+
+        entry = self._principals.get(user_id)
+        if entry is not None:
+            cached, expires_at = entry
+            if expires_at > time.monotonic():
+                self._principals.move_to_end(user_id)
+                self._record("principal", "hit")
+                return cached
+            del self._principals[user_id]
+
+        self._record("principal", "miss")
+        invalidations = self._invalidations
+        principal = await load(user_id)
+        if principal is not None and invalidations == self._invalidations:
+            self._principals[user_id] = (principal, time.monotonic() + self._principal_ttl)
+            while len(self._principals) > self._max_principals:
+                self._principals.popitem(last=False)
+        return principal
+
+    def drop_principal(self, user_id: str) -> None:
+        """Drop a user's cached principal in this process."""
+        self._principals.pop(user_id, None)
+        self._invalidations += 1
+
+    def add_revoked(self, jtis: Iterable[str]) -> None:
+        """Mark tokens as revoked in this process."""
+        self._revoked.update(jtis)
+
+    async def start(self) -> None:
+        """Start listening for invalidations."""
+        if self._running:
+            return
+        self._running = True
+        self._listener_task = asyncio.create_task(self._run_listener())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener."""
+        self._running = False
+        if self._listener_task:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+        self._synced_at = None
+
+    def _record(self, kind: str, result: str) -> None:
+        self._counters[kind, result] += 1
+        track_auth_cache_lookup(kind, result)
+
+    async def _reload_revoked(self, redis: Any) -> None:
+        """Replace the revoked set with the unexpired jtis in the Redis revoked index."""
+        started = time.perf_counter()
+        self._revoked = await token_blacklist.get_revoked_jtis(redis)
+        self._synced_at = time.monotonic()
+        track_auth_revocation_sync(len(self._revoked), (time.perf_counter() - started) * 1000)
+
+    async def _run_listener(self) -> None:
+        """Apply invalidations and periodically reload the revoked set, reconnecting on errors."""
+        while self._running:
+            pubsub = None
+            try:
+                redis = await get_redis_client()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(AUTH_INVALIDATE_CHANNEL)
+                # Invalidations may have been missed while not subscribed. Loading
+                # after subscribing means a revocation is either in the revoked
+                # index or queued on the channel.
+                self._principals.clear()
+                await self._reload_revoked(redis)
+
+                while self._running:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=1.0,
+                    )
+                    if message and message["type"] == "message":
+                        self._handle_message(message)
+                    if (
+                        self._synced_at is not None
+                        and time.monotonic() - self._synced_at >= self._resync_interval
+                    ):
+                        await self._reload_revoked(redis)
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                self._synced_at = None
+                logger.exception("Auth invalidation listener error, reconnecting")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.unsubscribe(AUTH_INVALIDATE_CHANNEL)
+                        await pubsub.aclose()
+
+        self._synced_at = None
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        try:
+            event = json.loads(data) if data else None
+        except (TypeError, json.JSONDecodeError):
+            logger.warning("Invalid JSON in auth invalidation event")
+            return
+
+        if not isinstance(event, dict):
+            return
+        jtis = event.get("jtis")
+        if isinstance(jtis, list):
+            self.add_revoked(str(jti) for jti in jtis)
+        user_id = event.get("user_id")
+        if user_id:
+            self.drop_principal(str(user_id))
+
+
+_auth_cache: AuthCache | None = None
+
+
+def get_auth_cache() -> AuthCache:
+    """Get the auth cache for this process."""
+    global _auth_cache
+    if _auth_cache is None:
+        _auth_cache = AuthCache(
+            principal_ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+            resync_interval=settings.AUTH_REVOCATION_RESYNC_INTERVAL,
+        )
+    return _auth_cache
+
+
+async def _publish(event: dict[str, Any]) -> None:
+    try:
+        redis = await get_redis_client()
+        await redis.publish(AUTH_INVALIDATE_CHANNEL, json.dumps(event))
+    except Exception as e:
+        logger.warning("Failed to publish auth invalidation", error=str(e))
+
+
+async def invalidate_auth_principal(user_id: str) -> None:
+    """Drop a user's cached principal in every API worker.
+
+    Call after committing a deactivation, role change or logout, otherwise a
+    concurrent request can cache the old principal again.
+    """
+    get_auth_cache().drop_principal(user_id)
+    await _publish({"user_id": user_id})
+
+
+async def publish_token_revocations(jtis: Collection[str]) -> None:
+    """Tell every API worker that tokens were added to the Redis blacklist."""
+    if not jtis:
+        return
+    get_auth_cache().add_revoked(jtis)
+    await _publish({"jtis": list(jtis)})
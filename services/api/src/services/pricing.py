@@ -52,8 +52,28 @@ class ModelPricing:
     input_price_per_million: Decimal
     output_price_per_million: Decimal
     cached_input_price_per_million: Decimal | None = None
+    cache_write_price_per_million: Decimal | None = None
     is_available: bool = True
 
+    def input_cost(
+        self,
+        input_tokens: int,
+        cached_input_tokens: int = 0,
+        cache_creation_input_tokens: int = 0,
+    ) -> Decimal:
+        """Cost in dollars of a call's input, including prompt cache reads and writes.
+
+        Cache tokens fall back to the regular input price when the model has no
+        cache rate.
+        """
+        cached_price = self.cached_input_price_per_million or self.input_price_per_million
+        write_price = self.cache_write_price_per_million or self.input_price_per_million
+        return (
+            Decimal(input_tokens) * self.input_price_per_million
+            + Decimal(cached_input_tokens) * cached_price
+            + Decimal(cache_creation_input_tokens) * write_price
+        ) / 1000000
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to JSON-serializable dict."""
         return {
@@ -65,6 +85,9 @@ class ModelPricing:
             "cached_input_price_per_million": str(self.cached_input_price_per_million)
             if self.cached_input_price_per_million
             else None,
+            "cache_write_price_per_million": str(self.cache_write_price_per_million)
+            if self.cache_write_price_per_million
+            else None,
             "is_available": self.is_available,
         }
 
@@ -80,6 +103,9 @@ class ModelPricing:
             cached_input_price_per_million=Decimal(data["cached_input_price_per_million"])
             if data.get("cached_input_price_per_million")
             else None,
+            cache_write_price_per_million=Decimal(data["cache_write_price_per_million"])
+            if data.get("cache_write_price_per_million")
+            else None,
             is_available=data.get("is_available", True),
         )
 
@@ -274,6 +300,15 @@ def get_all_pricing_from_cache() -> dict[str, ModelPricing]:
     return _local_cache.copy()
 
 
+def get_pricing_cache_version() -> object:
+    """Get a token identifying the current contents of the local cache.
+
+    The local cache is replaced rather than mutated on refresh, so callers
+    memoizing lookups can compare tokens with ``is`` to detect a refresh.
+    """
+    return _local_cache
+
+
 async def refresh_pricing_cache(db: AsyncSession) -> None:
     """Force refresh the pricing cache from database to Redis.
 
@@ -316,10 +351,13 @@ async def _load_pricing_from_db(db: AsyncSession) -> None:
         new_cache: dict[str, ModelPricing] = {}
 
         for model in models:
-            # Calculate cached input price (typically 10% of regular input)
+            # Calculate cached input price (typically 10% of regular input) and the
+            # cache write price (typically 125% of regular input)
             cached_input_price = None
+            cache_write_price = None
             if model.input_cost_per_million:
                 cached_input_price = Decimal(str(model.input_cost_per_million)) * Decimal("0.1")
+                cache_write_price = Decimal(str(model.input_cost_per_million)) * Decimal("1.25")
 
             pricing = ModelPricing(
                 model_id=model.model_id,
@@ -328,6 +366,7 @@ async def _load_pricing_from_db(db: AsyncSession) -> None:
                 input_price_per_million=Decimal(str(model.input_cost_per_million or 0)),
                 output_price_per_million=Decimal(str(model.output_cost_per_million or 0)),
                 cached_input_price_per_million=cached_input_price,
+                cache_write_price_per_million=cache_write_price,
                 is_available=model.is_enabled,
             )
             new_cache[model.model_id] = pricing
@@ -386,6 +425,7 @@ __all__ = [
     "get_all_model_pricing",
     "get_all_pricing_from_cache",
     "get_model_pricing",
+    "get_pricing_cache_version",
     "get_pricing_from_cache",
     "refresh_pricing_cache",
 ]
@@ -4,20 +4,30 @@ This module provides Redis-backed task queue functionality for:
 1. Main agent tasks - user messages processed by agents
 2. Subagent tasks - delegated tasks spawned by parent agents
 
-All agent services poll these queues and process tasks. Control commands
-(abort, pause, resume) are distributed via Redis pub/sub to all instances.
+Enqueuing a task also adds its session to a global ready set, which agent
+service workers block on (BZPOPMIN) to pick up work without scanning the
+keyspace. Control commands (abort, pause, resume) are distributed via Redis
+pub/sub to all instances.
+
+Callers waiting for a task to finish are woken by a per-process
+TaskCompletionListener that multiplexes the task update channels, with
+status polling kept only as a slow fallback.
 """
 
 import asyncio
+import contextlib
+import json
 import time
 import uuid
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Protocol
 
 import structlog
 
+from podex_shared.sentry import track_task_completion_waiters, track_task_completion_wakeup
 from src.cache import get_cache_client
 
 logger = structlog.get_logger()
@@ -48,6 +58,14 @@ PRIORITY_SCORES = {
     TaskPriority.LOW: 100,
 }
 
+TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+# Status re-check interval while waiting for completion. Completion events wake
+# waiters immediately; polling only covers events missed during a reconnect.
+FALLBACK_POLL_INTERVAL = 5.0  # seconds
+# Poll interval used while the completion listener is not subscribed
+DEGRADED_POLL_INTERVAL = 0.5  # seconds
+
 
 @dataclass
 class SubagentTaskData:
@@ -133,6 +151,7 @@ class SubagentTaskQueue:
     Key structure:
         podex:subagents:{session_id}:pending  - Sorted set of pending task IDs
         podex:subagents:{session_id}:active   - Set of active task IDs
+        podex:subagents:ready                 - Sorted set of sessions with pending tasks
         podex:subagent:{task_id}              - Task data (JSON)
         podex:subagents:updates               - Pub/sub channel for task events
     """
@@ -141,6 +160,7 @@ class SubagentTaskQueue:
     PENDING_KEY = "podex:subagents:{session_id}:pending"
     ACTIVE_KEY = "podex:subagents:{session_id}:active"
     COMPLETED_KEY = "podex:subagents:{session_id}:completed"
+    READY_KEY = "podex:subagents:ready"
     TASK_KEY = "podex:subagent:{task_id}"
     UPDATES_CHANNEL = "podex:subagents:updates"
 
@@ -203,9 +223,10 @@ class SubagentTaskQueue:
         task_key = self.TASK_KEY.format(task_id=task_id)
         await redis.set_json(task_key, task.to_dict(), ex=self.TASK_TTL)
 
-        # Add to pending queue
+        # Add to pending queue, then wake a worker via the ready set
         pending_key = self.PENDING_KEY.format(session_id=session_id)
         await redis.client.zadd(pending_key, {task_id: priority_score})
+        await redis.client.zadd(self.READY_KEY, {session_id: time.time()}, nx=True)
 
         # Publish task created event
         await self._publish_event("subagent_task_created", task)
@@ -289,35 +310,28 @@ class SubagentTaskQueue:
         self,
         task_id: str,
         timeout: float = 300.0,  # noqa: ASYNC109 - timeout parameter is valid API
-        poll_interval: float = 0.5,
+        poll_interval: float = FALLBACK_POLL_INTERVAL,
     ) -> SubagentTaskData | None:
         """Wait for a task to complete.
 
+        Woken by the task's completion event; status is re-read every
+        ``poll_interval`` seconds only as a fallback for missed events.
+
         Args:
             task_id: Task ID to wait for
             timeout: Maximum time to wait in seconds
-            poll_interval: How often to poll for status
+            poll_interval: Fallback status poll interval in seconds
 
         Returns:
             Completed task data or None if timeout/not found
         """
-        start_time = datetime.now(UTC)
-
-        while True:
-            task = await self.get_task(task_id)
-            if not task:
-                return None
-
-            if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-                return task
-
-            # Check timeout
-            elapsed = (datetime.now(UTC) - start_time).total_seconds()
-            if elapsed >= timeout:
-                logger.warning("Task wait timeout", task_id=task_id, elapsed=elapsed)
-                return task
-
-            await asyncio.sleep(poll_interval)
+        return await wait_for_task_completion(
+            self.get_task,
+            task_id,
+            timeout=timeout,
+            poll_interval=poll_interval,
+            timeout_message="Task wait timeout",
+        )
 
     async def _save_task(self, task: SubagentTaskData, ttl: int | None = None) -> None:
         """Save task data to Redis."""
@@ -437,6 +451,7 @@ class AgentTaskQueue:
     Key structure:
         podex:agents:{session_id}:pending    - Sorted set of pending task IDs
         podex:agents:{session_id}:active     - Set of active task IDs
+        podex:agents:ready                   - Sorted set of sessions with pending tasks
         podex:agents:task:{task_id}          - Task data (JSON)
         podex:agents:updates                 - Pub/sub channel for task events
         podex:agents:control                 - Pub/sub channel for control commands
@@ -444,6 +459,7 @@ class AgentTaskQueue:
 
     PENDING_KEY = "podex:agents:{session_id}:pending"
     ACTIVE_KEY = "podex:agents:{session_id}:active"
+    READY_KEY = "podex:agents:ready"
     TASK_KEY = "podex:agents:task:{task_id}"
     UPDATES_CHANNEL = "podex:agents:updates"
     CONTROL_CHANNEL = "podex:agents:control"
@@ -503,9 +519,10 @@ class AgentTaskQueue:
         task_key = self.TASK_KEY.format(task_id=task_id)
         await redis.set_json(task_key, task.to_dict(), ex=self.TASK_TTL)
 
-        # Add to pending queue
+        # Add to pending queue, then wake a worker via the ready set
         pending_key = self.PENDING_KEY.format(session_id=session_id)
         await redis.client.zadd(pending_key, {task_id: priority_score})
+        await redis.client.zadd(self.READY_KEY, {session_id: time.time()}, nx=True)
 
         # Publish task created event
         await self._publish_event("agent_task_created", task)
@@ -559,25 +576,16 @@ class AgentTaskQueue:
         self,
         task_id: str,
         timeout: float = 300.0,  # noqa: ASYNC109 - timeout parameter is valid API
-        poll_interval: float = 0.5,
+        poll_interval: float = FALLBACK_POLL_INTERVAL,
     ) -> AgentTaskData | None:
-        """Wait for a task to complete."""
-        start_time = datetime.now(UTC)
-
-        while True:
-            task = await self.get_task(task_id)
-            if not task:
-                return None
-
-            if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-                return task
-
-            elapsed = (datetime.now(UTC) - start_time).total_seconds()
-            if elapsed >= timeout:
-                logger.warning("Agent task wait timeout", task_id=task_id, elapsed=elapsed)
-                return task
-
-            await asyncio.sleep(poll_interval)
+        """Wait for a task to complete (event-driven, polling as fallback)."""
+        return await wait_for_task_completion(
+            self.get_task,
+            task_id,
+            timeout=timeout,
+            poll_interval=poll_interval,
+            timeout_message="Agent task wait timeout",
+        )
 
     async def send_control_command(
         self,
@@ -834,25 +842,16 @@ class CompactionTaskQueue:
         self,
         task_id: str,
         timeout: float = 120.0,  # noqa: ASYNC109 - timeout parameter is valid API
-        poll_interval: float = 0.5,
+        poll_interval: float = FALLBACK_POLL_INTERVAL,
     ) -> CompactionTaskData | None:
-        """Wait for a compaction task to complete."""
-        start_time = datetime.now(UTC)
-
-        while True:
-            task = await self.get_task(task_id)
-            if not task:
-                return None
-
-            if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
-                return task
-
-            elapsed = (datetime.now(UTC) - start_time).total_seconds()
-            if elapsed >= timeout:
-                logger.warning("Compaction task wait timeout", task_id=task_id, elapsed=elapsed)
-                return task
-
-            await asyncio.sleep(poll_interval)
+        """Wait for a compaction task to complete (event-driven, polling as fallback)."""
+        return await wait_for_task_completion(
+            self.get_task,
+            task_id,
+            timeout=timeout,
+            poll_interval=poll_interval,
+            timeout_message="Compaction task wait timeout",
+        )
 
     async def _publish_event(self, event_type: str, task: CompactionTaskData) -> None:
         """Publish task event to pub/sub channel."""
@@ -1053,6 +1052,249 @@ class ApprovalQueue:
         await redis.client.delete(request_key)
 
 
+# ============================================================================
+# Task completion listener (push-based wait_for_completion)
+# ============================================================================
+
+
+class _QueuedTask(Protocol):
+    status: TaskStatus
+
+
+class TaskCompletionListener:
+    """Wakes task waiters from the task queues' pub/sub update channels.
+
+    A single pub/sub connection per API worker process subscribes to the
+    subagent, agent and compaction update channels. Waiters register an
+    asyncio.Future keyed by task ID, which is resolved as soon as a terminal
+    status event for that task is published. This replaces one polling loop
+    per waiter with one shared listener.
+
+    Events published while the listener is reconnecting are lost, so every
+    waiter is woken after a (re)subscribe to re-check its task status.
+    """
+
+    CHANNELS = (
+        SubagentTaskQueue.UPDATES_CHANNEL,
+        AgentTaskQueue.UPDATES_CHANNEL,
+        CompactionTaskQueue.UPDATES_CHANNEL,
+    )
+    SUBSCRIBE_TIMEOUT = 2.0  # seconds to wait for the initial subscribe
+    RECONNECT_DELAY = 1.0  # seconds between reconnect attempts
+
+    def __init__(self) -> None:
+        """Initialize listener (started lazily on first registration)."""
+        self._redis: Any = None
+        self._running = False
+        self._listener_task: asyncio.Task[None] | None = None
+        self._subscribed = asyncio.Event()
+        # task_id -> futures of callers waiting on that task
+        self._waiters: dict[str, set[asyncio.Future[str]]] = {}
+
+    @property
+    def is_subscribed(self) -> bool:
+        """Whether completion events are currently being received."""
+        return self._subscribed.is_set()
+
+    @property
+    def outstanding_waiters(self) -> int:
+        """Number of registered waiters that have not been woken yet."""
+        return sum(len(futures) for futures in self._waiters.values())
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get listener statistics."""
+        return {
+            "subscribed": self.is_subscribed,
+            "outstanding_waiters": self.outstanding_waiters,
+            "tasks_waited_on": len(self._waiters),
+        }
+
+    async def start(self) -> None:
+        """Start the background listener if it is not running."""
+        if self._running:
+            return
+
+        self._running = True
+        self._listener_task = asyncio.create_task(self._run_listener())
+        logger.info("Task completion listener started", channels=self.CHANNELS)
+
+    async def stop(self) -> None:
+        """Stop the listener and wake all remaining waiters."""
+        self._running = False
+        if self._listener_task:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+        self._subscribed.clear()
+        self._wake_all("")
+        logger.info("Task completion listener stopped")
+
+    async def register(self, task_id: str) -> asyncio.Future[str]:
+        """Register a waiter for a task.
+
+        Waits briefly for the subscription to be active so that an event
+        published right after the caller's first status read is not missed.
+
+        Args:
+            task_id: Task ID to wait for
+
+        Returns:
+            Future resolved with the terminal status, or "" if the waiter
+            should simply re-check the task (e.g. after a reconnect)
+        """
+        await self.start()
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(task_id, set()).add(future)
+        track_task_completion_waiters(self.outstanding_waiters)
+
+        if not self._subscribed.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._subscribed.wait(), timeout=self.SUBSCRIBE_TIMEOUT)
+
+        return future
+
+    def unregister(self, task_id: str, future: asyncio.Future[str]) -> None:
+        """Remove a waiter that is no longer interested (timeout, cancellation)."""
+        futures = self._waiters.get(task_id)
+        if not futures or future not in futures:
+            return
+        futures.discard(future)
+        if not futures:
+            del self._waiters[task_id]
+        track_task_completion_waiters(self.outstanding_waiters)
+
+    def _resolve(self, task_id: str, status: str) -> None:
+        """Wake every waiter registered for a task."""
+        futures = self._waiters.pop(task_id, None)
+        if not futures:
+            return
+        track_task_completion_waiters(self.outstanding_waiters)
+        for future in futures:
+            if not future.done():
+                future.set_result(status)
+                track_task_completion_wakeup("event")
+
+    def _wake_all(self, status: str) -> None:
+        """Wake every registered waiter so it re-checks its task."""
+        for task_id in list(self._waiters):
+            self._resolve(task_id, status)
+
+    async def _run_listener(self) -> None:
+        """Subscribe to the update channels and dispatch events, reconnecting on errors."""
+        while self._running:
+            pubsub = None
+            try:
+                if self._redis is None:
+                    self._redis = await get_cache_client()
+                pubsub = self._redis.client.pubsub()
+                await pubsub.subscribe(*self.CHANNELS)
+                self._subscribed.set()
+                # Anything published while we were not subscribed was missed
+                self._wake_all("")
+
+                while self._running:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=1.0,
+                    )
+                    if message and message["type"] == "message":
+                        self._handle_message(message)
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                self._subscribed.clear()
+                logger.exception("Task completion listener error, reconnecting")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.unsubscribe(*self.CHANNELS)
+                        await pubsub.aclose()
+
+        self._subscribed.clear()
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        """Resolve waiters for a task update event with a terminal status."""
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        try:
+            event = json.loads(data) if data else None
+        except (TypeError, json.JSONDecodeError):
+            logger.warning("Invalid JSON in task update event")
+            return
+
+        if not isinstance(event, dict):
+            return
+
+        task_id = event.get("task_id")
+        status = event.get("status")
+        if not task_id or task_id not in self._waiters:
+            return
+        if status in {s.value for s in TERMINAL_STATUSES}:
+            self._resolve(task_id, status)
+
+
+async def wait_for_task_completion[T: _QueuedTask](
+    get_task: Callable[[str], Awaitable[T | None]],
+    task_id: str,
+    timeout: float,  # noqa: ASYNC109 - timeout parameter is valid API
+    poll_interval: float = FALLBACK_POLL_INTERVAL,
+    timeout_message: str = "Task wait timeout",
+) -> T | None:
+    """Wait for a queued task to reach a terminal status.
+
+    Args:
+        get_task: Queue accessor that loads the task by ID
+        task_id: Task ID to wait for
+        timeout: Maximum time to wait in seconds
+        poll_interval: Fallback status poll interval in seconds
+        timeout_message: Log message used when the wait times out
+
+    Returns:
+        Terminal task, the still-running task on timeout, or None if not found
+    """
+    listener = get_task_completion_listener()
+    future = await listener.register(task_id)
+
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+
+    try:
+        while True:
+            task = await get_task(task_id)
+            if not task:
+                return None
+
+            if task.status in TERMINAL_STATUSES:
+                return task
+
+            elapsed = loop.time() - start_time
+            if elapsed >= timeout:
+                logger.warning(timeout_message, task_id=task_id, elapsed=elapsed)
+                return task
+
+            if future.done():
+                # Woken without a terminal status (reconnect) - re-arm
+                future = await listener.register(task_id)
+
+            interval = poll_interval
+            if not listener.is_subscribed:
+                interval = min(poll_interval, DEGRADED_POLL_INTERVAL)
+
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(future),
+                    timeout=min(interval, timeout - elapsed),
+                )
+            except TimeoutError:
+                track_task_completion_wakeup("poll")
+    finally:
+        listener.unregister(task_id, future)
+
+
 # ============================================================================
 # Global singletons
 # ============================================================================
@@ -1061,6 +1303,7 @@ _task_queue: SubagentTaskQueue | None = None
 _agent_task_queue: AgentTaskQueue | None = None
 _compaction_task_queue: CompactionTaskQueue | None = None
 _approval_queue: ApprovalQueue | None = None
+_completion_listener: TaskCompletionListener | None = None
 
 
 def get_subagent_task_queue() -> SubagentTaskQueue:
@@ -1093,3 +1336,11 @@ def get_approval_queue() -> ApprovalQueue:
     if _approval_queue is None:
         _approval_queue = ApprovalQueue()
     return _approval_queue
+
+
+def get_task_completion_listener() -> TaskCompletionListener:
+    """Get the global task completion listener instance."""
+    global _completion_listener
+    if _completion_listener is None:
+        _completion_listener = TaskCompletionListener()
+    return _completion_listener
@@ -8,9 +8,13 @@ token revocation for security events like:
 - Admin-initiated session termination
 
 Tokens are stored with TTL matching their expiration time to automatically
-clean up expired entries.
+clean up expired entries. Revoked jtis are also indexed in a sorted set
+scored by that expiry, which API workers load into their in-process auth
+cache (src/services/auth_cache.py), and published to those caches as they
+happen.
 """
 
+import time
 from typing import Any
 
 import structlog
@@ -25,6 +29,13 @@ TOKEN_BLACKLIST_PREFIX = "podex:token:blacklist:"
 # Redis key prefix for user's all tokens (for revoking all sessions)
 USER_TOKENS_PREFIX = "podex:user:tokens:"
 
+# Sorted set of revoked jtis scored by the unix time their blacklist entry
+# expires, so current revocations can be loaded without scanning keys
+REVOKED_TOKENS_KEY = "podex:token:revoked"
+
+# Set once blacklist entries written before REVOKED_TOKENS_KEY existed are indexed
+REVOKED_TOKENS_INDEXED_KEY = "podex:token:revoked:indexed"
+
 
 async def _get_redis_client() -> Any:
     """Get Redis client for token operations."""
@@ -33,6 +44,30 @@ async def _get_redis_client() -> Any:
     return await get_redis_client()
 
 
+def _index_revocations(pipe: Any, jtis: list[str], ttl: int) -> None:
+    """Queue adding jtis to the revoked index and pruning expired ones."""
+    now = time.time()
+    pipe.zadd(REVOKED_TOKENS_KEY, dict.fromkeys(jtis, now + ttl))
+    pipe.zremrangebyscore(REVOKED_TOKENS_KEY, "-inf", now)
+
+
+async def get_revoked_jtis(client: Any) -> set[str]:
+    """Get every jti whose revocation has not expired yet.
+
+    Args:
+        client: Redis client to read the revoked index with.
+    """
+    jtis = await client.zrangebyscore(REVOKED_TOKENS_KEY, time.time(), "+inf")
+    return set(jtis)
+
+
+async def _publish_revocations(jtis: list[str]) -> None:
+    """Publish revoked jtis to the auth caches of all API workers."""
+    from src.services.auth_cache import publish_token_revocations
+
+    await publish_token_revocations(jtis)
+
+
 async def revoke_token(jti: str, expires_in_seconds: int) -> bool:
     """Add a token to the blacklist.
 
@@ -55,12 +90,16 @@ async def revoke_token(jti: str, expires_in_seconds: int) -> bool:
         # Store with TTL - no need to keep after token would have expired anyway
         # Add a small buffer (60 seconds) to account for clock skew
         ttl = max(expires_in_seconds + 60, 60)
-        await client.setex(key, ttl, "revoked")
+        pipe = client.pipeline()
+        pipe.setex(key, ttl, "revoked")
+        _index_revocations(pipe, [jti], ttl)
+        await pipe.execute()
     except Exception:
         logger.exception("Failed to revoke token")
         return False
     else:
         logger.info("Token revoked", jti=jti[:8] + "...")
+        await _publish_revocations([jti])
         return True
 
 
@@ -129,6 +168,8 @@ async def revoke_all_user_tokens(user_id: str) -> int:
             key = f"{TOKEN_BLACKLIST_PREFIX}{jti}"
             pipe.setex(key, default_ttl, "revoked")
 
+        _index_revocations(pipe, list(token_jtis), default_ttl)
+
         # Clear the user's token set
         pipe.delete(user_tokens_key)
         await pipe.execute()
@@ -139,6 +180,7 @@ async def revoke_all_user_tokens(user_id: str) -> int:
         return 0
     else:
         logger.info("Revoked all tokens for user", user_id=user_id, count=count)
+        await _publish_revocations(list(token_jtis))
         return count
 
 
@@ -171,3 +213,47 @@ async def register_user_token(user_id: str, jti: str, expires_in_seconds: int) -
         return False
     else:
         return True
+
+
+async def index_existing_revocations() -> None:
+    """Add blacklist entries written before REVOKED_TOKENS_KEY existed to it.
+
+    Scans the blacklist keys once per Redis; REVOKED_TOKENS_INDEXED_KEY
+    records that it has run.
+    """
+    try:
+        client = await _get_redis_client()
+        if await client.exists(REVOKED_TOKENS_INDEXED_KEY):
+            return
+
+        now = time.time()
+        indexed = 0
+        keys: list[str] = []
+
+        async def index(batch: list[str]) -> int:
+            ttl_pipe = client.pipeline()
+            for key in batch:
+                ttl_pipe.ttl(key)
+            ttls = await ttl_pipe.execute()
+            expiries = {
+                key.removeprefix(TOKEN_BLACKLIST_PREFIX): now + ttl
+                for key, ttl in zip(batch, ttls, strict=True)
+                if ttl > 0
+            }
+            if expiries:
+                await client.zadd(REVOKED_TOKENS_KEY, expiries)
+            return len(expiries)
+
+        async for key in client.scan_iter(match=f"{TOKEN_BLACKLIST_PREFIX}*", count=1000):
+            keys.append(key)
+            if len(keys) >= 1000:
+                indexed += await index(keys)
+                keys = []
+        if keys:
+            indexed += await index(keys)
+
+        await client.set(REVOKED_TOKENS_INDEXED_KEY, "1")
+    except Exception:
+        logger.exception("Failed to index existing token revocations")
+    else:
+        logger.info("Indexed existing token revocations", count=indexed)
@@ -0,0 +1,255 @@
+"""Pre-aggregated usage rollups for admin analytics.
+
+Admin analytics read hourly and daily usage totals instead of scanning
+usage_records. The usage rollup background task rebuilds the hours since the
+latest rollup from raw usage, then re-sums the affected days from the hourly
+rollups. Buckets are deleted and re-inserted whole, so every run is
+idempotent and a backfill (scripts/backfill_usage_rollups.py) can be repeated
+safely.
+
+The first refresh only rolls up the current day. Usage from before the
+earliest hourly rollup is read from usage_records until it is backfilled.
+
+Days are UTC days. Missing model/provider/tier values are rolled up as "".
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+
+import structlog
+from sqlalchemy import DateTime, Subquery, cast, delete, func, insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import UsageRecord, UsageRollupDaily, UsageRollupHourly
+
+logger = structlog.get_logger()
+
+# Hours before the latest rollup that are rebuilt on every refresh.
+# usage_records.created_at is the inserting transaction's start time, so a
+# record can commit into an hour that has already been rolled up.
+ROLLUP_LOOKBACK = timedelta(hours=2)
+
+ROLLUP_DIMENSIONS = ("usage_type", "model", "provider", "tier", "is_overage")
+ROLLUP_MEASURES = ("quantity", "total_cost_cents", "record_count")
+
+
+@dataclass
+class RollupMismatch:
+    """Daily totals for a usage type that differ between raw usage and rollups."""
+
+    bucket_date: date
+    usage_type: str
+    raw: tuple[int, int, int]  # (quantity, total_cost_cents, record_count)
+    rollup: tuple[int, int, int]
+
+
+def _floor_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=UTC)
+
+
+def _raw_usage(start: datetime, end: datetime) -> Subquery:
+    """Usage records created in [start, end) with rollup keys and dimensions."""
+    return (
+        select(
+            func.date_trunc("hour", UsageRecord.created_at).label("bucket_start"),
+            func.date(func.timezone("UTC", UsageRecord.created_at)).label("bucket_date"),
+            UsageRecord.usage_type,
+            func.coalesce(UsageRecord.model, "").label("model"),
+            func.coalesce(UsageRecord.provider, "").label("provider"),
+            func.coalesce(UsageRecord.tier, "").label("tier"),
+            UsageRecord.is_overage,
+            UsageRecord.quantity,
+            UsageRecord.total_cost_cents,
+        )
+        .where(UsageRecord.created_at >= start)
+        .where(UsageRecord.created_at < end)
+        .subquery("raw_usage")
+    )
+
+
+async def rollup_usage(db: AsyncSession, start: datetime, end: datetime) -> int:
+    """Rebuild the rollups for usage recorded between start and end.
+
+    Hourly rollups are rebuilt for every hour overlapping [start, end), then
+    daily rollups for every day containing one of those hours. The caller
+    commits.
+
+    Returns:
+        Number of hourly rollup rows written
+    """
+    start = _floor_hour(start)
+    if end != _floor_hour(end):
+        end = _floor_hour(end) + timedelta(hours=1)
+    if start >= end:
+        return 0
+
+    raw = _raw_usage(start, end)
+    hour_keys = [raw.c.bucket_start, *(raw.c[name] for name in ROLLUP_DIMENSIONS)]
+    await db.execute(
+        delete(UsageRollupHourly)
+        .where(UsageRollupHourly.bucket_start >= start)
+        .where(UsageRollupHourly.bucket_start < end)
+    )
+    result = await db.execute(
+        insert(UsageRollupHourly).from_select(
+            ["bucket_start", *ROLLUP_DIMENSIONS, *ROLLUP_MEASURES],
+            select(
+                *hour_keys,
+                func.sum(raw.c.quantity),
+                func.sum(raw.c.total_cost_cents),
+                func.count(),
+            ).group_by(*hour_keys),
+        )
+    )
+
+    first_day = start.date()
+    end_day = (end - timedelta(microseconds=1)).date() + timedelta(days=1)
+    hours = (
+        select(
+            func.date(func.timezone("UTC", UsageRollupHourly.bucket_start)).label("bucket_date"),
+            *(getattr(UsageRollupHourly, name) for name in ROLLUP_DIMENSIONS),
+            *(getattr(UsageRollupHourly, name) for name in ROLLUP_MEASURES),
+        )
+        .where(UsageRollupHourly.bucket_start >= _day_start(first_day))
+        .where(UsageRollupHourly.bucket_start < _day_start(end_day))
+        .subquery("hourly")
+    )
+    day_keys = [hours.c.bucket_date, *(hours.c[name] for name in ROLLUP_DIMENSIONS)]
+    await db.execute(
+        delete(UsageRollupDaily)
+        .where(UsageRollupDaily.bucket_date >= first_day)
+        .where(UsageRollupDaily.bucket_date < end_day)
+    )
+    await db.execute(
+        insert(UsageRollupDaily).from_select(
+            ["bucket_date", *ROLLUP_DIMENSIONS, *ROLLUP_MEASURES],
+            select(
+                *day_keys,
+                *(func.sum(hours.c[name]) for name in ROLLUP_MEASURES),
+            ).group_by(*day_keys),
+        )
+    )
+    return int(result.rowcount or 0)  # type: ignore[attr-defined]
+
+
+async def refresh_usage_rollups(db: AsyncSession, now: datetime | None = None) -> int:
+    """Roll up usage recorded since the latest hourly rollup.
+
+    With no rollups yet, only today is rolled up; earlier usage is loaded
+    with scripts/backfill_usage_rollups.py. The caller commits.
+
+    Returns:
+        Number of hourly rollup rows written
+    """
+    now = now or datetime.now(UTC)
+    latest = (await db.execute(select(func.max(UsageRollupHourly.bucket_start)))).scalar()
+    if latest is None:
+        logger.info("No usage rollups yet, rolling up today only")
+        start = _day_start(now.date())
+    else:
+        start = latest - ROLLUP_LOOKBACK
+    return await rollup_usage(db, start, now)
+
+
+async def check_usage_rollups(
+    db: AsyncSession, first_day: date, last_day: date
+) -> list[RollupMismatch]:
+    """Compare daily rollups with usage_records from first_day to last_day.
+
+    Totals are compared per day and usage type.
+
+    Returns:
+        Days and usage types whose totals differ
+    """
+    raw = _raw_usage(_day_start(first_day), _day_start(last_day + timedelta(days=1)))
+    raw_result = await db.execute(
+        select(
+            raw.c.bucket_date,
+            raw.c.usage_type,
+            func.sum(raw.c.quantity),
+            func.sum(raw.c.total_cost_cents),
+            func.count(),
+        ).group_by(raw.c.bucket_date, raw.c.usage_type)
+    )
+    raw_totals = {
+        (day, usage_type): (int(quantity), int(cost), int(count))
+        for day, usage_type, quantity, cost, count in raw_result.tuples()
+    }
+
+    rollup_result = await db.execute(
+        select(
+            UsageRollupDaily.bucket_date,
+            UsageRollupDaily.usage_type,
+            *(func.sum(getattr(UsageRollupDaily, name)) for name in ROLLUP_MEASURES),
+        )
+        .where(UsageRollupDaily.bucket_date >= first_day)
+        .where(UsageRollupDaily.bucket_date <= last_day)
+        .group_by(UsageRollupDaily.bucket_date, UsageRollupDaily.usage_type)
+    )
+    rollup_totals = {
+        (day, usage_type): (int(quantity), int(cost), int(count))
+        for day, usage_type, quantity, cost, count in rollup_result.tuples()
+    }
+
+    empty = (0, 0, 0)
+    return [
+        RollupMismatch(
+            bucket_date=day,
+            usage_type=usage_type,
+            raw=raw_totals.get((day, usage_type), empty),
+            rollup=rollup_totals.get((day, usage_type), empty),
+        )
+        for day, usage_type in sorted(raw_totals.keys() | rollup_totals.keys())
+        if raw_totals.get((day, usage_type), empty) != rollup_totals.get((day, usage_type), empty)
+    ]
+
+
+def usage_rollup_window(start: datetime) -> Subquery:
+    """Rollup rows covering usage from start (to the hour) until now.
+
+    Hourly rollups cover the rest of start's day and daily rollups every later
+    day, so a long range reads one row per day and dimension combination.
+    Usage from before the earliest hourly rollup, which has not been rolled
+    up, is read from usage_records one row per record.
+    Columns are bucket_date, the rollup dimensions and the rollup measures.
+    """
+    # A plain upper bound (rather than OR ... IS NULL) keeps this an index range scan
+    rolled_up_from = func.coalesce(
+        select(func.min(UsageRollupHourly.bucket_start)).scalar_subquery(),
+        cast(literal("infinity"), DateTime(timezone=True)),
+    )
+    unrolled = (
+        select(
+            func.date(func.timezone("UTC", UsageRecord.created_at)).label("bucket_date"),
+            UsageRecord.usage_type,
+            func.coalesce(UsageRecord.model, "").label("model"),
+            func.coalesce(UsageRecord.provider, "").label("provider"),
+            func.coalesce(UsageRecord.tier, "").label("tier"),
+            UsageRecord.is_overage,
+            UsageRecord.quantity,
+            UsageRecord.total_cost_cents,
+            literal(1).label("record_count"),
+        )
+        .where(UsageRecord.created_at >= start)
+        .where(UsageRecord.created_at < rolled_up_from)
+    )
+    next_day = start.date() + timedelta(days=1)
+    hourly = (
+        select(
+            func.date(func.timezone("UTC", UsageRollupHourly.bucket_start)).label("bucket_date"),
+            *(getattr(UsageRollupHourly, name) for name in ROLLUP_DIMENSIONS),
+            *(getattr(UsageRollupHourly, name) for name in ROLLUP_MEASURES),
+        )
+        .where(UsageRollupHourly.bucket_start >= _floor_hour(start))
+        .where(UsageRollupHourly.bucket_start < _day_start(next_day))
+    )
+    daily = select(
+        UsageRollupDaily.bucket_date,
+        *(getattr(UsageRollupDaily, name) for name in ROLLUP_DIMENSIONS),
+        *(getattr(UsageRollupDaily, name) for name in ROLLUP_MEASURES),
+    ).where(UsageRollupDaily.bucket_date >= next_day)
+    return union_all(unrolled, hourly, daily).subquery("usage_rollups")
@@ -15,11 +15,12 @@ from typing import Any
 
 import structlog
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
-from src.compute_client import ComputeClient
-from src.database.connection import get_db_context
-from src.database.models import Workspace
+from src.compute_client import (
+    ComputeClient,
+    get_compute_client_for_workspace,
+    get_workspace_placement,
+)
 from src.websocket.local_pod_hub import (
     PodNotConnectedError,
     RPCMethods,
@@ -59,35 +60,12 @@ class WorkspaceRouter:
         Raises:
             ValueError: If the workspace has no server assigned or no compute_service_url.
         """
-        async with get_db_context() as db:
-            result = await db.execute(
-                select(Workspace)
-                .options(selectinload(Workspace.server))
-                .where(Workspace.id == workspace_id)
-            )
-            workspace = result.scalar_one_or_none()
-
-            if not workspace:
-                msg = f"Workspace {workspace_id} not found"
-                raise ValueError(msg)
-
-            if not workspace.server:
-                msg = f"Workspace {workspace_id} has no server assigned"
-                raise ValueError(msg)
-
-            if not workspace.server.compute_service_url:
-                msg = f"Server {workspace.server.id} has no compute_service_url configured"
-                raise ValueError(msg)
-
-            return ComputeClient(workspace.server.compute_service_url)
+        return await get_compute_client_for_workspace(workspace_id)
 
     async def _get_local_pod_id(self, workspace_id: str) -> str | None:
         """Get the local_pod_id for a workspace, if any."""
-        async with get_db_context() as db:
-            result = await db.execute(
-                select(Workspace.local_pod_id).where(Workspace.id == workspace_id)
-            )
-            return result.scalar_one_or_none()
+        placement = await get_workspace_placement(workspace_id)
+        return placement.local_pod_id if placement else None
 
     async def _is_local_pod_workspace(self, workspace_id: str) -> tuple[bool, str | None]:
         """Check if workspace is on a local pod and return pod_id.
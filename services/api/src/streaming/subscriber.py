@@ -16,6 +16,7 @@ from typing import Any
 import redis.asyncio as redis
 import structlog
 
+from podex_shared import TokenBatcher
 from src.config import settings
 from src.websocket.hub import (
     emit_agent_stream_end,
@@ -45,6 +46,10 @@ class StreamSubscriber:
     - _subscribed_sessions: set of sessions this worker has pub/sub subscriptions for
     - _local_session_counts: dict of session_id -> count of LOCAL clients on this worker
     - Redis SUBSCRIPTION_COUNT_KEY: GLOBAL count across all workers
+
+    Token and thinking events are coalesced per (session, agent, message, event
+    type) before being emitted (see STREAMING_TOKEN_BATCH_MS). Any other event
+    for the same session/agent flushes pending tokens first to keep ordering.
     """
 
     def __init__(self) -> None:
@@ -59,6 +64,11 @@ class StreamSubscriber:
         # Local client count per session (on THIS worker only)
         self._local_session_counts: dict[str, int] = {}
         self._lock = asyncio.Lock()
+        self._token_batcher: TokenBatcher[tuple[str, str, str, str]] = TokenBatcher(
+            self._emit_token_batch,
+            window=settings.STREAMING_TOKEN_BATCH_MS / 1000,
+            max_chars=settings.STREAMING_TOKEN_BATCH_MAX_CHARS,
+        )
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -74,6 +84,7 @@ class StreamSubscriber:
     async def disconnect(self) -> None:
         """Disconnect from Redis and stop listening."""
         await self._stop_listener()
+        await self._token_batcher.flush_all()
 
         if self._pubsub:
             await self._pubsub.close()
@@ -267,26 +278,24 @@ class StreamSubscriber:
             message_id=message_id[-8:] if message_id else "None",
         )
 
-        if event_type == "start":
-            await emit_agent_stream_start(
-                session_id=session_id,
-                agent_id=agent_id,
-                message_id=message_id,
+        if event_type in ("token", "thinking"):
+            # Keep token/thinking interleaving intact by flushing the other kind first
+            await self._token_batcher.flush_where(
+                lambda key: (
+                    key[:2] == (session_id, agent_id) and key[2:] != (message_id, event_type)
+                )
             )
-
-        elif event_type == "token":
-            await emit_agent_token(
-                session_id=session_id,
-                agent_id=agent_id,
-                token=data.get("content", ""),
-                message_id=message_id,
+            await self._token_batcher.add(
+                (session_id, agent_id, message_id, event_type), data.get("content", "")
             )
+            return
 
-        elif event_type == "thinking":
-            await emit_agent_thinking_token(
+        await self._token_batcher.flush_where(lambda key: key[:2] == (session_id, agent_id))
+
+        if event_type == "start":
+            await emit_agent_stream_start(
                 session_id=session_id,
                 agent_id=agent_id,
-                thinking=data.get("content", ""),
                 message_id=message_id,
             )
 
@@ -305,9 +314,11 @@ class StreamSubscriber:
                 tool_call_id=data.get("tool_call_id", ""),
                 tool_name=data.get("tool_name", ""),
                 result=data.get("tool_input"),  # Tool input is what was requested
+                duration_ms=data.get("duration_ms"),
             )
 
         elif event_type == "done":
+            self._forget_stream(session_id, agent_id, message_id)
             await emit_agent_stream_end(
                 session_id=session_id,
                 agent_id=agent_id,
@@ -317,6 +328,7 @@ class StreamSubscriber:
             )
 
         elif event_type == "error":
+            self._forget_stream(session_id, agent_id, message_id)
             # Emit stream end with error info
             await emit_agent_stream_end(
                 session_id=session_id,
@@ -325,6 +337,37 @@ class StreamSubscriber:
                 full_content=f"Error: {data.get('error', 'Unknown error')}",
             )
 
+    async def _emit_token_batch(self, key: tuple[str, str, str, str], tokens: list[str]) -> None:
+        """Emit coalesced token or thinking events."""
+        session_id, agent_id, message_id, event_type = key
+        if event_type == "thinking":
+            await emit_agent_thinking_token(
+                session_id=session_id,
+                agent_id=agent_id,
+                thinking="".join(tokens),
+                message_id=message_id,
+            )
+        elif len(tokens) == 1:
+            await emit_agent_token(
+                session_id=session_id,
+                agent_id=agent_id,
+                token=tokens[0],
+                message_id=message_id,
+            )
+        else:
+            await emit_agent_token(
+                session_id=session_id,
+                agent_id=agent_id,
+                token="".join(tokens),
+                message_id=message_id,
+                tokens=tokens,
+            )
+
+    def _forget_stream(self, session_id: str, agent_id: str, message_id: str) -> None:
+        """Drop token batching state for a finished message stream."""
+        for event_type in ("token", "thinking"):
+            self._token_batcher.forget((session_id, agent_id, message_id, event_type))
+
 
 # Singleton instance
 _subscriber: StreamSubscriber | None = None
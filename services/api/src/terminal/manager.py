@@ -597,6 +597,11 @@ class TerminalManager:
         if session._websocket:
             with contextlib.suppress(Exception):
                 await session._websocket.close()
+        if session.is_local_pod:
+            # Import here to avoid circular imports
+            from src.websocket.local_pod_hub import forget_terminal_stream  # noqa: PLC0415
+
+            forget_terminal_stream(session.session_id)
 
     async def write_input(self, session_id: str, data: str) -> bool:
         """Write input to a terminal session.
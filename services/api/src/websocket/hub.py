@@ -11,6 +11,7 @@ from uuid import uuid4
 import socketio
 import structlog
 from jose import JWTError, jwt
+from pycrdt import merge_updates as merge_yjs_updates
 from sqlalchemy import select, update
 
 from src.auth_constants import COOKIE_ACCESS_TOKEN
@@ -22,6 +23,7 @@ from src.session_sync.manager import session_sync_manager
 from src.session_sync.models import SharingMode, SyncAction, SyncActionType
 from src.terminal.manager import terminal_manager
 from src.websocket.local_pod_hub import local_pod_namespace
+from src.websocket.terminal_history import terminal_history
 
 logger = structlog.get_logger()
 
@@ -207,6 +209,11 @@ async def _verify_workspace_access(workspace_id: str, user_id: str) -> bool:
 # Maximum bytes allowed per terminal input to prevent DoS
 MAX_TERMINAL_INPUT_BYTES = 8192
 
+# Agent token streams go to one of two rooms per session, depending on whether
+# the client opted into agent_token_batch events when joining
+SESSION_TOKEN_ROOM = "session:{session_id}:tokens"
+SESSION_TOKEN_BATCH_ROOM = "session:{session_id}:token_batches"
+
 # Track client info (sid -> {user_id, device_id, session_id, voice state, etc.})
 # SECURITY: Bounded by MAX_CLIENTS to prevent memory exhaustion if disconnect events are missed
 MAX_CLIENTS = 50000  # Safety limit - should match max concurrent WebSocket connections
@@ -216,7 +223,7 @@ _last_client_cleanup: datetime = datetime.now(UTC)
 # Cleanup interval in seconds
 CLIENT_CLEANUP_INTERVAL = 300  # 5 minutes
 
-# Maximum updates to store before forcing merge (prevents memory bloat)
+# Maximum updates to store before merging them into the snapshot (prevents memory bloat)
 MAX_YJS_UPDATES_PER_DOC = 100
 # Maximum bytes per session's Yjs data before cleanup warning
 MAX_YJS_BYTES_PER_SESSION = 10 * 1024 * 1024  # 10MB
@@ -262,6 +269,9 @@ class YjsStorage:
     def __init__(self) -> None:
         self._redis: Any = None
         self._initialized: bool = False
+        # Documents with a compaction running on this worker (single-flight)
+        self._compacting: set[tuple[str, str]] = set()
+        self._compaction_tasks: set[asyncio.Task[bool]] = set()
 
     async def init_redis(self) -> None:
         """Initialize Redis connection at startup.
@@ -310,6 +320,9 @@ class YjsStorage:
 
     async def close(self) -> None:
         """Close Redis connection during shutdown."""
+        # Let in-flight compactions finish writing their snapshots
+        if self._compaction_tasks:
+            await asyncio.gather(*self._compaction_tasks, return_exceptions=True)
         if self._redis is not None:
             try:
                 await self._redis.close()
@@ -354,6 +367,103 @@ class YjsStorage:
         key = YJS_UPDATES_KEY.format(session_id=session_id, doc_name=doc_name)
         await redis.delete(key)
 
+    async def get_doc_with_updates(
+        self, session_id: str, doc_name: str
+    ) -> tuple[bytes | None, list[bytes]]:
+        """Get the snapshot and the updates not yet merged into it.
+
+        Both are read in one MULTI so a concurrent compaction cannot make an
+        update appear in both (or neither).
+        """
+        redis = await self._get_redis()
+        doc_key = YJS_DOC_KEY.format(session_id=session_id, doc_name=doc_name)
+        updates_key = YJS_UPDATES_KEY.format(session_id=session_id, doc_name=doc_name)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.get(doc_key)
+            pipe.lrange(updates_key, 0, -1)
+            snapshot, updates = await pipe.execute()
+        return (bytes(snapshot) if snapshot else None), list(updates or [])
+
+    async def compact(self, session_id: str, doc_name: str) -> bool:
+        """Merge pending updates into the document snapshot.
+
+        The snapshot key is WATCHed while the updates are merged, so if another
+        worker compacts the same document concurrently only one write wins.
+        The merged updates are trimmed from the head of the list, keeping any
+        updates appended while the merge was running.
+
+        Returns:
+            True if a new snapshot was written
+        """
+        redis = await self._get_redis()
+        doc_key = YJS_DOC_KEY.format(session_id=session_id, doc_name=doc_name)
+        updates_key = YJS_UPDATES_KEY.format(session_id=session_id, doc_name=doc_name)
+
+        from redis.exceptions import WatchError
+
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(doc_key)
+                snapshot = await pipe.get(doc_key)
+                updates = await pipe.lrange(updates_key, 0, -1)
+                if not updates:
+                    return False
+
+                parts = [bytes(snapshot), *updates] if snapshot else list(updates)
+                # Merging is CPU bound - keep it off the event loop
+                merged = await asyncio.to_thread(merge_yjs_updates, *parts)
+
+                pipe.multi()
+                pipe.setex(doc_key, YJS_TTL, merged)
+                pipe.ltrim(updates_key, len(updates), -1)
+                await pipe.execute()
+        except WatchError:
+            logger.debug(
+                "Yjs compaction superseded by another worker",
+                session_id=session_id,
+                doc_name=doc_name,
+            )
+            return False
+
+        logger.info(
+            "Compacted Yjs updates into snapshot",
+            session_id=session_id,
+            doc_name=doc_name,
+            merged_updates=len(updates),
+            snapshot_bytes=len(merged),
+        )
+        return True
+
+    def schedule_compaction(self, session_id: str, doc_name: str) -> bool:
+        """Compact a document in the background unless already in progress here.
+
+        Returns:
+            True if a compaction was started
+        """
+        key = (session_id, doc_name)
+        if key in self._compacting:
+            return False
+        self._compacting.add(key)
+
+        async def _run() -> bool:
+            try:
+                return await self.compact(session_id, doc_name)
+            except Exception as e:
+                logger.warning(
+                    "Yjs compaction failed",
+                    session_id=session_id,
+                    doc_name=doc_name,
+                    error=str(e),
+                )
+                return False
+            finally:
+                self._compacting.discard(key)
+
+        task = asyncio.create_task(_run())
+        self._compaction_tasks.add(task)
+        task.add_done_callback(self._compaction_tasks.discard)
+        return True
+
     async def cleanup_session(self, session_id: str) -> None:
         """Clean up all Yjs data for a session from Redis."""
         redis = await self._get_redis()
@@ -635,8 +745,12 @@ async def disconnect(sid: str) -> None:
 
 
 @sio.event
-async def session_join(sid: str, data: dict[str, str]) -> None:
-    """Join a session room with authentication and authorization."""
+async def session_join(sid: str, data: dict[str, Any]) -> None:
+    """Join a session room with authentication and authorization.
+
+    Clients that pass ``token_batching: true`` receive agent_token_batch events
+    instead of one agent_token event per streamed chunk.
+    """
     session_id = data.get("session_id")
     auth_token = await _get_auth_token(sid, data)
     username = data.get("username", "Anonymous")
@@ -688,6 +802,8 @@ async def session_join(sid: str, data: dict[str, str]) -> None:
 
     # Now join the session room (client can start receiving events)
     await sio.enter_room(sid, f"session:{session_id}")
+    token_room = SESSION_TOKEN_BATCH_ROOM if data.get("token_batching") else SESSION_TOKEN_ROOM
+    await sio.enter_room(sid, token_room.format(session_id=session_id))
     logger.info("User joined session", sid=sid, session_id=session_id, user_id=user_id)
 
     # Add viewer to session sync (broadcasts to other instances)
@@ -743,6 +859,8 @@ async def session_leave(sid: str, data: dict[str, str]) -> None:
 
     # Leave the session room
     await sio.leave_room(sid, f"session:{session_id}")
+    await sio.leave_room(sid, SESSION_TOKEN_ROOM.format(session_id=session_id))
+    await sio.leave_room(sid, SESSION_TOKEN_BATCH_ROOM.format(session_id=session_id))
     logger.info("User left session", sid=sid, session_id=session_id, user_id=user_id)
 
     # Remove viewer from session sync (broadcasts to other instances)
@@ -1078,30 +1196,44 @@ async def emit_agent_token(
     agent_id: str,
     token: str,
     message_id: str | None = None,
+    tokens: list[str] | None = None,
 ) -> None:
     """Emit a streaming token from an agent response.
 
     This allows real-time display of agent responses as they are generated.
+    ``token`` may hold several coalesced tokens; ``tokens`` lists them
+    individually for clients that opted into agent_token_batch events. The
+    agent_token event is only emitted while STREAMING_LEGACY_TOKEN_EVENTS is
+    enabled.
     """
-    # Note: room check shows LOCAL workers only, actual delivery uses Redis adapter
-    room_name = f"session:{session_id}"
-    room = sio.manager.rooms.get("/", {}).get(room_name, set())
+    timestamp = datetime.now(UTC).isoformat()
     logger.debug(
         "emit_agent_token",
         session_id=session_id[-8:] if session_id else "None",
         token_len=len(token),
-        local_room_clients=len(room),
     )
+    if settings.STREAMING_LEGACY_TOKEN_EVENTS:
+        await sio.emit(
+            "agent_token",
+            {
+                "session_id": session_id,
+                "agent_id": agent_id,
+                "token": token,
+                "message_id": message_id,
+                "timestamp": timestamp,
+            },
+            room=SESSION_TOKEN_ROOM.format(session_id=session_id),
+        )
     await sio.emit(
-        "agent_token",
+        "agent_token_batch",
         {
             "session_id": session_id,
             "agent_id": agent_id,
-            "token": token,
+            "tokens": tokens if tokens is not None else [token],
             "message_id": message_id,
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": timestamp,
         },
-        room=f"session:{session_id}",
+        room=SESSION_TOKEN_BATCH_ROOM.format(session_id=session_id),
     )
 
 
@@ -1277,38 +1409,7 @@ async def emit_tool_call_progress(
 
 # ============== Terminal History ==============
 # Multi-Worker Architecture: Terminal history stored in Redis for consistency
-
-# Redis key patterns for terminal history
-TERMINAL_HISTORY_KEY = "podex:terminal:history:{workspace_id}"
-TERMINAL_HISTORY_TTL = 3600  # 1 hour TTL
-MAX_TERMINAL_HISTORY_LINES = 1000
-
-
-async def _add_to_terminal_history(workspace_id: str, output: str) -> None:
-    """Add terminal output to history buffer in Redis."""
-    import json
-
-    import redis.asyncio as aioredis
-
-    try:
-        redis: aioredis.Redis = aioredis.from_url(  # type: ignore[type-arg]
-            settings.REDIS_URL, decode_responses=True
-        )
-        key = TERMINAL_HISTORY_KEY.format(workspace_id=workspace_id)
-
-        # Add entry to list
-        entry = json.dumps({"output": output, "timestamp": datetime.now(UTC).isoformat()})
-        await redis.rpush(key, entry)
-
-        # Trim to max size
-        await redis.ltrim(key, -MAX_TERMINAL_HISTORY_LINES, -1)
-
-        # Refresh TTL
-        await redis.expire(key, TERMINAL_HISTORY_TTL)
-
-        await redis.aclose()  # type: ignore[attr-defined]
-    except Exception as e:
-        logger.warning("Failed to add terminal history to Redis", error=str(e))
+# (coalesced and pipelined by src.websocket.terminal_history)
 
 
 async def get_terminal_history(workspace_id: str, limit: int = 100) -> list[dict[str, Any]]:
@@ -1321,45 +1422,18 @@ async def get_terminal_history(workspace_id: str, limit: int = 100) -> list[dict
     Returns:
         List of terminal history entries with output and timestamps
     """
-    import json
-
-    import redis.asyncio as aioredis
-
-    try:
-        redis: aioredis.Redis = aioredis.from_url(  # type: ignore[type-arg]
-            settings.REDIS_URL, decode_responses=True
-        )
-        key = TERMINAL_HISTORY_KEY.format(workspace_id=workspace_id)
-
-        # Get last 'limit' entries
-        entries = await redis.lrange(key, -limit, -1)
-        await redis.aclose()  # type: ignore[attr-defined]
-
-        return [json.loads(e) for e in entries]
-    except Exception as e:
-        logger.warning("Failed to get terminal history from Redis", error=str(e))
-        return []
+    return await terminal_history.get(workspace_id, limit)
 
 
 async def clear_terminal_history(workspace_id: str) -> None:
     """Clear terminal history for a workspace from Redis."""
-    import redis.asyncio as aioredis
-
-    try:
-        redis: aioredis.Redis = aioredis.from_url(  # type: ignore[type-arg]
-            settings.REDIS_URL, decode_responses=True
-        )
-        key = TERMINAL_HISTORY_KEY.format(workspace_id=workspace_id)
-        await redis.delete(key)
-        await redis.aclose()  # type: ignore[attr-defined]
-    except Exception as e:
-        logger.warning("Failed to clear terminal history from Redis", error=str(e))
+    await terminal_history.clear(workspace_id)
 
 
 async def emit_to_terminal(workspace_id: str, data: str) -> None:
     """Emit terminal data to attached clients and store in history."""
-    # Store in history buffer (Redis)
-    await _add_to_terminal_history(workspace_id, data)
+    # Store in history buffer (flushed to Redis in batches)
+    terminal_history.append(workspace_id, data)
 
     await sio.emit(
         "terminal_data",
@@ -1384,16 +1458,17 @@ async def yjs_subscribe(sid: str, data: dict[str, str]) -> None:
     await sio.enter_room(sid, room_name)
     logger.info("Client subscribed to Yjs doc", sid=sid, session_id=session_id, doc_name=doc_name)
 
-    # Send existing state from Redis if available
+    # Send the stored snapshot plus the updates not yet merged into it
     try:
-        state = await yjs_storage.get_doc(session_id, doc_name)
-        if state:
+        state, updates = await yjs_storage.get_doc_with_updates(session_id, doc_name)
+        if state or updates:
             await sio.emit(
                 "yjs_sync",
                 {
                     "session_id": session_id,
                     "doc_name": doc_name,
-                    "state": base64.b64encode(state).decode("utf-8"),
+                    "state": base64.b64encode(state).decode("utf-8") if state else None,
+                    "updates": [base64.b64encode(u).decode("utf-8") for u in updates],
                     "type": "state",
                 },
                 to=sid,
@@ -1452,17 +1527,10 @@ async def yjs_update(sid: str, data: dict[str, Any]) -> None:
         try:
             update_count = await yjs_storage.add_update(session_id, doc_name, update)
 
-            # Trim updates if too many (Redis handles this with TTL but we also limit count)
+            # Merge updates into the snapshot if too many (Redis handles this with
+            # TTL but we also limit count)
             if update_count > MAX_YJS_UPDATES_PER_DOC:
-                # Clear and keep only the merged state
-                logger.info(
-                    "Compacting Yjs updates in Redis",
-                    session_id=session_id,
-                    doc_name=doc_name,
-                    update_count=update_count,
-                )
-                # Get current doc state, clear updates
-                await yjs_storage.clear_updates(session_id, doc_name)
+                yjs_storage.schedule_compaction(session_id, doc_name)
         except YjsStorageError as e:
             logger.warning("Failed to store Yjs update in Redis", error=str(e))
             # Continue to broadcast even if storage fails
@@ -56,6 +56,15 @@ _rpc_listener_task: asyncio.Task[None] | None = None
 
 # RPC timeout in seconds
 DEFAULT_RPC_TIMEOUT = 30.0
+TERMINAL_REPLAY_TIMEOUT = 5.0
+
+# Last forwarded terminal frame per (pod_id, session_id): (stream_id, seq).
+# Kept for TERMINAL_STREAM_RECONNECT_GRACE seconds after a pod disconnects so
+# a reconnecting pod's gap can be replayed, and dropped when the terminal closes.
+_terminal_stream_seqs: dict[tuple[str, str], tuple[str, int]] = {}
+_terminal_stream_locks: dict[tuple[str, str], asyncio.Lock] = {}
+_terminal_stream_cleanup: dict[str, asyncio.Task[None]] = {}
+TERMINAL_STREAM_RECONNECT_GRACE = 300.0
 
 
 async def _get_redis() -> aioredis.Redis:  # type: ignore[type-arg]
@@ -335,6 +344,11 @@ class LocalPodNamespace(socketio.AsyncNamespace):
         await _store_pod_connection(pod.id, pod.user_id, pod.name, sid)
         _sid_to_pod[sid] = pod.id
 
+        # Keep terminal stream positions so gaps from the outage can be replayed
+        cleanup_task = _terminal_stream_cleanup.pop(pod.id, None)
+        if cleanup_task:
+            cleanup_task.cancel()
+
         # Update pod status in database
         await _update_pod_status(pod.id, "online")
 
@@ -353,6 +367,8 @@ class LocalPodNamespace(socketio.AsyncNamespace):
         pod_id = _sid_to_pod.pop(sid, None)
 
         if pod_id:
+            _schedule_terminal_stream_cleanup(pod_id)
+
             # Get pod info from Redis before removing
             pod_info = await _get_pod_connection(pod_id)
 
@@ -496,8 +512,10 @@ class LocalPodNamespace(socketio.AsyncNamespace):
     async def on_terminal_output(self, sid: str, data: dict[str, Any]) -> None:
         """Handle terminal output from pod.
 
-        Pods stream terminal output for local pod terminals.
-        Forward to the terminal manager which will send to connected clients.
+        Pods stream terminal output for local pod terminals as numbered frames
+        (``stream_id`` + ``seq``). Frames are forwarded in order; duplicates are
+        dropped and gaps (e.g. output produced while the pod was reconnecting)
+        are filled from the pod's replay buffer before forwarding.
         """
         pod_id = _sid_to_pod.get(sid)
         if not pod_id:
@@ -507,70 +525,176 @@ class LocalPodNamespace(socketio.AsyncNamespace):
         session_id = data.get("session_id")
         workspace_id = data.get("workspace_id")
         output_data = data.get("data", "")
-        output_type = data.get("type")  # "incremental" or "full"
+        output_type = data.get("type")  # "stream"
+        seq = data.get("seq")
+        stream_id = data.get("stream_id")
 
-        logger.info(
+        logger.debug(
             "Received terminal_output from pod",
             pod_id=pod_id,
             session_id=session_id,
             workspace_id=workspace_id,
             output_type=output_type,
+            seq=seq,
             data_length=len(output_data) if output_data else 0,
         )
 
         if not output_data:
             return
 
-        # Forward to terminal manager which handles client connections
-        from src.terminal.manager import terminal_manager
+        if seq is None or not stream_id or not session_id:
+            # Pod without frame sequencing: forward as-is
+            await _forward_terminal_output(session_id, workspace_id, output_data)
+            return
 
-        # Log available sessions for debugging
-        logger.debug(
-            "Looking up terminal session",
-            session_id=session_id,
-            workspace_id=workspace_id,
-            available_sessions=list(terminal_manager.sessions.keys()),
-        )
+        key = (pod_id, session_id)
+        lock = _terminal_stream_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Without history (first frame seen by this worker) there is no gap
+            last_stream_id, last_seq = _terminal_stream_seqs.get(key, (stream_id, seq - 1))
+            if last_stream_id != stream_id:
+                # New stream on the pod (session restarted or pod restarted)
+                last_seq = 0
+
+            if seq <= last_seq:
+                logger.debug("Dropping duplicate terminal frame", session_id=session_id, seq=seq)
+                return
+
+            frames: list[tuple[int, str]] = [(seq, output_data)]
+            if seq > last_seq + 1:
+                frames = await _replay_terminal_frames(
+                    pod_id, session_id, stream_id, last_seq, seq, output_data
+                )
 
-        # Try to find session by session_id first, then by workspace_id
-        session = terminal_manager.sessions.get(session_id) if session_id else None
-        if not session and workspace_id:
-            session = terminal_manager.sessions.get(workspace_id)
+            for frame_seq, frame_data in frames:
+                await _forward_terminal_output(session_id, workspace_id, frame_data)
+                last_seq = frame_seq
+            _terminal_stream_seqs[key] = (stream_id, last_seq)
 
-        if session and session.on_output:
-            try:
-                # Call the output callback (handles both sync and async)
-                # The callback expects workspace_id as first param (for room targeting)
-                import inspect
 
-                # Use workspace_id for the callback (it's used to target the room)
-                callback_id = workspace_id or session.workspace_id
+def forget_terminal_stream(session_id: str) -> None:
+    """Drop frame tracking for a closed terminal session."""
+    for key in [key for key in _terminal_stream_seqs if key[1] == session_id]:
+        _terminal_stream_seqs.pop(key, None)
+    for key in [key for key in _terminal_stream_locks if key[1] == session_id]:
+        _terminal_stream_locks.pop(key, None)
 
-                if inspect.iscoroutinefunction(session.on_output):
-                    await session.on_output(callback_id, output_data)
-                else:
-                    session.on_output(callback_id, output_data)
 
-                logger.info(
-                    "Terminal output forwarded to client",
-                    session_id=session_id,
-                    workspace_id=workspace_id,
-                    output_type=output_type,
-                    data_length=len(output_data),
-                )
-            except Exception as e:
-                logger.warning(
-                    "Failed to forward terminal output",
-                    session_id=session_id,
-                    error=str(e),
-                )
-        else:
-            logger.warning(
-                "No active terminal session for output",
+def _forget_pod_terminal_streams(pod_id: str) -> None:
+    """Drop frame tracking for every terminal of a pod."""
+    for key in [key for key in _terminal_stream_seqs if key[0] == pod_id]:
+        _terminal_stream_seqs.pop(key, None)
+    for key in [key for key in _terminal_stream_locks if key[0] == pod_id]:
+        _terminal_stream_locks.pop(key, None)
+
+
+def _schedule_terminal_stream_cleanup(pod_id: str) -> None:
+    """Forget a disconnected pod's terminal streams unless it reconnects in time."""
+
+    async def cleanup() -> None:
+        await asyncio.sleep(TERMINAL_STREAM_RECONNECT_GRACE)
+        _terminal_stream_cleanup.pop(pod_id, None)
+        _forget_pod_terminal_streams(pod_id)
+
+    previous = _terminal_stream_cleanup.pop(pod_id, None)
+    if previous:
+        previous.cancel()
+    _terminal_stream_cleanup[pod_id] = asyncio.create_task(cleanup())
+
+
+async def _replay_terminal_frames(
+    pod_id: str,
+    session_id: str,
+    stream_id: str,
+    last_seq: int,
+    seq: int,
+    output_data: str,
+) -> list[tuple[int, str]]:
+    """Fetch frames missed between ``last_seq`` and ``seq`` from the pod.
+
+    Returns the frames to forward, in order, ending with frame ``seq``. If the
+    pod cannot fill the gap, the missing output is lost and only frame ``seq``
+    is returned.
+    """
+    logger.info(
+        "Gap in terminal output, requesting replay",
+        pod_id=pod_id,
+        session_id=session_id,
+        last_seq=last_seq,
+        seq=seq,
+    )
+    try:
+        result = await call_pod(
+            pod_id,
+            "terminal.replay",
+            {"session_id": session_id, "after_seq": last_seq},
+            rpc_timeout=TERMINAL_REPLAY_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning("Terminal replay failed", session_id=session_id, error=str(e))
+        return [(seq, output_data)]
+
+    if not isinstance(result, dict) or result.get("stream_id") != stream_id:
+        return [(seq, output_data)]
+    if not result.get("complete"):
+        logger.warning(
+            "Terminal output lost, replay buffer exceeded",
+            session_id=session_id,
+            last_seq=last_seq,
+        )
+
+    replayed = [
+        (frame["seq"], frame["data"])
+        for frame in result.get("frames", [])
+        if last_seq < frame["seq"] < seq
+    ]
+    return [*replayed, (seq, output_data)]
+
+
+async def _forward_terminal_output(
+    session_id: str | None, workspace_id: str | None, output_data: str
+) -> None:
+    """Forward terminal output to the terminal manager's connected clients."""
+    from src.terminal.manager import terminal_manager
+
+    # Try to find session by session_id first, then by workspace_id
+    session = terminal_manager.sessions.get(session_id) if session_id else None
+    if not session and workspace_id:
+        session = terminal_manager.sessions.get(workspace_id)
+
+    if session and session.on_output:
+        try:
+            # Call the output callback (handles both sync and async)
+            # The callback expects workspace_id as first param (for room targeting)
+            import inspect
+
+            # Use workspace_id for the callback (it's used to target the room)
+            callback_id = workspace_id or session.workspace_id
+
+            if inspect.iscoroutinefunction(session.on_output):
+                await session.on_output(callback_id, output_data)
+            else:
+                session.on_output(callback_id, output_data)
+
+            logger.debug(
+                "Terminal output forwarded to client",
                 session_id=session_id,
                 workspace_id=workspace_id,
-                available_sessions=list(terminal_manager.sessions.keys()),
+                data_length=len(output_data),
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to forward terminal output",
+                session_id=session_id,
+                error=str(e),
             )
+    else:
+        logger.warning(
+            "No active terminal session for output",
+            session_id=session_id,
+            workspace_id=workspace_id,
+            available_sessions=list(terminal_manager.sessions.keys()),
+        )
 
 
 # Create namespace instance
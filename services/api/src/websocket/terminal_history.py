@@ -0,0 +1,177 @@
+"""Terminal output history buffer backed by Redis.
+
+Multi-Worker Architecture: terminal history is stored in Redis so every API
+worker serves the same scrollback.
+
+Terminals emit output in many small chunks (hundreds per second when busy).
+Rather than a Redis round trip per chunk, chunks are coalesced in memory per
+workspace for a few milliseconds and flushed for all workspaces in a single
+pipeline (RPUSH + LTRIM + EXPIRE per workspace) on the shared cache client.
+
+History is a size-bounded ring: a Redis list of segments, each holding at most
+``TERMINAL_HISTORY_SEGMENT_SIZE`` characters of output, trimmed to the newest
+``MAX_TERMINAL_HISTORY_SEGMENTS`` segments. Segments are stored as
+``<timestamp>\\x1f<output>`` instead of JSON, so the ANSI control characters in
+terminal output are not escaped (which inflates them up to six times).
+"""
+
+import asyncio
+import contextlib
+import json
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import structlog
+
+from src.cache import get_cache_client
+
+logger = structlog.get_logger()
+
+# Redis key patterns for terminal history
+TERMINAL_HISTORY_KEY = "podex:terminal:history:{workspace_id}"
+TERMINAL_HISTORY_TTL = 3600  # 1 hour TTL
+
+# Ring bounds: at most MAX_TERMINAL_HISTORY_SEGMENTS * TERMINAL_HISTORY_SEGMENT_SIZE
+# characters (256 KiB for ASCII output) are retained per workspace
+TERMINAL_HISTORY_SEGMENT_SIZE = 1024
+MAX_TERMINAL_HISTORY_SEGMENTS = 256
+
+# How long chunks are coalesced before being written
+TERMINAL_HISTORY_FLUSH_INTERVAL = 0.005  # seconds
+
+# Separator between the timestamp and the output of a stored segment
+_SEGMENT_SEPARATOR = "\x1f"
+
+
+@dataclass
+class _PendingOutput:
+    """Output buffered for one workspace since the last flush."""
+
+    timestamp: str
+    chunks: list[str] = field(default_factory=list)
+
+
+def _encode_segments(pending: _PendingOutput) -> list[str]:
+    """Split buffered output into bounded, timestamp-prefixed segments."""
+    output = "".join(pending.chunks)
+    prefix = pending.timestamp + _SEGMENT_SEPARATOR
+    return [
+        prefix + output[i : i + TERMINAL_HISTORY_SEGMENT_SIZE]
+        for i in range(0, len(output), TERMINAL_HISTORY_SEGMENT_SIZE)
+    ]
+
+
+def _decode_segment(entry: str) -> dict[str, Any]:
+    """Decode a stored segment into an output/timestamp entry."""
+    # Entries written before the segment format were JSON objects
+    if entry.startswith("{"):
+        with contextlib.suppress(ValueError):
+            data = json.loads(entry)
+            if isinstance(data, dict):
+                return data
+    timestamp, _, output = entry.partition(_SEGMENT_SEPARATOR)
+    return {"output": output, "timestamp": timestamp}
+
+
+class TerminalHistoryBuffer:
+    """Coalesces terminal output and writes it to Redis in pipelined batches."""
+
+    def __init__(self, flush_interval: float = TERMINAL_HISTORY_FLUSH_INTERVAL) -> None:
+        self._flush_interval = flush_interval
+        self._pending: dict[str, _PendingOutput] = {}
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        # Serializes flushes so segments land in Redis in arrival order
+        self._flush_lock = asyncio.Lock()
+
+    def append(self, workspace_id: str, output: str) -> None:
+        """Buffer terminal output and schedule a flush."""
+        if not output:
+            return
+
+        pending = self._pending.get(workspace_id)
+        if pending is None:
+            pending = _PendingOutput(timestamp=datetime.now(UTC).isoformat())
+            self._pending[workspace_id] = pending
+        pending.chunks.append(output)
+
+        if self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._flush_interval, self._start_flush
+            )
+
+    def _start_flush(self) -> None:
+        """Flush all buffered output once the coalescing window has passed."""
+        self._flush_timer = None
+        self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self, workspace_id: str | None = None) -> None:
+        """Write buffered output to Redis.
+
+        Args:
+            workspace_id: Only flush this workspace (all workspaces if None)
+        """
+        if workspace_id is None:
+            batch, self._pending = self._pending, {}
+        else:
+            pending = self._pending.pop(workspace_id, None)
+            batch = {workspace_id: pending} if pending else {}
+
+        if not batch:
+            return
+
+        async with self._flush_lock:
+            try:
+                redis = await get_cache_client()
+                pipe = redis.client.pipeline(transaction=False)
+                for ws_id, buffered in batch.items():
+                    key = TERMINAL_HISTORY_KEY.format(workspace_id=ws_id)
+                    pipe.rpush(key, *_encode_segments(buffered))
+                    pipe.ltrim(key, -MAX_TERMINAL_HISTORY_SEGMENTS, -1)
+                    pipe.expire(key, TERMINAL_HISTORY_TTL)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(
+                    "Failed to add terminal history to Redis",
+                    workspaces=len(batch),
+                    error=str(e),
+                )
+
+    async def get(self, workspace_id: str, limit: int = 100) -> list[dict[str, Any]]:
+        """Get the newest ``limit`` history segments for a workspace."""
+        # Make output that is still being coalesced visible to the reader
+        await self.flush(workspace_id)
+
+        try:
+            redis = await get_cache_client()
+            key = TERMINAL_HISTORY_KEY.format(workspace_id=workspace_id)
+            entries = await redis.client.lrange(key, -limit, -1)
+            return [_decode_segment(entry) for entry in entries]
+        except Exception as e:
+            logger.warning("Failed to get terminal history from Redis", error=str(e))
+            return []
+
+    async def clear(self, workspace_id: str) -> None:
+        """Drop buffered and stored history for a workspace."""
+        self._pending.pop(workspace_id, None)
+
+        try:
+            redis = await get_cache_client()
+            await redis.delete(TERMINAL_HISTORY_KEY.format(workspace_id=workspace_id))
+        except Exception as e:
+            logger.warning("Failed to clear terminal history from Redis", error=str(e))
+
+    async def close(self) -> None:
+        """Cancel the coalescing timer and write out everything buffered."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+
+# Global terminal history buffer
+terminal_history = TerminalHistoryBuffer()
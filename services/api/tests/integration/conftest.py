@@ -530,14 +530,10 @@ async def test_client(
     # Bypass rate limiter Redis in tests to avoid "Future attached to a different loop"
     from src.middleware.rate_limit import RateLimitMiddleware
 
-    _orig_dispatch = RateLimitMiddleware.dispatch
+    async def _pass_through(self, scope, receive, send):
+        await self.app(scope, receive, send)
 
-    async def _pass_through_dispatch(self, request, call_next):
-        return await call_next(request)
-
-    patch_rate_limit = patch.object(
-        RateLimitMiddleware, "dispatch", _pass_through_dispatch
-    )
+    patch_rate_limit = patch.object(RateLimitMiddleware, "__call__", _pass_through)
     patch_rate_limit.start()
 
     # Allow Origin http://test for CSRF in integration tests
@@ -0,0 +1,136 @@
+"""Integration tests for bulk usage ingestion against PostgreSQL.
+
+Covers idempotent inserts, per-user quota updates and the per-event
+fallback for batches that cross a quota limit.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import User
+from src.database.models import UsageQuota, UsageRecord
+from src.routes.billing import UsageEventInput, _record_usage_batch
+from tests.integration.conftest import create_test_agent, create_test_session
+
+
+async def _create_token_quota(
+    db: AsyncSession, user: User, limit_value: int, current_usage: int = 0
+) -> None:
+    db.add(
+        UsageQuota(
+            user_id=user.id,
+            quota_type="tokens",
+            limit_value=limit_value,
+            current_usage=current_usage,
+            overage_allowed=False,
+        )
+    )
+    await db.commit()
+
+
+def _token_event(user: User, **fields: object) -> UsageEventInput:
+    return UsageEventInput(
+        **{
+            "id": f"evt-{uuid4().hex}",
+            "user_id": user.id,
+            "usage_type": "tokens",
+            "unit": "tokens",
+            "quantity": 300,
+            "input_tokens": 200,
+            "output_tokens": 100,
+            "model": "claude-sonnet-4.5",
+            **fields,
+        }
+    )
+
+
+async def _token_usage(db: AsyncSession, user: User) -> int:
+    result = await db.execute(
+        select(UsageQuota.current_usage).where(
+            UsageQuota.user_id == user.id, UsageQuota.quota_type == "tokens"
+        )
+    )
+    return result.scalar_one()
+
+
+async def _record_count(db: AsyncSession, user: User) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(UsageRecord).where(UsageRecord.user_id == user.id)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.integration
+async def test_bulk_records_batch_and_updates_quota(
+    integration_db: AsyncSession, test_user_with_db: User
+) -> None:
+    """A batch is inserted with snapshot names and one quota update."""
+    user = test_user_with_db
+    await _create_token_quota(integration_db, user, limit_value=1_000_000)
+    session = await create_test_session(integration_db, user, name="Billing session")
+    agent = await create_test_agent(integration_db, session.id, name="Coder")
+    events = [_token_event(user, session_id=session.id, agent_id=agent.id) for _ in range(5)]
+
+    results = await _record_usage_batch(integration_db, events)
+    await integration_db.commit()
+
+    assert results == [(True, None)] * 5
+    assert await _record_count(integration_db, user) == 10
+    assert await _token_usage(integration_db, user) >= 5 * 300
+    record = (
+        await integration_db.execute(
+            select(UsageRecord).where(UsageRecord.user_id == user.id).limit(1)
+        )
+    ).scalar_one()
+    assert (record.session_name, record.agent_name) == ("Billing session", "Coder")
+
+
+@pytest.mark.integration
+async def test_bulk_replay_is_idempotent(
+    integration_db: AsyncSession, test_user_with_db: User
+) -> None:
+    """Replaying a batch records nothing and does not add quota usage."""
+    user = test_user_with_db
+    await _create_token_quota(integration_db, user, limit_value=1_000_000)
+    events = [_token_event(user) for _ in range(3)]
+
+    await _record_usage_batch(integration_db, events)
+    await integration_db.commit()
+    usage = await _token_usage(integration_db, user)
+
+    results = await _record_usage_batch(integration_db, [*events, events[0]])
+    await integration_db.commit()
+
+    assert results == [(True, None)] * 4
+    assert await _record_count(integration_db, user) == 6
+    assert await _token_usage(integration_db, user) == usage
+
+
+@pytest.mark.integration
+async def test_bulk_falls_back_when_quota_crossed(
+    integration_db: AsyncSession, test_user_with_db: User
+) -> None:
+    """A batch crossing the quota is handled event by event."""
+    user = test_user_with_db
+    await _create_token_quota(integration_db, user, limit_value=500)
+    events = [_token_event(user) for _ in range(2)]
+
+    results = await _record_usage_batch(integration_db, events)
+    await integration_db.commit()
+
+    assert results[0] == (True, None)
+    assert results[1] == (False, "Token quota exceeded and overage not allowed")
+    assert await _record_count(integration_db, user) == 2
+
+
+@pytest.mark.integration
+async def test_bulk_rejects_missing_token_quota(
+    integration_db: AsyncSession, test_user_with_db: User
+) -> None:
+    """Billable token usage without a quota record is rejected."""
+    results = await _record_usage_batch(integration_db, [_token_event(test_user_with_db)])
+
+    assert results == [(False, "Usage quota not configured. Please contact support.")]
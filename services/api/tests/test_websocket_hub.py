@@ -1,7 +1,9 @@
 """Comprehensive tests for WebSocket hub."""
 
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pycrdt
 import pytest
 from jose import jwt as jose_jwt
 
@@ -288,6 +290,41 @@ class TestWebSocketEvents:
 
             mock_sio.emit.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_emit_agent_token_targets_both_token_rooms(self, mock_sio: MagicMock) -> None:
+        """Test coalesced tokens go out as agent_token and agent_token_batch."""
+        from src.websocket.hub import emit_agent_token
+
+        with patch("src.websocket.hub.sio", mock_sio):
+            await emit_agent_token("session-1", "agent-1", "ab", "msg-1", tokens=["a", "b"])
+
+        (legacy_event, legacy), (batch_event, batch) = [
+            (call.args[0], call) for call in mock_sio.emit.call_args_list
+        ]
+        assert legacy_event == "agent_token"
+        assert legacy.args[1]["token"] == "ab"
+        assert legacy.kwargs["room"] == "session:session-1:tokens"
+        assert batch_event == "agent_token_batch"
+        assert batch.args[1]["tokens"] == ["a", "b"]
+        assert batch.kwargs["room"] == "session:session-1:token_batches"
+
+    @pytest.mark.asyncio
+    async def test_emit_agent_token_skips_legacy_event_when_disabled(
+        self, mock_sio: MagicMock
+    ) -> None:
+        """Test each batch is emitted once when legacy token events are off."""
+        from src.websocket.hub import emit_agent_token
+
+        with (
+            patch("src.websocket.hub.sio", mock_sio),
+            patch("src.websocket.hub.settings.STREAMING_LEGACY_TOKEN_EVENTS", False),
+        ):
+            await emit_agent_token("session-1", "agent-1", "ab", "msg-1", tokens=["a", "b"])
+
+        mock_sio.emit.assert_called_once()
+        assert mock_sio.emit.call_args.args[0] == "agent_token_batch"
+        assert mock_sio.emit.call_args.kwargs["room"] == "session:session-1:token_batches"
+
 
 class TestTerminalEvents:
     """Tests for terminal WebSocket events."""
@@ -435,6 +472,196 @@ class TestYjsEvents:
 
             mock_sio.emit.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_yjs_subscribe_sends_snapshot_and_tail(self, mock_sio: MagicMock) -> None:
+        """Test yjs_subscribe serves the snapshot plus unmerged updates in one sync."""
+        from src.websocket.hub import yjs_subscribe
+
+        storage = MagicMock()
+        storage.get_doc_with_updates = AsyncMock(return_value=(b"snap", [b"u1", b"u2"]))
+
+        with (
+            patch("src.websocket.hub.sio", mock_sio),
+            patch("src.websocket.hub.yjs_storage", storage),
+        ):
+            await yjs_subscribe("sid-123", {"session_id": "s1", "doc_name": "file:/a.py"})
+
+        event, payload = mock_sio.emit.call_args.args
+        assert event == "yjs_sync"
+        assert payload["state"] == "c25hcA=="
+        assert payload["updates"] == ["dTE=", "dTI="]
+        assert mock_sio.emit.call_args.kwargs == {"to": "sid-123"}
+
+    @pytest.mark.asyncio
+    async def test_yjs_update_over_limit_schedules_compaction(self, mock_sio: MagicMock) -> None:
+        """Test that exceeding the update limit merges instead of discarding updates."""
+        from src.websocket.hub import yjs_update
+
+        storage = MagicMock()
+        storage.add_update = AsyncMock(return_value=MAX_YJS_UPDATES_PER_DOC + 1)
+        storage.clear_updates = AsyncMock()
+
+        with (
+            patch("src.websocket.hub.sio", mock_sio),
+            patch("src.websocket.hub.yjs_storage", storage),
+        ):
+            await yjs_update(
+                "sid-123", {"session_id": "s1", "doc_name": "file:/a.py", "update": "dTE="}
+            )
+
+        storage.schedule_compaction.assert_called_once_with("s1", "file:/a.py")
+        storage.clear_updates.assert_not_called()
+        mock_sio.emit.assert_called_once()
+
+
+class TestYjsCompaction:
+    """Tests for merging Yjs updates into the stored snapshot."""
+
+    class FakePipeline:
+        """Minimal redis-py transactional pipeline over a dict."""
+
+        def __init__(self, data: dict[str, Any], watch_error: bool = False) -> None:
+            self.data = data
+            self.watch_error = watch_error
+            self.buffered = True
+            self.queued: list[tuple[str, tuple[Any, ...]]] = []
+
+        async def __aenter__(self) -> Any:
+            return self
+
+        async def __aexit__(self, *args: object) -> None:
+            return None
+
+        async def watch(self, *_keys: str) -> None:
+            self.buffered = False
+
+        def multi(self) -> None:
+            self.buffered = True
+
+        def _command(self, op: str, *args: Any) -> Any:
+            if self.buffered:
+                self.queued.append((op, args))
+                return self
+
+            async def immediate() -> Any:
+                return self._apply(op, args)
+
+            return immediate()
+
+        def _apply(self, op: str, args: tuple[Any, ...]) -> Any:
+            if op == "get":
+                return self.data.get(args[0])
+            if op == "lrange":
+                return list(self.data.get(args[0], []))
+            if op == "setex":
+                self.data[args[0]] = args[2]
+            elif op == "ltrim":
+                self.data[args[0]] = self.data[args[0]][args[1] :]
+            return True
+
+        def get(self, key: str) -> Any:
+            return self._command("get", key)
+
+        def lrange(self, key: str, start: int, end: int) -> Any:
+            return self._command("lrange", key, start, end)
+
+        def setex(self, key: str, ttl: int, value: bytes) -> Any:
+            return self._command("setex", key, ttl, value)
+
+        def ltrim(self, key: str, start: int, end: int) -> Any:
+            return self._command("ltrim", key, start, end)
+
+        async def execute(self) -> list[Any]:
+            from redis.exceptions import WatchError
+
+            if self.watch_error:
+                raise WatchError
+            return [self._apply(op, args) for op, args in self.queued]
+
+    @staticmethod
+    def _text_updates(*chunks: str) -> list[bytes]:
+        doc = pycrdt.Doc()
+        text = doc.get("content", type=pycrdt.Text)
+        updates: list[bytes] = []
+        doc.observe(lambda event: updates.append(event.update))
+        for chunk in chunks:
+            with doc.transaction():
+                text += chunk
+        return updates
+
+    @pytest.mark.asyncio
+    async def test_compact_merges_updates_into_snapshot(self) -> None:
+        """Test compaction writes a merged snapshot and trims merged updates."""
+        from src.websocket.hub import YJS_DOC_KEY, YJS_UPDATES_KEY, YjsStorage
+
+        doc_key = YJS_DOC_KEY.format(session_id="s1", doc_name="d")
+        updates_key = YJS_UPDATES_KEY.format(session_id="s1", doc_name="d")
+        data: dict[str, Any] = {updates_key: self._text_updates("hello", " world")}
+        redis = MagicMock()
+        redis.pipeline = MagicMock(side_effect=lambda **_: self.FakePipeline(data))
+        storage = YjsStorage()
+        storage._redis = redis
+        storage._initialized = True
+
+        assert await storage.compact("s1", "d") is True
+
+        assert data[updates_key] == []
+        doc = pycrdt.Doc()
+        doc.apply_update(data[doc_key])
+        assert str(doc.get("content", type=pycrdt.Text)) == "hello world"
+
+    @pytest.mark.asyncio
+    async def test_compact_keeps_updates_appended_during_merge(self) -> None:
+        """Test compaction only trims the updates it merged."""
+        from src.websocket.hub import YJS_UPDATES_KEY, YjsStorage
+
+        updates_key = YJS_UPDATES_KEY.format(session_id="s1", doc_name="d")
+        first, second, late = self._text_updates("a", "b", "c")
+        data: dict[str, Any] = {updates_key: [first, second]}
+        redis = MagicMock()
+
+        def pipeline(**_: Any) -> Any:
+            pipe = self.FakePipeline(data)
+            original_multi = pipe.multi
+
+            def multi() -> None:
+                data[updates_key].append(late)  # Arrives while merging
+                original_multi()
+
+            pipe.multi = multi  # type: ignore[method-assign]
+            return pipe
+
+        redis.pipeline = MagicMock(side_effect=pipeline)
+        storage = YjsStorage()
+        storage._redis = redis
+        storage._initialized = True
+
+        assert await storage.compact("s1", "d") is True
+        assert data[updates_key] == [late]
+
+        snapshot, tail = await storage.get_doc_with_updates("s1", "d")
+        assert snapshot is not None
+        assert tail == [late]
+
+    @pytest.mark.asyncio
+    async def test_compact_yields_to_concurrent_writer(self) -> None:
+        """Test a compaction that loses the WATCH race leaves the data untouched."""
+        from src.websocket.hub import YJS_UPDATES_KEY, YjsStorage
+
+        updates_key = YJS_UPDATES_KEY.format(session_id="s1", doc_name="d")
+        updates = self._text_updates("hello")
+        data: dict[str, Any] = {updates_key: list(updates)}
+        redis = MagicMock()
+        redis.pipeline = MagicMock(
+            side_effect=lambda **_: self.FakePipeline(data, watch_error=True)
+        )
+        storage = YjsStorage()
+        storage._redis = redis
+        storage._initialized = True
+
+        assert await storage.compact("s1", "d") is False
+        assert data[updates_key] == updates
+
 
 class TestVoiceEvents:
     """Tests for voice streaming events."""
@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
 
 from src.middleware import auth as auth_mw
 
@@ -42,3 +47,47 @@ def test_is_internal_or_user_path() -> None:
     assert auth_mw._is_internal_or_user_path("/api/servers") is True
     assert auth_mw._is_internal_or_user_path("/api/billing/hardware-specs") is True
     assert auth_mw._is_internal_or_user_path("/api/other") is False
+
+
+def _client() -> TestClient:
+    async def endpoint(request: Request) -> JSONResponse:
+        return JSONResponse({"user_id": getattr(request.state, "user_id", None)})
+
+    app = Starlette(
+        routes=[
+            Route("/api/billing/plans", endpoint),
+            Route("/api/agent-tools", endpoint),
+            Route("/api/sessions", endpoint),
+        ]
+    )
+    app.add_middleware(auth_mw.AuthMiddleware)
+    return TestClient(app)
+
+
+def test_public_path_skips_auth(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Public paths are passed through without reading credentials."""
+    monkeypatch.setattr(auth_mw, "Request", None)
+
+    response = _client().get("/api/billing/plans")
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": None}
+
+
+def test_internal_token_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth_mw.settings, "INTERNAL_SERVICE_TOKEN", "service-secret")
+    client = _client()
+
+    allowed = client.get("/api/agent-tools", headers={"X-Internal-Service-Token": "service-secret"})
+    rejected = client.get("/api/agent-tools", headers={"X-Internal-Service-Token": "wrong"})
+
+    assert allowed.status_code == 200
+    assert rejected.status_code == 401
+    assert rejected.json() == {"detail": "Invalid service token"}
+
+
+def test_protected_path_requires_token() -> None:
+    response = _client().get("/api/sessions")
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Authentication required"}
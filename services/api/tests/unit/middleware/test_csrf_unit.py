@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
 
 from src.middleware import csrf as csrf_mw
 
@@ -35,3 +40,33 @@ def test_is_allowed_origin_wildcard_development(monkeypatch: pytest.MonkeyPatch)
     monkeypatch.setattr(csrf_mw.settings, "ENVIRONMENT", "development")
 
     assert csrf_mw._is_allowed_origin("https://localhost:3000") is True
+
+
+def _client() -> TestClient:
+    async def endpoint(_request: Request) -> JSONResponse:
+        return JSONResponse({"ok": True})
+
+    app = Starlette(routes=[Route("/api/things", endpoint, methods=["GET", "POST"])])
+    app.add_middleware(csrf_mw.CSRFMiddleware)
+    return TestClient(app)
+
+
+def test_middleware_rejects_invalid_origin(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(csrf_mw.settings, "CORS_ORIGINS_RAW", '["https://app.example.com"]')
+    monkeypatch.setattr(csrf_mw.settings, "ENVIRONMENT", "production")
+    client = _client()
+
+    rejected = client.post("/api/things", headers={"Origin": "https://evil.com"})
+    allowed = client.post("/api/things", headers={"Origin": "https://app.example.com"})
+
+    assert rejected.status_code == 403
+    assert rejected.json() == {"detail": "Invalid request origin"}
+    assert allowed.status_code == 200
+
+
+def test_middleware_skips_safe_methods(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(csrf_mw.settings, "ENVIRONMENT", "production")
+
+    response = _client().get("/api/things", headers={"Origin": "https://evil.com"})
+
+    assert response.status_code == 200
@@ -0,0 +1,84 @@
+"""Unit tests for gzip request body decompression middleware."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.middleware.decompression import (
+    InvalidGzipBodyError,
+    RequestBodyTooLargeError,
+    RequestDecompressionMiddleware,
+    gunzip_body,
+)
+
+
+async def _echo(request: Request) -> JSONResponse:
+    return JSONResponse(
+        {
+            "body": (await request.body()).decode(),
+            "content_encoding": request.headers.get("content-encoding"),
+            "content_length": request.headers.get("content-length"),
+        }
+    )
+
+
+def _client(max_body_size: int = 1024) -> TestClient:
+    app = Starlette(routes=[Route("/echo", _echo, methods=["POST"])])
+    app.add_middleware(RequestDecompressionMiddleware, max_body_size=max_body_size)
+    return TestClient(app)
+
+
+def test_gzip_body_inflated() -> None:
+    payload = json.dumps({"events": [{"id": "evt-1"}]})
+
+    response = _client().post(
+        "/echo", content=gzip.compress(payload.encode()), headers={"Content-Encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "body": payload,
+        "content_encoding": None,
+        "content_length": str(len(payload)),
+    }
+
+
+def test_plain_body_untouched() -> None:
+    response = _client().post("/echo", content=b'{"events": []}')
+
+    assert response.json()["body"] == '{"events": []}'
+
+
+def test_invalid_gzip_rejected() -> None:
+    response = _client().post("/echo", content=b"not gzip", headers={"Content-Encoding": "gzip"})
+
+    assert response.status_code == 400
+
+
+def test_decompression_bomb_rejected() -> None:
+    """A small compressed body that inflates past the limit is rejected."""
+    compressed = gzip.compress(b"0" * 100_000)
+    assert len(compressed) < 1024
+
+    response = _client().post("/echo", content=compressed, headers={"Content-Encoding": "gzip"})
+
+    assert response.status_code == 413
+
+
+def test_gunzip_body_truncated() -> None:
+    with pytest.raises(InvalidGzipBodyError):
+        gunzip_body(gzip.compress(b"x" * 100)[:-10], max_size=1024)
+
+
+def test_gunzip_body_limit() -> None:
+    assert gunzip_body(gzip.compress(b"x" * 1024), max_size=1024) == b"x" * 1024
+    with pytest.raises(RequestBodyTooLargeError):
+        gunzip_body(gzip.compress(b"x" * 1025), max_size=1024)
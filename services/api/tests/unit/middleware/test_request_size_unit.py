@@ -0,0 +1,35 @@
+"""Unit tests for request body size limit middleware."""
+
+from __future__ import annotations
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.middleware.request_size import RequestSizeLimitMiddleware
+
+
+async def _echo(request: Request) -> JSONResponse:
+    return JSONResponse({"size": len(await request.body())})
+
+
+def _client() -> TestClient:
+    app = Starlette(routes=[Route("/echo", _echo, methods=["POST"])])
+    app.add_middleware(RequestSizeLimitMiddleware, max_body_size=2 * 1024 * 1024)
+    return TestClient(app)
+
+
+def test_body_within_limit_passes() -> None:
+    response = _client().post("/echo", content=b"x" * 1024)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 1024}
+
+
+def test_body_over_limit_rejected() -> None:
+    response = _client().post("/echo", content=b"x" * (2 * 1024 * 1024 + 1))
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large. Maximum size is 2MB."}
@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+from typing import TYPE_CHECKING
+
 import pytest
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from starlette.types import Message
 
 from src.middleware import security_headers as sh
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 
 def test_build_csp_directives_production(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(sh.settings, "ENVIRONMENT", "production")
@@ -40,3 +52,51 @@ def test_build_csp_directives_empty_filtered(monkeypatch: pytest.MonkeyPatch) ->
     csp = sh._build_csp_directives()
 
     assert ";;" not in csp
+
+
+def _streaming_app(release: asyncio.Event) -> Starlette:
+    async def stream() -> AsyncIterator[bytes]:
+        yield b"first"
+        await release.wait()
+        yield b"second"
+
+    async def endpoint(_request: Request) -> StreamingResponse:
+        return StreamingResponse(stream(), media_type="text/plain")
+
+    app = Starlette(routes=[Route("/api/stream", endpoint)])
+    app.add_middleware(sh.SecurityHeadersMiddleware)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_headers_added_without_buffering_stream() -> None:
+    """Headers are set on the response start and body chunks are sent as produced."""
+    release = asyncio.Event()
+    messages: list[Message] = []
+    first_chunk = asyncio.Event()
+
+    async def receive() -> Message:
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+        if message.get("body") == b"first":
+            first_chunk.set()
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/stream",
+        "headers": [],
+        "query_string": b"",
+    }
+    task = asyncio.create_task(_streaming_app(release)(scope, receive, send))
+    await asyncio.wait_for(first_chunk.wait(), timeout=1)
+    release.set()
+    await task
+
+    headers = MutableHeaders(raw=messages[0]["headers"])
+    assert headers["x-frame-options"] == "DENY"
+    assert headers["cache-control"] == "no-store, no-cache, must-revalidate, private"
+    assert [m.get("body") for m in messages[1:] if m.get("body")] == [b"first", b"second"]
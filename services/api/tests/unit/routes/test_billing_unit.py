@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
 from unittest.mock import MagicMock
 
 import pytest
 
 from src.routes import billing as billing_module
+from src.services import pricing as pricing_module
 
 
 def test_validate_subscription_transition_same_status() -> None:
@@ -114,3 +116,164 @@ def test_build_plan_response_none_overage_rates() -> None:
     assert resp.overage_compute_rate == 0.0
     assert resp.overage_storage_rate == 0.0
     assert resp.features == {}
+
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+SESSION_ID = "00000000-0000-0000-0000-000000000002"
+AGENT_ID = "00000000-0000-0000-0000-000000000003"
+
+
+def _usage_lookups(**overrides: object) -> billing_module._UsageBatchLookups:
+    lookups = billing_module._UsageBatchLookups(
+        recorded_keys=set(),
+        user_ids={USER_ID},
+        owned_workspaces=set(),
+        agents={AGENT_ID: (SESSION_ID, "Coder")},
+        session_names={SESSION_ID: "My session"},
+        plans={USER_ID: MagicMock(llm_margin_percent=50, compute_margin_percent=0)},
+        tier_rates={"pro": 36000},
+    )
+    for name, value in overrides.items():
+        setattr(lookups, name, value)
+    return lookups
+
+
+def _usage_event(**fields: object) -> billing_module.UsageEventInput:
+    return billing_module.UsageEventInput(
+        **{"id": "evt-1", "user_id": USER_ID, "unit": "tokens", **fields}
+    )
+
+
+def test_plan_usage_event_tokens_rows_and_quota() -> None:
+    """Token events become input/output rows with margin-adjusted quota usage."""
+    event = _usage_event(
+        usage_type="tokens",
+        quantity=1000,
+        input_tokens=600,
+        output_tokens=400,
+        session_id=SESSION_ID,
+        agent_id=AGENT_ID,
+    )
+
+    planned = billing_module._plan_usage_event(event, _usage_lookups())
+
+    assert [row["idempotency_key"] for row in planned.rows] == [
+        f"{USER_ID}:evt-1:input",
+        f"{USER_ID}:evt-1:output",
+    ]
+    assert planned.rows[0]["agent_name"] == "Coder"
+    assert planned.rows[0]["session_name"] == "My session"
+    assert planned.quota_type == "tokens"
+    assert planned.quota_check == 1000
+    assert planned.quota_delta == 1500
+
+
+@pytest.fixture
+def sonnet_pricing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Price claude-sonnet-4 with Anthropic's prompt cache rates."""
+    pricing = pricing_module.ModelPricing(
+        model_id="claude-sonnet-4",
+        display_name="Claude Sonnet 4",
+        provider="anthropic",
+        input_price_per_million=Decimal("3.00"),
+        output_price_per_million=Decimal("15.00"),
+        cached_input_price_per_million=Decimal("0.30"),
+        cache_write_price_per_million=Decimal("3.75"),
+    )
+    monkeypatch.setattr(
+        pricing_module,
+        "get_pricing_from_cache",
+        lambda model: pricing if model == "claude-sonnet-4" else None,
+    )
+
+
+@pytest.mark.usefixtures("sonnet_pricing")
+def test_token_cost_includes_prompt_cache() -> None:
+    """Cache reads and writes are priced at the model's cache rates."""
+    uncached = billing_module._calculate_token_cost_from_db("claude-sonnet-4", 1_000_000, 0)
+    cached = billing_module._calculate_token_cost_from_db(
+        "claude-sonnet-4", 0, 0, cached_input_tokens=1_000_000
+    )
+    written = billing_module._calculate_token_cost_from_db(
+        "claude-sonnet-4", 0, 0, cache_creation_input_tokens=1_000_000
+    )
+
+    assert (uncached, cached, written) == (300, 30, 375)
+
+
+@pytest.mark.usefixtures("sonnet_pricing")
+def test_plan_usage_event_cached_call_is_charged() -> None:
+    """A call served mostly from the prompt cache is billed and counted toward quota."""
+    event = _usage_event(
+        usage_type="tokens",
+        # Quantity as reported before cache tokens were counted
+        quantity=150,
+        model="claude-sonnet-4",
+        input_tokens=100,
+        output_tokens=50,
+        cached_input_tokens=1_000_000,
+        cache_creation_input_tokens=2_000,
+    )
+
+    planned = billing_module._plan_usage_event(event, _usage_lookups())
+
+    input_row, output_row = planned.rows
+    assert input_row["quantity"] == 1_002_100
+    assert input_row["metadata"]["cached_input_tokens"] == 1_000_000
+    # $0.0003 uncached + $0.30 cache reads + $0.0075 cache writes + $0.00075 output
+    assert input_row["base_cost_cents"] + output_row["base_cost_cents"] == 31
+    assert input_row["total_cost_cents"] + output_row["total_cost_cents"] == 47
+    assert planned.quota_check == 1_002_150
+    assert planned.quota_delta == 1_503_225
+
+
+def test_plan_usage_event_external_tokens_skip_quota() -> None:
+    """Usage on the user's own API key is recorded at no cost and no quota."""
+    event = _usage_event(usage_type="tokens", quantity=10, input_tokens=10, usage_source="external")
+
+    planned = billing_module._plan_usage_event(event, _usage_lookups())
+
+    assert planned.quota_type is None
+    assert planned.rows[0]["total_cost_cents"] == 0
+
+
+def test_plan_usage_event_rejects_foreign_workspace_and_agent() -> None:
+    """Workspaces and agents must belong to the user and session."""
+    workspace_event = _usage_event(usage_type="api_calls", quantity=1, workspace_id=SESSION_ID)
+    agent_event = _usage_event(
+        usage_type="tokens", quantity=1, session_id=SESSION_ID, agent_id=USER_ID
+    )
+
+    assert (
+        billing_module._plan_usage_event(workspace_event, _usage_lookups())
+        == "Workspace not found or not owned by user"
+    )
+    assert (
+        billing_module._plan_usage_event(agent_event, _usage_lookups())
+        == "Agent not found in session"
+    )
+
+
+def test_plan_usage_event_compute_cost_from_tier_rate() -> None:
+    """Compute events are priced from the tier's hourly rate."""
+    event = _usage_event(
+        usage_type="compute", quantity=0, unit="seconds", duration_seconds=60, tier="pro"
+    )
+
+    planned = billing_module._plan_usage_event(event, _usage_lookups())
+
+    assert planned.rows[0]["total_cost_cents"] == 600
+    assert planned.rows[0]["unit_price_cents"] == 10
+    assert planned.quota_delta == 600
+
+
+def test_quota_needs_single_path() -> None:
+    """Only batches crossing a quota limit need per-event overage handling."""
+    tokens = MagicMock(quota_type="tokens", current_usage=900, limit_value=1000)
+    storage = MagicMock(
+        quota_type="storage_gb", current_usage=9, limit_value=10, overage_allowed=True
+    )
+
+    assert billing_module._quota_needs_single_path(tokens, 100) is False
+    assert billing_module._quota_needs_single_path(tokens, 101) is True
+    assert billing_module._quota_needs_single_path(storage, 5) is False
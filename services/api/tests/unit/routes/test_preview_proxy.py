@@ -0,0 +1,118 @@
+"""Unit tests for the preview proxy hop from the API to the compute service."""
+
+from __future__ import annotations
+
+import gzip
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from src.routes import preview as preview_module
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+BUNDLE = b"console.log('hello');\n" * 500
+
+
+def _make_request(method: str = "GET", body: bytes = b"") -> Request:
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": "/api/preview/ws-1/proxy/3000/app.js",
+        "query_string": b"v=1",
+        "headers": [(b"host", b"api"), (b"accept-encoding", b"gzip, br")],
+    }
+    sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+
+async def _send_response(response: Any) -> tuple[dict[str, str], bytes]:
+    """Run an ASGI response and return its headers and raw body bytes."""
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    await response({"type": "http"}, receive, send)
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return headers, body
+
+
+@pytest.fixture
+def compute_requests(monkeypatch: pytest.MonkeyPatch) -> list[httpx.Request]:
+    """Route the compute client to a transport serving a gzipped bundle."""
+    seen: list[httpx.Request] = []
+    compressed = gzip.compress(BUNDLE)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(compressed), 256):
+            yield compressed[start : start + 256]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        seen.append(request)
+        return httpx.Response(
+            200,
+            headers={
+                "content-type": "application/javascript",
+                "content-encoding": "gzip",
+                "content-length": str(len(compressed)),
+                "connection": "keep-alive",
+            },
+            content=chunks(),
+        )
+
+    def client(compute_url: str, _user_id: str | None = None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=compute_url, transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(
+        preview_module,
+        "_verify_workspace_access",
+        AsyncMock(return_value=(MagicMock(), "user-1", "http://compute")),
+    )
+    monkeypatch.setattr(preview_module, "_get_compute_client", client)
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_gzip_body_passes_through_undecoded(compute_requests: list[httpx.Request]) -> None:
+    """The compressed body and its encoding headers reach the client unchanged."""
+    response = await preview_module._proxy_to_compute(
+        "ws-1", 3000, "app.js", _make_request(), MagicMock()
+    )
+    headers, body = await _send_response(response)
+
+    assert body == gzip.compress(BUNDLE)
+    assert gzip.decompress(body) == BUNDLE
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(body))
+    assert "connection" not in headers
+    assert str(compute_requests[0].url) == "http://compute/preview/ws-1/proxy/3000/app.js?v=1"
+    assert compute_requests[0].headers["accept-encoding"] == "gzip, br"
+
+
+@pytest.mark.asyncio
+async def test_request_body_is_streamed_to_compute(compute_requests: list[httpx.Request]) -> None:
+    """Mutation bodies are forwarded to the compute service."""
+    response = await preview_module._proxy_to_compute(
+        "ws-1", 3000, "app.js", _make_request("POST", b'{"a": 1}'), MagicMock()
+    )
+    await _send_response(response)
+
+    assert compute_requests[0].content == b'{"a": 1}'
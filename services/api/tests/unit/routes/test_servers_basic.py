@@ -504,6 +504,35 @@ async def test_update_server_applies_fields_and_returns_response(
     assert server.status == "draining"
 
 
+@pytest.mark.asyncio
+async def test_update_server_compute_url_invalidates_placements(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Changing compute_service_url drops the cached placements of the server's workspaces."""
+    monkeypatch.setattr(servers_module.limiter, "enabled", False, raising=False)
+    invalidate = AsyncMock()
+    monkeypatch.setattr(servers_module, "invalidate_workspace_placements", invalidate)
+    server = _make_workspace_server_mock()
+    server.compute_service_url = "http://compute-old:3003"
+    db = AsyncMock()
+    execute_result = MagicMock()
+    execute_result.scalar_one_or_none.return_value = server
+    execute_result.scalars.return_value.all.return_value = ["ws-1", "ws-2"]
+    db.execute.return_value = execute_result
+
+    for url in ("http://compute-new:3003", "http://compute-new:3003"):
+        await servers_module.update_server(
+            server_id=server.id,
+            request=_make_admin_request(f"/servers/{server.id}"),
+            response=Response(),
+            data=servers_module.ServerUpdateRequest(compute_service_url=url),
+            db=db,
+        )
+
+    # The second update keeps the same URL, so only the first invalidates
+    invalidate.assert_awaited_once_with(["ws-1", "ws-2"])
+
+
 @pytest.mark.asyncio
 async def test_delete_server_404_when_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
     """delete_server raises 404 when server_id does not exist."""
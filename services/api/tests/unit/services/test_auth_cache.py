@@ -0,0 +1,153 @@
+"""Unit tests for the in-process auth cache."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services import auth_cache, token_blacklist
+from src.services.auth_cache import AuthCache, AuthPrincipal
+
+PRINCIPAL = AuthPrincipal(user_id="user-1", email="a@example.com", role="member", is_active=True)
+
+
+class _FakeRedis:
+    """Redis stub holding the revoked token index as jti -> expiry score."""
+
+    def __init__(self, revoked: dict[str, float]) -> None:
+        self.revoked = revoked
+
+    async def zrangebyscore(self, key: str, min_score: float, max_score: str) -> list[str]:
+        assert key == token_blacklist.REVOKED_TOKENS_KEY
+        assert max_score == "+inf"
+        return [jti for jti, expires in self.revoked.items() if expires >= min_score]
+
+
+async def _synced_cache(revoked: list[str] | None = None) -> AuthCache:
+    cache = AuthCache(principal_ttl=30, resync_interval=60)
+    await cache._reload_revoked(_FakeRedis(dict.fromkeys(revoked or [], time.time() + 3600)))
+    return cache
+
+
+def _message(event: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "message", "data": json.dumps(event)}
+
+
+@pytest.mark.asyncio
+async def test_not_synced_bypasses_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Before the listener has loaded the blacklist, Redis and the DB are used."""
+    redis_check = AsyncMock(return_value=True)
+    monkeypatch.setattr(token_blacklist, "is_token_revoked", redis_check)
+    load = AsyncMock(return_value=PRINCIPAL)
+    cache = AuthCache(principal_ttl=30, resync_interval=60)
+
+    assert await cache.is_token_revoked("jti-1") is True
+    await cache.get_principal("user-1", load)
+    await cache.get_principal("user-1", load)
+
+    redis_check.assert_awaited_once_with("jti-1")
+    assert load.await_count == 2
+    assert cache.get_stats()["principal_bypass"] == 2
+
+
+@pytest.mark.asyncio
+async def test_synced_revocation_check_is_local(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Once synced, revocations are answered from the loaded blacklist."""
+    redis_check = AsyncMock()
+    monkeypatch.setattr(token_blacklist, "is_token_revoked", redis_check)
+    cache = await _synced_cache(["revoked-jti"])
+
+    assert await cache.is_token_revoked("revoked-jti") is True
+    assert await cache.is_token_revoked("other-jti") is False
+    redis_check.assert_not_awaited()
+    assert cache.get_stats()["revocation_local_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_expired_revocations_not_loaded() -> None:
+    """Index entries past their expiry are left out of the revoked set."""
+    cache = AuthCache(principal_ttl=30, resync_interval=60)
+    await cache._reload_revoked(
+        _FakeRedis({"live-jti": time.time() + 60, "expired-jti": time.time() - 60})
+    )
+
+    assert await cache.is_token_revoked("live-jti") is True
+    assert await cache.is_token_revoked("expired-jti") is False
+
+
+@pytest.mark.asyncio
+async def test_revocation_message_applies_immediately() -> None:
+    """Published revocations are added to the local set."""
+    cache = await _synced_cache()
+
+    cache._handle_message(_message({"jtis": ["jti-2"]}))
+
+    assert await cache.is_token_revoked("jti-2") is True
+
+
+@pytest.mark.asyncio
+async def test_principal_cached_until_invalidated() -> None:
+    """A principal is loaded once and dropped by an invalidation message."""
+    load = AsyncMock(return_value=PRINCIPAL)
+    cache = await _synced_cache()
+
+    assert await cache.get_principal("user-1", load) == PRINCIPAL
+    assert await cache.get_principal("user-1", load) == PRINCIPAL
+    assert load.await_count == 1
+
+    cache._handle_message(_message({"user_id": "user-1"}))
+    await cache.get_principal("user-1", load)
+
+    assert load.await_count == 2
+    stats = cache.get_stats()
+    assert (stats["principal_hit"], stats["principal_miss"]) == (1, 2)
+    assert stats["principal_ttl_seconds"] == 30
+
+
+@pytest.mark.asyncio
+async def test_principal_expires_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A cached principal is reloaded once its TTL has passed."""
+    now = [1000.0]
+    monkeypatch.setattr(auth_cache.time, "monotonic", lambda: now[0])
+    load = AsyncMock(return_value=PRINCIPAL)
+    cache = await _synced_cache()
+
+    await cache.get_principal("user-1", load)
+    now[0] += 31
+    await cache.get_principal("user-1", load)
+
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_racing_invalidation_not_cached() -> None:
+    """A principal loaded while an invalidation arrives is not cached."""
+    cache = await _synced_cache()
+
+    async def load(user_id: str) -> AuthPrincipal:
+        cache.drop_principal(user_id)
+        return PRINCIPAL
+
+    await cache.get_principal("user-1", load)
+
+    assert cache.get_stats()["principals"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_sync_falls_back_to_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    """If the blacklist has not been reloaded recently, Redis is checked again."""
+    now = [1000.0]
+    monkeypatch.setattr(auth_cache.time, "monotonic", lambda: now[0])
+    redis_check = AsyncMock(return_value=False)
+    monkeypatch.setattr(token_blacklist, "is_token_revoked", redis_check)
+    cache = await _synced_cache()
+
+    now[0] += 120
+    await cache.is_token_revoked("jti-1")
+
+    assert cache.is_synced is False
+    redis_check.assert_awaited_once_with("jti-1")
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import time
 from datetime import UTC, datetime
 from typing import Any
 
@@ -23,8 +26,10 @@ class FakeRedisClient:
             def __init__(self, parent: "FakeRedisClient") -> None:
                 self.parent = parent
 
-            async def zadd(self, key: str, mapping: dict[str, float]) -> None:
+            async def zadd(self, key: str, mapping: dict[str, float], nx: bool = False) -> None:
                 zs = self.parent.sorted_sets.setdefault(key, {})
+                if nx:
+                    mapping = {k: v for k, v in mapping.items() if k not in zs}
                 zs.update(mapping)
 
             async def zrem(self, key: str, member: str) -> None:
@@ -101,6 +106,10 @@ async def test_subagent_queue_enqueue_and_cancel(monkeypatch: pytest.MonkeyPatch
     pending_ids = await fake_redis.client.zrange(pending_key, 0, -1)
     assert task.id in pending_ids
 
+    # Session should be marked ready so workers pick it up without scanning
+    ready = await fake_redis.client.zrange(tq.SubagentTaskQueue.READY_KEY, 0, -1)
+    assert ready == ["s1"]
+
     # Cancel should update status and move out of queues
     cancelled = await queue.cancel_task(task.id)
     assert cancelled is True
@@ -186,3 +195,88 @@ async def test_approval_request_data_roundtrip() -> None:
     assert restored.approval_id == "ap1"
     assert restored.arguments["path"] == "foo.txt"
     assert isinstance(restored.created_at, datetime)
+
+
+def _subscribed_listener(monkeypatch: pytest.MonkeyPatch) -> tq.TaskCompletionListener:
+    """Completion listener that behaves as if subscribed, without a pub/sub connection."""
+    listener = tq.TaskCompletionListener()
+
+    async def fake_start() -> None:
+        listener._subscribed.set()
+
+    monkeypatch.setattr(listener, "start", fake_start)
+    monkeypatch.setattr(tq, "_completion_listener", listener)
+    return listener
+
+
+def _event(task_id: str, status: str) -> dict[str, Any]:
+    return {"type": "message", "data": json.dumps({"task_id": task_id, "status": status})}
+
+
+@pytest.mark.asyncio
+async def test_completion_listener_resolves_on_terminal_event(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    listener = _subscribed_listener(monkeypatch)
+
+    future = await listener.register("t1")
+    assert listener.outstanding_waiters == 1
+
+    # Non-terminal updates do not wake the waiter
+    listener._handle_message(_event("t1", "running"))
+    assert not future.done()
+
+    listener._handle_message(_event("t1", "completed"))
+    assert future.result() == "completed"
+    assert listener.outstanding_waiters == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_woken_by_event(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_redis = FakeRedisClient()
+
+    async def fake_get_cache_client() -> FakeRedisClient:
+        return fake_redis
+
+    monkeypatch.setattr(tq, "get_cache_client", fake_get_cache_client)
+    listener = _subscribed_listener(monkeypatch)
+
+    queue = tq.AgentTaskQueue()
+    task = await queue.enqueue(session_id="s1", agent_id="a1", message="hi", message_id="m1")
+
+    async def complete_task() -> None:
+        await asyncio.sleep(0.05)
+        task.status = tq.TaskStatus.COMPLETED
+        await queue._save_task(task)
+        listener._handle_message(_event(task.id, "completed"))
+
+    completer = asyncio.create_task(complete_task())
+    start = time.monotonic()
+    # A long fallback poll interval proves the wake-up came from the event
+    result = await queue.wait_for_completion(task.id, timeout=10.0, poll_interval=30.0)
+    await completer
+
+    assert result is not None
+    assert result.status == tq.TaskStatus.COMPLETED
+    assert time.monotonic() - start < 5.0
+    assert listener.outstanding_waiters == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_redis = FakeRedisClient()
+
+    async def fake_get_cache_client() -> FakeRedisClient:
+        return fake_redis
+
+    monkeypatch.setattr(tq, "get_cache_client", fake_get_cache_client)
+    listener = _subscribed_listener(monkeypatch)
+
+    queue = tq.CompactionTaskQueue()
+    task = await queue.enqueue(agent_id="a1", session_id="s1")
+
+    result = await queue.wait_for_completion(task.id, timeout=0.1, poll_interval=0.05)
+
+    assert result is not None
+    assert result.status == tq.TaskStatus.PENDING
+    assert listener.outstanding_waiters == 0
@@ -8,6 +8,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from src.services.token_blacklist import (
+    REVOKED_TOKENS_INDEXED_KEY,
+    REVOKED_TOKENS_KEY,
+    index_existing_revocations,
     is_token_revoked,
     register_user_token,
     revoke_all_user_tokens,
@@ -15,22 +18,37 @@ from src.services.token_blacklist import (
 )
 
 
+def _pipelined_redis() -> tuple[AsyncMock, MagicMock]:
+    """Build a Redis mock whose pipeline records queued commands."""
+    mock_redis = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.execute = AsyncMock()
+    mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
+    return mock_redis, mock_pipeline
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_revoke_token_success():
     """Test successfully revoking a token."""
-    mock_redis = AsyncMock()
-    mock_redis.setex = AsyncMock()
+    mock_redis, mock_pipeline = _pipelined_redis()
 
-    with patch("src.services.token_blacklist._get_redis_client", return_value=mock_redis):
+    with (
+        patch("src.services.token_blacklist._get_redis_client", return_value=mock_redis),
+        patch("src.services.token_blacklist.time.time", return_value=1000.0),
+    ):
         result = await revoke_token("test-jti-123", expires_in_seconds=3600)
 
         assert result is True
-        mock_redis.setex.assert_called_once()
-        call_args = mock_redis.setex.call_args[0]
+        mock_pipeline.setex.assert_called_once()
+        call_args = mock_pipeline.setex.call_args[0]
         assert call_args[0] == "podex:token:blacklist:test-jti-123"
         assert call_args[1] == 3660  # 3600 + 60 buffer
         assert call_args[2] == "revoked"
+        # Indexed with its expiry, pruning entries that have expired
+        mock_pipeline.zadd.assert_called_once_with(REVOKED_TOKENS_KEY, {"test-jti-123": 4660.0})
+        mock_pipeline.zremrangebyscore.assert_called_once_with(REVOKED_TOKENS_KEY, "-inf", 1000.0)
+        mock_pipeline.execute.assert_awaited_once()
 
 
 @pytest.mark.unit
@@ -45,8 +63,8 @@ async def test_revoke_token_empty_jti():
 @pytest.mark.asyncio
 async def test_revoke_token_redis_error():
     """Test revoke token when Redis fails."""
-    mock_redis = AsyncMock()
-    mock_redis.setex = AsyncMock(side_effect=Exception("Redis error"))
+    mock_redis, mock_pipeline = _pipelined_redis()
+    mock_pipeline.execute = AsyncMock(side_effect=Exception("Redis error"))
 
     with patch("src.services.token_blacklist._get_redis_client", return_value=mock_redis):
         result = await revoke_token("test-jti-123", expires_in_seconds=3600)
@@ -58,14 +76,13 @@ async def test_revoke_token_redis_error():
 @pytest.mark.asyncio
 async def test_revoke_token_minimum_ttl():
     """Test revoke token with very short expiry uses minimum TTL."""
-    mock_redis = AsyncMock()
-    mock_redis.setex = AsyncMock()
+    mock_redis, mock_pipeline = _pipelined_redis()
 
     with patch("src.services.token_blacklist._get_redis_client", return_value=mock_redis):
         result = await revoke_token("test-jti-123", expires_in_seconds=10)
 
         assert result is True
-        call_args = mock_redis.setex.call_args[0]
+        call_args = mock_pipeline.setex.call_args[0]
         # Should use minimum of 60 seconds
         assert call_args[1] == 70  # max(10 + 60, 60) = 70
 
@@ -127,6 +144,8 @@ async def test_revoke_all_user_tokens_success():
     mock_redis.smembers = AsyncMock(return_value={"jti1", "jti2", "jti3"})
     mock_pipeline = AsyncMock()
     mock_pipeline.setex = MagicMock()
+    mock_pipeline.zadd = MagicMock()
+    mock_pipeline.zremrangebyscore = MagicMock()
     mock_pipeline.delete = MagicMock()
     mock_pipeline.execute = AsyncMock()
     mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
@@ -144,6 +163,10 @@ async def test_revoke_all_user_tokens_success():
             assert mock_pipeline.setex.call_count == 3
             # Should delete the user tokens set
             mock_pipeline.delete.assert_called_once_with("podex:user:tokens:user123")
+            # Every revoked jti should be added to the revoked index
+            indexed = mock_pipeline.zadd.call_args[0]
+            assert indexed[0] == REVOKED_TOKENS_KEY
+            assert set(indexed[1]) == {"jti1", "jti2", "jti3"}
 
 
 @pytest.mark.unit
@@ -230,3 +253,42 @@ async def test_register_user_token_minimum_ttl():
 
         assert result is True
         mock_redis.expire.assert_called_once_with("podex:user:tokens:user123", 70)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_index_existing_revocations():
+    """Blacklist keys from before the revoked index are added to it once."""
+    mock_redis, mock_pipeline = _pipelined_redis()
+    mock_redis.exists = AsyncMock(return_value=0)
+    mock_pipeline.execute = AsyncMock(return_value=[120, -2])
+
+    async def scan_iter(match: str, count: int):
+        for key in ("podex:token:blacklist:jti1", "podex:token:blacklist:gone"):
+            yield key
+
+    mock_redis.scan_iter = scan_iter
+
+    with (
+        patch("src.services.token_blacklist._get_redis_client", return_value=mock_redis),
+        patch("src.services.token_blacklist.time.time", return_value=1000.0),
+    ):
+        await index_existing_revocations()
+
+    mock_redis.zadd.assert_awaited_once_with(REVOKED_TOKENS_KEY, {"jti1": 1120.0})
+    mock_redis.set.assert_awaited_once_with(REVOKED_TOKENS_INDEXED_KEY, "1")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_index_existing_revocations_runs_once():
+    """Once indexed, the blacklist keys are not scanned again."""
+    mock_redis = AsyncMock()
+    mock_redis.exists = AsyncMock(return_value=1)
+    mock_redis.scan_iter = MagicMock()
+
+    with patch("src.services.token_blacklist._get_redis_client", return_value=mock_redis):
+        await index_existing_revocations()
+
+    mock_redis.scan_iter.assert_not_called()
+    mock_redis.zadd.assert_not_awaited()
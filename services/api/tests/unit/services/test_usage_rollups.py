@@ -0,0 +1,141 @@
+"""Unit tests for the admin analytics usage rollups."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services import usage_rollups
+from src.services.usage_rollups import (
+    RollupMismatch,
+    check_usage_rollups,
+    refresh_usage_rollups,
+    rollup_usage,
+    usage_rollup_window,
+)
+
+
+def _sql(statement: Any) -> str:
+    return str(
+        statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+
+def _db(*results: Any) -> AsyncMock:
+    db = AsyncMock()
+    db.execute.side_effect = list(results)
+    return db
+
+
+@pytest.mark.asyncio
+async def test_rollup_usage_rebuilds_whole_hours_and_days() -> None:
+    """The range is widened to whole hours and the touched days are re-summed."""
+    insert_result = MagicMock(rowcount=7)
+    db = _db(MagicMock(), insert_result, MagicMock(), MagicMock())
+
+    written = await rollup_usage(
+        db,
+        datetime(2026, 3, 1, 22, 15, tzinfo=UTC),
+        datetime(2026, 3, 2, 0, 5, tzinfo=UTC),
+    )
+
+    assert written == 7
+    delete_hourly, insert_hourly, delete_daily, insert_daily = (
+        _sql(call.args[0]) for call in db.execute.call_args_list
+    )
+    assert "usage_rollups_hourly.bucket_start >= '2026-03-01 22:00:00+00:00'" in delete_hourly
+    assert "usage_rollups_hourly.bucket_start < '2026-03-02 01:00:00+00:00'" in delete_hourly
+    assert insert_hourly.startswith("INSERT INTO usage_rollups_hourly")
+    assert "date_trunc('hour', usage_records.created_at)" in insert_hourly
+    assert "GROUP BY raw_usage.bucket_start, raw_usage.usage_type" in insert_hourly
+    assert "usage_rollups_daily.bucket_date >= '2026-03-01'" in delete_daily
+    assert "usage_rollups_daily.bucket_date < '2026-03-03'" in delete_daily
+    assert insert_daily.startswith("INSERT INTO usage_rollups_daily")
+    assert "FROM usage_rollups_hourly" in insert_daily
+
+
+@pytest.mark.asyncio
+async def test_rollup_usage_empty_range() -> None:
+    """An empty range writes nothing."""
+    db = _db()
+    moment = datetime(2026, 3, 1, 12, tzinfo=UTC)
+
+    assert await rollup_usage(db, moment, moment) == 0
+    db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_refresh_starts_before_latest_rollup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Refresh rebuilds from the latest hourly rollup minus the lookback."""
+    latest = MagicMock()
+    latest.scalar.return_value = datetime(2026, 3, 1, 10, tzinfo=UTC)
+    rollup = AsyncMock(return_value=3)
+    monkeypatch.setattr(usage_rollups, "rollup_usage", rollup)
+    db = _db(latest)
+    now = datetime(2026, 3, 1, 10, 40, tzinfo=UTC)
+
+    assert await refresh_usage_rollups(db, now=now) == 3
+    rollup.assert_awaited_once_with(db, datetime(2026, 3, 1, 8, tzinfo=UTC), now)
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_rollups_starts_today(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With no rollups yet, refresh only rolls up the current day."""
+    latest = MagicMock()
+    latest.scalar.return_value = None
+    rollup = AsyncMock(return_value=0)
+    monkeypatch.setattr(usage_rollups, "rollup_usage", rollup)
+    db = _db(latest)
+    now = datetime(2026, 3, 1, 10, 40, tzinfo=UTC)
+
+    await refresh_usage_rollups(db, now=now)
+
+    rollup.assert_awaited_once_with(db, datetime(2026, 3, 1, tzinfo=UTC), now)
+
+
+@pytest.mark.asyncio
+async def test_check_reports_differing_totals() -> None:
+    """Only days and usage types whose totals differ are reported."""
+    day = date(2026, 3, 1)
+    raw = MagicMock()
+    raw.tuples.return_value = [
+        (day, "tokens_input", 100, 5, 2),
+        (day, "compute_seconds", 60, 1, 1),
+    ]
+    rolled = MagicMock()
+    rolled.tuples.return_value = [
+        (day, "tokens_input", 100, 5, 2),
+        (day, "storage_gb", 10, 0, 1),
+    ]
+    db = _db(raw, rolled)
+
+    mismatches = await check_usage_rollups(db, day, day)
+
+    assert mismatches == [
+        RollupMismatch(day, "compute_seconds", raw=(60, 1, 1), rollup=(0, 0, 0)),
+        RollupMismatch(day, "storage_gb", raw=(0, 0, 0), rollup=(10, 0, 1)),
+    ]
+
+
+def test_usage_rollup_window_splits_hourly_and_daily() -> None:
+    """The first partial day reads hourly rollups, later days read daily ones."""
+    sql = _sql(usage_rollup_window(datetime(2026, 3, 1, 9, 30, tzinfo=UTC)).select())
+
+    assert "usage_rollups_hourly.bucket_start >= '2026-03-01 09:00:00+00:00'" in sql
+    assert "usage_rollups_hourly.bucket_start < '2026-03-02 00:00:00+00:00'" in sql
+    assert "UNION ALL" in sql
+    assert "usage_rollups_daily.bucket_date >= '2026-03-02'" in sql
+
+
+def test_usage_rollup_window_reads_unrolled_usage_raw() -> None:
+    """Usage from before the earliest hourly rollup is read from usage_records."""
+    sql = _sql(usage_rollup_window(datetime(2026, 3, 1, 9, 30, tzinfo=UTC)).select())
+
+    assert "FROM usage_records" in sql
+    assert "usage_records.created_at >= '2026-03-01 09:30:00+00:00'" in sql
+    assert "min(usage_rollups_hourly.bucket_start)" in sql
+    assert sql.count("UNION ALL") == 2
@@ -241,6 +241,7 @@ class TestStreamSubscriber:
                 "tool_call_id": "tc-001",
                 "tool_name": "read_file",
                 "tool_input": {"path": "/test.txt"},
+                "duration_ms": 42,
             }
             await subscriber._handle_message(data)
 
@@ -250,6 +251,7 @@ class TestStreamSubscriber:
                 tool_call_id="tc-001",
                 tool_name="read_file",
                 result={"path": "/test.txt"},
+                duration_ms=42,
             )
 
     @pytest.mark.asyncio
@@ -315,6 +317,38 @@ class TestStreamSubscriber:
         # Should not raise
         await subscriber._handle_message(data)
 
+    @pytest.mark.asyncio
+    async def test_fast_tokens_coalesced_before_done(self):
+        """Test buffered tokens are emitted as one batch ahead of the stream end."""
+        subscriber = StreamSubscriber()
+        base = {"session_id": "session-123", "agent_id": "agent-456", "message_id": "msg-789"}
+        calls: list[str] = []
+
+        with (
+            patch(
+                "src.streaming.subscriber.emit_agent_token",
+                new_callable=AsyncMock,
+                side_effect=lambda **_kw: calls.append("token"),
+            ) as mock_token,
+            patch(
+                "src.streaming.subscriber.emit_agent_stream_end",
+                new_callable=AsyncMock,
+                side_effect=lambda **_kw: calls.append("end"),
+            ),
+        ):
+            for token in ["Hello", ",", " world"]:
+                await subscriber._handle_message({**base, "event_type": "token", "content": token})
+            await subscriber._handle_message({**base, "event_type": "done", "content": ""})
+
+        assert calls == ["token", "token", "end"]
+        assert mock_token.call_args_list[1].kwargs == {
+            "session_id": "session-123",
+            "agent_id": "agent-456",
+            "token": ", world",
+            "message_id": "msg-789",
+            "tokens": [",", " world"],
+        }
+
 
 @pytest.mark.unit
 class TestGetStreamSubscriber:
@@ -0,0 +1,155 @@
+"""Unit tests for sequenced terminal output from local pods."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.websocket import local_pod_hub
+from src.websocket.local_pod_hub import LocalPodNamespace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def forwarded(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[str]]:
+    """Register a pod connection and capture forwarded output."""
+    output: list[str] = []
+
+    async def forward(_session_id: str | None, _workspace_id: str | None, data: str) -> None:
+        output.append(data)
+
+    monkeypatch.setattr(local_pod_hub, "_forward_terminal_output", forward)
+    monkeypatch.setitem(local_pod_hub._sid_to_pod, "sid-1", "pod-1")
+    yield output
+    local_pod_hub._terminal_stream_seqs.clear()
+    local_pod_hub._terminal_stream_locks.clear()
+
+
+def _frame(seq: int, data: str, stream_id: str = "stream-a") -> dict[str, Any]:
+    return {
+        "session_id": "term-1",
+        "workspace_id": "ws-1",
+        "data": data,
+        "type": "stream",
+        "stream_id": stream_id,
+        "seq": seq,
+    }
+
+
+@pytest.mark.asyncio
+async def test_forwards_frames_in_sequence(forwarded: list[str]) -> None:
+    namespace = LocalPodNamespace()
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+    await namespace.on_terminal_output("sid-1", _frame(2, "b"))
+
+    assert forwarded == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_drops_duplicate_frames(forwarded: list[str]) -> None:
+    namespace = LocalPodNamespace()
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+
+    assert forwarded == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_replays_gap_before_forwarding(
+    forwarded: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    call_pod = AsyncMock(
+        return_value={
+            "stream_id": "stream-a",
+            "last_seq": 4,
+            "frames": [
+                {"seq": 2, "data": "b"},
+                {"seq": 3, "data": "c"},
+                {"seq": 4, "data": "d"},
+            ],
+            "complete": True,
+        }
+    )
+    monkeypatch.setattr(local_pod_hub, "call_pod", call_pod)
+    namespace = LocalPodNamespace()
+
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+    await namespace.on_terminal_output("sid-1", _frame(4, "d"))
+
+    assert forwarded == ["a", "b", "c", "d"]
+    call_pod.assert_awaited_once()
+    assert call_pod.await_args.args[1:3] == (
+        "terminal.replay",
+        {"session_id": "term-1", "after_seq": 1},
+    )
+
+
+@pytest.mark.asyncio
+async def test_forwards_frame_when_replay_fails(
+    forwarded: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(local_pod_hub, "call_pod", AsyncMock(side_effect=TimeoutError))
+    namespace = LocalPodNamespace()
+
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+    await namespace.on_terminal_output("sid-1", _frame(3, "c"))
+    await namespace.on_terminal_output("sid-1", _frame(2, "b"))
+
+    assert forwarded == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_new_stream_restarts_sequence(forwarded: list[str]) -> None:
+    namespace = LocalPodNamespace()
+    await namespace.on_terminal_output("sid-1", _frame(5, "old"))
+    await namespace.on_terminal_output("sid-1", _frame(1, "new", stream_id="stream-b"))
+
+    assert forwarded == ["old", "new"]
+
+
+@pytest.mark.asyncio
+async def test_first_frame_is_baseline(
+    forwarded: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    call_pod = AsyncMock()
+    monkeypatch.setattr(local_pod_hub, "call_pod", call_pod)
+    namespace = LocalPodNamespace()
+
+    await namespace.on_terminal_output("sid-1", _frame(7, "g"))
+
+    assert forwarded == ["g"]
+    call_pod.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_closed_terminal_is_forgotten(forwarded: list[str]) -> None:
+    namespace = LocalPodNamespace()
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+
+    local_pod_hub.forget_terminal_stream("term-1")
+
+    assert forwarded == ["a"]
+    assert local_pod_hub._terminal_stream_seqs == {}
+    assert local_pod_hub._terminal_stream_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_disconnected_pod_is_forgotten_after_grace(
+    forwarded: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(local_pod_hub, "TERMINAL_STREAM_RECONNECT_GRACE", 0)
+    monkeypatch.setattr(local_pod_hub, "_get_pod_connection", AsyncMock(return_value=None))
+    namespace = LocalPodNamespace()
+    await namespace.on_terminal_output("sid-1", _frame(1, "a"))
+
+    await namespace.on_disconnect("sid-1")
+    await local_pod_hub._terminal_stream_cleanup["pod-1"]
+
+    assert forwarded == ["a"]
+    assert local_pod_hub._terminal_stream_seqs == {}
+    assert local_pod_hub._terminal_stream_locks == {}
+    assert "pod-1" not in local_pod_hub._terminal_stream_cleanup
@@ -0,0 +1,265 @@
+"""Unit tests for the realtime cost tracker's running totals.
+
+Tests cover:
+- Session, agent and model totals maintained on write
+- User totals over since windows and daily buckets
+- Memoized pricing lookups
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Self
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import src.services.pricing as pricing_module
+from src.cost import realtime_tracker
+from src.cost.realtime_tracker import RealtimeCostTracker, TokenUsage, _user_bucket_keys
+from src.services.pricing import ModelPricing, UnknownModelError
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        self._redis.executed_pipelines += 1
+        return [await getattr(self._redis, name)(*a, **kw) for name, a, kw in self._commands]
+
+
+class FakeRedis:
+    """Minimal in-memory Redis covering the commands the tracker uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.executed_pipelines = 0
+
+    def pipeline(self, **_kwargs: Any) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def rpush(self, key: str, value: str) -> None:
+        self.data.setdefault(key, []).append(value)
+
+    async def ltrim(self, key: str, start: int, _end: int) -> None:
+        self.data[key] = self.data[key][start:]
+
+    async def lrange(self, key: str, *_range: int) -> list[str]:
+        return list(self.data.get(key, []))
+
+    async def set(self, key: str, value: str, **_kwargs: Any) -> None:
+        self.data[key] = value
+
+    async def expire(self, *_args: Any) -> None:
+        return None
+
+    async def sadd(self, key: str, value: str) -> None:
+        self.data.setdefault(key, set()).add(value)
+
+    async def hincrbyfloat(self, key: str, field: str, amount: str) -> None:
+        hash_ = self.data.setdefault(key, {})
+        hash_[field] = str(float(hash_.get(field, 0)) + float(amount))
+
+    async def hincrby(self, key: str, field: str, amount: int) -> None:
+        hash_ = self.data.setdefault(key, {})
+        hash_[field] = str(int(hash_.get(field, 0)) + amount)
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.data.get(key, {}))
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """Patch the tracker's Redis client with an in-memory fake."""
+    redis = FakeRedis()
+    with patch.object(realtime_tracker, "_get_redis", AsyncMock(return_value=redis)):
+        yield redis
+
+
+@pytest.fixture(autouse=True)
+def pricing_cache():
+    """Install pricing for two models in the local pricing cache."""
+    previous = pricing_module._local_cache
+    pricing_module._local_cache = {
+        model_id: ModelPricing(
+            model_id=model_id,
+            display_name=model_id,
+            provider="anthropic",
+            input_price_per_million=Decimal(input_price),
+            output_price_per_million=Decimal(output_price),
+        )
+        for model_id, input_price, output_price in [
+            ("claude-sonnet-4", "3.00", "15.00"),
+            ("claude-haiku-4", "1.00", "5.00"),
+        ]
+    }
+    yield
+    pricing_module._local_cache = previous
+
+
+def _usage(model: str = "claude-sonnet-4", agent_id: str | None = "agent-1", **kwargs: Any):
+    return TokenUsage(
+        input_tokens=kwargs.pop("input_tokens", 1_000_000),
+        output_tokens=kwargs.pop("output_tokens", 100_000),
+        model=model,
+        agent_id=agent_id,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestSessionTotals:
+    """Tests for session and agent totals."""
+
+    async def test_totals_maintained_on_write(self, fake_redis: FakeRedis) -> None:
+        """Test session cost is read from totals without the usage list."""
+        tracker = RealtimeCostTracker()
+        await tracker.track_usage("session-1", _usage(), user_id="user-1")
+        await tracker.track_usage("session-1", _usage("claude-haiku-4", "agent-2"))
+        fake_redis.data.pop(realtime_tracker.COST_SESSION_USAGE_KEY.format(session_id="session-1"))
+
+        cost = await tracker.get_session_cost("session-1")
+
+        assert cost.total_cost == Decimal(6)
+        assert cost.call_count == 2
+        assert cost.total_tokens == 2_200_000
+        assert cost.by_model["claude-haiku-4"].total_cost == Decimal("1.5")
+        assert set(cost.by_agent) == {"agent-1", "agent-2"}
+
+    async def test_single_transaction_per_usage(self, fake_redis: FakeRedis) -> None:
+        """Test the record, totals and user buckets are written in one MULTI."""
+        tracker = RealtimeCostTracker()
+        callback = AsyncMock()
+        tracker.set_update_callback(callback)
+
+        await tracker.track_usage("session-1", _usage(), user_id="user-1")
+
+        assert fake_redis.executed_pipelines == 1
+        session_cost = callback.await_args.args[1]
+        assert session_cost.total_cost == Decimal("4.5")
+
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_agent_cost(self) -> None:
+        """Test agent cost comes from the session totals."""
+        tracker = RealtimeCostTracker()
+        await tracker.track_usage("session-1", _usage(agent_id="agent-1"))
+        await tracker.track_usage("session-1", _usage(agent_id="agent-2"))
+
+        cost = await tracker.get_agent_cost("session-1", "agent-2")
+
+        assert cost.total_cost == Decimal("4.5")
+        assert cost.call_count == 1
+
+    async def test_unknown_model_not_recorded(self, fake_redis: FakeRedis) -> None:
+        """Test unpriced usage raises before anything is stored."""
+        tracker = RealtimeCostTracker()
+
+        with pytest.raises(UnknownModelError):
+            await tracker.track_usage("session-1", _usage("mystery-model"))
+
+        assert fake_redis.data == {}
+
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_reset_session_clears_totals(self) -> None:
+        """Test resetting a session drops its running totals."""
+        tracker = RealtimeCostTracker()
+        await tracker.track_usage("session-1", _usage())
+
+        await tracker.reset_session("session-1")
+
+        assert (await tracker.get_session_cost("session-1")).call_count == 0
+
+
+@pytest.mark.unit
+class TestUserTotals:
+    """Tests for user totals and time buckets."""
+
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_user_cost_since(self) -> None:
+        """Test since windows only include usage in later buckets."""
+        tracker = RealtimeCostTracker()
+        now = datetime.now(UTC)
+        await tracker.track_usage(
+            "session-1", _usage(timestamp=now - timedelta(days=3)), user_id="user-1"
+        )
+        await tracker.track_usage("session-2", _usage(timestamp=now), user_id="user-1")
+
+        recent = await tracker.get_user_cost("user-1", since=now - timedelta(hours=1))
+        total = await tracker.get_user_cost("user-1")
+
+        assert recent.total_cost == Decimal("4.5")
+        assert recent.by_model["claude-sonnet-4"].call_count == 1
+        assert total.total_cost == Decimal(9)
+
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_daily_usage(self) -> None:
+        """Test daily usage reads one bucket per day."""
+        tracker = RealtimeCostTracker()
+        now = datetime.now(UTC)
+        for days_ago in (0, 0, 2, 10):
+            await tracker.track_usage(
+                "session-1", _usage(timestamp=now - timedelta(days=days_ago)), user_id="user-1"
+            )
+
+        daily = await tracker.get_daily_usage("user-1", days=7)
+
+        assert [entry["date"] for entry in daily] == [
+            (now - timedelta(days=2)).strftime("%Y-%m-%d"),
+            now.strftime("%Y-%m-%d"),
+        ]
+        assert daily[-1]["call_count"] == 2
+
+    def test_bucket_keys_use_coarsest_buckets(self) -> None:
+        """Test a window is covered by minute, then hour, then day buckets."""
+        now = datetime(2026, 3, 12, 9, 30, tzinfo=UTC)
+        since = datetime(2026, 3, 11, 22, 58, tzinfo=UTC)
+
+        keys = _user_bucket_keys("u", since, now)
+
+        assert keys == [
+            "podex:cost:user:u:minute:2026-03-11T22:58",
+            "podex:cost:user:u:minute:2026-03-11T22:59",
+            "podex:cost:user:u:hour:2026-03-11T23",
+            "podex:cost:user:u:day:2026-03-12",
+        ]
+
+
+@pytest.mark.unit
+class TestPricingMemo:
+    """Tests for memoized pricing resolution."""
+
+    def test_partial_match_resolved_once(self) -> None:
+        """Test the fuzzy scan runs once per model until pricing refreshes."""
+        tracker = RealtimeCostTracker()
+        with patch.object(
+            realtime_tracker,
+            "get_all_pricing_from_cache",
+            wraps=realtime_tracker.get_all_pricing_from_cache,
+        ) as scan:
+            tracker.get_pricing("anthropic/claude-sonnet-4-latest")
+            tracker.get_pricing("anthropic/claude-sonnet-4-latest")
+            assert scan.call_count == 1
+
+            pricing_module._local_cache = dict(pricing_module._local_cache)
+            tracker.get_pricing("anthropic/claude-sonnet-4-latest")
+            assert scan.call_count == 2
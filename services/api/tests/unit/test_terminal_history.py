@@ -0,0 +1,160 @@
+"""Unit tests for the coalescing terminal history buffer."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.websocket import terminal_history as history_module
+from src.websocket.terminal_history import (
+    MAX_TERMINAL_HISTORY_SEGMENTS,
+    TERMINAL_HISTORY_SEGMENT_SIZE,
+    TERMINAL_HISTORY_TTL,
+    TerminalHistoryBuffer,
+)
+
+
+class FakePipeline:
+    def __init__(self, lists: dict[str, list[str]]) -> None:
+        self.lists = lists
+        self.commands: list[tuple[Any, ...]] = []
+
+    def rpush(self, key: str, *values: str) -> None:
+        self.commands.append(("rpush", key, *values))
+
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        self.commands.append(("ltrim", key, start, end))
+
+    def expire(self, key: str, ttl: int) -> None:
+        self.commands.append(("expire", key, ttl))
+
+    async def execute(self) -> list[Any]:
+        for command in self.commands:
+            if command[0] == "rpush":
+                self.lists.setdefault(command[1], []).extend(command[2:])
+            elif command[0] == "ltrim":
+                self.lists[command[1]] = self.lists[command[1]][command[2] :]
+        return []
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.lists: dict[str, list[str]] = {}
+        self.pipelines: list[FakePipeline] = []
+        self.client = MagicMock()
+        self.client.pipeline = MagicMock(side_effect=self._pipeline)
+        self.client.lrange = AsyncMock(side_effect=self._lrange)
+        self.delete = AsyncMock(side_effect=self._delete)
+
+    def _pipeline(self, **_kwargs: Any) -> FakePipeline:
+        pipe = FakePipeline(self.lists)
+        self.pipelines.append(pipe)
+        return pipe
+
+    async def _lrange(self, key: str, start: int, _end: int) -> list[str]:
+        return self.lists.get(key, [])[start:]
+
+    async def _delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.lists.pop(key, None) is not None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    fake = FakeRedis()
+    monkeypatch.setattr(history_module, "get_cache_client", AsyncMock(return_value=fake))
+    return fake
+
+
+class TestTerminalHistoryBuffer:
+    """Tests for TerminalHistoryBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_coalesced_into_one_pipeline(self, fake_redis: FakeRedis) -> None:
+        buffer = TerminalHistoryBuffer(flush_interval=60)
+        for chunk in ("$ ls\r\n", "\x1b[34msrc\x1b[0m ", "tests\r\n"):
+            buffer.append("ws-1", chunk)
+        buffer.append("ws-2", "other")
+
+        await buffer.close()
+
+        assert len(fake_redis.pipelines) == 1
+        commands = fake_redis.pipelines[0].commands
+        assert [c[0] for c in commands] == ["rpush", "ltrim", "expire"] * 2
+        assert ("expire", "podex:terminal:history:ws-1", TERMINAL_HISTORY_TTL) in commands
+        assert (
+            "ltrim",
+            "podex:terminal:history:ws-1",
+            -MAX_TERMINAL_HISTORY_SEGMENTS,
+            -1,
+        ) in commands
+
+        history = await buffer.get("ws-1")
+        assert len(history) == 1
+        assert history[0]["output"] == "$ ls\r\n\x1b[34msrc\x1b[0m tests\r\n"
+        assert history[0]["timestamp"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_large_output_split_into_bounded_segments(self) -> None:
+        buffer = TerminalHistoryBuffer(flush_interval=60)
+        buffer.append("ws-1", "x" * (TERMINAL_HISTORY_SEGMENT_SIZE * 2 + 10))
+
+        history = await buffer.get("ws-1", limit=10)
+
+        assert [len(entry["output"]) for entry in history] == [
+            TERMINAL_HISTORY_SEGMENT_SIZE,
+            TERMINAL_HISTORY_SEGMENT_SIZE,
+            10,
+        ]
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_ring_keeps_newest_segments(self) -> None:
+        buffer = TerminalHistoryBuffer(flush_interval=60)
+        for i in range(MAX_TERMINAL_HISTORY_SEGMENTS + 5):
+            buffer.append("ws-1", f"line {i}")
+            await buffer.flush()
+
+        history = await buffer.get("ws-1", limit=MAX_TERMINAL_HISTORY_SEGMENTS * 2)
+
+        assert len(history) == MAX_TERMINAL_HISTORY_SEGMENTS
+        assert history[-1]["output"] == f"line {MAX_TERMINAL_HISTORY_SEGMENTS + 4}"
+
+    @pytest.mark.asyncio
+    async def test_reads_legacy_json_entries(self, fake_redis: FakeRedis) -> None:
+        legacy = {"output": "old", "timestamp": "2026-01-01T00:00:00+00:00"}
+        fake_redis.lists["podex:terminal:history:ws-1"] = [json.dumps(legacy)]
+        buffer = TerminalHistoryBuffer()
+
+        assert await buffer.get("ws-1") == [legacy]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("fake_redis")
+    async def test_clear_drops_buffered_output(self) -> None:
+        buffer = TerminalHistoryBuffer(flush_interval=60)
+        buffer.append("ws-1", "stored")
+        await buffer.flush()
+        buffer.append("ws-1", "pending")
+
+        await buffer.clear("ws-1")
+        await buffer.close()
+
+        assert await buffer.get("ws-1") == []
+
+    @pytest.mark.asyncio
+    async def test_flush_errors_are_logged_not_raised(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            history_module, "get_cache_client", AsyncMock(side_effect=ConnectionError("down"))
+        )
+        buffer = TerminalHistoryBuffer(flush_interval=0)
+        buffer.append("ws-1", "output")
+
+        await buffer.close()
+
+        assert await buffer.get("ws-1") == []
@@ -1,6 +1,8 @@
 """Compute service configuration."""
 
 import json
+import tempfile
+from pathlib import Path
 from typing import Literal
 
 from pydantic import AliasChoices, Field
@@ -59,6 +61,11 @@ class Settings(BaseSettings):
 
     # API service (for usage tracking)
     api_base_url: str = "http://localhost:3001"
+    # Usage events are spooled to this SQLite file until the API accepts them
+    # (None keeps them in memory); put it on a volume to survive container restarts
+    usage_spool_path: str | None = str(
+        Path(tempfile.gettempdir()) / "podex" / "usage-spool-compute.db"
+    )
 
     # CORS - stored as raw string to avoid pydantic-settings JSON parsing issues
     cors_origins_raw: str = Field(
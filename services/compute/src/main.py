@@ -163,6 +163,7 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
         service_token=settings.internal_service_token,
         batch_size=10,
         flush_interval=5.0,
+        spool_path=settings.usage_spool_path,
     )
     logger.info("Usage tracker initialized", api_url=settings.api_base_url)
 
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-import base64
+import io
+import posixpath
 import shlex
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, BinaryIO
 
 import structlog
 
@@ -17,16 +21,23 @@ from src.models.workspace import (
     WorkspaceScaleResponse,
     WorkspaceStatus,
 )
+from src.utils.tar_stream import TarMemberReader, build_file_archive
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import (
+        AsyncGenerator,
+        AsyncIterable,
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+    )
 
     from src.storage.workspace_store import WorkspaceStore
 
 logger = structlog.get_logger()
 
 # Constants for parsing command output
-MIN_LS_PARTS = 9
 MIN_SS_PARTS = 4
 SS_LOCAL_ADDR_INDEX = 3
 SS_ALT_LOCAL_ADDR_INDEX = 2
@@ -35,6 +46,26 @@ MIN_SYSTEM_PORT = 1024
 PROCESS_NAME_START_OFFSET = 3
 MIN_PROCESS_NAME_START = 2
 
+# Workspace filesystem layout: relative paths resolve against the dev user's home
+WORKSPACE_HOME = "/home/dev"
+WORKSPACE_UID = 1000
+WORKSPACE_GID = 1000
+DEFAULT_FILE_MODE = 0o644
+
+# Streamed writes are spooled (in memory up to this size, then on disk) because
+# tar headers need the file size up front
+FILE_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Go os.FileMode type bits used in Docker path stats
+_GO_MODE_DIR = 1 << 31
+_GO_MODE_SYMLINK = 1 << 27
+
+# `find -printf` format for list_files: one NUL-terminated field per value
+_LIST_FIELDS = ("name", "type", "target_type", "size", "mtime", "mode", "link_target")
+_LIST_FORMAT = r"%f\0%y\0%Y\0%s\0%T@\0%m\0%l\0"
+_FIND_TYPES = {"d": "directory", "f": "file", "l": "symlink"}
+
 
 @dataclass
 class ProxyRequest:
@@ -47,6 +78,64 @@ class ProxyRequest:
     headers: dict[str, str]
     body: bytes | None = None
     query_string: str | None = None
+    # Streamed request body, forwarded as it arrives (takes precedence over body)
+    body_stream: AsyncIterable[bytes] | None = None
+
+
+@dataclass
+class ProxyResponse:
+    """Streamed HTTP proxy response.
+
+    ``close`` releases the upstream connection and must be awaited once the
+    body is consumed or abandoned.
+    """
+
+    status_code: int
+    headers: dict[str, str]
+    body: AsyncIterator[bytes]
+    close: Callable[[], Awaitable[None]]
+
+
+@dataclass
+class FileStat:
+    """Structured file metadata for a path in a workspace."""
+
+    name: str
+    path: str
+    type: str  # "file", "directory", "symlink" or "other"
+    size: int
+    mode: str  # Permission bits in octal, e.g. "0644"
+    mtime: str  # ISO 8601 timestamp
+    link_target: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_docker_stat(cls, path: str, stat: dict[str, Any]) -> FileStat:
+        """Build from the path stat returned by Docker's archive API."""
+        go_mode = int(stat.get("mode", 0))
+        if go_mode & _GO_MODE_SYMLINK:
+            file_type = "symlink"
+        elif go_mode & _GO_MODE_DIR:
+            file_type = "directory"
+        else:
+            file_type = "file"
+        return cls(
+            name=stat.get("name", posixpath.basename(path)),
+            path=path,
+            type=file_type,
+            size=int(stat.get("size", 0)),
+            mode=f"{go_mode & 0o777:04o}",
+            mtime=stat.get("mtime", ""),
+            link_target=stat.get("linkTarget") or None,
+        )
+
+
+def resolve_workspace_path(path: str) -> str:
+    """Resolve a workspace path to an absolute, normalized container path."""
+    return posixpath.normpath(posixpath.join(WORKSPACE_HOME, path))
 
 
 class ComputeManager(ABC):
@@ -60,6 +149,8 @@ class ComputeManager(ABC):
 
     Many methods have default implementations that rely on exec_command
     and the workspace store. Subclasses can override for custom behavior.
+    File transfer defaults rely on the archive methods (get_archive,
+    put_archive, stat_path), which stream tar data instead of shelling out.
     """
 
     # Subclasses should initialize this
@@ -214,6 +305,17 @@ class ComputeManager(ABC):
             Tuple of (status_code, response_headers, response_body)
         """
 
+    @abstractmethod
+    async def proxy_request_stream(self, request: ProxyRequest) -> ProxyResponse:
+        """Proxy an HTTP request to a workspace container, streaming the response.
+
+        Args:
+            request: The proxy request parameters
+
+        Returns:
+            Response whose body is streamed from the container
+        """
+
     @abstractmethod
     async def track_running_workspaces_usage(self) -> None:
         """Track compute usage for all running workspaces.
@@ -239,6 +341,58 @@ class ComputeManager(ABC):
             WorkspaceScaleResponse with scaling result
         """
 
+    @abstractmethod
+    async def get_archive(
+        self,
+        workspace_id: str,
+        path: str,
+    ) -> tuple[dict[str, Any], AsyncGenerator[bytes, None]]:
+        """Stream a path out of the workspace as a tar archive.
+
+        Args:
+            workspace_id: The workspace ID
+            path: Absolute path in the workspace
+
+        Returns:
+            Tuple of (Docker-style path stat, async iterator of tar chunks)
+
+        Raises:
+            FileNotFoundError: If the path does not exist
+        """
+
+    @abstractmethod
+    async def put_archive(
+        self,
+        workspace_id: str,
+        path: str,
+        data: bytes | Iterable[bytes],
+    ) -> None:
+        """Extract a tar archive into an existing workspace directory.
+
+        Args:
+            workspace_id: The workspace ID
+            path: Absolute directory path in the workspace
+            data: Tar archive, as bytes or an iterable of chunks
+
+        Raises:
+            FileNotFoundError: If the directory does not exist
+        """
+
+    @abstractmethod
+    async def stat_path(self, workspace_id: str, path: str) -> dict[str, Any]:
+        """Stat a path in the workspace without reading its content.
+
+        Args:
+            workspace_id: The workspace ID
+            path: Absolute path in the workspace
+
+        Returns:
+            Docker-style path stat (name, size, mode, mtime, linkTarget)
+
+        Raises:
+            FileNotFoundError: If the path does not exist
+        """
+
     # --- Default Implementations (can be overridden by subclasses) ---
 
     async def list_workspaces(
@@ -269,8 +423,95 @@ class ComputeManager(ABC):
         # Fallback: return empty list if store not available
         return []
 
+    async def stat_file(self, workspace_id: str, path: str) -> FileStat:
+        """Get structured metadata for a workspace path.
+
+        Args:
+            workspace_id: The workspace ID
+            path: File path relative to workspace root
+
+        Returns:
+            File metadata (symlinks are reported as such, with their target)
+        """
+        abs_path = resolve_workspace_path(path)
+        try:
+            stat = await self.stat_path(workspace_id, abs_path)
+        except FileNotFoundError as e:
+            msg = f"File not found: {path}"
+            raise ValueError(msg) from e
+        return FileStat.from_docker_stat(abs_path, stat)
+
+    async def open_file_stream(
+        self,
+        workspace_id: str,
+        path: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> tuple[FileStat, AsyncGenerator[bytes, None]]:
+        """Open a workspace file for streaming, following symlinks.
+
+        Args:
+            workspace_id: The workspace ID
+            path: File path relative to workspace root
+            offset: First byte to read
+            length: Maximum number of bytes to read (to end of file if None)
+
+        Returns:
+            Tuple of (metadata of the file read, async iterator of content chunks)
+        """
+        abs_path = resolve_workspace_path(path)
+        try:
+            stat, chunks = await self.get_archive(workspace_id, abs_path)
+            file_stat = FileStat.from_docker_stat(abs_path, stat)
+            if file_stat.type == "symlink" and file_stat.link_target:
+                # Docker archives the link itself; its stat carries the resolved target
+                await chunks.aclose()
+                target = file_stat.link_target
+                stat, chunks = await self.get_archive(workspace_id, target)
+                file_stat = FileStat.from_docker_stat(target, stat)
+        except FileNotFoundError as e:
+            msg = f"File not found: {path}"
+            raise ValueError(msg) from e
+
+        if file_stat.type != "file":
+            await chunks.aclose()
+            msg = f"Not a regular file: {path}"
+            raise ValueError(msg)
+
+        reader = TarMemberReader(chunks)
+
+        async def _content() -> AsyncGenerator[bytes, None]:
+            try:
+                async for data in reader.iter_content(offset, length):
+                    yield data
+            finally:
+                await chunks.aclose()
+
+        return file_stat, _content()
+
+    async def read_file_bytes(
+        self,
+        workspace_id: str,
+        path: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> bytes:
+        """Read a file (or a byte range of it) from the workspace.
+
+        Args:
+            workspace_id: The workspace ID
+            path: File path relative to workspace root
+            offset: First byte to read
+            length: Maximum number of bytes to read (to end of file if None)
+
+        Returns:
+            File contents as bytes
+        """
+        _stat, chunks = await self.open_file_stream(workspace_id, path, offset, length)
+        return b"".join([chunk async for chunk in chunks])
+
     async def read_file(self, workspace_id: str, path: str) -> str:
-        """Read a file from the workspace.
+        """Read a text file from the workspace.
 
         Args:
             workspace_id: The workspace ID
@@ -279,37 +520,130 @@ class ComputeManager(ABC):
         Returns:
             File contents as string
         """
-        safe_path = shlex.quote(path)
-        result = await self.exec_command(workspace_id, f"cat {safe_path}")
-        if result.exit_code != 0:
-            msg = f"Failed to read file: {result.stderr}"
-            raise ValueError(msg)
-        return result.stdout
+        content = await self.read_file_bytes(workspace_id, path)
+        try:
+            return content.decode("utf-8")
+        except UnicodeDecodeError as e:
+            msg = f"Failed to read file: {path} is not UTF-8 text"
+            raise ValueError(msg) from e
+
+    async def _put_file(
+        self,
+        workspace_id: str,
+        path: str,
+        source: BinaryIO,
+        size: int,
+        mode: int | None,
+    ) -> None:
+        """Upload ``size`` bytes from ``source`` to a workspace file.
+
+        Like a shell redirect, overwriting keeps the existing file's mode and
+        writes through symlinks. Missing parent directories are created (as
+        the workspace user) and the upload is retried once.
+        """
+        abs_path = resolve_workspace_path(path)
+        if mode is None:
+            mode = DEFAULT_FILE_MODE
+            try:
+                existing = FileStat.from_docker_stat(
+                    abs_path, await self.stat_path(workspace_id, abs_path)
+                )
+            except FileNotFoundError:
+                existing = None
+            if existing and existing.type == "symlink" and existing.link_target:
+                abs_path = existing.link_target
+                existing = FileStat.from_docker_stat(
+                    abs_path, await self.stat_path(workspace_id, abs_path)
+                )
+            if existing and existing.type == "file":
+                mode = int(existing.mode, 8)
+
+        parent, name = posixpath.split(abs_path)
+        start = source.tell()
+        mtime = time.time()
+
+        for attempt in range(2):
+            source.seek(start)
+            archive = build_file_archive(
+                name,
+                source,
+                size,
+                mode=mode,
+                uid=WORKSPACE_UID,
+                gid=WORKSPACE_GID,
+                mtime=mtime,
+                chunk_size=FILE_CHUNK_SIZE,
+            )
+            try:
+                await self.put_archive(workspace_id, parent, archive)
+                return
+            except FileNotFoundError as e:
+                if attempt:
+                    msg = f"Failed to write file: {parent} does not exist"
+                    raise ValueError(msg) from e
+            result = await self.exec_command(workspace_id, f"mkdir -p {shlex.quote(parent)}")
+            if result.exit_code != 0:
+                msg = f"Failed to write file: {result.stderr}"
+                raise ValueError(msg)
+
+    async def write_file_bytes(
+        self,
+        workspace_id: str,
+        path: str,
+        content: bytes,
+        mode: int | None = None,
+    ) -> None:
+        """Write binary content to a workspace file.
+
+        Args:
+            workspace_id: The workspace ID
+            path: File path relative to workspace root
+            content: File contents
+            mode: Permission bits (keeps the existing mode, or 0644, if None)
+        """
+        await self._put_file(workspace_id, path, io.BytesIO(content), len(content), mode)
+
+    async def write_file_stream(
+        self,
+        workspace_id: str,
+        path: str,
+        chunks: AsyncIterable[bytes],
+        mode: int | None = None,
+    ) -> int:
+        """Write streamed content to a workspace file.
+
+        Args:
+            workspace_id: The workspace ID
+            path: File path relative to workspace root
+            chunks: File contents as an async iterable of chunks
+            mode: Permission bits (keeps the existing mode, or 0644, if None)
+
+        Returns:
+            Number of bytes written
+        """
+        with tempfile.SpooledTemporaryFile(max_size=FILE_SPOOL_MAX_MEMORY) as spool:
+            async for chunk in chunks:
+                spool.write(chunk)
+            size = spool.tell()
+            spool.seek(0)
+            await self._put_file(workspace_id, path, spool, size, mode)  # type: ignore[arg-type]
+        return size
 
     async def write_file(self, workspace_id: str, path: str, content: str) -> None:
-        """Write a file to the workspace.
+        """Write a text file to the workspace.
 
         Args:
             workspace_id: The workspace ID
             path: File path relative to workspace root
             content: File contents
         """
-        safe_path = shlex.quote(path)
-        encoded_content = base64.b64encode(content.encode("utf-8")).decode("ascii")
-        cmd = (
-            f"mkdir -p $(dirname {safe_path}) && "
-            f"echo {shlex.quote(encoded_content)} | base64 -d > {safe_path}"
-        )
-        result = await self.exec_command(workspace_id, cmd)
-        if result.exit_code != 0:
-            msg = f"Failed to write file: {result.stderr}"
-            raise ValueError(msg)
+        await self.write_file_bytes(workspace_id, path, content.encode("utf-8"))
 
     async def list_files(
         self,
         workspace_id: str,
         path: str = ".",
-    ) -> list[dict[str, str]]:
+    ) -> list[dict[str, Any]]:
         """List files in a workspace directory.
 
         Args:
@@ -317,34 +651,38 @@ class ComputeManager(ABC):
             path: Directory path relative to workspace root
 
         Returns:
-            List of file info dicts with name, type, size
+            List of file info dicts sorted by name, with name, type, size,
+            mode, mtime, is_symlink and link_target. ``type`` follows
+            symlinks, so links to directories are listed as directories.
         """
         safe_path = shlex.quote(path)
-        # Use -L to follow symlinks so symlinks to directories show as directories
         result = await self.exec_command(
             workspace_id,
-            f"ls -laL {safe_path} | tail -n +2",
+            f"find {safe_path} -mindepth 1 -maxdepth 1 -printf '{_LIST_FORMAT}'",
         )
         if result.exit_code != 0:
             return []
 
-        files = []
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
-            parts = line.split()
-            if len(parts) >= MIN_LS_PARTS:
-                name = " ".join(parts[8:])
-                file_type = "directory" if parts[0].startswith("d") else "file"
-
-                files.append(
-                    {
-                        "name": name,
-                        "type": file_type,
-                        "size": parts[4],
-                    }
-                )
+        fields = result.stdout.split("\0")
+        files: list[dict[str, Any]] = []
+        for i in range(0, len(fields) - len(_LIST_FIELDS) + 1, len(_LIST_FIELDS)):
+            entry = dict(zip(_LIST_FIELDS, fields[i : i + len(_LIST_FIELDS)], strict=True))
+            is_symlink = entry["type"] == "l"
+            # %Y is "N"/"L" for broken or looping links
+            file_type = _FIND_TYPES.get(entry["target_type"], "symlink" if is_symlink else "other")
+            files.append(
+                {
+                    "name": entry["name"],
+                    "type": file_type,
+                    "size": int(entry["size"]),
+                    "mode": entry["mode"].zfill(4),
+                    "mtime": datetime.fromtimestamp(float(entry["mtime"]), UTC).isoformat(),
+                    "is_symlink": is_symlink,
+                    "link_target": entry["link_target"] or None,
+                }
+            )
 
+        files.sort(key=lambda f: f["name"])
         return files
 
     async def heartbeat(self, workspace_id: str) -> None:
@@ -389,17 +727,16 @@ class ComputeManager(ABC):
         cleaned_up = []
         managed_servers = self.managed_server_ids
 
-        # Get all workspaces from store
-        workspaces: list[WorkspaceInfo] = []
+        # Workspaces pending deletion AND on managed servers
+        workspaces_to_cleanup: list[WorkspaceInfo] = []
         if self._workspace_store:
-            workspaces = await self._workspace_store.list_all()
-
-        # Filter workspaces that are pending deletion AND on managed servers
-        workspaces_to_cleanup = [
-            ws
-            for ws in workspaces
-            if ws.status == WorkspaceStatus.PENDING_DELETION and ws.server_id in managed_servers
-        ]
+            workspaces_to_cleanup = [
+                ws
+                async for ws in self._workspace_store.iter_by_status(
+                    WorkspaceStatus.PENDING_DELETION
+                )
+                if ws.status == WorkspaceStatus.PENDING_DELETION and ws.server_id in managed_servers
+            ]
 
         if workspaces_to_cleanup:
             logger.info(
@@ -455,12 +792,10 @@ class ComputeManager(ABC):
         Returns a dict mapping workspace_id to health status.
         """
         results: dict[str, bool] = {}
+        if not self._workspace_store:
+            return results
 
-        workspaces: list[WorkspaceInfo] = []
-        if self._workspace_store:
-            workspaces = await self._workspace_store.list_all()
-
-        for workspace in workspaces:
+        async for workspace in self._workspace_store.iter_by_status(WorkspaceStatus.RUNNING):
             if workspace.status == WorkspaceStatus.RUNNING:
                 is_healthy = await self.check_workspace_health(workspace.id)
                 results[workspace.id] = is_healthy
@@ -12,6 +12,7 @@ The service performs three key functions:
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
@@ -20,6 +21,7 @@ from typing import TYPE_CHECKING, Any
 import httpx
 import structlog
 
+from podex_shared.sentry import track_heartbeat_sweep
 from src.config import settings
 from src.models.workspace import WorkspaceStatus
 from src.utils.task_lock import release_task_lock, try_acquire_task_lock
@@ -75,6 +77,9 @@ class HeartbeatConfig:
     report_to_api: bool = True  # Whether to report heartbeats to the central API
     check_workspace_containers: bool = True  # Whether to check workspace container health
     workspace_check_interval_multiplier: int = 2  # Check workspaces every N heartbeats
+    workspace_check_concurrency: int = 32  # Max container checks in flight fleet-wide
+    per_server_check_concurrency: int = 8  # Max concurrent Docker calls per server
+    container_stats_timeout_seconds: float = 5.0  # Timeout for one container stats call
 
 
 class HeartbeatService:
@@ -113,6 +118,9 @@ class HeartbeatService:
         self._http_client: httpx.AsyncClient | None = None
         self._workspace_store = workspace_store
         self._heartbeat_count = 0  # Counter for workspace check interval
+        # Previous cpu_stats per container: one-shot stats have no precpu sample
+        self._cpu_samples: dict[str, dict[str, Any]] = {}
+        self._last_sweep_started: float | None = None
 
     @property
     def is_running(self) -> bool:
@@ -333,125 +341,211 @@ class HeartbeatService:
     async def check_all_workspace_containers(self) -> dict[str, str]:
         """Check health of all workspace containers across all servers.
 
-        Queries each server for workspace containers and checks their status.
-        Updates workspace status in Redis and reports to API if unhealthy.
+        Containers on all servers are checked concurrently, bounded by a
+        fleet-wide limit and a per-server limit so no Docker host is flooded.
+        Running containers get a one-shot stats sample; their metrics are
+        written to Redis in pipelined batches at the end of the sweep.
+        Unhealthy containers update the workspace status in Redis and are
+        reported to the API.
 
         Returns:
             Dict mapping workspace_id to container status
         """
-        results: dict[str, str] = {}
-        unhealthy_count = 0
-        checked_count = 0
+        started = time.monotonic()
+        lag_seconds = self._sweep_lag_seconds(started)
+        self._last_sweep_started = started
 
-        for server_id in self._docker.servers:
-            try:
-                # Get all workspace containers on this server
-                containers = await self._docker.list_containers(
-                    server_id,
-                    all=True,  # Include stopped containers
-                    filters={"label": "podex.workspace=true"},
+        server_ids = list(self._docker.servers)
+        listings = await asyncio.gather(
+            *(self._list_workspace_containers(server_id) for server_id in server_ids)
+        )
+
+        results: dict[str, str] = {}
+        metrics: dict[str, dict[str, Any]] = {}
+        fleet_limit = asyncio.Semaphore(self._config.workspace_check_concurrency)
+        checks = []
+        for server_id, containers in zip(server_ids, listings, strict=True):
+            server_limit = asyncio.Semaphore(self._config.per_server_check_concurrency)
+            for container in containers:
+                workspace_id = container.get("labels", {}).get("podex.workspace_id")
+                if not workspace_id:
+                    continue
+                container_status = container.get("status", "unknown")
+                results[workspace_id] = container_status
+                checks.append(
+                    self._check_workspace_container(
+                        server_id,
+                        workspace_id,
+                        container_id=container.get("id"),
+                        container_status=container_status,
+                        metrics=metrics,
+                        limits=(fleet_limit, server_limit),
+                    )
                 )
 
-                for container in containers:
-                    workspace_id = container.get("labels", {}).get("podex.workspace_id")
-                    if not workspace_id:
-                        continue
-
-                    checked_count += 1
-                    container_status = container.get("status", "unknown")
-                    results[workspace_id] = container_status
-
-                    # Determine if workspace is healthy
-                    is_healthy = container_status == "running"
-
-                    # Collect metrics for healthy containers
-                    if is_healthy:
-                        container_id = container.get("id")
-                        if container_id:
-                            await self._collect_workspace_metrics(
-                                workspace_id,
-                                container_id,
-                                server_id,
-                            )
-
-                    if not is_healthy:
-                        unhealthy_count += 1
-                        logger.warning(
-                            "Unhealthy workspace container detected",
-                            workspace_id=workspace_id[:12],
-                            server_id=server_id,
-                            container_status=container_status,
-                        )
-
-                        # Update workspace status in Redis
-                        await self._update_workspace_status(
-                            workspace_id,
-                            container_status,
-                            server_id,
-                        )
-
-                        # Report to API
-                        await self._report_workspace_status_to_api(
-                            workspace_id,
-                            container_status,
-                        )
+        unhealthy_count = sum(not healthy for healthy in await asyncio.gather(*checks))
 
+        if metrics and self._workspace_store:
+            try:
+                await self._workspace_store.update_metrics_many(metrics)
             except Exception:
-                logger.exception(
-                    "Failed to check workspace containers on server",
-                    server_id=server_id,
-                )
-
-        if checked_count > 0:
+                logger.exception("Failed to store workspace metrics", count=len(metrics))
+
+        # Forget CPU samples of containers that are gone
+        live_ids = {c.get("id") for containers in listings for c in containers}
+        for container_id in self._cpu_samples.keys() - live_ids:
+            del self._cpu_samples[container_id]
+
+        duration_seconds = time.monotonic() - started
+        track_heartbeat_sweep(
+            duration_ms=duration_seconds * 1000,
+            lag_ms=lag_seconds * 1000,
+            containers=len(results),
+            unhealthy=unhealthy_count,
+        )
+        if results:
             logger.debug(
                 "Workspace container health check complete",
-                checked=checked_count,
+                checked=len(results),
                 unhealthy=unhealthy_count,
+                duration_seconds=round(duration_seconds, 3),
+                lag_seconds=round(lag_seconds, 3),
             )
 
         return results
 
+    def _sweep_lag_seconds(self, started: float) -> float:
+        """How late this sweep started relative to its schedule."""
+        if self._last_sweep_started is None:
+            return 0.0
+        expected_interval = (
+            self._config.interval_seconds * self._config.workspace_check_interval_multiplier
+        )
+        return max(0.0, started - self._last_sweep_started - expected_interval)
+
+    async def _list_workspace_containers(self, server_id: str) -> list[dict[str, Any]]:
+        """List workspace containers on a server (empty on failure)."""
+        try:
+            return await self._docker.list_containers(
+                server_id,
+                all=True,  # Include stopped containers
+                filters={"label": "podex.workspace=true"},
+            )
+        except Exception:
+            logger.exception(
+                "Failed to check workspace containers on server",
+                server_id=server_id,
+            )
+            return []
+
+    async def _check_workspace_container(
+        self,
+        server_id: str,
+        workspace_id: str,
+        *,
+        container_id: str | None,
+        container_status: str,
+        metrics: dict[str, dict[str, Any]],
+        limits: tuple[asyncio.Semaphore, asyncio.Semaphore],
+    ) -> bool:
+        """Check one workspace container, collecting metrics if it is running.
+
+        Returns:
+            True if the container is healthy
+        """
+        fleet_limit, server_limit = limits
+        async with fleet_limit, server_limit:
+            if container_status == "running":
+                if container_id:
+                    collected = await self._collect_workspace_metrics(
+                        workspace_id,
+                        container_id,
+                        server_id,
+                    )
+                    if collected:
+                        metrics[workspace_id] = collected
+                return True
+
+            logger.warning(
+                "Unhealthy workspace container detected",
+                workspace_id=workspace_id[:12],
+                server_id=server_id,
+                container_status=container_status,
+            )
+
+            # Update workspace status in Redis
+            await self._update_workspace_status(
+                workspace_id,
+                container_status,
+                server_id,
+            )
+
+            # Report to API
+            await self._report_workspace_status_to_api(
+                workspace_id,
+                container_status,
+            )
+            return False
+
     async def _collect_workspace_metrics(
         self,
         workspace_id: str,
         container_id: str,
         server_id: str,
-    ) -> None:
-        """Collect and store resource metrics for a workspace container.
+    ) -> dict[str, Any] | None:
+        """Collect resource metrics for a workspace container.
+
+        Uses a one-shot stats sample; CPU usage is computed against the
+        sample taken for the same container in the previous sweep.
 
         Args:
             workspace_id: The workspace ID
             container_id: Docker container ID
             server_id: Server where container is running
+
+        Returns:
+            Parsed metrics, or None if unavailable
         """
         if not self._workspace_store:
-            return
+            return None
 
         try:
-            # Get raw stats from Docker
-            stats = await self._docker.get_container_stats(server_id, container_id)
+            stats = await asyncio.wait_for(
+                self._docker.get_container_stats(server_id, container_id, one_shot=True),
+                timeout=self._config.container_stats_timeout_seconds,
+            )
             if not stats:
-                return
+                return None
+
+            previous = self._cpu_samples.get(container_id)
+            self._cpu_samples[container_id] = stats.get("cpu_stats", {})
+            if previous:
+                stats["precpu_stats"] = previous
 
             # Parse into metrics
             metrics = self._docker.parse_container_stats(stats)
 
-            # Store in Redis
-            await self._workspace_store.update_metrics(workspace_id, metrics)
-
             logger.debug(
                 "Collected workspace metrics",
                 workspace_id=workspace_id[:12],
                 cpu_percent=f"{metrics.get('cpu_percent', 0):.1f}%",
                 memory_mb=metrics.get("memory_used_mb", 0),
             )
+            return metrics
 
+        except TimeoutError:
+            logger.warning(
+                "Timed out collecting workspace metrics",
+                workspace_id=workspace_id[:12],
+                container_id=container_id[:12],
+            )
         except Exception:
             logger.exception(
                 "Failed to collect workspace metrics",
                 workspace_id=workspace_id[:12],
                 container_id=container_id[:12],
             )
+        return None
 
     async def _update_workspace_status(
         self,
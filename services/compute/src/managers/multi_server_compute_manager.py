@@ -6,6 +6,7 @@ interface expected by routes, while using the multi-server Docker backend.
 
 from __future__ import annotations
 
+import zlib
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
@@ -14,9 +15,9 @@ import httpx
 import structlog
 
 from podex_shared import ComputeUsageParams, get_usage_tracker
-from src.managers.base import ComputeManager, ProxyRequest
+from src.managers.base import ComputeManager, ProxyRequest, ProxyResponse
 from src.managers.hardware_specs_provider import get_hardware_specs_provider
-from src.middleware.script_injector import inject_devtools_script
+from src.middleware.script_injector import StreamingScriptInjector, should_inject_script
 from src.models.workspace import (
     WorkspaceConfig,
     WorkspaceExecResponse,
@@ -27,7 +28,7 @@ from src.models.workspace import (
 from src.utils.task_lock import release_task_lock, try_acquire_task_lock
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Iterable
 
     from src.managers.multi_server_docker import MultiServerDockerManager
     from src.managers.workspace_orchestrator import WorkspaceOrchestrator
@@ -35,6 +36,91 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger()
 
+# Hop-by-hop headers are never forwarded in either direction
+_HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+# Content encodings httpx can decode, so HTML sent in them can be rewritten
+_DECODABLE_ENCODINGS = frozenset({"identity", "gzip", "deflate"})
+PROXY_RECOMPRESS_LEVEL = 6
+# Long enough for long-polling and SSE between keepalives
+PROXY_READ_TIMEOUT = 300.0
+PROXY_TIMEOUT = httpx.Timeout(30.0, read=PROXY_READ_TIMEOUT)
+
+
+def _is_document_request(headers: dict[str, str]) -> bool:
+    """Whether a request is (likely) for an HTML page that will be rewritten."""
+    lowered = {k.lower(): v for k, v in headers.items()}
+    if lowered.get("sec-fetch-dest") in ("document", "iframe"):
+        return True
+    return "text/html" in lowered.get("accept", "")
+
+
+def _accepts_gzip(headers: dict[str, str]) -> bool:
+    """Whether the client's Accept-Encoding allows gzip."""
+    accept = next((v for k, v in headers.items() if k.lower() == "accept-encoding"), "")
+    for item in accept.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        _, _, quality = params.partition("q=")
+        try:
+            return not quality or float(quality) > 0
+        except ValueError:
+            return True
+    return False
+
+
+async def _iter_proxy_body(
+    response: httpx.Response,
+    *,
+    inject: bool,
+    recompress: bool,
+) -> AsyncGenerator[bytes, None]:
+    """Stream an upstream response body, optionally injecting the DevTools script.
+
+    Without injection the raw (possibly compressed) bytes pass straight
+    through. With injection the decoded body goes through the streaming
+    injector and, if ``recompress``, is gzipped again chunk by chunk.
+    """
+    try:
+        if not inject:
+            async for chunk in response.aiter_raw():
+                yield chunk
+            return
+
+        injector = StreamingScriptInjector()
+        compressor = (
+            zlib.compressobj(PROXY_RECOMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            if recompress
+            else None
+        )
+        async for chunk in response.aiter_bytes():
+            data = injector.feed(chunk)
+            if data and compressor:
+                # Sync-flush so streamed HTML reaches the browser without waiting
+                data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        tail = injector.close()
+        if compressor:
+            tail = compressor.compress(tail) + compressor.flush()
+        if tail:
+            yield tail
+    except httpx.TransportError as e:
+        logger.warning("Upstream preview stream failed", url=str(response.url), error=str(e))
+    finally:
+        await response.aclose()
+
 
 class MultiServerComputeManager(ComputeManager):
     """Multi-server compute manager that uses WorkspaceOrchestrator internally.
@@ -264,6 +350,44 @@ class MultiServerComputeManager(ComputeManager):
         if result.stderr:
             yield result.stderr
 
+    async def _get_running_container(self, workspace_id: str) -> tuple[str, str]:
+        """Get (server_id, container_id) of a running workspace for file transfers."""
+        workspace = await self._get_workspace(workspace_id)
+        if not workspace:
+            raise ValueError(f"Workspace {workspace_id} not found")
+
+        if not workspace.container_id or not workspace.server_id:
+            raise ValueError(f"Workspace {workspace_id} has no container/server")
+
+        if workspace.status != WorkspaceStatus.RUNNING:
+            raise ValueError(f"Workspace is not running (status: {workspace.status.value})")
+
+        return workspace.server_id, workspace.container_id
+
+    async def get_archive(
+        self,
+        workspace_id: str,
+        path: str,
+    ) -> tuple[dict[str, Any], AsyncGenerator[bytes, None]]:
+        """Stream a path out of the workspace container as a tar archive."""
+        server_id, container_id = await self._get_running_container(workspace_id)
+        return await self._docker.get_archive(server_id, container_id, path)
+
+    async def put_archive(
+        self,
+        workspace_id: str,
+        path: str,
+        data: bytes | Iterable[bytes],
+    ) -> None:
+        """Extract a tar archive into a directory of the workspace container."""
+        server_id, container_id = await self._get_running_container(workspace_id)
+        await self._docker.put_archive(server_id, container_id, path, data)
+
+    async def stat_path(self, workspace_id: str, path: str) -> dict[str, Any]:
+        """Stat a path in the workspace container."""
+        server_id, container_id = await self._get_running_container(workspace_id)
+        return await self._docker.stat_path(server_id, container_id, path)
+
     async def check_workspace_health(self, workspace_id: str) -> bool:
         """Check if a workspace is healthy and can execute commands."""
         return await self._orchestrator.check_workspace_health(workspace_id)
@@ -286,6 +410,20 @@ class MultiServerComputeManager(ComputeManager):
         request: ProxyRequest,
     ) -> tuple[int, dict[str, str], bytes]:
         """Proxy an HTTP request to a workspace container."""
+        response = await self.proxy_request_stream(request)
+        try:
+            body = b"".join([chunk async for chunk in response.body])
+        finally:
+            await response.close()
+        return response.status_code, response.headers, body
+
+    async def proxy_request_stream(self, request: ProxyRequest) -> ProxyResponse:
+        """Proxy an HTTP request to a workspace container, streaming both bodies.
+
+        Responses pass through with their original content encoding. HTML
+        documents get the DevTools script injected into their head; if they
+        were compressed they are re-gzipped for clients that accept it.
+        """
         workspace = await self._get_workspace(request.workspace_id)
         if not workspace:
             raise ValueError(f"Workspace {request.workspace_id} not found")
@@ -303,19 +441,14 @@ class MultiServerComputeManager(ComputeManager):
         filtered_headers = {
             k: v
             for k, v in request.headers.items()
-            if k.lower()
-            not in (
-                "host",
-                "connection",
-                "keep-alive",
-                "proxy-authenticate",
-                "proxy-authorization",
-                "te",
-                "trailer",
-                "transfer-encoding",
-                "upgrade",
-            )
+            if k.lower() not in _HOP_BY_HOP_HEADERS and k.lower() != "host"
         }
+        if _is_document_request(request.headers):
+            # Only ask for encodings that can be decoded for script injection
+            filtered_headers = {
+                k: v for k, v in filtered_headers.items() if k.lower() != "accept-encoding"
+            }
+            filtered_headers["accept-encoding"] = "gzip, deflate"
 
         logger.debug(
             "Proxying request",
@@ -326,37 +459,16 @@ class MultiServerComputeManager(ComputeManager):
             path=request.path,
         )
 
+        client = await self._get_http_client()
+        upstream_request = client.build_request(
+            method=request.method,
+            url=target_url,
+            headers=filtered_headers,
+            content=request.body_stream if request.body_stream is not None else request.body,
+            timeout=PROXY_TIMEOUT,
+        )
         try:
-            client = await self._get_http_client()
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                headers=filtered_headers,
-                content=request.body,
-                follow_redirects=False,
-            )
-
-            # Filter response headers
-            response_headers = {
-                k: v
-                for k, v in response.headers.items()
-                if k.lower()
-                not in (
-                    "content-encoding",
-                    "transfer-encoding",
-                    "connection",
-                )
-            }
-
-            # Inject DevTools bridge script into HTML responses
-            content_type = response_headers.get("content-type", "")
-            response_body = inject_devtools_script(response.content, content_type)
-
-            if len(response_body) != len(response.content):
-                response_headers["content-length"] = str(len(response_body))
-
-            return response.status_code, response_headers, response_body
-
+            response = await client.send(upstream_request, stream=True, follow_redirects=False)
         except httpx.ConnectError as e:
             logger.warning(
                 "Failed to connect to workspace service",
@@ -376,6 +488,32 @@ class MultiServerComputeManager(ComputeManager):
             )
             raise ValueError("Request timed out") from e
 
+        response_headers = {
+            k: v for k, v in response.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        encoding = response_headers.get("content-encoding", "identity").strip().lower()
+        inject = (
+            request.method != "HEAD"
+            and response.status_code not in (204, 304)
+            and should_inject_script(response_headers.get("content-type"))
+            and encoding in _DECODABLE_ENCODINGS
+        )
+        recompress = False
+        if inject:
+            # The rewritten body has a different length (and maybe encoding)
+            response_headers.pop("content-length", None)
+            response_headers.pop("content-encoding", None)
+            if encoding != "identity" and _accepts_gzip(request.headers):
+                response_headers["content-encoding"] = "gzip"
+                recompress = True
+
+        return ProxyResponse(
+            status_code=response.status_code,
+            headers=response_headers,
+            body=_iter_proxy_body(response, inject=inject, recompress=recompress),
+            close=response.aclose,
+        )
+
     async def track_running_workspaces_usage(self) -> None:
         """Track compute usage for all running workspaces.
 
@@ -599,23 +737,8 @@ class MultiServerComputeManager(ComputeManager):
         workspace containers.
         """
         try:
-            redis_workspaces: dict[str, WorkspaceInfo] = {}
-            if self._workspace_store:
-                try:
-                    all_workspaces = await self._workspace_store.list_all()
-                    redis_workspaces = {w.id: w for w in all_workspaces}
-                    logger.info(
-                        "Loaded workspaces from Redis",
-                        count=len(redis_workspaces),
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Failed to load workspaces from Redis",
-                        error=str(e),
-                    )
-
             # Query all servers for workspace containers
-            rediscovered_count = 0
+            container_workspace_ids: set[str] = set()
             for server_id in self._docker.servers:
                 try:
                     containers = await self._docker.list_containers(
@@ -626,27 +749,41 @@ class MultiServerComputeManager(ComputeManager):
                     for container in containers:
                         workspace_id = container.get("labels", {}).get("podex.workspace_id")
                         if workspace_id:
-                            redis_workspaces.pop(workspace_id, None)
-                            rediscovered_count += 1
+                            container_workspace_ids.add(workspace_id)
 
                 except Exception:
                     logger.exception(
                         "Failed to discover containers on server",
                         server_id=server_id,
                     )
+            rediscovered_count = len(container_workspace_ids)
 
-            # Mark stale workspaces as stopped
+            # Mark running workspaces without a container as stopped, streaming
+            # them from Redis instead of loading every workspace up front
             stale_count = 0
-            for workspace_id, workspace in redis_workspaces.items():
-                if workspace.status == WorkspaceStatus.RUNNING:
+            if self._workspace_store:
+                try:
+                    async for workspace in self._workspace_store.iter_by_status(
+                        WorkspaceStatus.RUNNING
+                    ):
+                        if (
+                            workspace.id in container_workspace_ids
+                            or workspace.status != WorkspaceStatus.RUNNING
+                        ):
+                            continue
+                        logger.warning(
+                            "Workspace in Redis but container not found, marking as stopped",
+                            workspace_id=workspace.id,
+                        )
+                        workspace.status = WorkspaceStatus.STOPPED
+                        workspace.metadata["stale_discovery"] = True
+                        await self._save_workspace(workspace)
+                        stale_count += 1
+                except Exception as e:
                     logger.warning(
-                        "Workspace in Redis but container not found, marking as stopped",
-                        workspace_id=workspace_id,
+                        "Failed to load workspaces from Redis",
+                        error=str(e),
                     )
-                    workspace.status = WorkspaceStatus.STOPPED
-                    workspace.metadata["stale_discovery"] = True
-                    await self._save_workspace(workspace)
-                    stale_count += 1
 
             logger.info(
                 "Workspace discovery complete",
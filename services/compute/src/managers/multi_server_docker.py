@@ -13,17 +13,24 @@ from typing import TYPE_CHECKING, Any
 
 import docker
 import structlog
+from docker.errors import NotFound
 from docker.tls import TLSConfig
+from docker.utils import decode_json_header
 
 from src.config import settings
 from src.utils.task_lock import release_task_lock, try_acquire_task_lock
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable, Iterator
+
     from docker import DockerClient
     from docker.models.containers import Container
 
 logger = structlog.get_logger()
 
+# Chunk size for streamed archive transfers
+ARCHIVE_CHUNK_SIZE = 64 * 1024
+
 
 @dataclass
 class ServerConnection:
@@ -966,16 +973,152 @@ class MultiServerDockerManager:
             )
             return (1, "", str(e))
 
+    async def get_archive(
+        self,
+        server_id: str,
+        container_id: str,
+        path: str,
+        chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    ) -> tuple[dict[str, Any], AsyncGenerator[bytes, None]]:
+        """Stream a path out of a container as a tar archive.
+
+        Args:
+            server_id: Server identifier
+            container_id: Container ID or name
+            path: Absolute path inside the container
+            chunk_size: Size of the chunks read from the Docker API
+
+        Returns:
+            Tuple of (path stat from Docker, async iterator of tar chunks).
+            Closing the iterator early stops the transfer.
+
+        Raises:
+            ConnectionError: If the server is not available
+            FileNotFoundError: If the path does not exist
+        """
+        client = self.get_client(server_id)
+        if not client:
+            raise ConnectionError("Server not available")
+
+        loop = asyncio.get_event_loop()
+
+        def _open() -> tuple[Iterator[bytes], dict[str, Any] | None]:
+            container = client.containers.get(container_id)
+            return container.get_archive(path, chunk_size=chunk_size)
+
+        try:
+            stream, stat = await loop.run_in_executor(None, _open)
+        except NotFound as e:
+            raise FileNotFoundError(path) from e
+
+        async def _chunks() -> AsyncGenerator[bytes, None]:
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(None, next, stream, None)
+                    if chunk is None:
+                        return
+                    yield chunk
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+
+        return stat or {}, _chunks()
+
+    async def put_archive(
+        self,
+        server_id: str,
+        container_id: str,
+        path: str,
+        data: bytes | Iterable[bytes],
+    ) -> None:
+        """Extract a tar archive into a directory in a container.
+
+        Args:
+            server_id: Server identifier
+            container_id: Container ID or name
+            path: Existing directory inside the container to extract into
+            data: Tar archive, as bytes or an iterable of chunks (sent chunked)
+
+        Raises:
+            ConnectionError: If the server is not available
+            FileNotFoundError: If the directory does not exist
+        """
+        client = self.get_client(server_id)
+        if not client:
+            raise ConnectionError("Server not available")
+
+        loop = asyncio.get_event_loop()
+
+        def _put() -> bool:
+            container = client.containers.get(container_id)
+            return bool(container.put_archive(path, data))
+
+        try:
+            await loop.run_in_executor(None, _put)
+        except NotFound as e:
+            raise FileNotFoundError(path) from e
+
+    async def stat_path(
+        self,
+        server_id: str,
+        container_id: str,
+        path: str,
+    ) -> dict[str, Any]:
+        """Stat a path in a container without transferring its content.
+
+        Args:
+            server_id: Server identifier
+            container_id: Container ID or name
+            path: Absolute path inside the container
+
+        Returns:
+            Docker path stat (name, size, mode, mtime, linkTarget)
+
+        Raises:
+            ConnectionError: If the server is not available
+            FileNotFoundError: If the path does not exist
+        """
+        client = self.get_client(server_id)
+        if not client:
+            raise ConnectionError("Server not available")
+
+        loop = asyncio.get_event_loop()
+
+        def _stat() -> dict[str, Any] | None:
+            # HEAD on the archive endpoint returns only the stat header.
+            # docker-py has no public wrapper, but APIClient is a requests.Session.
+            url = (
+                f"{client.api.base_url}/v{client.api.api_version}/containers/{container_id}/archive"
+            )
+            response = client.api.head(url, params={"path": path})
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            stat: dict[str, Any] = decode_json_header(
+                response.headers["x-docker-container-path-stat"]
+            )
+            return stat
+
+        stat = await loop.run_in_executor(None, _stat)
+        if stat is None:
+            raise FileNotFoundError(path)
+        return stat
+
     async def get_container_stats(
         self,
         server_id: str,
         container_id: str,
+        one_shot: bool = False,
     ) -> dict[str, Any] | None:
         """Get container resource usage stats.
 
         Args:
             server_id: Server identifier
             container_id: Container ID or name
+            one_shot: Return a single sample immediately instead of waiting
+                ~1s for a second one. ``precpu_stats`` is then empty, so the
+                caller must supply the previous sample to compute CPU usage.
 
         Returns:
             Stats dict or None if unavailable
@@ -987,6 +1130,10 @@ class MultiServerDockerManager:
         loop = asyncio.get_event_loop()
 
         def _stats() -> dict[str, Any]:
+            if one_shot:
+                # Low-level call avoids the extra inspect round trip of containers.get()
+                sample: dict[str, Any] = client.api.stats(container_id, stream=False, one_shot=True)
+                return sample
             container = client.containers.get(container_id)
             stats = container.stats(stream=False)
             # stats() with stream=False returns a dict, not an iterator
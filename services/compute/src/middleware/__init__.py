@@ -1,5 +1,9 @@
 """Middleware modules for the compute service."""
 
-from .script_injector import inject_devtools_script, should_inject_script
+from .script_injector import (
+    StreamingScriptInjector,
+    inject_devtools_script,
+    should_inject_script,
+)
 
-__all__ = ["inject_devtools_script", "should_inject_script"]
+__all__ = ["StreamingScriptInjector", "inject_devtools_script", "should_inject_script"]
@@ -534,6 +534,45 @@ def should_inject_script(content_type: str | None) -> bool:
     return "text/html" in content_type_lower or "application/xhtml" in content_type_lower
 
 
+# Tag patterns matched against raw bytes: the tags are ASCII, so this works for
+# any ASCII-compatible document encoding without decoding the page
+_HEAD_TAG = re.compile(rb"<head[^>]*>", re.IGNORECASE)
+_HTML_TAG = re.compile(rb"<html[^>]*>", re.IGNORECASE)
+_DOCTYPE_TAG = re.compile(rb"<!DOCTYPE[^>]*>", re.IGNORECASE)
+_BODY_TAG = re.compile(rb"<body[\s>]", re.IGNORECASE)
+_INJECTED_MARKER = b"data-podex-devtools"
+_SCRIPT_BYTES = DEVTOOLS_BRIDGE_SCRIPT.encode("utf-8")
+
+# How much of a streamed HTML document is buffered while looking for <head>
+HEAD_SCAN_LIMIT = 64 * 1024
+
+
+def _insert_script(html: bytes) -> bytes:
+    """Insert the bridge script into (the start of) an HTML document."""
+    if _INJECTED_MARKER in html:
+        return html
+
+    # Try to inject after <head> tag
+    match = _HEAD_TAG.search(html)
+    if match:
+        return html[: match.end()] + _SCRIPT_BYTES + html[match.end() :]
+
+    # Fallback: inject after <html> tag with a new <head>
+    match = _HTML_TAG.search(html)
+    if match:
+        return html[: match.end()] + b"<head>" + _SCRIPT_BYTES + b"</head>" + html[match.end() :]
+
+    # Last resort: check for <!DOCTYPE and inject after it
+    match = _DOCTYPE_TAG.search(html)
+    if match:
+        return (
+            html[: match.end()] + b"<html><head>" + _SCRIPT_BYTES + b"</head>" + html[match.end() :]
+        )
+
+    # No recognizable HTML structure, prepend the script
+    return _SCRIPT_BYTES + html
+
+
 def inject_devtools_script(html_content: bytes, content_type: str | None) -> bytes:
     """Inject DevTools bridge script into HTML content.
 
@@ -551,58 +590,44 @@ def inject_devtools_script(html_content: bytes, content_type: str | None) -> byt
     """
     if not should_inject_script(content_type):
         return html_content
+    return _insert_script(html_content)
 
-    # Try to decode as UTF-8
-    try:
-        html_str = html_content.decode("utf-8")
-    except UnicodeDecodeError:
-        # Try with latin-1 as fallback
-        try:
-            html_str = html_content.decode("latin-1")
-        except UnicodeDecodeError:
-            # Can't decode, return unchanged
-            return html_content
-
-    # Check if already injected
-    if "data-podex-devtools" in html_str:
-        return html_content
 
-    # Try to inject after <head> tag
-    head_pattern = re.compile(r"(<head[^>]*>)", re.IGNORECASE)
-    match = head_pattern.search(html_str)
-    if match:
-        insert_pos = match.end()
-        modified = html_str[:insert_pos] + DEVTOOLS_BRIDGE_SCRIPT + html_str[insert_pos:]
-        return modified.encode("utf-8")
-
-    # Fallback: inject after <html> tag with a new <head>
-    html_pattern = re.compile(r"(<html[^>]*>)", re.IGNORECASE)
-    match = html_pattern.search(html_str)
-    if match:
-        insert_pos = match.end()
-        modified = (
-            html_str[:insert_pos]
-            + "<head>"
-            + DEVTOOLS_BRIDGE_SCRIPT
-            + "</head>"
-            + html_str[insert_pos:]
-        )
-        return modified.encode("utf-8")
+class StreamingScriptInjector:
+    """Inject the DevTools bridge script into an HTML document as it streams.
 
-    # Last resort: check for <!DOCTYPE and inject after it
-    doctype_pattern = re.compile(r"(<!DOCTYPE[^>]*>)", re.IGNORECASE)
-    match = doctype_pattern.search(html_str)
-    if match:
-        insert_pos = match.end()
-        modified = (
-            html_str[:insert_pos]
-            + "<html><head>"
-            + DEVTOOLS_BRIDGE_SCRIPT
-            + "</head>"
-            + html_str[insert_pos:]
-        )
-        return modified.encode("utf-8")
+    Only the start of the document is buffered: once the <head> tag (or the
+    <body> tag, or ``scan_limit`` bytes) has been seen, the script is inserted
+    and every later chunk passes straight through.
+    """
 
-    # No recognizable HTML structure, prepend the script
-    modified = DEVTOOLS_BRIDGE_SCRIPT + html_str
-    return modified.encode("utf-8")
+    def __init__(self, scan_limit: int = HEAD_SCAN_LIMIT) -> None:
+        self._scan_limit = scan_limit
+        self._buffer = bytearray()
+        self._done = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Process a chunk, returning the bytes that can be sent now."""
+        if self._done:
+            return chunk
+        self._buffer.extend(chunk)
+        if (
+            _HEAD_TAG.search(self._buffer) is None
+            and _BODY_TAG.search(self._buffer) is None
+            and len(self._buffer) < self._scan_limit
+        ):
+            return b""
+        return self._flush()
+
+    def close(self) -> bytes:
+        """Finish the document, returning any bytes still buffered."""
+        if self._done or not self._buffer:
+            self._done = True
+            return b""
+        return self._flush()
+
+    def _flush(self) -> bytes:
+        self._done = True
+        html = bytes(self._buffer)
+        self._buffer.clear()
+        return _insert_script(html)
@@ -3,6 +3,8 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from podex_shared import PortInfo, PreviewInfo
 from src.deps import get_compute_manager, verify_internal_auth
@@ -114,14 +116,18 @@ async def _proxy_request(
     request: Request,
     compute: ComputeManager,
 ) -> Response:
-    """Internal proxy implementation."""
+    """Internal proxy implementation.
+
+    Request and response bodies are streamed, so large bundles and
+    long-lived responses (long polling, SSE) are never buffered.
+    """
     # Convert headers to dict
     headers = dict(request.headers.items())
 
-    # Get request body for POST/PUT/PATCH
-    body = None
+    # Stream request body for POST/PUT/PATCH
+    body_stream = None
     if request.method in ("POST", "PUT", "PATCH"):
-        body = await request.body()
+        body_stream = request.stream()
 
     # Get query string
     query_string = str(request.url.query) if request.url.query else None
@@ -133,16 +139,18 @@ async def _proxy_request(
             method=request.method,
             path=path,
             headers=headers,
-            body=body,
             query_string=query_string,
+            body_stream=body_stream,
         )
-        status_code, response_headers, response_body = await compute.proxy_request(proxy_req)
-
-        return Response(
-            content=response_body,
-            status_code=status_code,
-            headers=response_headers,
-            media_type=response_headers.get("content-type"),
+        proxy_response = await compute.proxy_request_stream(proxy_req)
+
+        return StreamingResponse(
+            proxy_response.body,
+            status_code=proxy_response.status_code,
+            headers=proxy_response.headers,
+            media_type=proxy_response.headers.get("content-type"),
+            # Release the upstream connection even if the client disconnects early
+            background=BackgroundTask(proxy_response.close),
         )
 
     except ValueError as e:
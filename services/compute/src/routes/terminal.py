@@ -9,7 +9,7 @@ import asyncio
 import contextlib
 import struct
 import time
-from typing import Annotated, Any, ClassVar
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar
 
 import docker
 import structlog
@@ -24,8 +24,12 @@ from src.managers.base import (
     ComputeManager,  # noqa: TC001 - FastAPI needs this at runtime for Depends()
 )
 from src.models.workspace import WorkspaceInfo, WorkspaceStatus
+from src.utils.terminal_io import TerminalOutputPump, TerminalSocket, TerminalStats
 from src.validation import ValidationError, validate_workspace_id
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
 logger = structlog.get_logger()
 
 router = APIRouter(
@@ -157,10 +161,7 @@ class TmuxSessionManager:
                 try:
                     session._running = False
                     # Close the Docker socket to unblock read operations
-                    if session.socket:
-                        with contextlib.suppress(Exception):
-                            sock = getattr(session.socket, "_sock", session.socket)
-                            sock.close()
+                    session.close_socket()
                     # Close the WebSocket to unblock websocket.receive()
                     if session.websocket:
                         with contextlib.suppress(Exception):
@@ -172,6 +173,17 @@ class TmuxSessionManager:
             await asyncio.sleep(0.5)
             logger.info("Terminal sessions signaled to close")
 
+    def get_session_stats(self) -> list[dict[str, Any]]:
+        """Return I/O throughput and latency stats for local terminal sessions."""
+        return [
+            {
+                "workspace_id": session.workspace_id,
+                "session_name": session.session_name,
+                **session.stats.snapshot(),
+            }
+            for session in self._local_sessions
+        ]
+
     def reset(self) -> None:
         """Reset the manager state - called on startup to clear any stale state."""
         self._shutdown_event.clear()
@@ -223,6 +235,8 @@ class TmuxTerminalSession:
         self.client = docker_client
         self.exec_id: str | None = None
         self.socket: Any = None
+        self._io: TerminalSocket | None = None  # Non-blocking view of self.socket
+        self.stats = TerminalStats()
         self.websocket: WebSocket | None = None  # Reference to client WebSocket for shutdown
         self._running = False
         self._using_tmux = False
@@ -378,6 +392,7 @@ class TmuxTerminalSession:
             socket=True,
             tty=True,
         )
+        self._io = TerminalSocket(self.socket)
 
         self._running = True
         self._using_tmux = True
@@ -422,6 +437,7 @@ class TmuxTerminalSession:
             socket=True,
             tty=True,
         )
+        self._io = TerminalSocket(self.socket)
 
         self._running = True
         self._using_tmux = False
@@ -476,12 +492,11 @@ class TmuxTerminalSession:
 
     async def write(self, data: bytes) -> bool:
         """Write data to the terminal."""
-        if not self.socket or not self._running:
+        if not self._io or not self._running:
             return False
         try:
-            # Get the underlying socket - handle both regular and SSL sockets
-            sock = getattr(self.socket, "_sock", self.socket)
-            await asyncio.to_thread(sock.sendall, data)
+            await self._io.sendall(data)
+            self.stats.bytes_in += len(data)
             return True
         except Exception as e:
             logger.warning(
@@ -492,20 +507,15 @@ class TmuxTerminalSession:
             return False
 
     async def read(self, size: int = 4096) -> bytes | None:
-        """Read data from the terminal."""
-        if not self.socket or not self._running:
+        """Read data from the terminal, waiting until output is available.
+
+        Returns None once the terminal stream has ended.
+        """
+        if not self._io or not self._running:
             return None
         try:
-            # Get the underlying socket - handle both regular and SSL sockets
-            # Docker's socket wrapper may have _sock (non-TLS) or be an SSLSocket (TLS)
-            sock = getattr(self.socket, "_sock", self.socket)
-            # Set a short timeout for non-blocking behavior
-            sock.settimeout(0.1)
-            try:
-                data = await asyncio.to_thread(sock.recv, size)
-                return data if data else None
-            except TimeoutError:
-                return b""
+            data = await self._io.recv(size)
+            return data if data else None
         except Exception as e:
             logger.warning(
                 "Failed to read from terminal",
@@ -514,6 +524,21 @@ class TmuxTerminalSession:
             )
             return None
 
+    async def pump_output(self, send: Callable[[bytes], Awaitable[None]]) -> None:
+        """Forward terminal output to ``send`` until the stream ends."""
+        if not self._io or not self._running:
+            return
+        await TerminalOutputPump(self._io, send, self.stats).run()
+
+    def close_socket(self) -> None:
+        """Close the Docker exec socket, waking any pending reads or writes."""
+        if self._io:
+            self._io.close()
+        elif self.socket:
+            with contextlib.suppress(Exception):
+                sock = getattr(self.socket, "_sock", self.socket)
+                sock.close()
+
     async def resize(self, rows: int, cols: int) -> bool:
         """Resize the terminal."""
         if not self.exec_id or not self._running:
@@ -587,16 +612,14 @@ class TmuxTerminalSession:
         # Unregister from session manager
         await tmux_manager.unregister_client(self.container_id, self.session_name)
 
-        if self.socket:
-            with contextlib.suppress(Exception):
-                sock = getattr(self.socket, "_sock", self.socket)
-                sock.close()
+        self.close_socket()
 
         # Note: We do NOT kill the tmux session - it keeps running
         logger.info(
             "Terminal connection closed (tmux session persists)",
             workspace_id=self.workspace_id,
             session_name=self.session_name,
+            **self.stats.snapshot(),
         )
 
     async def kill_session(self) -> bool:
@@ -771,39 +794,13 @@ async def terminal_websocket(
     await tmux_manager.register_active_session(session)
 
     async def read_from_container() -> None:
-        """Read output from container and send to websocket with batching."""
-        buffer = bytearray()
-        last_send = asyncio.get_event_loop().time()
-        batch_interval = 0.016  # 16ms (~60fps) for smooth rendering
-
-        while session.running:
-            try:
-                data = await session.read()
-                if data is None:
-                    # Send any remaining buffer before exit
-                    if buffer:
-                        await websocket.send_bytes(bytes(buffer))
-                    break
-                if data:
-                    buffer.extend(data)
-                    now = asyncio.get_event_loop().time()
-                    # Send if batch interval passed and buffer has data
-                    if (now - last_send) >= batch_interval:
-                        await websocket.send_bytes(bytes(buffer))
-                        buffer.clear()
-                        last_send = now
-                else:
-                    # Flush any remaining buffer on idle, then sleep
-                    if buffer:
-                        await websocket.send_bytes(bytes(buffer))
-                        buffer.clear()
-                        last_send = asyncio.get_event_loop().time()
-                    await asyncio.sleep(0.016)  # 16ms idle sleep
-            except WebSocketDisconnect:
-                break
-            except Exception as e:
-                logger.debug("Read error", error=str(e))
-                break
+        """Stream container output to the websocket, batching while sends are in flight."""
+        try:
+            await session.pump_output(websocket.send_bytes)
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.debug("Read error", error=str(e))
 
     async def write_to_container() -> None:
         """Read from websocket and write to container."""
@@ -859,6 +856,13 @@ async def terminal_websocket(
         )
 
 
+@router.get("/stats")
+async def terminal_stats() -> dict[str, Any]:
+    """Per-terminal I/O throughput and latency for sessions on this instance."""
+    sessions = tmux_manager.get_session_stats()
+    return {"count": len(sessions), "sessions": sessions}
+
+
 @router.delete("/{workspace_id}/session/{session_id}")
 async def kill_terminal_session(
     workspace_id: str,
@@ -4,7 +4,7 @@ from collections.abc import AsyncGenerator
 from typing import Annotated, Any, cast
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 
 from src.deps import AuthenticatedUser, InternalAuth, get_compute_manager
@@ -272,7 +272,7 @@ async def list_files(
     _auth: InternalAuth,
     compute: Annotated[ComputeManager, Depends(get_compute_manager)],
     path: str = ".",
-) -> list[dict[str, str]]:
+) -> list[dict[str, Any]]:
     """List files in workspace directory."""
     await verify_workspace_ownership(workspace_id, user_id, compute)
     try:
@@ -319,6 +319,77 @@ async def write_file(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
 
 
+@router.get("/{workspace_id}/files/stat")
+async def stat_file(
+    workspace_id: str,
+    path: str,
+    user_id: AuthenticatedUser,
+    _auth: InternalAuth,
+    compute: Annotated[ComputeManager, Depends(get_compute_manager)],
+) -> dict[str, Any]:
+    """Get structured metadata (size, mode, mtime, symlink target) for a path."""
+    await verify_workspace_ownership(workspace_id, user_id, compute)
+    try:
+        file_stat = await compute.stat_file(workspace_id, path)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    return file_stat.to_dict()
+
+
+@router.get("/{workspace_id}/files/raw")
+async def download_file(
+    workspace_id: str,
+    path: str,
+    user_id: AuthenticatedUser,
+    _auth: InternalAuth,
+    compute: Annotated[ComputeManager, Depends(get_compute_manager)],
+    offset: Annotated[int, Query(ge=0)] = 0,
+    length: Annotated[int | None, Query(ge=0)] = None,
+) -> StreamingResponse:
+    """Stream a file (or a byte range of it) as binary content."""
+    await verify_workspace_ownership(workspace_id, user_id, compute)
+    try:
+        file_stat, chunks = await compute.open_file_stream(workspace_id, path, offset, length)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+    start = min(offset, file_stat.size)
+    end = file_stat.size if length is None else min(file_stat.size, start + length)
+    return StreamingResponse(
+        chunks,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Length": str(end - start),
+            "X-File-Size": str(file_stat.size),
+            "X-File-Mode": file_stat.mode,
+            "X-File-Mtime": file_stat.mtime,
+        },
+    )
+
+
+@router.put("/{workspace_id}/files/raw", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_file(
+    workspace_id: str,
+    path: str,
+    request: Request,
+    user_id: AuthenticatedUser,
+    _auth: InternalAuth,
+    compute: Annotated[ComputeManager, Depends(get_compute_manager)],
+    mode: Annotated[str | None, Query(pattern=r"^0?[0-7]{3}$")] = None,
+) -> None:
+    """Write the streamed request body to a file as binary content."""
+    await verify_workspace_ownership(workspace_id, user_id, compute)
+    try:
+        await compute.write_file_stream(
+            workspace_id,
+            path,
+            request.stream(),
+            mode=int(mode, 8) if mode else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
 @router.post("/{workspace_id}/heartbeat", status_code=status.HTTP_204_NO_CONTENT)
 async def heartbeat(
     workspace_id: str,
@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING, Any, cast
 import structlog
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import AsyncIterator, Iterable
 
 from podex_shared.redis_client import RedisClient, get_redis_client
 from src.config import settings
@@ -19,6 +19,14 @@ logger = structlog.get_logger()
 
 
 WORKSPACE_TTL_SECONDS = 24 * 60 * 60  # 24 hours
+METRICS_TTL_SECONDS = 120  # 2 min TTL
+METRICS_PIPELINE_CHUNK_SIZE = 200  # Metrics writes per pipeline round trip
+LOAD_CHUNK_SIZE = 200  # Workspaces loaded per pipelined HGETALL batch
+
+# Set of every workspace ID, maintained by save/delete. The ready marker records
+# that workspaces written before the index existed have been backfilled.
+WORKSPACE_INDEX_KEY = "workspace:index:all"
+WORKSPACE_INDEX_READY_KEY = "workspace:index:ready"
 
 
 def _workspace_key(workspace_id: str) -> str:
@@ -38,6 +46,32 @@ def _status_set_key(status: WorkspaceStatus | str) -> str:
     return f"workspace:status:{status_value}"
 
 
+def _workspace_id_from_key(key: str | bytes) -> str | None:
+    """Extract the workspace ID from a ``workspace:{id}`` key (None for other keys)."""
+    key_str = key.decode() if isinstance(key, bytes) else key
+    if not isinstance(key_str, str) or not key_str.startswith("workspace:"):
+        return None
+    # Skip index and auxiliary keys (workspace:user:*, workspace:{id}:metrics, ...)
+    if ":" in key_str[10:]:  # After "workspace:"
+        return None
+    return key_str[10:]
+
+
+def _decode_workspace(workspace_id: str, record: dict[str, str]) -> WorkspaceInfo | None:
+    """Decode a workspace hash (None if it has no valid data)."""
+    data_json = record.get("data")
+    if not data_json:
+        return None
+    try:
+        data: dict[str, Any] = json.loads(data_json)
+        # Remove store-only fields before validation
+        data.pop("updated_at", None)
+        return WorkspaceInfo.model_validate(data)
+    except Exception:
+        logger.exception("Failed to decode workspace from Redis", workspace_id=workspace_id)
+        return None
+
+
 class WorkspaceStore:
     """Redis-backed workspace state storage.
 
@@ -49,6 +83,7 @@ class WorkspaceStore:
     def __init__(self, redis_url: str | None = None) -> None:
         self._redis_url = redis_url or settings.redis_url
         self._client: RedisClient | None = None
+        self._index_ready = False
 
     async def _get_client(self) -> RedisClient:
         """Get or create the Redis client and ensure it's connected."""
@@ -77,18 +112,19 @@ class WorkspaceStore:
         # Store JSON blob in 'data' field
         await client.hset(key, "data", json.dumps(data))
 
-        # Set TTL
-        await client.expire(key, WORKSPACE_TTL_SECONDS)
-
-        # Update indices
-        redis = client.client
-        await redis.sadd(_user_set_key(workspace.user_id), workspace.id)
-        await redis.sadd(_session_set_key(workspace.session_id), workspace.id)
+        # TTL and indices in one round trip
+        pipe = client.client.pipeline(transaction=False)
+        pipe.expire(key, WORKSPACE_TTL_SECONDS)
+        pipe.sadd(WORKSPACE_INDEX_KEY, workspace.id)
+        pipe.sadd(_user_set_key(workspace.user_id), workspace.id)
+        pipe.sadd(_session_set_key(workspace.session_id), workspace.id)
 
         # Status index
         for status in WorkspaceStatus:
-            await redis.srem(_status_set_key(status), workspace.id)
-        await redis.sadd(_status_set_key(workspace.status), workspace.id)
+            if status != workspace.status:
+                pipe.srem(_status_set_key(status), workspace.id)
+        pipe.sadd(_status_set_key(workspace.status), workspace.id)
+        await pipe.execute()
 
     async def get(self, workspace_id: str) -> WorkspaceInfo | None:
         """Get workspace information."""
@@ -137,22 +173,71 @@ class WorkspaceStore:
         workspace = await self.get(workspace_id)
         await client.delete(key)
 
-        if not workspace:
-            return
+        pipe = client.client.pipeline(transaction=False)
+        pipe.srem(WORKSPACE_INDEX_KEY, workspace_id)
+        if workspace:
+            pipe.srem(_user_set_key(workspace.user_id), workspace.id)
+            pipe.srem(_session_set_key(workspace.session_id), workspace.id)
+            for status in WorkspaceStatus:
+                pipe.srem(_status_set_key(status), workspace.id)
+        await pipe.execute()
 
-        redis = client.client
-        await redis.srem(_user_set_key(workspace.user_id), workspace.id)
-        await redis.srem(_session_set_key(workspace.session_id), workspace.id)
-        for status in WorkspaceStatus:
-            await redis.srem(_status_set_key(status), workspace.id)
+    async def _load_chunk(
+        self,
+        client: RedisClient,
+        workspace_ids: list[str],
+        prune_key: str | None = None,
+    ) -> list[WorkspaceInfo]:
+        """Load workspaces with one pipelined HGETALL round trip.
+
+        Args:
+            client: Connected Redis client
+            workspace_ids: IDs to load
+            prune_key: Index set to remove IDs from whose hash no longer exists
+                (expired by TTL), if any
+        """
+        records = await client.hgetall_many([_workspace_key(wid) for wid in workspace_ids])
+        results: list[WorkspaceInfo] = []
+        missing: list[str] = []
+        for wid, record in zip(workspace_ids, records, strict=True):
+            if not record:
+                missing.append(wid)
+                continue
+            workspace = _decode_workspace(wid, record)
+            if workspace:
+                results.append(workspace)
+
+        if prune_key and missing:
+            await client.client.srem(prune_key, *missing)
+        return results
+
+    async def _iter_set(self, set_key: str, prune: bool = False) -> AsyncIterator[WorkspaceInfo]:
+        """Stream the workspaces in an ID set, loading them in pipelined chunks."""
+        client = await self._get_client()
+        seen: set[str] = set()
+        chunk: list[str] = []
+        async for raw_id in client.client.sscan_iter(set_key, count=LOAD_CHUNK_SIZE):
+            wid = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+            # SSCAN may return an element more than once
+            if wid in seen:
+                continue
+            seen.add(wid)
+            chunk.append(wid)
+            if len(chunk) >= LOAD_CHUNK_SIZE:
+                for workspace in await self._load_chunk(client, chunk, set_key if prune else None):
+                    yield workspace
+                chunk = []
+        if chunk:
+            for workspace in await self._load_chunk(client, chunk, set_key if prune else None):
+                yield workspace
 
     async def list_by_ids(self, workspace_ids: Iterable[str]) -> list[WorkspaceInfo]:
         """Load multiple workspaces by ID."""
+        client = await self._get_client()
+        ids = list(workspace_ids)
         results: list[WorkspaceInfo] = []
-        for wid in workspace_ids:
-            ws = await self.get(wid)
-            if ws:
-                results.append(ws)
+        for start in range(0, len(ids), LOAD_CHUNK_SIZE):
+            results.extend(await self._load_chunk(client, ids[start : start + LOAD_CHUNK_SIZE]))
         return results
 
     async def list_by_user(self, user_id: str) -> list[WorkspaceInfo]:
@@ -171,46 +256,65 @@ class WorkspaceStore:
 
     async def list_running(self) -> list[WorkspaceInfo]:
         """List all running workspaces."""
-        client = await self._get_client()
-        redis = client.client
-        ids = await redis.smembers(_status_set_key(WorkspaceStatus.RUNNING))
-        return await self.list_by_ids(ids)
+        return [ws async for ws in self.iter_by_status(WorkspaceStatus.RUNNING)]
+
+    def iter_by_status(self, status: WorkspaceStatus) -> AsyncIterator[WorkspaceInfo]:
+        """Stream workspaces with a given status without loading them all at once.
+
+        The status index is updated on save, so callers should still check
+        ``workspace.status`` if they depend on it.
+        """
+        return self._iter_set(_status_set_key(status))
+
+    async def iter_all(self) -> AsyncIterator[WorkspaceInfo]:
+        """Stream all known workspaces from the index in pipelined chunks."""
+        await self._ensure_index()
+        async for workspace in self._iter_set(WORKSPACE_INDEX_KEY, prune=True):
+            yield workspace
 
     async def list_all(self) -> list[WorkspaceInfo]:
-        """List all known workspaces (scan)."""
+        """List all known workspaces."""
+        return [ws async for ws in self.iter_all()]
+
+    async def _scan_workspace_ids(self) -> AsyncIterator[list[str]]:
+        """SCAN for ``workspace:{id}`` keys, yielding IDs one SCAN page at a time."""
         client = await self._get_client()
-        redis = client.client
         cursor = 0
-        ids: list[str] = []
-
-        pattern = "workspace:*"
         while True:
-            cursor, keys = await redis.scan(cursor=cursor, match=pattern, count=100)
-            for raw_key in keys:
-                # Extract workspace_id from key
-                key_str = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
-                if not isinstance(key_str, str):
-                    continue
-
-                # Skip index keys (workspace:user:*, workspace:session:*, workspace:status:*)
-                if ":" in key_str[10:]:  # After "workspace:"
-                    continue
-
-                # Only process direct workspace keys (workspace:{id})
-                if key_str.startswith("workspace:"):
-                    workspace_id = key_str.split(":", 1)[1]
-                    # Verify it's a hash before adding to list
-                    try:
-                        key_type = await redis.type(key_str)
-                        if key_type == "hash":
-                            ids.append(workspace_id)
-                    except Exception:
-                        # Skip keys that cause errors (logged at debug level)
-                        logger.debug("Error checking key type", key=key_str)
+            cursor, keys = await client.client.scan(
+                cursor=cursor, match="workspace:*", count=LOAD_CHUNK_SIZE
+            )
+            ids = [wid for wid in map(_workspace_id_from_key, keys) if wid]
+            if ids:
+                yield ids
             if cursor == 0:
                 break
 
-        return await self.list_by_ids(ids)
+    async def rebuild_index(self) -> int:
+        """Add every stored workspace to the index (backfill and repair).
+
+        Returns:
+            Number of IDs found
+        """
+        client = await self._get_client()
+        count = 0
+        async for ids in self._scan_workspace_ids():
+            await client.client.sadd(WORKSPACE_INDEX_KEY, *ids)
+            count += len(ids)
+        await client.client.set(WORKSPACE_INDEX_READY_KEY, "1")
+        self._index_ready = True
+        return count
+
+    async def _ensure_index(self) -> None:
+        """Backfill the index once if it predates this deployment's data."""
+        if self._index_ready:
+            return
+        client = await self._get_client()
+        if await client.client.exists(WORKSPACE_INDEX_READY_KEY):
+            self._index_ready = True
+            return
+        count = await self.rebuild_index()
+        logger.info("Backfilled workspace index", count=count)
 
     async def update_heartbeat(self, workspace_id: str) -> None:
         """Update last_activity and extend TTL."""
@@ -248,55 +352,35 @@ class WorkspaceStore:
 
         This is a defensive cleanup on top of key TTLs to handle cases where
         TTL wasn't set correctly or was extended incorrectly.
+
+        This also re-adds every stored workspace to the all-workspaces index,
+        repairing it if a writer that predates the index saved a workspace.
         """
         client = await self._get_client()
-        redis = client.client
 
         now = datetime.now(UTC)
         threshold = now - timedelta(seconds=max_age_seconds)
         removed: list[str] = []
 
-        cursor = 0
-        pattern = "workspace:*"
-        while True:
-            cursor, keys = await redis.scan(cursor=cursor, match=pattern, count=100)
-            for key in keys:
-                key_str = key.decode() if isinstance(key, bytes) else key
-                if not isinstance(key_str, str) or not key_str.startswith("workspace:"):
-                    continue
-
-                # Skip index keys (workspace:user:*, workspace:session:*, workspace:status:*)
-                if ":" in key_str[10:]:  # After "workspace:"
-                    continue
-
-                workspace_id = key_str.split(":", 1)[1]
-
-                # Check if key is a hash before calling hget
-                try:
-                    key_type = await redis.type(key_str)
-                    if key_type != "hash":
-                        continue
-                except Exception:
-                    logger.debug("Error checking key type during stale cleanup", key=key_str)
-                    continue
+        async for ids in self._scan_workspace_ids():
+            records = await client.hgetall_many([_workspace_key(wid) for wid in ids])
+            present = [wid for wid, record in zip(ids, records, strict=True) if record]
+            if present:
+                await client.client.sadd(WORKSPACE_INDEX_KEY, *present)
 
-                try:
-                    data_json = await client.hget(key_str, "data")
-                except Exception as e:
-                    logger.debug(
-                        "Error reading workspace during stale cleanup",
-                        workspace_id=workspace_id,
-                        error=str(e),
-                    )
+            for workspace_id, record in zip(ids, records, strict=True):
+                # Missing (expired mid-scan) or not a hash
+                if not record:
                     continue
 
-                if not data_json:
-                    await client.delete(key_str)
+                key = _workspace_key(workspace_id)
+                if not record.get("data"):
+                    await client.delete(key)
                     removed.append(workspace_id)
                     continue
 
                 try:
-                    data: dict[str, Any] = json.loads(data_json)
+                    data: dict[str, Any] = json.loads(record["data"])
                     updated_at_str = data.get("updated_at")
                     updated_at = datetime.fromisoformat(updated_at_str) if updated_at_str else None
                     # Also validate that we can deserialize workspace
@@ -307,7 +391,7 @@ class WorkspaceStore:
                         "Failed to decode workspace during stale cleanup",
                         workspace_id=workspace_id,
                     )
-                    await client.delete(key_str)
+                    await client.delete(key)
                     removed.append(workspace_id)
                     continue
 
@@ -316,9 +400,6 @@ class WorkspaceStore:
                     await self.delete(workspace_id)
                     removed.append(workspace_id)
 
-            if cursor == 0:
-                break
-
         if removed:
             logger.info("Cleaned up stale workspaces in Redis", count=len(removed))
 
@@ -337,7 +418,28 @@ class WorkspaceStore:
         """
         client = await self._get_client()
         key = f"workspace:{workspace_id}:metrics"
-        await client.client.set(key, json.dumps(metrics), ex=120)  # 2 min TTL
+        await client.client.set(key, json.dumps(metrics), ex=METRICS_TTL_SECONDS)
+
+    async def update_metrics_many(self, metrics_by_workspace: dict[str, dict[str, Any]]) -> None:
+        """Store resource metrics for many workspaces in pipelined batches.
+
+        Args:
+            metrics_by_workspace: Mapping of workspace ID to metrics dict
+        """
+        if not metrics_by_workspace:
+            return
+
+        client = await self._get_client()
+        items = list(metrics_by_workspace.items())
+        for start in range(0, len(items), METRICS_PIPELINE_CHUNK_SIZE):
+            pipe = client.client.pipeline(transaction=False)
+            for workspace_id, metrics in items[start : start + METRICS_PIPELINE_CHUNK_SIZE]:
+                pipe.set(
+                    f"workspace:{workspace_id}:metrics",
+                    json.dumps(metrics),
+                    ex=METRICS_TTL_SECONDS,
+                )
+            await pipe.execute()
 
     async def get_metrics(self, workspace_id: str) -> dict[str, Any] | None:
         """Get resource metrics for a workspace.
@@ -0,0 +1,172 @@
+"""Streaming helpers for single-file tar archives.
+
+Docker's archive API (``GET``/``PUT /containers/{id}/archive``) transfers files
+as tar streams. These helpers build and read single-member archives chunk by
+chunk, so file transfers never hold a whole file or archive in memory.
+"""
+
+from __future__ import annotations
+
+import tarfile
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+
+BLOCK_SIZE = tarfile.BLOCKSIZE
+_END_OF_ARCHIVE = tarfile.NUL * BLOCK_SIZE * 2
+_TAR_ENCODING = "utf-8"
+_TAR_ERRORS = "surrogateescape"
+
+
+def _padding(size: int) -> int:
+    """Bytes needed to pad ``size`` up to a whole tar block."""
+    return -size % BLOCK_SIZE
+
+
+def _parse_pax_headers(data: bytes) -> dict[str, str]:
+    """Parse PAX extended header records (``"<len> <key>=<value>\\n"``)."""
+    headers: dict[str, str] = {}
+    pos = 0
+    while pos < len(data):
+        length_str, sep, _ = data[pos : pos + 20].partition(b" ")
+        if not sep or not length_str.isdigit():
+            break
+        length = int(length_str)
+        record = data[pos + len(length_str) + 1 : pos + length - 1]
+        key, _, value = record.partition(b"=")
+        headers[key.decode(_TAR_ENCODING)] = value.decode(_TAR_ENCODING, _TAR_ERRORS)
+        pos += length
+    return headers
+
+
+def build_file_archive(
+    name: str,
+    source: BinaryIO,
+    size: int,
+    *,
+    mode: int,
+    uid: int,
+    gid: int,
+    mtime: float,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    """Yield a tar archive containing one regular file read from ``source``.
+
+    Args:
+        name: Member name (relative to the extraction directory)
+        source: Binary file positioned at the start of the content
+        size: Number of bytes to read from ``source``
+        mode: Permission bits for the file
+        uid: Owner user ID
+        gid: Owner group ID
+        mtime: Modification time (seconds since the epoch)
+        chunk_size: Size of the content chunks read from ``source``
+    """
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mode = mode
+    info.uid = uid
+    info.gid = gid
+    info.mtime = int(mtime)
+    yield info.tobuf(tarfile.PAX_FORMAT, _TAR_ENCODING, _TAR_ERRORS)
+
+    remaining = size
+    while remaining > 0:
+        chunk = source.read(min(chunk_size, remaining))
+        if not chunk:
+            msg = f"Source ended {remaining} bytes before the declared size"
+            raise ValueError(msg)
+        remaining -= len(chunk)
+        yield chunk
+
+    if padding := _padding(size):
+        yield tarfile.NUL * padding
+    yield _END_OF_ARCHIVE
+
+
+class TarMemberReader:
+    """Reads the first member of a streamed tar archive.
+
+    Only as much of the stream as is needed is consumed: the header is parsed
+    from the first blocks, and content is yielded as it arrives.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = bytearray()
+        self._member: tarfile.TarInfo | None = None
+
+    async def _fill(self, size: int) -> None:
+        """Buffer at least ``size`` bytes from the stream."""
+        while len(self._buffer) < size:
+            chunk = await anext(self._chunks, None)
+            if chunk is None:
+                msg = "Archive stream ended unexpectedly"
+                raise ValueError(msg)
+            self._buffer.extend(chunk)
+
+    async def _take(self, size: int) -> bytes:
+        """Consume exactly ``size`` bytes."""
+        await self._fill(size)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def read_header(self) -> tarfile.TarInfo:
+        """Parse the header of the first member, applying PAX/GNU long names."""
+        overrides: dict[str, str] = {}
+        while True:
+            block = await self._take(BLOCK_SIZE)
+            if block == tarfile.NUL * BLOCK_SIZE:
+                msg = "Archive is empty"
+                raise ValueError(msg)
+            info = tarfile.TarInfo.frombuf(block, _TAR_ENCODING, _TAR_ERRORS)
+            if info.type not in (
+                tarfile.XHDTYPE,
+                tarfile.XGLTYPE,
+                tarfile.GNUTYPE_LONGNAME,
+                tarfile.GNUTYPE_LONGLINK,
+            ):
+                break
+            data = await self._take(info.size + _padding(info.size))
+            data = data[: info.size]
+            if info.type == tarfile.XHDTYPE:
+                overrides.update(_parse_pax_headers(data))
+            elif info.type == tarfile.GNUTYPE_LONGNAME:
+                overrides["path"] = data.rstrip(tarfile.NUL).decode(_TAR_ENCODING, _TAR_ERRORS)
+            elif info.type == tarfile.GNUTYPE_LONGLINK:
+                overrides["linkpath"] = data.rstrip(tarfile.NUL).decode(_TAR_ENCODING, _TAR_ERRORS)
+
+        if "path" in overrides:
+            info.name = overrides["path"]
+        if "linkpath" in overrides:
+            info.linkname = overrides["linkpath"]
+        if "size" in overrides:
+            info.size = int(overrides["size"])
+        self._member = info
+        return info
+
+    async def iter_content(
+        self,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the content of the first member, optionally a byte range of it.
+
+        Args:
+            offset: First byte to yield
+            length: Maximum number of bytes to yield (to the end if None)
+        """
+        member = self._member or await self.read_header()
+        start = min(offset, member.size)
+        end = member.size if length is None else min(member.size, start + length)
+        pos = 0
+        while pos < end:
+            if not self._buffer:
+                await self._fill(1)
+            take = min(len(self._buffer), end - pos)
+            if pos + take > start:
+                yield bytes(self._buffer[max(start - pos, 0) : take])
+            del self._buffer[:take]
+            pos += take
@@ -0,0 +1,230 @@
+"""Event-loop driven I/O for interactive terminal sockets.
+
+Docker exec sockets are plain blocking sockets (or ``SSLSocket`` for TLS
+hosts). Instead of parking a thread-pool worker in ``recv`` per terminal,
+the socket is switched to non-blocking mode and readiness is awaited with
+``loop.add_reader``/``add_writer``, so an idle terminal costs nothing but a
+registered file descriptor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    import socket
+    from collections.abc import Awaitable, Callable
+
+# Output buffered for a slow websocket before reads from the container pause
+MAX_PENDING_OUTPUT = 1024 * 1024
+# Largest single websocket message sent to the client
+MAX_MESSAGE_SIZE = 64 * 1024
+READ_SIZE = 64 * 1024
+
+
+def unwrap_socket(raw: Any) -> socket.socket:
+    """Return the OS socket behind Docker's exec socket wrapper.
+
+    Docker's socket wrapper may have ``_sock`` (non-TLS) or be an
+    ``SSLSocket`` itself (TLS).
+    """
+    return cast("socket.socket", getattr(raw, "_sock", raw))
+
+
+class TerminalSocket:
+    """Non-blocking async wrapper around a Docker exec socket."""
+
+    def __init__(self, raw: Any, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self._sock = unwrap_socket(raw)
+        self._sock.setblocking(False)
+        self._fd = self._sock.fileno()
+        self._loop = loop or asyncio.get_running_loop()
+        self._waiters: set[asyncio.Future[None]] = set()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def _wait(self, writable: bool) -> None:
+        """Wait until the socket is readable (or writable)."""
+        if self._closed:
+            raise ConnectionError("Terminal socket is closed")
+        waiter: asyncio.Future[None] = self._loop.create_future()
+
+        def _ready() -> None:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        add, remove = (
+            (self._loop.add_writer, self._loop.remove_writer)
+            if writable
+            else (self._loop.add_reader, self._loop.remove_reader)
+        )
+        add(self._fd, _ready)
+        self._waiters.add(waiter)
+        try:
+            await waiter
+        finally:
+            self._waiters.discard(waiter)
+            if not self._closed:
+                remove(self._fd)
+
+    async def recv(self, size: int = READ_SIZE) -> bytes:
+        """Receive up to ``size`` bytes; ``b""`` means the stream ended."""
+        while True:
+            try:
+                # Always try first: SSL sockets may hold decrypted bytes that
+                # never show up as fd readiness
+                return self._sock.recv(size)
+            except (BlockingIOError, ssl.SSLWantReadError):
+                await self._wait(writable=False)
+            except ssl.SSLWantWriteError:
+                await self._wait(writable=True)
+
+    async def sendall(self, data: bytes) -> None:
+        """Send all of ``data``, waiting for socket buffer space as needed."""
+        view = memoryview(data)
+        while view:
+            try:
+                sent = self._sock.send(view)
+            except (BlockingIOError, ssl.SSLWantWriteError):
+                await self._wait(writable=True)
+                continue
+            except ssl.SSLWantReadError:
+                await self._wait(writable=False)
+                continue
+            view = view[sent:]
+
+    def close(self) -> None:
+        """Close the socket, failing any pending reads or writes."""
+        if self._closed:
+            return
+        self._closed = True
+        self._loop.remove_reader(self._fd)
+        self._loop.remove_writer(self._fd)
+        for waiter in list(self._waiters):
+            if not waiter.done():
+                waiter.set_exception(ConnectionError("Terminal socket is closed"))
+        with contextlib.suppress(OSError):
+            self._sock.close()
+
+
+@dataclass
+class TerminalStats:
+    """Throughput and latency counters for one terminal connection."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    bytes_in: int = 0  # Client input written to the container
+    bytes_out: int = 0  # Container output sent to the client
+    messages_out: int = 0
+    # Time output waited in the buffer before its websocket send completed
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    # Times reads from the container paused because the client fell behind
+    backpressure_stalls: int = 0
+
+    def record_send(self, size: int, latency: float) -> None:
+        self.bytes_out += size
+        self.messages_out += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def snapshot(self) -> dict[str, float | int]:
+        """Return the counters plus derived rates as a plain dict."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "duration_s": round(elapsed, 3),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "messages_out": self.messages_out,
+            "out_bytes_per_s": round(self.bytes_out / elapsed, 1),
+            "avg_latency_ms": round(self.latency_total / self.messages_out * 1000, 3)
+            if self.messages_out
+            else 0.0,
+            "max_latency_ms": round(self.latency_max * 1000, 3),
+            "backpressure_stalls": self.backpressure_stalls,
+        }
+
+
+class TerminalOutputPump:
+    """Forward terminal output to a websocket with backpressure-aware batching.
+
+    Reads and sends run concurrently: while a websocket send is in flight,
+    further output accumulates and goes out as one message. If the client
+    falls ``max_pending`` bytes behind, reads stop so the container's PTY
+    blocks instead of the buffer growing without bound.
+    """
+
+    def __init__(
+        self,
+        sock: TerminalSocket,
+        send: Callable[[bytes], Awaitable[None]],
+        stats: TerminalStats,
+        *,
+        max_pending: int = MAX_PENDING_OUTPUT,
+        max_message: int = MAX_MESSAGE_SIZE,
+    ) -> None:
+        self._sock = sock
+        self._send = send
+        self._stats = stats
+        self._max_pending = max_pending
+        self._max_message = max_message
+        self._buffer = bytearray()
+        self._buffered_at = 0.0  # When the oldest unsent byte arrived
+        self._data_ready = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._eof = False
+
+    async def run(self) -> None:
+        """Pump until the container closes the stream or the client goes away."""
+        reader = asyncio.create_task(self._read_loop())
+        try:
+            await self._send_loop()
+        finally:
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError, OSError):
+                await reader
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                if not self._has_space.is_set():
+                    self._stats.backpressure_stalls += 1
+                    await self._has_space.wait()
+                data = await self._sock.recv(READ_SIZE)
+                if not data:
+                    break
+                if not self._buffer:
+                    self._buffered_at = time.monotonic()
+                self._buffer.extend(data)
+                self._data_ready.set()
+                if len(self._buffer) >= self._max_pending:
+                    self._has_space.clear()
+        finally:
+            self._eof = True
+            self._data_ready.set()
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._data_ready.wait()
+            if not self._buffer:
+                if self._eof:
+                    return
+                self._data_ready.clear()
+                continue
+            buffered_at = self._buffered_at
+            chunk = bytes(self._buffer[: self._max_message])
+            del self._buffer[: self._max_message]
+            if self._buffer:
+                self._buffered_at = time.monotonic()
+            if len(self._buffer) < self._max_pending:
+                self._has_space.set()
+            await self._send(chunk)
+            self._stats.record_send(len(chunk), time.monotonic() - buffered_at)
@@ -119,6 +119,17 @@ class MockWorkspaceStore:
         """List all workspaces."""
         return list(self._workspaces.values())
 
+    async def iter_all(self) -> AsyncGenerator[Any, None]:
+        """Stream all workspaces."""
+        for w in list(self._workspaces.values()):
+            yield w
+
+    async def iter_by_status(self, status: Any) -> AsyncGenerator[Any, None]:
+        """Stream workspaces with a given status."""
+        for w in list(self._workspaces.values()):
+            if hasattr(w, 'status') and w.status == status:
+                yield w
+
 
 @pytest.fixture
 def mock_workspace_store() -> MockWorkspaceStore:
@@ -0,0 +1,239 @@
+"""Tests for tar-streamed workspace file transfer."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.managers.base import FileStat
+from src.managers.multi_server_compute_manager import MultiServerComputeManager
+from src.models.workspace import WorkspaceExecResponse, WorkspaceInfo, WorkspaceStatus
+from src.utils.tar_stream import TarMemberReader, build_file_archive
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable
+
+# Docker stat mode for a regular file with 0755 permissions
+FILE_STAT = {"name": "run.sh", "size": 11, "mode": 0o755, "mtime": "2026-01-01T00:00:00Z"}
+
+
+def _archive(name: str, content: bytes, mode: int = 0o644) -> bytes:
+    return b"".join(
+        build_file_archive(
+            name,
+            io.BytesIO(content),
+            len(content),
+            mode=mode,
+            uid=1000,
+            gid=1000,
+            mtime=0,
+            chunk_size=7,
+        )
+    )
+
+
+async def _chunked(data: bytes, size: int = 100) -> AsyncGenerator[bytes, None]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+class TestTarStream:
+    """Tests for building and reading single-file archives."""
+
+    def test_built_archive_is_valid_tar(self) -> None:
+        """Test the streamed archive can be read by tarfile."""
+        data = _archive("hello.txt", b"hello world", mode=0o600)
+
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            member = tar.getmember("hello.txt")
+            assert (member.mode, member.uid, member.gid) == (0o600, 1000, 1000)
+            assert tar.extractfile(member).read() == b"hello world"  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_reader_parses_pax_long_name(self) -> None:
+        """Test PAX headers for long names are applied to the member."""
+        name = "d" * 150 + ".bin"
+        reader = TarMemberReader(_chunked(_archive(name, b"\x00\xff" * 300)))
+
+        member = await reader.read_header()
+        content = b"".join([chunk async for chunk in reader.iter_content()])
+
+        assert member.name == name
+        assert content == b"\x00\xff" * 300
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("offset", "length", "expected"),
+        [(0, None, slice(0, None)), (150, 100, slice(150, 250)), (990, 50, slice(990, None))],
+    )
+    async def test_reader_ranged_content(
+        self, offset: int, length: int | None, expected: slice
+    ) -> None:
+        """Test byte ranges spanning chunk boundaries."""
+        content = bytes(range(256)) * 4
+        reader = TarMemberReader(_chunked(_archive("f", content), size=64))
+
+        data = b"".join([chunk async for chunk in reader.iter_content(offset, length)])
+
+        assert data == content[expected]
+
+
+class TestWorkspaceFileTransfer:
+    """Tests for ComputeManager file operations over the archive API."""
+
+    @pytest.fixture
+    def docker_manager(self) -> MagicMock:
+        manager = MagicMock()
+        manager.servers = {}
+        manager.stat_path = AsyncMock(side_effect=FileNotFoundError)
+        manager.put_archive = AsyncMock()
+        return manager
+
+    @pytest.fixture
+    def orchestrator(self) -> MagicMock:
+        orchestrator = MagicMock()
+        orchestrator.exec_command = AsyncMock(
+            return_value=WorkspaceExecResponse(exit_code=0, stdout="", stderr="")
+        )
+        return orchestrator
+
+    @pytest.fixture
+    def compute(
+        self, docker_manager: MagicMock, orchestrator: MagicMock
+    ) -> MultiServerComputeManager:
+        workspace = WorkspaceInfo(
+            id="ws-1",
+            user_id="user-1",
+            session_id="session-1",
+            status=WorkspaceStatus.RUNNING,
+            tier="starter_arm",
+            host="localhost",
+            port=3000,
+            server_id="server-1",
+            container_id="container-1",
+            created_at=datetime.now(UTC),
+            last_activity=datetime.now(UTC),
+        )
+        store = MagicMock()
+        store.get = AsyncMock(return_value=workspace)
+        return MultiServerComputeManager(
+            orchestrator=orchestrator,
+            docker_manager=docker_manager,
+            workspace_store=store,
+        )
+
+    @staticmethod
+    def _uploaded(docker_manager: MagicMock) -> tuple[str, tarfile.TarInfo, bytes]:
+        _server, _container, path, data = docker_manager.put_archive.call_args.args
+        archive = b"".join(data) if not isinstance(data, bytes) else data
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            member = tar.getmembers()[0]
+            content = tar.extractfile(member).read()  # type: ignore[union-attr]
+        return path, member, content
+
+    @pytest.mark.asyncio
+    async def test_read_file_follows_symlink(
+        self, compute: MultiServerComputeManager, docker_manager: MagicMock
+    ) -> None:
+        """Test reading a symlink streams the resolved target."""
+        link_stat = {"name": "link", "size": 8, "mode": 1 << 27 | 0o777, "linkTarget": "/opt/t"}
+        archives = {
+            "/home/dev/link": (link_stat, _chunked(b"")),
+            "/opt/t": ({**FILE_STAT, "name": "t"}, _chunked(_archive("t", b"target text"))),
+        }
+        docker_manager.get_archive = AsyncMock(side_effect=lambda _s, _c, path: archives[path])
+
+        assert await compute.read_file("ws-1", "link") == "target text"
+
+    @pytest.mark.asyncio
+    async def test_read_file_missing_raises_value_error(
+        self, compute: MultiServerComputeManager, docker_manager: MagicMock
+    ) -> None:
+        """Test missing files map to ValueError for the routes."""
+        docker_manager.get_archive = AsyncMock(side_effect=FileNotFoundError)
+
+        with pytest.raises(ValueError, match="File not found"):
+            await compute.read_file("ws-1", "missing.txt")
+
+    @pytest.mark.asyncio
+    async def test_write_file_keeps_existing_mode(
+        self, compute: MultiServerComputeManager, docker_manager: MagicMock
+    ) -> None:
+        """Test overwriting a file keeps its permissions and ownership."""
+        docker_manager.stat_path = AsyncMock(return_value=FILE_STAT)
+
+        await compute.write_file("ws-1", "bin/run.sh", "echo hi\n")
+
+        path, member, content = self._uploaded(docker_manager)
+        assert path == "/home/dev/bin"
+        assert (member.name, member.mode, member.uid) == ("run.sh", 0o755, 1000)
+        assert content == b"echo hi\n"
+
+    @pytest.mark.asyncio
+    async def test_write_stream_creates_missing_parent(
+        self,
+        compute: MultiServerComputeManager,
+        docker_manager: MagicMock,
+        orchestrator: MagicMock,
+    ) -> None:
+        """Test a missing parent directory is created and the upload retried."""
+        uploads: list[bytes] = []
+
+        async def put_archive(_s: str, _c: str, path: str, data: Iterable[bytes]) -> None:
+            uploads.append(b"".join(data))
+            if len(uploads) == 1:
+                raise FileNotFoundError(path)
+
+        docker_manager.put_archive = AsyncMock(side_effect=put_archive)
+
+        written = await compute.write_file_stream(
+            "ws-1", "new/dir/data.bin", _chunked(b"\x01" * 500)
+        )
+
+        assert written == 500
+        assert orchestrator.exec_command.call_args.kwargs["command"] == "mkdir -p /home/dev/new/dir"
+        assert len(uploads) == 2
+        assert uploads[0] == uploads[1]
+
+    @pytest.mark.asyncio
+    async def test_list_files_parses_structured_output(
+        self, compute: MultiServerComputeManager, orchestrator: MagicMock
+    ) -> None:
+        """Test list_files returns typed entries including symlink info."""
+        entries = [
+            ["src", "d", "d", "4096", "1767225600.5", "755", ""],
+            ["my file.txt", "f", "f", "12", "1767225600.0", "644", ""],
+            ["lib", "l", "d", "9", "1767225600.0", "777", "/opt/lib"],
+        ]
+        stdout = "".join(field + "\0" for entry in entries for field in entry)
+        orchestrator.exec_command = AsyncMock(
+            return_value=WorkspaceExecResponse(exit_code=0, stdout=stdout, stderr="")
+        )
+
+        files = await compute.list_files("ws-1", "project")
+
+        assert [f["name"] for f in files] == ["lib", "my file.txt", "src"]
+        lib: dict[str, Any] = files[0]
+        assert lib["type"] == "directory"
+        assert lib["is_symlink"] is True
+        assert lib["link_target"] == "/opt/lib"
+        assert files[1] == {
+            "name": "my file.txt",
+            "type": "file",
+            "size": 12,
+            "mode": "0644",
+            "mtime": "2026-01-01T00:00:00+00:00",
+            "is_symlink": False,
+            "link_target": None,
+        }
+
+    def test_file_stat_from_docker_stat(self) -> None:
+        """Test Docker's Go file mode bits are decoded."""
+        stat = FileStat.from_docker_stat("/home/dev/src", {"name": "src", "mode": 1 << 31 | 0o755})
+
+        assert (stat.type, stat.mode, stat.link_target) == ("directory", "0755", None)
@@ -0,0 +1,130 @@
+"""Tests for the workspace container health sweep."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.managers.heartbeat import HeartbeatConfig, HeartbeatService
+
+
+def _container(workspace_id: str, status: str = "running") -> dict[str, Any]:
+    return {
+        "id": f"c-{workspace_id}",
+        "status": status,
+        "labels": {"podex.workspace_id": workspace_id},
+    }
+
+
+@pytest.fixture
+def docker_manager() -> MagicMock:
+    manager = MagicMock()
+    manager.servers = {"server-a": MagicMock(), "server-b": MagicMock()}
+    manager.list_containers = AsyncMock(
+        side_effect=lambda server_id, **_kw: [_container(f"{server_id}-ws{i}") for i in range(6)]
+    )
+    manager.parse_container_stats = MagicMock(
+        side_effect=lambda stats: {"cpu": stats.get("precpu_stats", {}).get("total")}
+    )
+    return manager
+
+
+@pytest.fixture
+def workspace_store() -> MagicMock:
+    store = MagicMock()
+    store.update_metrics_many = AsyncMock()
+    store.get = AsyncMock(return_value=None)
+    return store
+
+
+def _service(
+    docker_manager: MagicMock, workspace_store: MagicMock, **config: Any
+) -> HeartbeatService:
+    return HeartbeatService(
+        docker_manager=docker_manager,
+        config=HeartbeatConfig(report_to_api=False, **config),
+        workspace_store=workspace_store,
+    )
+
+
+class TestWorkspaceContainerSweep:
+    """Tests for HeartbeatService.check_all_workspace_containers."""
+
+    @pytest.mark.asyncio
+    async def test_sweep_respects_per_server_concurrency(
+        self, docker_manager: MagicMock, workspace_store: MagicMock
+    ) -> None:
+        """Test servers are swept in parallel with at most N stats calls per server."""
+        in_flight: dict[str, int] = {"server-a": 0, "server-b": 0}
+        peak: dict[str, int] = {"server-a": 0, "server-b": 0}
+
+        async def stats(server_id: str, _container_id: str, one_shot: bool) -> dict[str, Any]:
+            assert one_shot
+            in_flight[server_id] += 1
+            peak[server_id] = max(peak[server_id], in_flight[server_id])
+            await asyncio.sleep(0.01)
+            in_flight[server_id] -= 1
+            return {"cpu_stats": {}}
+
+        docker_manager.get_container_stats = AsyncMock(side_effect=stats)
+        service = _service(docker_manager, workspace_store, per_server_check_concurrency=2)
+
+        results = await service.check_all_workspace_containers()
+
+        assert len(results) == 12
+        assert peak == {"server-a": 2, "server-b": 2}
+
+    @pytest.mark.asyncio
+    async def test_metrics_written_in_one_batch(
+        self, docker_manager: MagicMock, workspace_store: MagicMock
+    ) -> None:
+        """Test metrics for all running containers are stored with one batched call."""
+        docker_manager.get_container_stats = AsyncMock(return_value={"cpu_stats": {"total": 1}})
+        service = _service(docker_manager, workspace_store)
+
+        await service.check_all_workspace_containers()
+
+        workspace_store.update_metrics_many.assert_awaited_once()
+        assert len(workspace_store.update_metrics_many.await_args.args[0]) == 12
+
+    @pytest.mark.asyncio
+    async def test_cpu_measured_against_previous_sweep(
+        self, docker_manager: MagicMock, workspace_store: MagicMock
+    ) -> None:
+        """Test one-shot samples use the previous sweep's sample as precpu_stats."""
+        samples = iter([{"cpu_stats": {"total": 100}}, {"cpu_stats": {"total": 250}}])
+        docker_manager.servers = {"server-a": MagicMock()}
+        docker_manager.list_containers = AsyncMock(return_value=[_container("ws-1")])
+        docker_manager.get_container_stats = AsyncMock(side_effect=lambda *_a, **_kw: next(samples))
+        service = _service(docker_manager, workspace_store)
+
+        await service.check_all_workspace_containers()
+        await service.check_all_workspace_containers()
+
+        first, second = (c.args[0] for c in workspace_store.update_metrics_many.await_args_list)
+        assert first == {"ws-1": {"cpu": None}}
+        assert second == {"ws-1": {"cpu": 100}}
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_and_failing_servers_do_not_stop_sweep(
+        self, docker_manager: MagicMock, workspace_store: MagicMock
+    ) -> None:
+        """Test a failing server listing and stopped containers are handled per item."""
+
+        async def list_containers(server_id: str, **_kw: Any) -> list[dict[str, Any]]:
+            if server_id == "server-a":
+                raise ConnectionError("down")
+            return [_container("ws-1", "exited"), _container("ws-2")]
+
+        docker_manager.list_containers = AsyncMock(side_effect=list_containers)
+        docker_manager.get_container_stats = AsyncMock(side_effect=TimeoutError)
+        service = _service(docker_manager, workspace_store)
+
+        results = await service.check_all_workspace_containers()
+
+        assert results == {"ws-1": "exited", "ws-2": "running"}
+        workspace_store.get.assert_awaited_once_with("ws-1")
+        workspace_store.update_metrics_many.assert_not_awaited()
@@ -0,0 +1,125 @@
+"""Tests for the preview proxy hop from the compute service to a workspace."""
+
+from __future__ import annotations
+
+import gzip
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from src.managers.multi_server_compute_manager import MultiServerComputeManager
+from src.middleware.script_injector import DEVTOOLS_BRIDGE_SCRIPT
+from src.routes.preview import _proxy_request
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+BUNDLE = b"console.log('hello');\n" * 500
+PAGE = b"<html><head><title>app</title></head><body>" + b"<p>hi</p>" * 500 + b"</body></html>"
+
+
+def _make_request(headers: dict[str, str]) -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/preview/ws-1/proxy/3000/app.js",
+        "query_string": b"",
+        "headers": [(key.encode(), value.encode()) for key, value in headers.items()],
+    }
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    return Request(scope, receive)
+
+
+async def _send_response(response: Any) -> tuple[dict[str, str], bytes]:
+    """Run an ASGI response and return its headers and raw body bytes."""
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    await response({"type": "http"}, receive, send)
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return headers, body
+
+
+def _compute(
+    mock_workspace_store: Any, workspace_factory: Any, content_type: str, body: bytes
+) -> MultiServerComputeManager:
+    """Build a manager whose workspace serves body gzipped."""
+    mock_workspace_store._workspaces["ws-1"] = workspace_factory.create_info(workspace_id="ws-1")
+    compressed = gzip.compress(body)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(compressed), 256):
+            yield compressed[start : start + 256]
+
+    async def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={
+                "content-type": content_type,
+                "content-encoding": "gzip",
+                "content-length": str(len(compressed)),
+            },
+            content=chunks(),
+        )
+
+    manager = MagicMock()
+    manager.servers = {}
+    compute = MultiServerComputeManager(
+        orchestrator=MagicMock(),
+        docker_manager=manager,
+        workspace_store=mock_workspace_store,
+    )
+    compute._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return compute
+
+
+@pytest.mark.asyncio
+async def test_gzip_asset_passes_through_undecoded(
+    mock_workspace_store: Any, workspace_factory: Any
+) -> None:
+    """A compressed non-HTML body keeps its bytes and encoding headers."""
+    compute = _compute(mock_workspace_store, workspace_factory, "application/javascript", BUNDLE)
+
+    response = await _proxy_request(
+        "ws-1", 3000, "app.js", _make_request({"accept-encoding": "gzip, br"}), compute
+    )
+    headers, body = await _send_response(response)
+
+    assert body == gzip.compress(BUNDLE)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(body))
+
+
+@pytest.mark.asyncio
+async def test_gzip_html_is_injected_and_recompressed(
+    mock_workspace_store: Any, workspace_factory: Any
+) -> None:
+    """Compressed HTML is rewritten and re-gzipped without a stale content-length."""
+    compute = _compute(mock_workspace_store, workspace_factory, "text/html", PAGE)
+
+    response = await _proxy_request(
+        "ws-1",
+        3000,
+        "",
+        _make_request({"accept": "text/html", "accept-encoding": "gzip"}),
+        compute,
+    )
+    headers, body = await _send_response(response)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    html = gzip.decompress(body)
+    assert DEVTOOLS_BRIDGE_SCRIPT.encode() in html
+    assert html.endswith(b"</body></html>")
@@ -0,0 +1,64 @@
+"""Tests for DevTools script injection into proxied HTML."""
+
+from __future__ import annotations
+
+from src.middleware.script_injector import (
+    DEVTOOLS_BRIDGE_SCRIPT,
+    StreamingScriptInjector,
+    inject_devtools_script,
+)
+
+SCRIPT = DEVTOOLS_BRIDGE_SCRIPT.encode()
+
+
+def _stream(injector: StreamingScriptInjector, data: bytes, size: int) -> bytes:
+    chunks = [injector.feed(data[i : i + size]) for i in range(0, len(data), size)]
+    return b"".join(chunks) + injector.close()
+
+
+class TestInjectDevtoolsScript:
+    """Tests for whole-document injection."""
+
+    def test_injects_after_head(self) -> None:
+        html = b"<html><head><title>x</title></head><body></body></html>"
+        result = inject_devtools_script(html, "text/html")
+        assert result.startswith(b"<html><head>" + SCRIPT + b"<title>")
+
+    def test_skips_non_html(self) -> None:
+        assert inject_devtools_script(b"{}", "application/json") == b"{}"
+
+    def test_does_not_inject_twice(self) -> None:
+        once = inject_devtools_script(b"<head></head>", "text/html")
+        assert inject_devtools_script(once, "text/html") == once
+
+    def test_preserves_non_utf8_bytes(self) -> None:
+        html = b"<head></head><p>caf\xe9</p>"
+        assert inject_devtools_script(html, "text/html").endswith(b"caf\xe9</p>")
+
+
+class TestStreamingScriptInjector:
+    """Tests for streamed injection."""
+
+    def test_matches_buffered_injection(self) -> None:
+        html = b"<!DOCTYPE html><html><head></head><body>" + b"a" * 5000 + b"</body></html>"
+        result = _stream(StreamingScriptInjector(), html, 7)
+        assert result == inject_devtools_script(html, "text/html")
+
+    def test_passes_through_after_head(self) -> None:
+        injector = StreamingScriptInjector()
+        assert injector.feed(b"<html><he") == b""
+        assert injector.feed(b"ad>") == b"<html><head>" + SCRIPT
+        assert injector.feed(b"<body>") == b"<body>"
+        assert injector.close() == b""
+
+    def test_stops_buffering_at_scan_limit(self) -> None:
+        injector = StreamingScriptInjector(scan_limit=16)
+        assert injector.feed(b"x" * 16) == SCRIPT + b"x" * 16
+
+    def test_flushes_short_document_on_close(self) -> None:
+        injector = StreamingScriptInjector()
+        assert injector.feed(b"<html>") == b""
+        assert injector.close() == b"<html><head>" + SCRIPT + b"</head>"
+
+    def test_empty_document(self) -> None:
+        assert StreamingScriptInjector().close() == b""
@@ -0,0 +1,167 @@
+"""Tests for event-loop driven terminal socket I/O."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.utils.terminal_io import TerminalOutputPump, TerminalSocket, TerminalStats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def sock_pair() -> Iterator[tuple[socket.socket, socket.socket]]:
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+class TestTerminalSocket:
+    """Tests for TerminalSocket."""
+
+    async def test_recv_waits_for_data(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, right = sock_pair
+        term = TerminalSocket(left)
+
+        recv = asyncio.create_task(term.recv())
+        await asyncio.sleep(0.01)
+        assert not recv.done()
+
+        right.sendall(b"hello")
+        assert await asyncio.wait_for(recv, 1) == b"hello"
+
+    async def test_recv_returns_empty_at_eof(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, right = sock_pair
+        term = TerminalSocket(left)
+        right.close()
+        assert await asyncio.wait_for(term.recv(), 1) == b""
+
+    async def test_sendall(self, sock_pair: tuple[socket.socket, socket.socket]) -> None:
+        left, right = sock_pair
+        term = TerminalSocket(left)
+        await term.sendall(b"ls\n")
+        assert right.recv(16) == b"ls\n"
+
+    async def test_unwraps_docker_socket(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, right = sock_pair
+
+        class Wrapper:
+            _sock = left
+
+        term = TerminalSocket(Wrapper())
+        right.sendall(b"x")
+        assert await asyncio.wait_for(term.recv(), 1) == b"x"
+
+    async def test_close_wakes_pending_recv(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, _ = sock_pair
+        term = TerminalSocket(left)
+
+        recv = asyncio.create_task(term.recv())
+        await asyncio.sleep(0.01)
+        term.close()
+
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(recv, 1)
+        assert term.closed
+
+
+class TestTerminalOutputPump:
+    """Tests for TerminalOutputPump."""
+
+    async def test_forwards_output_until_eof(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, right = sock_pair
+        sent: list[bytes] = []
+
+        async def send(data: bytes) -> None:
+            sent.append(data)
+
+        stats = TerminalStats()
+        right.sendall(b"abc")
+        right.close()
+        await asyncio.wait_for(TerminalOutputPump(TerminalSocket(left), send, stats).run(), 1)
+
+        assert b"".join(sent) == b"abc"
+        assert stats.bytes_out == 3
+        assert stats.messages_out == len(sent)
+
+    async def test_batches_output_while_send_in_flight(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, right = sock_pair
+        sent: list[bytes] = []
+        release = asyncio.Event()
+
+        async def send(data: bytes) -> None:
+            sent.append(data)
+            await release.wait()
+
+        pump = asyncio.create_task(
+            TerminalOutputPump(TerminalSocket(left), send, TerminalStats()).run()
+        )
+        right.sendall(b"first")
+        await asyncio.sleep(0.02)
+        for part in (b"a", b"b", b"c"):
+            right.sendall(part)
+            await asyncio.sleep(0.01)
+        right.close()
+        release.set()
+        await asyncio.wait_for(pump, 1)
+
+        assert sent == [b"first", b"abc"]
+
+    async def test_pauses_reads_when_client_falls_behind(
+        self, sock_pair: tuple[socket.socket, socket.socket]
+    ) -> None:
+        left, right = sock_pair
+        release = asyncio.Event()
+
+        async def send(_: bytes) -> None:
+            await release.wait()
+
+        stats = TerminalStats()
+        pump = asyncio.create_task(
+            TerminalOutputPump(TerminalSocket(left), send, stats, max_pending=4).run()
+        )
+        right.sendall(b"first")
+        await asyncio.sleep(0.02)
+        right.sendall(b"12345")
+        await asyncio.sleep(0.02)
+        right.sendall(b"more")
+        await asyncio.sleep(0.02)
+
+        assert stats.backpressure_stalls >= 1
+        right.close()
+        release.set()
+        await asyncio.wait_for(pump, 1)
+        assert stats.bytes_out == 14
+
+
+class TestTerminalStats:
+    """Tests for TerminalStats."""
+
+    def test_snapshot(self) -> None:
+        stats = TerminalStats()
+        stats.record_send(100, 0.002)
+        stats.record_send(50, 0.004)
+
+        snapshot = stats.snapshot()
+        assert snapshot["bytes_out"] == 150
+        assert snapshot["messages_out"] == 2
+        assert snapshot["avg_latency_ms"] == pytest.approx(3.0)
+        assert snapshot["max_latency_ms"] == pytest.approx(4.0)
@@ -9,6 +9,9 @@ import pytest
 
 from src.models.workspace import WorkspaceStatus
 from src.storage.workspace_store import (
+    LOAD_CHUNK_SIZE,
+    WORKSPACE_INDEX_KEY,
+    WORKSPACE_INDEX_READY_KEY,
     WORKSPACE_TTL_SECONDS,
     WorkspaceStore,
     _session_set_key,
@@ -309,6 +312,66 @@ async def test_list_by_ids_with_nonexistent(workspace_store: WorkspaceStore, wor
     assert workspaces[0].id == "ws-1"
 
 
+@pytest.mark.asyncio
+async def test_iter_all_spans_multiple_chunks(workspace_store: WorkspaceStore, workspace_factory):
+    """Test iter_all streams every workspace when there are more than one chunk."""
+    count = LOAD_CHUNK_SIZE + 5
+    for i in range(count):
+        await workspace_store.save(workspace_factory.create_info(workspace_id=f"ws-{i}"))
+
+    ids = [ws.id async for ws in workspace_store.iter_all()]
+
+    assert len(ids) == count
+    assert set(ids) == {f"ws-{i}" for i in range(count)}
+
+
+@pytest.mark.asyncio
+async def test_list_all_backfills_index(
+    workspace_store: WorkspaceStore, workspace_factory, redis_client
+):
+    """Test workspaces saved before the index existed are found once."""
+    await workspace_store.save(workspace_factory.create_info(workspace_id="ws-1"))
+    # Simulate data written by a version without the index
+    await redis_client.client.delete(WORKSPACE_INDEX_KEY, WORKSPACE_INDEX_READY_KEY)
+
+    all_workspaces = await workspace_store.list_all()
+
+    assert [ws.id for ws in all_workspaces] == ["ws-1"]
+    assert await redis_client.client.sismember(WORKSPACE_INDEX_KEY, "ws-1")
+    assert await redis_client.client.exists(WORKSPACE_INDEX_READY_KEY)
+
+
+@pytest.mark.asyncio
+async def test_iter_all_prunes_expired_workspaces(
+    workspace_store: WorkspaceStore, workspace_factory, redis_client
+):
+    """Test index entries whose hash expired are skipped and removed."""
+    await workspace_store.save(workspace_factory.create_info(workspace_id="ws-1"))
+    await workspace_store.save(workspace_factory.create_info(workspace_id="ws-2"))
+    # Simulate TTL expiry, which does not update the index
+    await redis_client.client.delete(_workspace_key("ws-2"))
+
+    ids = [ws.id async for ws in workspace_store.iter_all()]
+
+    assert ids == ["ws-1"]
+    assert not await redis_client.client.sismember(WORKSPACE_INDEX_KEY, "ws-2")
+
+
+@pytest.mark.asyncio
+async def test_iter_by_status(workspace_store: WorkspaceStore, workspace_factory):
+    """Test iter_by_status streams only workspaces in that status set."""
+    await workspace_store.save(
+        workspace_factory.create_info(workspace_id="ws-1", status=WorkspaceStatus.RUNNING)
+    )
+    await workspace_store.save(
+        workspace_factory.create_info(workspace_id="ws-2", status=WorkspaceStatus.STOPPED)
+    )
+
+    ids = [ws.id async for ws in workspace_store.iter_by_status(WorkspaceStatus.STOPPED)]
+
+    assert ids == ["ws-2"]
+
+
 # ============================================
 # Heartbeat & Activity Tests
 # ============================================
@@ -481,6 +544,20 @@ async def test_cleanup_stale_returns_removed_ids(
     assert "ws-2" in removed
 
 
+@pytest.mark.asyncio
+async def test_cleanup_stale_reconciles_index(
+    workspace_store: WorkspaceStore, workspace_factory, redis_client
+):
+    """Test cleanup_stale re-adds live workspaces missing from the index."""
+    await workspace_store.save(workspace_factory.create_info(workspace_id="ws-1"))
+    await redis_client.client.srem(WORKSPACE_INDEX_KEY, "ws-1")
+
+    removed = await workspace_store.cleanup_stale(max_age_seconds=3600)
+
+    assert removed == []
+    assert await redis_client.client.sismember(WORKSPACE_INDEX_KEY, "ws-1")
+
+
 # ============================================
 # Concurrency Tests
 # ============================================
@@ -8,6 +8,7 @@ with each call and the pod doesn't need to track workspace state.
 
 import asyncio
 import contextlib
+import errno
 import os
 import shlex
 import stat
@@ -17,6 +18,8 @@ from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from .terminal_stream import FifoReader, TerminalOutputBuffer, read_frame
+
 if TYPE_CHECKING:
     import socketio
 
@@ -26,7 +29,7 @@ if TYPE_CHECKING:
 logger = structlog.get_logger()
 
 # Terminal streaming settings
-TERMINAL_PIPE_READ_SIZE = 4096  # Bytes to read at a time from pipe
+TERMINAL_SESSION_CHECK_INTERVAL = 10.0  # Idle seconds between tmux session checks
 TERMINAL_FIFO_DIR = "/tmp/podex-terminals"  # Directory for terminal FIFOs
 
 
@@ -57,6 +60,8 @@ class RPCHandler:
         self._terminal_output_tasks: dict[str, asyncio.Task[None]] = {}
         # Track terminal FIFOs for cleanup: session_id -> fifo_path
         self._terminal_fifos: dict[str, str] = {}
+        # Output sequencing and replay history: session_id -> buffer
+        self._terminal_outputs: dict[str, TerminalOutputBuffer] = {}
         # Track cloudflared tunnel processes: f"{workspace_id}:{port}" -> Popen
         self._tunnel_processes: dict[str, subprocess.Popen[bytes]] = {}
 
@@ -89,6 +94,7 @@ class RPCHandler:
             "terminal.input": self._terminal_input,
             "terminal.resize": self._terminal_resize,
             "terminal.close": self._terminal_close,
+            "terminal.replay": self._terminal_replay,
             # Tunnel (cloudflared)
             "tunnel.start": self._tunnel_start,
             "tunnel.stop": self._tunnel_stop,
@@ -120,6 +126,7 @@ class RPCHandler:
             logger.debug("Cleaned up FIFO", session_id=session_id)
 
         self._terminal_fifos.clear()
+        self._terminal_outputs.clear()
 
         # Stop all tunnel processes
         for key, proc in list(self._tunnel_processes.items()):
@@ -670,6 +677,42 @@ class RPCHandler:
 
         return fifo_path
 
+    async def _terminal_session_exists(self, session_id: str, working_dir: str) -> bool:
+        """Check whether a tmux session is still alive."""
+        check = await self._exec_native(
+            f"tmux has-session -t {session_id} 2>/dev/null && echo 'exists'",
+            working_dir,
+            timeout=5,
+        )
+        return "exists" in check.get("stdout", "")
+
+    async def _reopen_terminal_fifo(
+        self, session_id: str, working_dir: str, fifo_path: str
+    ) -> FifoReader | None:
+        """Recreate a lost FIFO, re-point pipe-pane at it and open it again."""
+        if not await self._terminal_session_exists(session_id, working_dir):
+            logger.info("tmux session ended, not recreating FIFO", session_id=session_id)
+            return None
+
+        if not self._create_fifo_sync(fifo_path, session_id):
+            logger.error("Failed to recreate FIFO after deletion", session_id=session_id)
+            return None
+
+        pipe_cmd = f"tmux pipe-pane -t {session_id} 'cat >> {fifo_path}'"
+        pipe_result = await self._exec_native(pipe_cmd, working_dir, timeout=5)
+        if pipe_result.get("exit_code") != 0:
+            logger.error("Failed to re-establish pipe-pane", session_id=session_id)
+            return None
+
+        try:
+            reader = FifoReader(fifo_path)
+        except OSError:
+            logger.error("Failed to reopen recreated FIFO", session_id=session_id)
+            return None
+        self._terminal_fifos[session_id] = fifo_path
+        logger.info("FIFO recreated successfully", session_id=session_id)
+        return reader
+
     async def _terminal_stream_output(
         self, session_id: str, workspace_id: str, working_dir: str, fifo_path: str
     ) -> None:
@@ -677,7 +720,12 @@ class RPCHandler:
 
         This provides real-time streaming by:
         1. Setting up pipe-pane to stream output to a FIFO immediately
-        2. Reading from FIFO asynchronously and forwarding to websocket
+        2. Waiting on the FIFO with the event loop (no polling while idle)
+        3. Coalescing output into numbered frames bounded by size and delay
+
+        Every frame carries ``stream_id`` and ``seq`` and is kept in a replay
+        buffer, so the cloud can detect gaps and fetch missed frames with
+        ``terminal.replay`` (e.g. after a reconnect).
 
         Note: We intentionally do NOT use capture-pane for initial content because
         it causes duplicate output. The shell prompt gets captured by both
@@ -692,7 +740,9 @@ class RPCHandler:
             fifo=fifo_path,
         )
 
-        fd = None
+        output = TerminalOutputBuffer()
+        self._terminal_outputs[session_id] = output
+        reader: FifoReader | None = None
         try:
             # Small initial delay to let tmux session start
             await asyncio.sleep(0.1)
@@ -710,8 +760,7 @@ class RPCHandler:
 
             logger.info("pipe-pane configured", session_id=session_id)
 
-            # 3. Open FIFO for reading (non-blocking)
-            # First ensure the FIFO exists (recreate if needed)
+            # Open FIFO for reading, first ensuring it exists (recreate if needed)
             if not os.path.exists(fifo_path):
                 logger.warning(
                     "FIFO missing before open, recreating",
@@ -726,119 +775,59 @@ class RPCHandler:
                     )
                     return
 
-            # O_RDONLY | O_NONBLOCK so we don't block waiting for writers
-            fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
-
-            # 4. Read from FIFO and stream to websocket
-            consecutive_empty_reads = 0
-            max_empty_reads = 1000  # ~10 seconds of no output before checking session
+            reader = FifoReader(fifo_path)
 
+            # Read frames from FIFO and stream to websocket
             while True:
                 try:
-                    # Try to read data from FIFO
-                    data = os.read(fd, TERMINAL_PIPE_READ_SIZE)
-
-                    if data:
-                        consecutive_empty_reads = 0
-                        # Decode and emit immediately (real-time!)
-                        text = data.decode("utf-8", errors="replace")
-
-                        if self.sio and self.sio.connected:
-                            await self.sio.emit(
-                                "terminal_output",
-                                {
-                                    "session_id": session_id,
-                                    "workspace_id": workspace_id,
-                                    "data": text,
-                                    "type": "stream",
-                                },
-                                namespace="/local-pod",
-                            )
-                        else:
-                            logger.warning(
-                                "Cannot emit - sio not connected",
-                                session_id=session_id,
-                            )
-                    else:
-                        consecutive_empty_reads += 1
-
-                        # Periodically check if tmux session still exists
-                        if consecutive_empty_reads >= max_empty_reads:
-                            consecutive_empty_reads = 0
-                            check = await self._exec_native(
-                                f"tmux has-session -t {session_id} 2>/dev/null && echo 'exists'",
-                                working_dir,
-                                timeout=5,
-                            )
-                            if "exists" not in check.get("stdout", ""):
-                                logger.info(
-                                    "tmux session ended",
-                                    session_id=session_id,
-                                )
-                                break
-
-                        # Small sleep when no data (avoid busy loop)
-                        await asyncio.sleep(0.01)
-
-                except BlockingIOError:
-                    # No data available right now - this is expected
-                    await asyncio.sleep(0.01)
+                    frame = await read_frame(reader, TERMINAL_SESSION_CHECK_INTERVAL)
                 except OSError as e:
-                    if e.errno == 9:  # Bad file descriptor - FIFO was deleted
-                        # Try to recreate FIFO and continue (lazy-load resilience)
-                        logger.info(
-                            "FIFO deleted, attempting recreation",
-                            session_id=session_id,
-                            fifo=fifo_path,
-                        )
-
-                        # Check if tmux session still exists before recreating
-                        check = await self._exec_native(
-                            f"tmux has-session -t {session_id} 2>/dev/null && echo 'exists'",
-                            working_dir,
-                            timeout=5,
-                        )
-                        if "exists" not in check.get("stdout", ""):
-                            logger.info(
-                                "tmux session ended, not recreating FIFO",
-                                session_id=session_id,
-                            )
-                            break
-
-                        # Recreate the FIFO
-                        if not self._create_fifo_sync(fifo_path, session_id):
-                            logger.error(
-                                "Failed to recreate FIFO after deletion",
-                                session_id=session_id,
-                            )
-                            break
-
-                        # Re-establish pipe-pane
-                        pipe_cmd = f"tmux pipe-pane -t {session_id} 'cat >> {fifo_path}'"
-                        pipe_result = await self._exec_native(pipe_cmd, working_dir, timeout=5)
-                        if pipe_result.get("exit_code") != 0:
-                            logger.error(
-                                "Failed to re-establish pipe-pane",
-                                session_id=session_id,
-                            )
-                            break
-
-                        # Re-open the FIFO
-                        try:
-                            fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
-                            self._terminal_fifos[session_id] = fifo_path
-                            logger.info(
-                                "FIFO recreated successfully",
-                                session_id=session_id,
-                            )
-                            continue
-                        except OSError:
-                            logger.error(
-                                "Failed to reopen recreated FIFO",
-                                session_id=session_id,
-                            )
-                            break
-                    raise
+                    if e.errno != errno.EBADF:
+                        raise
+                    # FIFO was lost - recreate it and continue (lazy-load resilience)
+                    logger.info(
+                        "FIFO deleted, attempting recreation",
+                        session_id=session_id,
+                        fifo=fifo_path,
+                    )
+                    reader.close()
+                    reader = await self._reopen_terminal_fifo(session_id, working_dir, fifo_path)
+                    if reader is None:
+                        break
+                    continue
+
+                if frame is None:
+                    # Idle: periodically check if tmux session still exists
+                    if not await self._terminal_session_exists(session_id, working_dir):
+                        logger.info("tmux session ended", session_id=session_id)
+                        break
+                    continue
+
+                recorded = output.add(frame)
+                if recorded is None:
+                    continue
+                seq, text = recorded
+
+                if self.sio and self.sio.connected:
+                    await self.sio.emit(
+                        "terminal_output",
+                        {
+                            "session_id": session_id,
+                            "workspace_id": workspace_id,
+                            "data": text,
+                            "type": "stream",
+                            "stream_id": output.stream_id,
+                            "seq": seq,
+                        },
+                        namespace="/local-pod",
+                    )
+                else:
+                    # Kept in the replay buffer; the cloud fetches it on the next gap
+                    logger.debug(
+                        "Cannot emit - sio not connected",
+                        session_id=session_id,
+                        seq=seq,
+                    )
 
         except asyncio.CancelledError:
             logger.debug("Terminal stream cancelled", session_id=session_id)
@@ -850,9 +839,8 @@ class RPCHandler:
             )
         finally:
             # Clean up
-            if fd is not None:
-                with contextlib.suppress(OSError):
-                    os.close(fd)
+            if reader is not None:
+                reader.close()
 
             # Stop pipe-pane
             await self._exec_native(
@@ -867,9 +855,31 @@ class RPCHandler:
                 with contextlib.suppress(OSError):
                     os.unlink(fifo)
 
+            if self._terminal_outputs.get(session_id) is output:
+                self._terminal_outputs.pop(session_id, None)
             self._terminal_output_tasks.pop(session_id, None)
             logger.info("Terminal stream stopped", session_id=session_id)
 
+    async def _terminal_replay(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Return buffered terminal output frames after a sequence number.
+
+        Used by the cloud to fill gaps in the ``terminal_output`` stream.
+
+        Args:
+            params: Must contain 'session_id', optionally 'after_seq'
+
+        Returns:
+            Dict with 'stream_id', 'last_seq', 'frames' and 'complete'
+            ('stream_id' is None if the session is not streaming)
+        """
+        session_id = params.get("session_id", params.get("workspace_id", "default"))
+        after_seq = int(params.get("after_seq", 0))
+
+        output = self._terminal_outputs.get(session_id)
+        if output is None:
+            return {"stream_id": None, "last_seq": 0, "frames": [], "complete": False}
+        return output.replay(after_seq)
+
     async def _terminal_input(self, params: dict[str, Any]) -> None:
         """Send input to a terminal session.
 
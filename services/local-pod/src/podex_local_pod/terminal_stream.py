@@ -0,0 +1,152 @@
+"""Terminal output streaming primitives for tmux pipe-pane FIFOs.
+
+The FIFO is read through the event loop (``loop.add_reader``), so an idle
+terminal costs nothing until tmux writes to it. Output is coalesced into
+numbered frames; a bounded replay buffer of recent frames lets the cloud
+detect gaps (e.g. frames emitted while the Socket.IO connection was down)
+and fetch what it missed.
+"""
+
+import asyncio
+import codecs
+import contextlib
+import os
+import uuid
+from collections import deque
+from typing import Any
+
+# Bytes to read at a time from the FIFO
+FIFO_READ_SIZE = 4096
+# Frames close at whichever of these limits is hit first
+FRAME_MAX_BYTES = 16 * 1024
+FRAME_MAX_DELAY = 0.01  # seconds after the first byte of a frame
+# Recent output kept for replay after gaps/reconnects
+REPLAY_BUFFER_CHARS = 256 * 1024
+
+
+class FifoReader:
+    """Event-loop driven, non-blocking reader for a named pipe.
+
+    The FIFO is also held open for writing. Without a writer a FIFO reads as
+    EOF and polls as permanently readable, which would turn readiness waiting
+    back into a busy loop between tmux pipe-pane writes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            self._keepalive_fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            os.close(self._fd)
+            raise
+        self._loop = asyncio.get_running_loop()
+
+    async def read(self, size: int, timeout: float | None) -> bytes | None:
+        """Read up to ``size`` bytes, or return None if nothing arrives in ``timeout``."""
+        while True:
+            try:
+                return os.read(self._fd, size)
+            except BlockingIOError:
+                pass
+            if not await self._wait_readable(timeout):
+                return None
+
+    async def _wait_readable(self, timeout: float | None) -> bool:
+        ready = self._loop.create_future()
+
+        def _on_ready() -> None:
+            if not ready.done():
+                ready.set_result(None)
+
+        self._loop.add_reader(self._fd, _on_ready)
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except TimeoutError:
+            return False
+        finally:
+            self._loop.remove_reader(self._fd)
+        return True
+
+    def close(self) -> None:
+        """Close both ends held by this reader."""
+        for fd in (self._fd, self._keepalive_fd):
+            with contextlib.suppress(OSError):
+                os.close(fd)
+
+
+class TerminalOutputBuffer:
+    """Sequence numbering, UTF-8 decoding and replay history for one terminal.
+
+    ``stream_id`` changes whenever a new buffer is created (new stream task or
+    pod restart), telling the receiver that sequence numbers start over.
+    """
+
+    def __init__(self, max_replay_chars: int = REPLAY_BUFFER_CHARS) -> None:
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self._max_replay_chars = max_replay_chars
+        self._replay: deque[tuple[int, str]] = deque()
+        self._replay_chars = 0
+        # Incremental decoder keeps multi-byte characters split across reads intact
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def add(self, data: bytes) -> tuple[int, str] | None:
+        """Decode a frame's bytes and record it, returning ``(seq, text)``.
+
+        Returns None if the bytes only contained the start of a character.
+        """
+        text = self._decoder.decode(data)
+        if not text:
+            return None
+        self.last_seq += 1
+        self._replay.append((self.last_seq, text))
+        self._replay_chars += len(text)
+        while self._replay_chars > self._max_replay_chars and len(self._replay) > 1:
+            _, dropped = self._replay.popleft()
+            self._replay_chars -= len(dropped)
+        return self.last_seq, text
+
+    def replay(self, after_seq: int) -> dict[str, Any]:
+        """Return the frames after ``after_seq`` that are still buffered.
+
+        ``complete`` is False when some of the requested frames were evicted.
+        """
+        frames = [{"seq": seq, "data": text} for seq, text in self._replay if seq > after_seq]
+        first_kept = self._replay[0][0] if self._replay else self.last_seq + 1
+        return {
+            "stream_id": self.stream_id,
+            "last_seq": self.last_seq,
+            "frames": frames,
+            "complete": after_seq >= first_kept - 1,
+        }
+
+
+async def read_frame(
+    reader: FifoReader,
+    idle_timeout: float | None,
+    max_bytes: int = FRAME_MAX_BYTES,
+    max_delay: float = FRAME_MAX_DELAY,
+) -> bytes | None:
+    """Wait for output and coalesce it into one frame.
+
+    Blocks (without polling) until the first bytes arrive, then keeps reading
+    until ``max_bytes`` are collected or ``max_delay`` has passed. Returns
+    None if nothing arrived within ``idle_timeout``.
+    """
+    first = await reader.read(min(FIFO_READ_SIZE, max_bytes), idle_timeout)
+    if not first:
+        return None
+
+    frame = bytearray(first)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_delay
+    while len(frame) < max_bytes:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        data = await reader.read(min(FIFO_READ_SIZE, max_bytes - len(frame)), remaining)
+        if not data:
+            break
+        frame.extend(data)
+    return bytes(frame)
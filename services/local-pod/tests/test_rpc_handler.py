@@ -47,6 +47,7 @@ class TestRPCHandlerInit:
             "terminal.input",
             "terminal.resize",
             "terminal.close",
+            "terminal.replay",
             "host.browse",
         ]
 
@@ -0,0 +1,137 @@
+"""Tests for terminal FIFO streaming primitives."""
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from podex_local_pod.terminal_stream import FifoReader, TerminalOutputBuffer, read_frame
+
+
+@pytest.fixture
+def fifo_path(tmp_path: Path) -> str:
+    """Create a FIFO in a temp directory."""
+    path = str(tmp_path / "term.fifo")
+    os.mkfifo(path)
+    return path
+
+
+class TestFifoReader:
+    """Tests for FifoReader."""
+
+    @pytest.mark.asyncio
+    async def test_read_times_out_when_idle(self, fifo_path: str) -> None:
+        """Test an idle FIFO returns None instead of EOF."""
+        reader = FifoReader(fifo_path)
+        try:
+            assert await reader.read(4096, 0.02) is None
+        finally:
+            reader.close()
+
+    @pytest.mark.asyncio
+    async def test_read_wakes_on_data(self, fifo_path: str) -> None:
+        """Test a pending read completes when a writer sends data."""
+        reader = FifoReader(fifo_path)
+        writer = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            pending = asyncio.create_task(reader.read(4096, 1.0))
+            await asyncio.sleep(0.01)
+            os.write(writer, b"hello")
+            assert await pending == b"hello"
+        finally:
+            os.close(writer)
+            reader.close()
+
+    @pytest.mark.asyncio
+    async def test_writer_close_is_not_eof(self, fifo_path: str) -> None:
+        """Test the keepalive writer stops a departed writer from looking like EOF."""
+        reader = FifoReader(fifo_path)
+        try:
+            writer = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+            os.close(writer)
+            assert await reader.read(4096, 0.02) is None
+        finally:
+            reader.close()
+
+
+class TestReadFrame:
+    """Tests for read_frame coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_writes(self, fifo_path: str) -> None:
+        """Test writes within the frame delay are merged into one frame."""
+        reader = FifoReader(fifo_path)
+        writer = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            os.write(writer, b"a")
+            os.write(writer, b"b")
+            os.write(writer, b"c")
+            assert await read_frame(reader, 1.0, max_delay=0.02) == b"abc"
+        finally:
+            os.close(writer)
+            reader.close()
+
+    @pytest.mark.asyncio
+    async def test_frame_size_bound(self, fifo_path: str) -> None:
+        """Test frames never exceed max_bytes."""
+        reader = FifoReader(fifo_path)
+        writer = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            os.write(writer, b"x" * 10)
+            assert await read_frame(reader, 1.0, max_bytes=4) == b"xxxx"
+            assert await read_frame(reader, 1.0, max_bytes=4) == b"xxxx"
+            assert await read_frame(reader, 1.0, max_bytes=4) == b"xx"
+        finally:
+            os.close(writer)
+            reader.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_returns_none(self, fifo_path: str) -> None:
+        """Test read_frame returns None after the idle timeout."""
+        reader = FifoReader(fifo_path)
+        try:
+            assert await read_frame(reader, 0.02) is None
+        finally:
+            reader.close()
+
+
+class TestTerminalOutputBuffer:
+    """Tests for TerminalOutputBuffer."""
+
+    def test_sequences_frames(self) -> None:
+        """Test frames are numbered consecutively."""
+        buffer = TerminalOutputBuffer()
+        assert buffer.add(b"one") == (1, "one")
+        assert buffer.add(b"two") == (2, "two")
+        assert buffer.last_seq == 2
+
+    def test_split_utf8_character(self) -> None:
+        """Test a multi-byte character split across frames is decoded whole."""
+        buffer = TerminalOutputBuffer()
+        encoded = "é".encode()
+        assert buffer.add(encoded[:1]) is None
+        assert buffer.add(encoded[1:]) == (1, "é")
+
+    def test_replay_after_seq(self) -> None:
+        """Test replay returns only frames after the requested sequence."""
+        buffer = TerminalOutputBuffer()
+        for text in (b"a", b"b", b"c"):
+            buffer.add(text)
+
+        result = buffer.replay(1)
+        assert result["stream_id"] == buffer.stream_id
+        assert result["last_seq"] == 3
+        assert result["frames"] == [{"seq": 2, "data": "b"}, {"seq": 3, "data": "c"}]
+        assert result["complete"] is True
+
+    def test_replay_reports_evicted_frames(self) -> None:
+        """Test replay is marked incomplete once old frames are evicted."""
+        buffer = TerminalOutputBuffer(max_replay_chars=4)
+        for text in (b"aa", b"bb", b"cc"):
+            buffer.add(text)
+
+        result = buffer.replay(0)
+        assert [frame["seq"] for frame in result["frames"]] == [2, 3]
+        assert result["complete"] is False
+        assert buffer.replay(1)["complete"] is True
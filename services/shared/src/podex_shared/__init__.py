@@ -51,6 +51,7 @@ from podex_shared.sentry import (
     start_transaction,
     timing,
 )
+from podex_shared.token_batcher import TokenBatcher
 from podex_shared.tts_summary import SummaryResult, generate_tts_summary
 from podex_shared.usage_tracker import (
     ComputeUsageParams,
@@ -68,6 +69,12 @@ from podex_shared.voice_commands import (
     get_command_description,
     parse_voice_command,
 )
+from podex_shared.workspace_placement import (
+    WorkspacePlacement,
+    WorkspacePlacementCache,
+    invalidate_workspace_placement,
+    invalidate_workspace_placements,
+)
 
 __all__ = [
     "AgentLayout",
@@ -91,6 +98,7 @@ __all__ = [
     "SyncAction",
     "SyncActionType",
     "SyncBroadcast",
+    "TokenBatcher",
     "TokenUsageParams",
     "UsageEvent",
     "UsageEventStatus",
@@ -101,6 +109,8 @@ __all__ = [
     "WorkspaceExecResponse",
     "WorkspaceFileRequest",
     "WorkspaceInfo",
+    "WorkspacePlacement",
+    "WorkspacePlacementCache",
     "WorkspaceScaleRequest",
     "WorkspaceScaleResponse",
     "WorkspaceSessionState",
@@ -123,6 +133,8 @@ __all__ = [
     "incr",
     "init_sentry",
     "init_usage_tracker",
+    "invalidate_workspace_placement",
+    "invalidate_workspace_placements",
     "parse_voice_command",
     "set_context",
     "set_metric",
@@ -4,9 +4,10 @@ import asyncio
 import contextlib
 import json
 import random
+import time
 import uuid
 from collections.abc import AsyncIterator, Callable, Coroutine
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any, cast
 
 import redis.asyncio as redis
@@ -19,6 +20,69 @@ logger = structlog.get_logger()
 # Constants for lock acquisition logging
 LOCK_WARNING_THRESHOLD = 10
 
+# Atomically claims task IDs read from a pending sorted set.
+#
+# KEYS[1] pending sorted set, KEYS[2] active set, KEYS[3] ready set,
+# KEYS[4..] task data keys of the candidate task IDs
+# ARGV[1] "1" to add claimed IDs to KEYS[2], ARGV[2] "1" to re-add the ready
+# member to KEYS[3], ARGV[3] "1" to stamp claim fields, ARGV[4] worker id,
+# ARGV[5] started_at, ARGV[6] task TTL in seconds (0 keeps TTL),
+# ARGV[7] ready set member, ARGV[8] ready set score,
+# ARGV[9..] candidate task IDs, one per task data key
+#
+# Unused active/ready slots hold the pending key, so every key the script
+# touches is declared. A candidate is claimed only if this script removes it
+# from the pending set, so candidates claimed concurrently by another worker
+# are skipped. Empty arrays in the task JSON are kept as arrays by decoding
+# with the array metatable (Redis 7+).
+#
+# Returns a flat list of task_id, payload pairs.
+CLAIM_TASKS_SCRIPT = """
+if cjson.decode_array_with_array_mt then
+    cjson.decode_array_with_array_mt(true)
+end
+local count = tonumber(ARGV[10])
+local claimed = {}
+local found = 0
+while found < count do
+    local popped = redis.call('ZPOPMIN', KEYS[1], count - found)
+    if #popped == 0 then
+        break
+    end
+    for i = 1, #popped, 2 do
+        local task_id = popped[i]
+        local task_key = ARGV[9] .. task_id
+        local payload = redis.call('GET', task_key)
+        if payload then
+            if ARGV[1] == '1' then
+                redis.call('SADD', KEYS[2], task_id)
+            end
+            if ARGV[3] == '1' then
+                local ok, task = pcall(cjson.decode, payload)
+                if ok and type(task) == 'table' then
+                    task['status'] = 'running'
+                    task['started_at'] = ARGV[5]
+                    task['assigned_worker_id'] = ARGV[4]
+                    payload = cjson.encode(task)
+                    if tonumber(ARGV[6]) > 0 then
+                        redis.call('SET', task_key, payload, 'EX', ARGV[6])
+                    else
+                        redis.call('SET', task_key, payload, 'KEEPTTL')
+                    end
+                end
+            end
+            claimed[#claimed + 1] = task_id
+            claimed[#claimed + 1] = payload
+            found = found + 1
+        end
+    end
+end
+if ARGV[2] == '1' and redis.call('ZCARD', KEYS[1]) > 0 then
+    redis.call('ZADD', KEYS[3], 'NX', ARGV[8], ARGV[7])
+end
+return claimed
+"""
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """JSON encoder that handles datetime objects."""
@@ -52,6 +116,7 @@ class RedisClient:
         self._pubsub: Any = None
         self._running = False
         self._listen_task: asyncio.Task[None] | None = None
+        self._claim_script: Any = None
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -79,6 +144,7 @@ class RedisClient:
         if self._client:
             await self._client.aclose()
             self._client = None
+            self._claim_script = None
 
         logger.info("Disconnected from Redis")
 
@@ -111,6 +177,7 @@ class RedisClient:
         value: str,
         ex: int | None = None,
         px: int | None = None,
+        nx: bool = False,
     ) -> bool:
         """Set a value with optional expiration.
 
@@ -121,11 +188,15 @@ class RedisClient:
             value: The value to set
             ex: Expiration in seconds
             px: Expiration in milliseconds
+            nx: Only set the key if it does not already exist
+
+        Returns:
+            True if the value was set
         """
         # Encrypt if enabled
         if self._encrypt:
             value = encrypt_value(value)
-        result = await self.client.set(key, value, ex=ex, px=px)
+        result = await self.client.set(key, value, ex=ex, px=px, nx=nx)
         return bool(result)
 
     async def delete(self, *keys: str) -> int:
@@ -158,9 +229,10 @@ class RedisClient:
         key: str,
         value: dict[str, Any] | list[Any],
         ex: int | None = None,
+        nx: bool = False,
     ) -> bool:
         """Set a JSON value."""
-        return await self.set(key, json.dumps(value, cls=DateTimeEncoder), ex=ex)
+        return await self.set(key, json.dumps(value, cls=DateTimeEncoder), ex=ex, nx=nx)
 
     # Hash operations
 
@@ -198,6 +270,29 @@ class RedisClient:
             return {k: decrypt_value(v) for k, v in result.items()}
         return cast("dict[str, str]", result)
 
+    async def hgetall_many(self, names: list[str]) -> list[dict[str, str]]:
+        """Get all fields of many hashes in one pipelined round trip.
+
+        If encryption is enabled, automatically decrypts all values. Missing
+        keys and keys that are not hashes yield an empty dict, so one bad key
+        does not fail the whole batch.
+        """
+        if not names:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.hgetall(name)
+        results = await pipe.execute(raise_on_error=False)
+        hashes: list[dict[str, str]] = []
+        for result in results:
+            if not result or isinstance(result, Exception):
+                hashes.append({})
+            elif self._encrypt:
+                hashes.append({k: decrypt_value(v) for k, v in result.items()})
+            else:
+                hashes.append(cast("dict[str, str]", result))
+        return hashes
+
     async def hdel(self, name: str, *keys: str) -> int:
         """Delete hash fields."""
         result = await self.client.hdel(name, *keys)
@@ -271,9 +366,134 @@ class RedisClient:
             await self._pubsub.unsubscribe(channel)
             logger.info("Unsubscribed from Redis channel", channel=channel)
 
+    # Task queue claims
+
+    async def claim_task(
+        self,
+        pending_key: str,
+        task_key_prefix: str,
+        *,
+        active_key: str | None = None,
+        ready_key: str | None = None,
+        ready_member: str | None = None,
+        worker_id: str | None = None,
+        ttl: int | None = None,
+    ) -> dict[str, Any] | None:
+        """Atomically claim the highest priority task from a pending sorted set.
+
+        See claim_tasks for the arguments.
+
+        Returns:
+            Claimed task data, or None if there was nothing to claim
+        """
+        claimed = await self.claim_tasks(
+            pending_key,
+            task_key_prefix,
+            1,
+            active_key=active_key,
+            ready_key=ready_key,
+            ready_member=ready_member,
+            worker_id=worker_id,
+            ttl=ttl,
+        )
+        return claimed[0] if claimed else None
+
+    async def claim_tasks(
+        self,
+        pending_key: str,
+        task_key_prefix: str,
+        count: int,
+        *,
+        active_key: str | None = None,
+        ready_key: str | None = None,
+        ready_member: str | None = None,
+        worker_id: str | None = None,
+        ttl: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Atomically claim up to ``count`` tasks from a pending sorted set.
+
+        One Lua script pops the highest priority task IDs from the pending
+        set, adds them to the active set, stamps status/started_at/
+        assigned_worker_id into the stored task JSON and returns the payloads,
+        so the claim is a single round trip. The pending, active and ready keys
+        are passed in KEYS; task keys are built in the script from
+        ``task_key_prefix``, so under Redis Cluster they must share the pending
+        key's hash slot (use a hash tag). Tasks whose data has expired are
+        dropped from the pending set and skipped.
+
+        If ``ready_key`` is given, ``ready_member`` is re-added to that sorted
+        set when the pending set still has tasks afterwards.
+
+        With value encryption enabled the script cannot read the payload, so
+        the claim fields are stamped client-side and written back in a second
+        (pipelined) round trip.
+
+        Args:
+            pending_key: Sorted set of pending task IDs
+            task_key_prefix: Prefix that yields the task data key when
+                followed by the task ID
+            count: Maximum number of tasks to claim
+            active_key: Optional set that claimed task IDs are added to
+            ready_key: Optional ready sorted set to re-add ``ready_member`` to
+            ready_member: Member to re-add to ``ready_key``
+            worker_id: Worker ID stamped as assigned_worker_id
+            ttl: TTL in seconds for the updated task data (None keeps the TTL)
+
+        Returns:
+            Claimed task data dicts in priority order
+        """
+        if count <= 0:
+            return []
+
+        if self._claim_script is None:
+            self._claim_script = self.client.register_script(CLAIM_TASKS_SCRIPT)
+
+        started_at = datetime.now(UTC).isoformat()
+        stamp_server_side = not self._encrypt
+        result = await self._claim_script(
+            keys=[pending_key, active_key or pending_key, ready_key or pending_key],
+            args=[
+                "1" if active_key else "0",
+                "1" if ready_key else "0",
+                "1" if stamp_server_side else "0",
+                worker_id or "",
+                started_at,
+                ttl or 0,
+                ready_member or "",
+                time.time(),
+                task_key_prefix,
+                count,
+            ],
+        )
+
+        claimed: list[dict[str, Any]] = []
+        for i in range(0, len(result or []), 2):
+            payload = result[i + 1]
+            if self._encrypt:
+                payload = decrypt_value(payload)
+            data = json.loads(payload)
+            if isinstance(data, dict):
+                claimed.append(data)
+
+        if not stamp_server_side and claimed:
+            pipe = self.client.pipeline(transaction=False)
+            for data in claimed:
+                data["status"] = "running"
+                data["started_at"] = started_at
+                data["assigned_worker_id"] = worker_id
+                value = encrypt_value(json.dumps(data, cls=DateTimeEncoder))
+                task_key = f"{task_key_prefix}{data['id']}"
+                if ttl:
+                    pipe.set(task_key, value, ex=ttl)
+                else:
+                    pipe.set(task_key, value, keepttl=True)
+            await pipe.execute()
+
+        return claimed
+
     # Distributed locking
 
-    async def acquire_lock(  # noqa: PLR0913
+    async def acquire_lock(
         self,
         key: str,
         timeout: int = 10,
@@ -371,7 +591,7 @@ class RedisClient:
         return bool(result)
 
     @contextlib.asynccontextmanager
-    async def lock(  # noqa: PLR0913
+    async def lock(
         self,
         key: str,
         timeout: int = 10,
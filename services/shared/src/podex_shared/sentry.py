@@ -875,6 +875,17 @@ def track_llm_usage(metrics: LLMUsageMetrics) -> None:
     distribution("podex.agent.llm.latency", metrics.latency_ms, unit="millisecond", tags=tags)
 
 
+def track_llm_request_attempt(provider: str, outcome: str, attempt: int) -> None:
+    """Track an LLM request attempt.
+
+    outcome is one of success, retryable_error, error, circuit_open, hedge or failover.
+    """
+    incr(
+        "podex.agent.llm.attempts",
+        tags={"provider": provider, "outcome": outcome, "attempt": str(attempt)},
+    )
+
+
 def track_agent_run(
     model: str,
     role: str,
@@ -960,6 +971,12 @@ def track_quota_exceeded(quota_type: str, user_id: str) -> None:
     incr("podex.billing.quota.exceeded", tags={"quota_type": quota_type, "user_id": user_id})
 
 
+def track_usage_spool(depth: int, lag_seconds: float) -> None:
+    """Track usage events waiting in the local spool and the age of the oldest."""
+    gauge("podex.billing.usage_spool.depth", float(depth))
+    gauge("podex.billing.usage_spool.lag", lag_seconds, unit="second")
+
+
 def track_subscription_renewed(plan: str, period: str) -> None:
     """Track subscription renewal."""
     incr("podex.billing.subscription.renewed", tags={"plan": plan, "period": period})
@@ -1044,3 +1061,53 @@ def track_http_latency(endpoint: str, method: str, duration_ms: float) -> None:
         unit="millisecond",
         tags={"endpoint": endpoint, "method": method},
     )
+
+
+def track_task_pickup_latency(queue: str, latency_ms: float) -> None:
+    """Track time between a task being enqueued and a worker claiming it."""
+    distribution(
+        "podex.agent.queue.pickup_latency",
+        latency_ms,
+        unit="millisecond",
+        tags={"queue": queue},
+    )
+
+
+def track_task_completion_waiters(count: int) -> None:
+    """Track callers currently waiting for a queued task to finish."""
+    gauge("podex.api.queue.completion_waiters", float(count))
+
+
+def track_task_completion_wakeup(source: str) -> None:
+    """Track task completion waiter wake-ups by source (event or poll)."""
+    incr("podex.api.queue.completion_wakeups", tags={"source": source})
+
+
+def track_heartbeat_sweep(
+    duration_ms: float, lag_ms: float, containers: int, unhealthy: int
+) -> None:
+    """Track a fleet-wide workspace container health sweep."""
+    distribution("podex.compute.heartbeat.sweep_duration", duration_ms, unit="millisecond")
+    distribution("podex.compute.heartbeat.sweep_lag", lag_ms, unit="millisecond")
+    gauge("podex.compute.heartbeat.containers_checked", float(containers))
+    gauge("podex.compute.heartbeat.containers_unhealthy", float(unhealthy))
+
+
+def track_workspace_placement_lookup(service: str, result: str) -> None:
+    """Track a workspace placement lookup by result (local_hit, redis_hit or miss)."""
+    incr("podex.infra.placement_cache.lookups", tags={"service": service, "result": result})
+
+
+def track_auth_cache_lookup(kind: str, result: str) -> None:
+    """Track an auth cache lookup by kind (principal or revocation) and result.
+
+    Principal lookups are a hit, miss or bypass; revocation checks are
+    answered locally or bypass the cache to Redis.
+    """
+    incr("podex.api.auth_cache.lookups", tags={"kind": kind, "result": result})
+
+
+def track_auth_revocation_sync(revoked_tokens: int, duration_ms: float) -> None:
+    """Track a full reload of the revoked token set from Redis."""
+    gauge("podex.api.auth_cache.revoked_tokens", float(revoked_tokens))
+    distribution("podex.api.auth_cache.revocation_sync_duration", duration_ms, unit="millisecond")
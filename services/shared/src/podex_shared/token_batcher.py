@@ -0,0 +1,167 @@
+"""Adaptive coalescing of streamed LLM tokens.
+
+Used on both sides of the agent stream fan-out (agent publisher -> Redis ->
+API subscriber -> Socket.IO) to turn one message per token into one message
+per small batch of tokens.
+
+Batching is adaptive: a token arriving on an idle stream (nothing flushed for
+that key within the window) is flushed immediately, so the first token of a
+response and slow streams keep their latency. Only when tokens arrive faster
+than the window are they buffered, until the window elapses or the buffered
+text reaches ``max_chars``.
+
+Flushes of a key run under that key's lock and pop the buffer while holding
+it, so callers that ``flush()`` before sending a non-token event are
+guaranteed that every earlier token of the key has been delivered first.
+Different keys flush concurrently, so one slow publish does not hold up other
+streams.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Default coalescing window and size limit
+DEFAULT_BATCH_WINDOW = 0.025  # seconds
+DEFAULT_BATCH_MAX_CHARS = 512
+
+
+@dataclass
+class _PendingTokens:
+    """Tokens buffered for one key."""
+
+    tokens: list[str] = field(default_factory=list)
+    chars: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+@dataclass
+class _FlushLock:
+    """Lock serializing flushes of one key, kept while any flush holds or awaits it."""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+class TokenBatcher[K: Hashable]:
+    """Coalesces tokens per key and hands each batch to a flush callback."""
+
+    def __init__(
+        self,
+        flush: Callable[[K, list[str]], Awaitable[None]],
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_chars: int = DEFAULT_BATCH_MAX_CHARS,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            flush: Called with the key and its tokens (in arrival order)
+            window: Maximum time a token is buffered, in seconds
+            max_chars: Buffered text size that triggers an immediate flush
+        """
+        self._flush = flush
+        self._window = window
+        self._max_chars = max_chars
+        self._pending: dict[K, _PendingTokens] = {}
+        self._last_flush: dict[K, float] = {}
+        self._last_prune = time.monotonic()
+        self._flush_locks: dict[K, _FlushLock] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending_keys(self) -> list[K]:
+        """Keys that currently have buffered tokens."""
+        return list(self._pending)
+
+    async def add(self, key: K, token: str) -> None:
+        """Add a token, flushing right away if the stream is idle or the batch is full."""
+        pending = self._pending.get(key)
+        if pending is None:
+            last_flush = self._last_flush.get(key)
+            if last_flush is None or time.monotonic() - last_flush >= self._window:
+                pending = self._pending[key] = _PendingTokens()
+                pending.tokens.append(token)
+                await self.flush(key)
+                return
+            pending = self._pending[key] = _PendingTokens()
+
+        pending.tokens.append(token)
+        pending.chars += len(token)
+
+        if pending.chars >= self._max_chars:
+            await self.flush(key)
+        elif pending.timer is None:
+            pending.timer = asyncio.get_running_loop().call_later(
+                self._window, self._schedule_flush, key
+            )
+
+    def _schedule_flush(self, key: K) -> None:
+        """Timer callback: flush a key once its window has elapsed."""
+        task = asyncio.create_task(self._flush_quietly(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_quietly(self, key: K) -> None:
+        """Flush from a timer, logging instead of raising."""
+        try:
+            await self.flush(key)
+        except Exception:
+            logger.exception("Failed to flush token batch", key=str(key))
+
+    async def flush(self, key: K) -> None:
+        """Deliver any tokens buffered for ``key``, after any flush of it in progress."""
+        flush_lock = self._flush_locks.get(key)
+        if flush_lock is None:
+            flush_lock = self._flush_locks[key] = _FlushLock()
+        flush_lock.users += 1
+        try:
+            async with flush_lock.lock:
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    return
+                if pending.timer is not None:
+                    pending.timer.cancel()
+                now = time.monotonic()
+                self._last_flush[key] = now
+                self._prune_idle(now)
+                if pending.tokens:
+                    await self._flush(key, pending.tokens)
+        finally:
+            flush_lock.users -= 1
+            if not flush_lock.users:
+                del self._flush_locks[key]
+
+    def _prune_idle(self, now: float) -> None:
+        """Drop idle-tracking entries older than the window, at most once per window.
+
+        An entry that old makes no difference to ``add``, and streams that end
+        without ``forget`` (e.g. cancelled) would otherwise keep theirs forever.
+        """
+        if now - self._last_prune < self._window:
+            return
+        self._last_prune = now
+        for key in [k for k, at in self._last_flush.items() if now - at >= self._window]:
+            del self._last_flush[key]
+
+    async def flush_where(self, predicate: Callable[[K], bool]) -> None:
+        """Deliver buffered tokens for every key matching ``predicate``.
+
+        Keys with a flush in progress are included, so on return every token
+        added before the call has been delivered.
+        """
+        keys = [k for k in dict.fromkeys((*self._pending, *self._flush_locks)) if predicate(k)]
+        for key in keys:
+            await self.flush(key)
+
+    async def flush_all(self) -> None:
+        """Deliver everything buffered."""
+        await self.flush_where(lambda _key: True)
+
+    def forget(self, key: K) -> None:
+        """Drop idle-tracking state for a finished stream."""
+        self._last_flush.pop(key, None)
@@ -0,0 +1,116 @@
+"""Durable on-disk spool for usage events.
+
+Usage events are billing records, so they are appended to a local SQLite
+database (WAL mode) before being shipped to the API. Events survive API
+outages and process restarts; the shipper reads the oldest events in large
+batches and deletes them once the API has acknowledged them.
+
+All methods are blocking and thread-safe. Async callers run them with
+asyncio.to_thread.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+
+class SpooledEvent(NamedTuple):
+    """A usage event waiting in the spool."""
+
+    seq: int
+    payload: str  # JSON-encoded UsageEvent
+    created_at: float  # Unix time the event was spooled
+
+
+class SpoolStats(NamedTuple):
+    """Current spool depth and the age of its oldest event."""
+
+    depth: int
+    oldest_created_at: float | None
+
+
+class UsageSpool:
+    """Append-only SQLite spool of JSON-encoded usage events.
+
+    Events are read back in append order. Acknowledged ranges are deleted,
+    and once the spool drains the WAL is truncated and free pages are
+    returned to the filesystem so an idle spool stays small.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (or create) the spool.
+
+        Args:
+            path: SQLite database file, created along with its directory
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        # auto_vacuum must be set before the first table is created to take effect
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Durable across process crashes; a power loss can lose the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "payload TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+
+    def append(self, payloads: Sequence[str]) -> None:
+        """Append events in a single transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO events (payload, created_at) VALUES (?, ?)",
+                    [(payload, now) for payload in payloads],
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def peek(self, limit: int) -> list[SpooledEvent]:
+        """Return up to limit of the oldest events without removing them."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, payload, created_at FROM events ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [SpooledEvent(*row) for row in rows]
+
+    def ack(self, first_seq: int, last_seq: int) -> int:
+        """Delete the acknowledged events from first_seq to last_seq inclusive.
+
+        Returns:
+            Number of events removed
+        """
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM events WHERE seq BETWEEN ? AND ?", (first_seq, last_seq)
+            ).rowcount
+            if self._conn.execute("SELECT 1 FROM events LIMIT 1").fetchone() is None:
+                # incremental_vacuum frees one page per step, so drain its cursor
+                self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return removed
+
+    def stats(self) -> SpoolStats:
+        """Return the number of spooled events and when the oldest was spooled."""
+        with self._lock:
+            depth, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM events"
+            ).fetchone()
+        return SpoolStats(depth=depth, oldest_created_at=oldest)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
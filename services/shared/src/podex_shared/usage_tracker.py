@@ -6,6 +6,8 @@ This module provides utilities to track and record usage events
 
 import asyncio
 import contextlib
+import gzip
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
@@ -17,9 +19,20 @@ import structlog
 from pydantic import BaseModel, Field
 
 from podex_shared.models.billing import UsageType
+from podex_shared.sentry import track_usage_spool
+from podex_shared.usage_spool import SpooledEvent, UsageSpool
 
 logger = structlog.get_logger()
 
+USAGE_RECORD_PATH = "/api/billing/usage/record"
+
+# Maximum events per request when shipping the spool
+SPOOL_SHIP_BATCH_SIZE = 500
+
+# Statuses the API returns for a batch it will never accept as-is. Spooled
+# batches rejected this way are split to isolate the offending event.
+REJECTED_BATCH_STATUSES = frozenset({400, 413, 422})
+
 
 class UsageEventStatus(str, Enum):
     """Status of a usage event."""
@@ -46,6 +59,10 @@ class UsageEvent(BaseModel):
     model: str | None = None
     input_tokens: int | None = None
     output_tokens: int | None = None
+    # Prompt cache reads and writes, billed at the model's cache rates on top of
+    # the uncached input_tokens
+    cached_input_tokens: int | None = None
+    cache_creation_input_tokens: int | None = None
 
     # For compute usage
     tier: str | None = None
@@ -81,6 +98,9 @@ class TokenUsageParams:
     # Usage source: "included" (OpenRouter/platform), "external" (user API key),
     # "local" (Ollama/LMStudio). Only "included" usage counts towards quota and incurs cost
     usage_source: str = "included"
+    # Prompt cache activity, reported separately from (uncached) input_tokens
+    cached_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
 
 
 @dataclass
@@ -107,7 +127,12 @@ class UsageTracker:
     - Compute usage from workspace sessions
     - Storage usage from file operations
 
-    Events are batched and sent to the API service asynchronously.
+    Events are batched and sent to the API service asynchronously as
+    gzip-compressed JSON. With a spool_path, events are first written to a
+    durable on-disk spool (see UsageSpool) and a background shipper sends
+    them in batches of up to SPOOL_SHIP_BATCH_SIZE, deleting them only once the
+    API has accepted them. Events left in the spool are shipped after a
+    restart.
     """
 
     def __init__(
@@ -116,6 +141,7 @@ class UsageTracker:
         service_token: str | None = None,
         batch_size: int = 10,
         flush_interval: float = 5.0,
+        spool_path: str | None = None,
     ) -> None:
         """Initialize usage tracker.
 
@@ -124,11 +150,13 @@ class UsageTracker:
             service_token: Internal service authentication token
             batch_size: Number of events to batch before sending
             flush_interval: Seconds between automatic flushes
+            spool_path: SQLite file to spool events to; None keeps them in memory
         """
         self.api_base_url = api_base_url.rstrip("/")
         self.service_token = service_token
         self.batch_size = batch_size
         self.flush_interval = flush_interval
+        self.spool_path = spool_path
 
         self._event_queue: list[UsageEvent] = []
         self._queue_lock = asyncio.Lock()
@@ -136,12 +164,19 @@ class UsageTracker:
         self._client: httpx.AsyncClient | None = None
         self._running = False
 
+        self._spool: UsageSpool | None = None
+        self._ship_lock = asyncio.Lock()
+        self._ship_wakeup = asyncio.Event()
+        self._spooled_since_ship = 0
+
     async def start(self) -> None:
         """Start the usage tracker background tasks."""
         if self._running:
             return
 
         self._running = True
+        if self.spool_path and self._spool is None:
+            self._spool = await asyncio.to_thread(UsageSpool, self.spool_path)
         self._client = httpx.AsyncClient(
             base_url=self.api_base_url,
             headers={
@@ -151,7 +186,9 @@ class UsageTracker:
             timeout=60.0,  # Increased timeout from 30 to 60 seconds
         )
         self._flush_task = asyncio.create_task(self._periodic_flush())
-        logger.info("Usage tracker started", api_base_url=self.api_base_url)
+        logger.info(
+            "Usage tracker started", api_base_url=self.api_base_url, spool_path=self.spool_path
+        )
 
     async def stop(self) -> None:
         """Stop the usage tracker and flush remaining events."""
@@ -170,13 +207,23 @@ class UsageTracker:
             await self._client.aclose()
             self._client = None
 
+        if self._spool:
+            # Unshipped events stay on disk and are sent after the next start
+            await asyncio.to_thread(self._spool.close)
+            self._spool = None
+
         logger.info("Usage tracker stopped")
 
     async def _periodic_flush(self) -> None:
-        """Periodically flush events to the API."""
+        """Periodically flush events to the API.
+
+        A full batch in the spool wakes the shipper before the interval ends.
+        """
         while self._running:
             try:
-                await asyncio.sleep(self.flush_interval)
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._ship_wakeup.wait(), self.flush_interval)
+                self._ship_wakeup.clear()
                 await self.flush()
             except asyncio.CancelledError:
                 break
@@ -185,6 +232,10 @@ class UsageTracker:
 
     async def flush(self) -> None:
         """Flush all pending events to the API."""
+        if self.spool_path:
+            await self._ship_spool()
+            return
+
         async with self._queue_lock:
             if not self._event_queue:
                 return
@@ -205,22 +256,78 @@ class UsageTracker:
                 if len(self._event_queue) < self.batch_size * 10:
                     self._event_queue.extend(events)
 
+    async def _ship_spool(self) -> None:
+        """Ship spooled events to the API until the spool is empty or a send fails."""
+        spool = self._spool
+        if spool is None or self._client is None:
+            return
+
+        async with self._ship_lock:
+            self._spooled_since_ship = 0
+            try:
+                while rows := await asyncio.to_thread(spool.peek, SPOOL_SHIP_BATCH_SIZE):
+                    await self._ship_rows(spool, rows)
+            except Exception:
+                logger.exception("Failed to ship spooled usage events")
+            finally:
+                await self._report_spool(spool)
+
+    async def _ship_rows(self, spool: UsageSpool, rows: list[SpooledEvent]) -> None:
+        """Send a batch of spooled events and acknowledge it.
+
+        A batch the API rejects outright is split in half until the rejected
+        event is isolated; that event is logged and dropped so it cannot
+        block the rest of the spool.
+        """
+        try:
+            await self._post_events([row.payload for row in rows])
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in REJECTED_BATCH_STATUSES:
+                raise
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                await self._ship_rows(spool, rows[:middle])
+                await self._ship_rows(spool, rows[middle:])
+                return
+            logger.error(
+                "Dropping usage event rejected by the API",
+                status_code=e.response.status_code,
+                payload=rows[0].payload,
+            )
+        await asyncio.to_thread(spool.ack, rows[0].seq, rows[-1].seq)
+
+    async def _report_spool(self, spool: UsageSpool) -> None:
+        """Publish spool depth and shipping lag metrics."""
+        stats = await asyncio.to_thread(spool.stats)
+        lag = time.time() - stats.oldest_created_at if stats.oldest_created_at else 0.0
+        track_usage_spool(stats.depth, max(lag, 0.0))
+
     async def _send_events(self, events: list[UsageEvent]) -> None:
         """Send events to the API service."""
         if not self._client:
             logger.warning("Usage tracker not started, events will be queued")
             return
 
+        await self._post_events([e.model_dump_json() for e in events])
+
+    async def _post_events(self, payloads: list[str]) -> None:
+        """POST JSON-encoded events to the API as one gzip-compressed batch."""
+        if not self._client:
+            raise RuntimeError("Usage tracker not started")
+        batch = '{"events":[' + ",".join(payloads) + "]}"
+        body = gzip.compress(batch.encode(), compresslevel=6)
+
         # Retry logic for resilience
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 response = await self._client.post(
-                    "/api/billing/usage/record",
-                    json={"events": [e.model_dump(mode="json") for e in events]},
+                    USAGE_RECORD_PATH,
+                    content=body,
+                    headers={"Content-Encoding": "gzip"},
                 )
                 response.raise_for_status()
-                logger.debug("Recorded usage events", count=len(events))
+                logger.debug("Recorded usage events", count=len(payloads))
                 return
             except httpx.HTTPStatusError as e:
                 logger.error(
@@ -229,7 +336,8 @@ class UsageTracker:
                     response=e.response.text,
                     attempt=attempt + 1,
                 )
-                if attempt == max_retries - 1:  # Last attempt
+                # Last attempt, or a batch that retrying cannot fix
+                if attempt == max_retries - 1 or e.response.status_code in REJECTED_BATCH_STATUSES:
                     raise
             except httpx.RequestError as e:
                 logger.error(
@@ -246,6 +354,15 @@ class UsageTracker:
         Args:
             event: The usage event to record
         """
+        if self.spool_path:
+            if self._spool is None:
+                self._spool = await asyncio.to_thread(UsageSpool, self.spool_path)
+            await asyncio.to_thread(self._spool.append, [event.model_dump_json()])
+            self._spooled_since_ship += 1
+            if self._spooled_since_ship >= self.batch_size:
+                self._ship_wakeup.set()
+            return
+
         async with self._queue_lock:
             self._event_queue.append(event)
 
@@ -282,7 +399,12 @@ class UsageTracker:
             to ensure accurate billing and prevent manipulation.
             This matches the compute usage pattern.
         """
-        total_tokens = params.input_tokens + params.output_tokens
+        total_tokens = (
+            params.input_tokens
+            + params.output_tokens
+            + params.cached_input_tokens
+            + params.cache_creation_input_tokens
+        )
         usage_source = params.usage_source or "included"
 
         event = UsageEvent(
@@ -296,6 +418,8 @@ class UsageTracker:
             model=params.model,
             input_tokens=params.input_tokens,
             output_tokens=params.output_tokens,
+            cached_input_tokens=params.cached_input_tokens or None,
+            cache_creation_input_tokens=params.cache_creation_input_tokens or None,
             usage_source=usage_source,
             metadata=params.metadata,
         )
@@ -440,6 +564,7 @@ class _UsageTrackerSingleton:
         service_token: str | None = None,
         batch_size: int = 10,
         flush_interval: float = 5.0,
+        spool_path: str | None = None,
     ) -> UsageTracker:
         """Initialize and start the global usage tracker.
 
@@ -448,6 +573,7 @@ class _UsageTrackerSingleton:
             service_token: Internal service authentication token
             batch_size: Number of events to batch before sending
             flush_interval: Seconds between automatic flushes
+            spool_path: SQLite file to spool events to; None keeps them in memory
 
         Returns:
             The initialized usage tracker
@@ -460,6 +586,7 @@ class _UsageTrackerSingleton:
             service_token=service_token,
             batch_size=batch_size,
             flush_interval=flush_interval,
+            spool_path=spool_path,
         )
         await cls._instance.start()
         return cls._instance
@@ -482,6 +609,7 @@ async def init_usage_tracker(
     service_token: str | None = None,
     batch_size: int = 10,
     flush_interval: float = 5.0,
+    spool_path: str | None = None,
 ) -> UsageTracker:
     """Initialize and start the global usage tracker.
 
@@ -490,6 +618,7 @@ async def init_usage_tracker(
         service_token: Internal service authentication token
         batch_size: Number of events to batch before sending
         flush_interval: Seconds between automatic flushes
+        spool_path: SQLite file to spool events to; None keeps them in memory
 
     Returns:
         The initialized usage tracker
@@ -499,6 +628,7 @@ async def init_usage_tracker(
         service_token=service_token,
         batch_size=batch_size,
         flush_interval=flush_interval,
+        spool_path=spool_path,
     )
 
 
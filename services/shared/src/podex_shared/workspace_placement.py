@@ -0,0 +1,297 @@
+"""Shared cache of where workspaces run (compute server or local pod).
+
+Routing an API or agent call to a workspace needs the compute service URL of
+its server, or the local pod it runs on. That placement rarely changes, so it
+is cached in two tiers:
+
+- an in-process LRU with a short TTL, answered without any I/O
+- Redis, shared by every API and agent worker
+
+When a workspace is created, moved to another server or deleted, or its
+server's compute service URL changes, the writer calls
+``invalidate_workspace_placement``. It replaces the Redis entry with a
+short-lived tombstone and publishes the workspace ID, and every running cache
+drops its local copy. Placements are only written back to Redis with SET NX,
+so a lookup that loaded the old placement before the invalidation cannot
+overwrite the tombstone. Both TTLs bound staleness if an invalidation message
+is missed.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+
+from podex_shared.redis_client import RedisClient
+from podex_shared.sentry import track_workspace_placement_lookup
+
+logger = structlog.get_logger()
+
+PLACEMENT_KEY_PREFIX = "podex:workspace:placement:"
+PLACEMENT_INVALIDATE_CHANNEL = "podex:workspace:placement:invalidate"
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_LOCAL_TTL = 60.0  # seconds
+DEFAULT_REDIS_TTL = 300  # seconds
+# Longer than a placement load, so a load racing an invalidation sees it
+PLACEMENT_TOMBSTONE_TTL = 30  # seconds
+_TOMBSTONE = {"invalidated": True}
+
+
+@dataclass(frozen=True)
+class WorkspacePlacement:
+    """Where a workspace runs."""
+
+    workspace_id: str
+    server_id: str | None = None
+    compute_service_url: str | None = None
+    local_pod_id: str | None = None
+
+    @property
+    def is_placed(self) -> bool:
+        """Whether the workspace has been assigned to a server or a local pod."""
+        return bool(self.server_id or self.local_pod_id)
+
+
+PlacementLoader = Callable[[str], Awaitable[WorkspacePlacement | None]]
+
+
+async def invalidate_workspace_placement(redis_client: RedisClient, workspace_id: str) -> None:
+    """Drop a workspace's cached placement everywhere.
+
+    Call after the change is committed, otherwise a concurrent lookup can
+    cache the old placement again.
+    """
+    await invalidate_workspace_placements(redis_client, [workspace_id])
+
+
+async def invalidate_workspace_placements(
+    redis_client: RedisClient, workspace_ids: Iterable[str]
+) -> None:
+    """Drop several workspaces' cached placements everywhere.
+
+    Each Redis entry is replaced by a tombstone rather than deleted, which
+    keeps lookups that started before the change from caching it again.
+    """
+    for workspace_id in workspace_ids:
+        try:
+            await redis_client.connect()
+            await redis_client.set_json(
+                f"{PLACEMENT_KEY_PREFIX}{workspace_id}", _TOMBSTONE, ex=PLACEMENT_TOMBSTONE_TTL
+            )
+            await redis_client.publish(PLACEMENT_INVALIDATE_CHANNEL, workspace_id)
+        except Exception as e:
+            logger.warning(
+                "Failed to invalidate workspace placement",
+                workspace_id=workspace_id,
+                error=str(e),
+            )
+
+
+class WorkspacePlacementCache:
+    """Two-tier (in-process LRU + Redis) cache in front of a placement loader.
+
+    Only placed workspaces are cached; missing workspaces and workspaces not
+    yet assigned to a server or pod are loaded again on the next lookup.
+    Redis errors are logged and fall through to the loader, so the cache
+    never makes a lookup fail.
+    """
+
+    RECONNECT_DELAY = 1.0  # seconds between invalidation listener reconnects
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        loader: PlacementLoader,
+        *,
+        service: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        local_ttl: float = DEFAULT_LOCAL_TTL,
+        redis_ttl: int = DEFAULT_REDIS_TTL,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            redis_client: Connected (or connectable) shared Redis client
+            loader: Loads a placement from the source of truth (the database)
+            service: Service name used to tag hit/miss metrics
+            max_entries: Size of the in-process LRU
+            local_ttl: Seconds an in-process entry is trusted
+            redis_ttl: Seconds a Redis entry lives
+        """
+        self._redis = redis_client
+        self._loader = loader
+        self._service = service
+        self._max_entries = max_entries
+        self._local_ttl = local_ttl
+        self._redis_ttl = redis_ttl
+        # workspace_id -> (placement, expires_at), least recently used first
+        self._local: OrderedDict[str, tuple[WorkspacePlacement, float]] = OrderedDict()
+        self._counters = {"local_hit": 0, "redis_hit": 0, "miss": 0}
+        # Bumped on every invalidation, so loads racing one are not cached locally
+        self._invalidations = 0
+        self._running = False
+        self._listener_task: asyncio.Task[None] | None = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and the in-process cache size."""
+        lookups = sum(self._counters.values())
+        hits = self._counters["local_hit"] + self._counters["redis_hit"]
+        return {
+            **self._counters,
+            "entries": len(self._local),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "listening": self._listener_task is not None and not self._listener_task.done(),
+        }
+
+    async def get(self, workspace_id: str) -> WorkspacePlacement | None:
+        """Get a workspace's placement, loading and caching it on a miss."""
+        placement = self._get_local(workspace_id)
+        if placement is not None:
+            self._record("local_hit")
+            return placement
+
+        invalidations = self._invalidations
+        placement = await self._get_redis(workspace_id)
+        if placement is not None:
+            self._record("redis_hit")
+            if invalidations == self._invalidations:
+                self._set_local(placement)
+            return placement
+
+        self._record("miss")
+        placement = await self._loader(workspace_id)
+        if placement is not None and placement.is_placed:
+            if invalidations == self._invalidations:
+                self._set_local(placement)
+            await self._set_redis(placement)
+        return placement
+
+    async def invalidate(self, workspace_id: str) -> None:
+        """Drop a workspace's placement here, in Redis and in every other cache."""
+        await self.invalidate_many([workspace_id])
+
+    async def invalidate_many(self, workspace_ids: Iterable[str]) -> None:
+        """Drop several workspaces' placements here, in Redis and in every other cache."""
+        workspace_ids = list(workspace_ids)
+        for workspace_id in workspace_ids:
+            self._drop_local(workspace_id)
+        await invalidate_workspace_placements(self._redis, workspace_ids)
+
+    def clear_local(self) -> None:
+        """Drop every in-process entry."""
+        self._local.clear()
+        self._invalidations += 1
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other processes."""
+        if self._running:
+            return
+        self._running = True
+        self._listener_task = asyncio.create_task(self._run_listener())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener."""
+        self._running = False
+        if self._listener_task:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+
+    def _record(self, result: str) -> None:
+        self._counters[result] += 1
+        track_workspace_placement_lookup(self._service, result)
+
+    def _get_local(self, workspace_id: str) -> WorkspacePlacement | None:
+        entry = self._local.get(workspace_id)
+        if entry is None:
+            return None
+        placement, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._local[workspace_id]
+            return None
+        self._local.move_to_end(workspace_id)
+        return placement
+
+    def _drop_local(self, workspace_id: str) -> None:
+        self._local.pop(workspace_id, None)
+        self._invalidations += 1
+
+    def _set_local(self, placement: WorkspacePlacement) -> None:
+        self._local[placement.workspace_id] = (placement, time.monotonic() + self._local_ttl)
+        self._local.move_to_end(placement.workspace_id)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_redis(self, workspace_id: str) -> WorkspacePlacement | None:
+        try:
+            await self._redis.connect()
+            data = await self._redis.get_json(f"{PLACEMENT_KEY_PREFIX}{workspace_id}")
+        except Exception as e:
+            logger.debug("Placement cache read failed", workspace_id=workspace_id, error=str(e))
+            return None
+        if not isinstance(data, dict) or data == _TOMBSTONE:
+            return None
+        try:
+            return WorkspacePlacement(**data)
+        except TypeError:
+            return None
+
+    async def _set_redis(self, placement: WorkspacePlacement) -> None:
+        try:
+            await self._redis.connect()
+            # NX: never replace a tombstone left by an invalidation during the load
+            await self._redis.set_json(
+                f"{PLACEMENT_KEY_PREFIX}{placement.workspace_id}",
+                asdict(placement),
+                ex=self._redis_ttl,
+                nx=True,
+            )
+        except Exception as e:
+            logger.debug(
+                "Placement cache write failed",
+                workspace_id=placement.workspace_id,
+                error=str(e),
+            )
+
+    async def _run_listener(self) -> None:
+        """Drop local entries named on the invalidation channel, reconnecting on errors."""
+        while self._running:
+            pubsub = None
+            try:
+                await self._redis.connect()
+                pubsub = self._redis.client.pubsub()
+                await pubsub.subscribe(PLACEMENT_INVALIDATE_CHANNEL)
+                # Invalidations may have been missed while not subscribed
+                self.clear_local()
+
+                while self._running:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=1.0,
+                    )
+                    if message and message["type"] == "message":
+                        self._handle_message(message)
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.exception("Placement invalidation listener error, reconnecting")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.unsubscribe(PLACEMENT_INVALIDATE_CHANNEL)
+                        await pubsub.aclose()
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        data = message.get("data")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        if isinstance(data, str):
+            self._drop_local(data)
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from podex_shared.redis_client import (
+    CLAIM_TASKS_SCRIPT,
     RedisClient,
     clear_redis_clients,
     get_redis_client,
@@ -149,7 +150,7 @@ class TestRedisClientKeyValue:
 
         result = await client.set("key", "value")
         assert result is True
-        mock_redis_client.set.assert_called_once_with("key", "value", ex=None, px=None)
+        mock_redis_client.set.assert_called_once_with("key", "value", ex=None, px=None, nx=False)
 
     @pytest.mark.asyncio
     async def test_set_with_expiration(self) -> None:
@@ -161,7 +162,7 @@ class TestRedisClientKeyValue:
         client._client = mock_redis_client
 
         await client.set("key", "value", ex=3600)
-        mock_redis_client.set.assert_called_once_with("key", "value", ex=3600, px=None)
+        mock_redis_client.set.assert_called_once_with("key", "value", ex=3600, px=None, nx=False)
 
     @pytest.mark.asyncio
     async def test_set_with_millisecond_expiration(self) -> None:
@@ -173,7 +174,7 @@ class TestRedisClientKeyValue:
         client._client = mock_redis_client
 
         await client.set("key", "value", px=5000)
-        mock_redis_client.set.assert_called_once_with("key", "value", ex=None, px=5000)
+        mock_redis_client.set.assert_called_once_with("key", "value", ex=None, px=5000, nx=False)
 
     @pytest.mark.asyncio
     async def test_delete(self) -> None:
@@ -269,6 +270,7 @@ class TestRedisClientJSON:
             '{"foo": "bar"}',
             ex=3600,
             px=None,
+            nx=False,
         )
 
 
@@ -313,6 +315,23 @@ class TestRedisClientHash:
         result = await client.hgetall("hash")
         assert result == {"f1": "v1", "f2": "v2"}
 
+    @pytest.mark.asyncio
+    async def test_hgetall_many_pipelines_and_tolerates_bad_keys(self) -> None:
+        """Test hgetall_many uses one pipeline and maps errors/missing keys to {}."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[{"f": "v"}, {}, ValueError("WRONGTYPE")])
+        mock_redis_client = MagicMock()
+        mock_redis_client.pipeline = MagicMock(return_value=pipe)
+
+        client = RedisClient("redis://localhost:6379", encrypt=False)
+        client._client = mock_redis_client
+
+        result = await client.hgetall_many(["a", "b", "c"])
+
+        assert result == [{"f": "v"}, {}, {}]
+        assert pipe.hgetall.call_count == 3
+        pipe.execute.assert_awaited_once_with(raise_on_error=False)
+
     @pytest.mark.asyncio
     async def test_hdel(self) -> None:
         """Test hdel operation."""
@@ -327,6 +346,114 @@ class TestRedisClientHash:
         mock_redis_client.hdel.assert_called_once_with("hash", "f1", "f2")
 
 
+class TestRedisClientTaskClaims:
+    """Tests for atomic task queue claims."""
+
+    @pytest.mark.asyncio
+    async def test_claim_tasks_runs_script_once(self) -> None:
+        """Test claiming a batch is one script call returning decoded payloads."""
+        script = AsyncMock(
+            return_value=[
+                "t1",
+                json.dumps({"id": "t1", "status": "running"}),
+                "t2",
+                json.dumps({"id": "t2"}),
+            ]
+        )
+        mock_redis_client = MagicMock()
+        mock_redis_client.register_script = MagicMock(return_value=script)
+        mock_redis_client.zrange = AsyncMock()
+
+        client = RedisClient("redis://localhost:6379", encrypt=False)
+        client._client = mock_redis_client
+
+        claimed = await client.claim_tasks(
+            "pending", "task:", 2, active_key="active", worker_id="w1", ttl=60
+        )
+
+        assert [task["id"] for task in claimed] == ["t1", "t2"]
+        assert claimed[0]["status"] == "running"
+        mock_redis_client.zrange.assert_not_awaited()
+        script.assert_awaited_once()
+        kwargs = script.call_args.kwargs
+        assert kwargs["keys"] == ["pending", "active", "pending"]
+        assert kwargs["args"][:4] == ["1", "0", "1", "w1"]
+        assert kwargs["args"][5] == 60
+        assert kwargs["args"][8:] == ["task:", 2]
+
+        await client.claim_tasks("pending", "task:", 1)
+        mock_redis_client.register_script.assert_called_once()
+
+    def test_claim_script_pops_in_script_and_uses_cjson(self) -> None:
+        """Test the script pops the pending set itself and re-encodes with cjson."""
+        assert "ZPOPMIN" in CLAIM_TASKS_SCRIPT
+        assert "cjson.decode" in CLAIM_TASKS_SCRIPT
+        assert "cjson.encode(task)" in CLAIM_TASKS_SCRIPT
+        assert "string.match" not in CLAIM_TASKS_SCRIPT
+
+    @pytest.mark.asyncio
+    async def test_claim_task_empty(self) -> None:
+        """Test claiming from an empty queue returns None."""
+        script = AsyncMock(return_value=[])
+        mock_redis_client = MagicMock()
+        mock_redis_client.register_script = MagicMock(return_value=script)
+
+        client = RedisClient("redis://localhost:6379", encrypt=False)
+        client._client = mock_redis_client
+
+        result = await client.claim_task(
+            "pending", "task:", ready_key="ready", ready_member="session-1"
+        )
+
+        assert result is None
+        kwargs = script.call_args.kwargs
+        assert kwargs["keys"] == ["pending", "pending", "ready"]
+        assert kwargs["args"][6] == "session-1"
+
+    @pytest.mark.asyncio
+    async def test_claim_tasks_zero_count(self) -> None:
+        """Test a zero count does not touch Redis."""
+        mock_redis_client = MagicMock()
+
+        client = RedisClient("redis://localhost:6379", encrypt=False)
+        client._client = mock_redis_client
+
+        assert await client.claim_tasks("pending", "task:", 0) == []
+        mock_redis_client.register_script.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_claim_tasks_encrypted_stamps_client_side(self) -> None:
+        """Test encrypted payloads are stamped and written back in a pipeline."""
+        script = AsyncMock(return_value=["t1", "encrypted"])
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True])
+        mock_redis_client = MagicMock()
+        mock_redis_client.register_script = MagicMock(return_value=script)
+        mock_redis_client.pipeline = MagicMock(return_value=pipe)
+
+        client = RedisClient("redis://localhost:6379")
+        client._client = mock_redis_client
+        client._encrypt = True
+
+        with (
+            patch(
+                "podex_shared.redis_client.decrypt_value",
+                return_value=json.dumps({"id": "t1", "status": "pending"}),
+            ),
+            patch("podex_shared.redis_client.encrypt_value", side_effect=lambda v: v),
+        ):
+            claimed = await client.claim_tasks("pending", "task:", 1, worker_id="w1")
+
+        assert claimed[0]["status"] == "running"
+        assert claimed[0]["assigned_worker_id"] == "w1"
+        assert script.call_args.kwargs["args"][2] == "0"
+        key, value = pipe.set.call_args.args
+        assert key == "task:t1"
+        assert json.loads(value)["status"] == "running"
+        assert pipe.set.call_args.kwargs == {"keepttl": True}
+        pipe.execute.assert_awaited_once()
+
+
 class TestRedisClientPubSub:
     """Tests for pub/sub operations."""
 
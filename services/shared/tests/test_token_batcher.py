@@ -0,0 +1,152 @@
+"""Tests for adaptive token batching."""
+
+import asyncio
+
+import pytest
+
+from podex_shared.token_batcher import TokenBatcher
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.batches: list[tuple[str, list[str]]] = []
+
+    async def __call__(self, key: str, tokens: list[str]) -> None:
+        self.batches.append((key, list(tokens)))
+
+
+class TestTokenBatcher:
+    """Tests for TokenBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_first_token_flushed_immediately(self) -> None:
+        """Test a token on an idle stream is delivered without waiting."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=60)
+
+        await batcher.add("stream", "Hello")
+
+        assert recorder.batches == [("stream", ["Hello"])]
+
+    @pytest.mark.asyncio
+    async def test_fast_tokens_coalesced_in_order(self) -> None:
+        """Test tokens arriving within the window are delivered as one batch."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=0.01)
+
+        for token in ["Hello", ",", " ", "world"]:
+            await batcher.add("stream", token)
+        await asyncio.sleep(0.05)
+
+        assert recorder.batches == [("stream", ["Hello"]), ("stream", [",", " ", "world"])]
+
+    @pytest.mark.asyncio
+    async def test_size_limit_forces_flush(self) -> None:
+        """Test reaching max_chars delivers the batch without waiting for the timer."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=60, max_chars=4)
+
+        for token in ["a", "bb", "cc", "d"]:
+            await batcher.add("stream", token)
+
+        assert recorder.batches == [("stream", ["a"]), ("stream", ["bb", "cc"])]
+        assert batcher.pending_keys == ["stream"]
+
+    @pytest.mark.asyncio
+    async def test_flush_where_only_matching_keys(self) -> None:
+        """Test selective flushing leaves other streams buffered."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=60)
+        for key in ("a", "b"):
+            await batcher.add(key, "first")
+            await batcher.add(key, "second")
+
+        await batcher.flush_where(lambda key: key == "a")
+
+        assert recorder.batches[-1] == ("a", ["second"])
+        assert batcher.pending_keys == ["b"]
+
+        await batcher.flush_all()
+        assert recorder.batches[-1] == ("b", ["second"])
+        assert batcher.pending_keys == []
+
+    @pytest.mark.asyncio
+    async def test_zero_window_disables_batching(self) -> None:
+        """Test a zero window delivers every token individually."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=0)
+
+        for token in ["a", "b", "c"]:
+            await batcher.add("stream", token)
+
+        assert [tokens for _key, tokens in recorder.batches] == [["a"], ["b"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_forget_makes_stream_idle(self) -> None:
+        """Test forgetting a stream lets its next token go out immediately."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=60)
+
+        await batcher.add("stream", "a")
+        batcher.forget("stream")
+        await batcher.add("stream", "b")
+
+        assert recorder.batches == [("stream", ["a"]), ("stream", ["b"])]
+
+    @pytest.mark.asyncio
+    async def test_slow_flush_does_not_block_other_keys(self) -> None:
+        """Test a stalled flush of one stream leaves other streams flowing."""
+        release = asyncio.Event()
+        batches: list[tuple[str, list[str]]] = []
+
+        async def flush(key: str, tokens: list[str]) -> None:
+            if key == "slow":
+                await release.wait()
+            batches.append((key, tokens))
+
+        batcher: TokenBatcher[str] = TokenBatcher(flush, window=60)
+        slow = asyncio.create_task(batcher.add("slow", "a"))
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(batcher.add("fast", "b"), timeout=1)
+        assert batches == [("fast", ["b"])]
+
+        release.set()
+        await slow
+        assert batches[-1] == ("slow", ["a"])
+
+    @pytest.mark.asyncio
+    async def test_flush_where_waits_for_flush_in_progress(self) -> None:
+        """Test flushing a key waits until its in-flight batch is delivered."""
+        release = asyncio.Event()
+        recorder = _Recorder()
+
+        async def flush(key: str, tokens: list[str]) -> None:
+            await release.wait()
+            await recorder(key, tokens)
+
+        batcher: TokenBatcher[str] = TokenBatcher(flush, window=60)
+        in_flight = asyncio.create_task(batcher.add("stream", "a"))
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(batcher.flush_all())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        release.set()
+        await asyncio.gather(in_flight, waiter)
+        assert recorder.batches == [("stream", ["a"])]
+        assert batcher._flush_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_idle_tracking_pruned(self) -> None:
+        """Test streams that never call forget do not keep idle-tracking entries."""
+        recorder = _Recorder()
+        batcher: TokenBatcher[str] = TokenBatcher(recorder, window=0.01)
+
+        await batcher.add("cancelled", "a")
+        await asyncio.sleep(0.02)
+        await batcher.add("other", "b")
+
+        assert "cancelled" not in batcher._last_flush
+        assert "other" in batcher._last_flush
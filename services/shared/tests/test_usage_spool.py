@@ -0,0 +1,67 @@
+"""Tests for the on-disk usage event spool."""
+
+from pathlib import Path
+
+from podex_shared.usage_spool import UsageSpool
+
+
+class TestUsageSpool:
+    """Tests for UsageSpool."""
+
+    def test_peek_returns_events_in_order(self, tmp_path: Path) -> None:
+        """Test events are read back oldest first without being removed."""
+        spool = UsageSpool(tmp_path / "spool.db")
+        spool.append(["a", "b"])
+        spool.append(["c"])
+
+        assert [row.payload for row in spool.peek(2)] == ["a", "b"]
+        assert [row.payload for row in spool.peek(10)] == ["a", "b", "c"]
+        spool.close()
+
+    def test_ack_removes_range(self, tmp_path: Path) -> None:
+        """Test acknowledged events are deleted and the rest remain."""
+        spool = UsageSpool(tmp_path / "spool.db")
+        spool.append(["a", "b", "c"])
+        rows = spool.peek(2)
+
+        assert spool.ack(rows[0].seq, rows[-1].seq) == 2
+        assert [row.payload for row in spool.peek(10)] == ["c"]
+        assert spool.stats().depth == 1
+        spool.close()
+
+    def test_survives_reopen(self, tmp_path: Path) -> None:
+        """Test unacknowledged events are still there after a restart."""
+        path = tmp_path / "nested" / "spool.db"
+        spool = UsageSpool(path)
+        spool.append(["a", "b"])
+        spool.ack(spool.peek(1)[0].seq, spool.peek(1)[0].seq)
+        spool.close()
+
+        reopened = UsageSpool(path)
+
+        assert [row.payload for row in reopened.peek(10)] == ["b"]
+        reopened.close()
+
+    def test_stats(self, tmp_path: Path) -> None:
+        """Test depth and oldest timestamp, including an empty spool."""
+        spool = UsageSpool(tmp_path / "spool.db")
+        assert spool.stats() == (0, None)
+
+        spool.append(["a", "b"])
+        stats = spool.stats()
+
+        assert stats.depth == 2
+        assert stats.oldest_created_at == spool.peek(1)[0].created_at
+        spool.close()
+
+    def test_drained_spool_truncates_wal(self, tmp_path: Path) -> None:
+        """Test the WAL is truncated once every event is acknowledged."""
+        path = tmp_path / "spool.db"
+        spool = UsageSpool(path)
+        spool.append(["x" * 1000] * 200)
+        rows = spool.peek(200)
+
+        spool.ack(rows[0].seq, rows[-1].seq)
+
+        assert Path(f"{path}-wal").stat().st_size == 0
+        spool.close()
@@ -1,10 +1,16 @@
 """Comprehensive tests for usage tracking utilities."""
 
+import gzip
+import json
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
+from podex_shared import usage_tracker
 from podex_shared.models.billing import UsageType
 from podex_shared.usage_tracker import (
     ComputeUsageParams,
@@ -254,6 +260,28 @@ class TestUsageTrackerRecordTokenUsage:
         assert event.usage_type == UsageType.TOKENS_OUTPUT
         # Pricing is calculated server-side, not client-side
 
+    @pytest.mark.asyncio
+    async def test_record_token_usage_with_prompt_cache(self) -> None:
+        """Test prompt cache token counts are recorded as billable usage."""
+        tracker = UsageTracker(api_base_url="http://localhost:8000", batch_size=100)
+        params = TokenUsageParams(
+            user_id="user-123",
+            model="claude-sonnet-4-20250514",
+            input_tokens=100,
+            output_tokens=50,
+            metadata={"provider": "anthropic"},
+            cached_input_tokens=4000,
+            cache_creation_input_tokens=200,
+        )
+
+        event = await tracker.record_token_usage(params)
+
+        assert event.input_tokens == 100
+        assert event.cached_input_tokens == 4000
+        assert event.cache_creation_input_tokens == 200
+        assert event.quantity == 4350
+        assert event.metadata == {"provider": "anthropic"}
+
     @pytest.mark.asyncio
     async def test_record_token_usage_unknown_model_accepted(self) -> None:
         """Test recording token usage with unknown model is accepted.
@@ -429,3 +457,119 @@ class TestUsageTrackerSingleton:
         assert get_usage_tracker() is tracker2
 
         await shutdown_usage_tracker()
+
+
+def _event(user_id: str = "user-123") -> UsageEvent:
+    return UsageEvent(
+        user_id=user_id,
+        usage_type=UsageType.TOKENS_OUTPUT,
+        quantity=1000,
+        unit="tokens",
+    )
+
+
+class RecordingClient:
+    """Fake API client that decodes gzip batches and rejects some users."""
+
+    def __init__(self, reject_user: str | None = None, down: bool = False) -> None:
+        self.reject_user = reject_user
+        self.down = down
+        self.batches: list[list[dict[str, Any]]] = []
+
+    async def post(self, url: str, content: bytes, headers: dict[str, str]) -> MagicMock:
+        assert headers["Content-Encoding"] == "gzip"
+        if self.down:
+            raise httpx.ConnectError("API unavailable")
+        events = json.loads(gzip.decompress(content))["events"]
+        response = MagicMock(status_code=200)
+        if any(event["user_id"] == self.reject_user for event in events):
+            response.status_code = 422
+            response.raise_for_status.side_effect = httpx.HTTPStatusError(
+                "rejected", request=MagicMock(), response=response
+            )
+        else:
+            self.batches.append(events)
+        return response
+
+
+class TestUsageTrackerSpool:
+    """Tests for spooling events to disk and shipping them."""
+
+    @pytest.mark.asyncio
+    async def test_events_spooled_and_shipped(self, tmp_path: Path) -> None:
+        """Test events go to disk and are shipped in one compressed batch."""
+        tracker = UsageTracker(
+            api_base_url="http://localhost:8000",
+            batch_size=100,
+            spool_path=str(tmp_path / "spool.db"),
+        )
+        for _ in range(3):
+            await tracker.record_event(_event())
+        client = RecordingClient()
+        tracker._client = client
+
+        assert tracker._event_queue == []
+        with patch.object(usage_tracker, "track_usage_spool") as track:
+            await tracker.flush()
+
+        assert [len(batch) for batch in client.batches] == [3]
+        assert tracker._spool.stats().depth == 0
+        track.assert_called_once_with(0, 0.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_ship_resumes_after_restart(self, tmp_path: Path) -> None:
+        """Test events survive a failed send and are shipped by the next tracker."""
+        path = str(tmp_path / "spool.db")
+        tracker = UsageTracker(api_base_url="http://localhost:8000", spool_path=path)
+        await tracker.record_event(_event())
+        tracker._client = RecordingClient(down=True)
+        with (
+            patch.object(usage_tracker.asyncio, "sleep", AsyncMock()),
+            patch.object(usage_tracker, "track_usage_spool") as track,
+        ):
+            await tracker.flush()
+        assert track.call_args.args[0] == 1
+        tracker._client = None
+        await tracker.stop()
+
+        restarted = UsageTracker(api_base_url="http://localhost:8000", spool_path=path)
+        await restarted.record_event(_event("user-456"))
+        client = RecordingClient()
+        restarted._client = client
+        await restarted.flush()
+
+        assert [event["user_id"] for event in client.batches[0]] == ["user-123", "user-456"]
+
+    @pytest.mark.asyncio
+    async def test_rejected_event_isolated(self, tmp_path: Path) -> None:
+        """Test a rejected batch is split so only the bad event is dropped."""
+        tracker = UsageTracker(
+            api_base_url="http://localhost:8000",
+            batch_size=100,
+            spool_path=str(tmp_path / "spool.db"),
+        )
+        for user_id in ["a", "b", "bad", "c"]:
+            await tracker.record_event(_event(user_id))
+        client = RecordingClient(reject_user="bad")
+        tracker._client = client
+
+        await tracker.flush()
+
+        shipped = [event["user_id"] for batch in client.batches for event in batch]
+        assert shipped == ["a", "b", "c"]
+        assert tracker._spool.stats().depth == 0
+
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_shipper(self, tmp_path: Path) -> None:
+        """Test reaching batch_size wakes the shipper early."""
+        tracker = UsageTracker(
+            api_base_url="http://localhost:8000",
+            batch_size=2,
+            spool_path=str(tmp_path / "spool.db"),
+        )
+        await tracker.record_event(_event())
+        assert not tracker._ship_wakeup.is_set()
+
+        await tracker.record_event(_event())
+
+        assert tracker._ship_wakeup.is_set()
@@ -0,0 +1,187 @@
+"""Tests for the shared workspace placement cache."""
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from podex_shared.workspace_placement import (
+    PLACEMENT_INVALIDATE_CHANNEL,
+    PLACEMENT_KEY_PREFIX,
+    PLACEMENT_TOMBSTONE_TTL,
+    WorkspacePlacement,
+    WorkspacePlacementCache,
+)
+
+PLACED = WorkspacePlacement(
+    workspace_id="ws-1",
+    server_id="server-1",
+    compute_service_url="http://compute-1:3003",
+)
+
+
+@pytest.fixture
+def redis_client() -> MagicMock:
+    """Create a mock shared RedisClient."""
+    client = MagicMock()
+    client.connect = AsyncMock()
+    client.get_json = AsyncMock(return_value=None)
+    client.set_json = AsyncMock(return_value=True)
+    client.delete = AsyncMock(return_value=1)
+    client.publish = AsyncMock(return_value=1)
+    return client
+
+
+def _cache(redis_client: MagicMock, loader: AsyncMock, **kwargs: Any) -> WorkspacePlacementCache:
+    return WorkspacePlacementCache(redis_client, loader, service="test", **kwargs)
+
+
+class TestWorkspacePlacementCache:
+    """Tests for WorkspacePlacementCache."""
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_and_caches(self, redis_client: MagicMock) -> None:
+        """Test a miss loads from the source and fills both tiers."""
+        loader = AsyncMock(return_value=PLACED)
+        cache = _cache(redis_client, loader)
+
+        assert await cache.get("ws-1") == PLACED
+        assert await cache.get("ws-1") == PLACED
+
+        loader.assert_awaited_once_with("ws-1")
+        redis_client.set_json.assert_awaited_once()
+        assert redis_client.set_json.await_args.args[0] == f"{PLACEMENT_KEY_PREFIX}ws-1"
+        assert redis_client.set_json.await_args.kwargs["nx"] is True
+        stats = cache.get_stats()
+        assert stats["miss"] == 1
+        assert stats["local_hit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_skips_loader(self, redis_client: MagicMock) -> None:
+        """Test a placement cached by another process is served from Redis."""
+        redis_client.get_json.return_value = {
+            "workspace_id": "ws-1",
+            "server_id": "server-1",
+            "compute_service_url": "http://compute-1:3003",
+            "local_pod_id": None,
+        }
+        loader = AsyncMock()
+        cache = _cache(redis_client, loader)
+
+        assert await cache.get("ws-1") == PLACED
+        loader.assert_not_awaited()
+        assert cache.get_stats()["redis_hit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unplaced_workspace_not_cached(self, redis_client: MagicMock) -> None:
+        """Test workspaces without a server or pod are loaded again next time."""
+        loader = AsyncMock(return_value=WorkspacePlacement(workspace_id="ws-1"))
+        cache = _cache(redis_client, loader)
+
+        await cache.get("ws-1")
+        await cache.get("ws-1")
+
+        assert loader.await_count == 2
+        redis_client.set_json.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_through(self, redis_client: MagicMock) -> None:
+        """Test Redis failures never fail the lookup."""
+        redis_client.get_json.side_effect = ConnectionError("down")
+        redis_client.set_json.side_effect = ConnectionError("down")
+        cache = _cache(redis_client, AsyncMock(return_value=PLACED))
+
+        assert await cache.get("ws-1") == PLACED
+
+    @pytest.mark.asyncio
+    async def test_invalidate_publishes(self, redis_client: MagicMock) -> None:
+        """Test invalidation drops the entry locally, in Redis and for other processes."""
+        loader = AsyncMock(return_value=PLACED)
+        cache = _cache(redis_client, loader)
+        await cache.get("ws-1")
+
+        await cache.invalidate("ws-1")
+        redis_client.set_json.reset_mock()
+        await cache.get("ws-1")
+
+        redis_client.publish.assert_awaited_once_with(PLACEMENT_INVALIDATE_CHANNEL, "ws-1")
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_leaves_tombstone(self, redis_client: MagicMock) -> None:
+        """Test invalidation replaces the Redis entry with a short-lived tombstone."""
+        cache = _cache(redis_client, AsyncMock(return_value=PLACED))
+
+        await cache.invalidate_many(["ws-1", "ws-2"])
+
+        tombstones = [
+            (call.args[0], call.kwargs["ex"]) for call in redis_client.set_json.await_args_list
+        ]
+        assert tombstones == [
+            (f"{PLACEMENT_KEY_PREFIX}ws-1", PLACEMENT_TOMBSTONE_TTL),
+            (f"{PLACEMENT_KEY_PREFIX}ws-2", PLACEMENT_TOMBSTONE_TTL),
+        ]
+        assert redis_client.publish.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_tombstone_is_a_miss(self, redis_client: MagicMock) -> None:
+        """Test a tombstoned placement is loaded from the source again."""
+        redis_client.get_json.return_value = {"invalidated": True}
+        loader = AsyncMock(return_value=PLACED)
+        cache = _cache(redis_client, loader)
+
+        assert await cache.get("ws-1") == PLACED
+        loader.assert_awaited_once_with("ws-1")
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidation_not_cached(self, redis_client: MagicMock) -> None:
+        """Test a placement loaded while an invalidation arrives is not cached locally."""
+        cache: WorkspacePlacementCache
+
+        async def load(_workspace_id: str) -> WorkspacePlacement:
+            cache._handle_message({"type": "message", "data": b"ws-1"})
+            return PLACED
+
+        cache = _cache(redis_client, AsyncMock(side_effect=load))
+
+        assert await cache.get("ws-1") == PLACED
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidation_message_drops_entry(self, redis_client: MagicMock) -> None:
+        """Test an invalidation from another process drops the local entry."""
+        loader = AsyncMock(return_value=PLACED)
+        cache = _cache(redis_client, loader)
+        await cache.get("ws-1")
+
+        cache._handle_message({"type": "message", "data": b"ws-1"})
+
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, redis_client: MagicMock) -> None:
+        """Test the least recently used entry is evicted at capacity."""
+
+        async def load(workspace_id: str) -> WorkspacePlacement:
+            return WorkspacePlacement(workspace_id=workspace_id, server_id="server-1")
+
+        cache = _cache(redis_client, AsyncMock(side_effect=load), max_entries=2)
+        await cache.get("ws-1")
+        await cache.get("ws-2")
+        await cache.get("ws-1")
+        await cache.get("ws-3")
+
+        assert list(cache._local) == ["ws-1", "ws-3"]
+
+    @pytest.mark.asyncio
+    async def test_local_ttl_expiry(self, redis_client: MagicMock) -> None:
+        """Test expired local entries are looked up again."""
+        loader = AsyncMock(return_value=PLACED)
+        cache = _cache(redis_client, loader, local_ttl=10)
+
+        with patch("podex_shared.workspace_placement.time.monotonic", return_value=100.0):
+            await cache.get("ws-1")
+        with patch("podex_shared.workspace_placement.time.monotonic", return_value=111.0):
+            await cache.get("ws-1")
+
+        assert loader.await_count == 2